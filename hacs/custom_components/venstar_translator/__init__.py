@@ -1,123 +1,115 @@
-"""The Venstar Translator integration."""
+"""The Venstar Translator integration.
+
+Only the modules that need Home Assistant at runtime (storage, services,
+websocket and the platforms) import it, and they are only imported when an
+entry is set up. The protocol modules stay importable on their own, which
+the standalone tools (e.g. ``python -m custom_components.venstar_translator.pcap``)
+rely on.
+"""
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from .aggregate import AggregateTracker
+from .broadcaster import Broadcaster
+from .const import BROADCAST_MODE_WORKER, DOMAIN, SETTING_BROADCAST_MODE
+from .coordinator import async_start_coordinators
+from .listener import ResponseListener
+from .metrics import LoopLagProbe
 
-from .const import DOMAIN
-from .coordinator import VenstarSensorCoordinator
-from .storage import VenstarTranslatorStorage
-from .venstar_sensor import VenstarSensor, broadcast_udp_packet
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
+# Platform.SENSOR; Home Assistant accepts the plain domain string
+PLATFORMS: list[str] = ["sensor"]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Venstar Translator from a config entry."""
+    from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+    from .healthchecks import HealthChecksPinger
+    from .http_source import HttpJsonFetcher
+    from .services import async_register_services
+    from .storage import VenstarTranslatorStorage
+    from .websocket import async_register_websocket_commands
+
     _LOGGER.info("Setting up Venstar Translator integration")
 
     # Initialize storage, passing MAC prefix from config entry for first-load sync
     storage = VenstarTranslatorStorage(hass)
     await storage.async_load(mac_prefix=entry.data.get("mac_prefix"))
 
-    # Store in hass.data
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "storage": storage,
-        "coordinators": {},
-    }
+    # All packets for this entry go through a single broadcaster
+    broadcaster = Broadcaster(hass, storage)
+    broadcaster.restore(storage.sensors)
 
-    # Initialize coordinators for each enabled sensor
-    coordinators = {}
-    for sensor_id_str, sensor_config in storage.sensors.items():
-        if sensor_config.get("enabled", True):
-            sensor_id = int(sensor_id_str)
-            coordinator = VenstarSensorCoordinator(hass, entry.entry_id, sensor_id)
-            await coordinator.start()
-            coordinators[sensor_id] = coordinator
-
-    hass.data[DOMAIN][entry.entry_id]["coordinators"] = coordinators
-
-    # Register pair_sensor service
-    async def handle_pair_sensor(call):
-        """Handle the pair_sensor service call."""
-        sensor_id = call.data.get("sensor_id")
-
-        if str(sensor_id) not in storage.sensors:
-            _LOGGER.error(f"Sensor {sensor_id} not configured")
-            return
-
-        sensor_config = storage.sensors[str(sensor_id)]
-
-        # Get current temperature
-        state = hass.states.get(sensor_config["entity_id"])
-        if not state or state.state in ("unknown", "unavailable"):
-            _LOGGER.error(
-                f"Cannot pair sensor {sensor_id}: temperature unavailable from "
-                f"entity {sensor_config['entity_id']}"
-            )
-            return
-
-        try:
-            temperature = float(state.state)
-
-            # Create sensor instance
-            sensor = VenstarSensor(
-                sensor_id=sensor_id,
-                mac_prefix=storage.mac_prefix,
-                name=sensor_config["name"],
-                purpose=sensor_config["purpose"],
-                scale=sensor_config.get("scale", "F"),
-                sequence=1,
-            )
+    # HTTP JSON sources share one pooled session and one document cache
+    http = HttpJsonFetcher(async_get_clientsession(hass))
 
-            # Build and broadcast pairing packet
-            packet = sensor.build_pairing_packet(temperature)
-            await hass.async_add_executor_job(broadcast_udp_packet, packet)
+    # Aggregate sources follow their member entities incrementally
+    aggregates = AggregateTracker(hass, storage)
 
-            # Reset stored sequence to 1 after pairing (matches C# behavior)
-            storage.update_sequence(sensor_id, 1)
-            await storage.async_save()
+    # healthchecks.io pings are batched over the same pooled session
+    healthchecks = HealthChecksPinger(async_get_clientsession(hass))
 
-            _LOGGER.info(
-                f"Pairing packet sent for sensor {sensor_id} ({sensor_config['name']})"
-            )
+    # Measure event-loop lag alongside broadcast lateness
+    loop_lag = LoopLagProbe()
 
-        except Exception as e:
-            _LOGGER.error(f"Failed to send pairing packet for sensor {sensor_id}: {e}")
+    # Listen for thermostat SUCCESS/FAILURE responses to adapt repeat counts
+    listener = ResponseListener(storage, broadcaster.on_response)
 
-    hass.services.async_register(DOMAIN, "pair_sensor", handle_pair_sensor)
+    # Store in hass.data
+    hass.data.setdefault(DOMAIN, {})
+    data = hass.data[DOMAIN][entry.entry_id] = {
+        "storage": storage,
+        "broadcaster": broadcaster,
+        "http": http,
+        "aggregates": aggregates,
+        "healthchecks": healthchecks,
+        "loop_lag": loop_lag,
+        "listener": listener,
+        "coordinators": {},
+        "worker": None,
+        "pairing": None,
+        "recording": None,  # Cancels a running record_timeline
+    }
 
-    # Register resend_last_packet service
-    async def handle_resend_last_packet(call):
-        """Handle the resend_last_packet service call."""
-        sensor_id = call.data.get("sensor_id")
+    try:
+        aggregates.start()
+        loop_lag.start()
+        await listener.async_start()
+
+        if storage.settings[SETTING_BROADCAST_MODE] == BROADCAST_MODE_WORKER:
+            # Scheduled broadcasts run in a supervised child process instead
+            from .supervisor import WorkerSupervisor
+
+            worker = WorkerSupervisor(hass, entry.entry_id)
+            data["worker"] = worker
+            await worker.async_start()
+        else:
+            # Initialize coordinators for each enabled sensor
+            await async_start_coordinators(
+                hass, entry.entry_id, [sensor.sensor_id for sensor in storage.sensors]
+            )
 
-        if str(sensor_id) not in storage.sensors:
-            _LOGGER.error(f"Sensor {sensor_id} not configured")
-            return
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        # Don't leave the sensor port bound, or a retried setup would bind a
+        # second listener next to it
+        _LOGGER.debug("Setting up Venstar Translator failed, stopping what was started")
+        await _async_stop_entry(data)
+        hass.data[DOMAIN].pop(entry.entry_id)
+        raise
 
-        packet = storage.get_last_packet(sensor_id)
-        if packet is None:
-            _LOGGER.error(
-                f"Sensor {sensor_id}: no cached packet to resend "
-                f"(sensor has never broadcast)"
-            )
-            return
-
-        try:
-            await hass.async_add_executor_job(broadcast_udp_packet, packet)
-            _LOGGER.info(
-                f"Resent last packet for sensor {sensor_id} "
-                f"({storage.sensors[str(sensor_id)]['name']}), "
-                f"{len(packet)} bytes"
-            )
-        except Exception as e:
-            _LOGGER.error(f"Failed to resend packet for sensor {sensor_id}: {e}")
+    # Live broadcast event stream for debug panels
+    async_register_websocket_commands(hass)
 
-    hass.services.async_register(DOMAIN, "resend_last_packet", handle_resend_last_packet)
+    async_register_services(hass, entry.entry_id, storage, broadcaster, http)
 
     return True
 
@@ -126,12 +118,39 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading Venstar Translator integration")
 
-    # Stop all coordinators
-    data = hass.data[DOMAIN][entry.entry_id]
-    for coordinator in data.get("coordinators", {}).values():
-        await coordinator.stop()
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+
+    await _async_stop_entry(hass.data[DOMAIN][entry.entry_id])
 
     # Clean up
     hass.data[DOMAIN].pop(entry.entry_id)
 
     return True
+
+
+async def _async_stop_entry(data: dict) -> None:
+    """Stop everything async_setup_entry started for an entry.
+
+    Each part can be stopped whether or not it was started, so this also
+    cleans up after a setup that failed halfway.
+
+    Args:
+        data: The entry's hass.data[DOMAIN][entry_id]
+    """
+    if data["recording"] is not None:
+        data["recording"]()
+        data["recording"] = None
+    # End a pairing session (resetting its sequences), then stop all coordinators
+    if data["pairing"] is not None:
+        await data["pairing"].async_cancel(resume=False)
+    for coordinator in data["coordinators"].values():
+        await coordinator.stop()
+    if data["worker"] is not None:
+        await data["worker"].async_stop()
+    await data["loop_lag"].stop()
+    data["aggregates"].stop()
+    # Write sequence updates still waiting for their batched save
+    await data["storage"].async_save()
+    await data["healthchecks"].async_stop()
+    data["listener"].stop()
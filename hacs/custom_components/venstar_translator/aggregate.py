@@ -0,0 +1,338 @@
+"""Aggregate temperature sources: one value maintained from several entities.
+
+An aggregate sensor broadcasts the mean, minimum, maximum, median or
+weighted mean of a set of member entities. The aggregate is kept up to date
+from state change events, one member reading at a time: the mean and
+weighted mean keep running sums (O(1) per update), the minimum, maximum
+and median keep the readings in a sorted list (an O(log n) bisect per
+update, plus a memmove of at most n floats). A broadcast reads the current
+value without touching the members, so every packet carries a consistent
+value computed from one set of readings.
+
+Members that have not reported for ``max_age`` seconds are dropped. Their
+report times sit in a heap; when the oldest one expires the member's state
+is looked up once more (an unchanged reading written again does not fire a
+state change event), and only a member that is still silent is dropped.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import time
+from bisect import bisect_left, insort
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    AGGREGATE_MAX,
+    AGGREGATE_MEDIAN,
+    AGGREGATE_MIN,
+    AGGREGATE_WEIGHTED,
+    SOURCE_AGGREGATE,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant, State
+
+    from .registry import SensorRecord
+    from .storage import VenstarTranslatorStorage
+
+_LOGGER = logging.getLogger(__name__)
+
+_SORTED_AGGREGATIONS = (AGGREGATE_MIN, AGGREGATE_MAX, AGGREGATE_MEDIAN)
+
+
+def member_reading(state: State | None) -> tuple[float, float] | None:
+    """Return a member entity's reading and report time, or None if it has none.
+
+    Quiet about non-numeric states: members are read on every state change.
+    """
+    if state is None:
+        return None
+    try:
+        value = float(state.state)
+    except (ValueError, TypeError):
+        return None
+    if not math.isfinite(value):
+        return None
+    # last_reported also moves when an unchanged reading is written again
+    reported = getattr(state, "last_reported", None) or state.last_updated
+    return value, reported.timestamp()
+
+
+class Aggregate:
+    """Incrementally maintained aggregate of member readings."""
+
+    __slots__ = (
+        "aggregation",
+        "weights",
+        "max_age",
+        "_values",
+        "_reported",
+        "_sorted",
+        "_sum",
+        "_weight_sum",
+        "_expiry",
+    )
+
+    def __init__(
+        self,
+        aggregation: str,
+        weights: dict[str, float] | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        """Initialize an aggregate with no members.
+
+        Args:
+            aggregation: mean, min, max, median or weighted
+            weights: Member weights for the weighted mean (default 1.0)
+            max_age: Seconds without a report before a member is dropped,
+                or None to keep members until they become unavailable
+        """
+        self.aggregation = aggregation
+        self.weights = weights or {}
+        self.max_age = max_age
+        self._values: dict[str, float] = {}
+        self._reported: dict[str, float] = {}
+        self._sorted: list[float] = []
+        self._sum = 0.0  # Sum of (weighted) values
+        self._weight_sum = 0.0
+        self._expiry: list[tuple[float, str]] = []  # (report time, member) heap
+
+    def __len__(self) -> int:
+        """Return the number of members with a current reading."""
+        return len(self._values)
+
+    def update(self, member: str, value: float | None, reported: float = 0.0) -> None:
+        """Replace a member's reading; None drops the member.
+
+        Args:
+            member: Member entity ID
+            value: New reading, or None if the member has none
+            reported: POSIX time of the reading
+        """
+        old = self._values.pop(member, None)
+        if old is not None:
+            self._discard(member, old)
+        if value is None:
+            self._reported.pop(member, None)
+            return
+
+        self._values[member] = value
+        self._reported[member] = reported
+        if self.aggregation in _SORTED_AGGREGATIONS:
+            insort(self._sorted, value)
+        else:
+            weight = self.weights.get(member, 1.0) if self.aggregation == AGGREGATE_WEIGHTED else 1.0
+            self._sum += weight * value
+            self._weight_sum += weight
+        if self.max_age is not None:
+            expiry = self._expiry
+            heapq.heappush(expiry, (reported, member))
+            # Superseded entries are skipped when they surface; compact a
+            # heap that mostly holds them
+            if len(expiry) > 2 * len(self._reported) + 32:
+                self._expiry = [(when, name) for name, when in self._reported.items()]
+                heapq.heapify(self._expiry)
+
+    def _discard(self, member: str, value: float) -> None:
+        """Remove a member's reading from the running state."""
+        if self.aggregation in _SORTED_AGGREGATIONS:
+            del self._sorted[bisect_left(self._sorted, value)]
+        elif not self._values:
+            # Last member gone: reset rather than carry rounding residue
+            self._sum = self._weight_sum = 0.0
+        else:
+            weight = self.weights.get(member, 1.0) if self.aggregation == AGGREGATE_WEIGHTED else 1.0
+            self._sum -= weight * value
+            self._weight_sum -= weight
+
+    def expire(
+        self,
+        now: float,
+        refresh: Callable[[str], tuple[float, float] | None] | None = None,
+    ) -> None:
+        """Drop members that have not reported for max_age seconds.
+
+        Args:
+            now: Current POSIX time
+            refresh: Returns a member's current reading and report time, for
+                a last look before it is dropped
+        """
+        if self.max_age is None:
+            return
+        cutoff = now - self.max_age
+        # update() may compact the heap, so look it up on every pass
+        while self._expiry and self._expiry[0][0] < cutoff:
+            reported, member = heapq.heappop(self._expiry)
+            if self._reported.get(member) != reported:
+                continue  # Superseded by a newer reading
+            reading = refresh(member) if refresh is not None else None
+            if reading is not None and reading[1] >= cutoff:
+                self.update(member, *reading)
+            else:
+                _LOGGER.debug(f"Dropping {member}: no report for {now - reported:.0f} s")
+                self.update(member, None)
+
+    def value(
+        self,
+        now: float | None = None,
+        refresh: Callable[[str], tuple[float, float] | None] | None = None,
+    ) -> float | None:
+        """Return the aggregate of the current readings, or None without any.
+
+        Args:
+            now: Current POSIX time (default: now), for dropping stale members
+            refresh: See expire
+        """
+        self.expire(time.time() if now is None else now, refresh)
+        if not self._values:
+            return None
+
+        aggregation = self.aggregation
+        if aggregation == AGGREGATE_MIN:
+            return self._sorted[0]
+        if aggregation == AGGREGATE_MAX:
+            return self._sorted[-1]
+        if aggregation == AGGREGATE_MEDIAN:
+            values = self._sorted
+            middle = len(values) // 2
+            if len(values) % 2:
+                return values[middle]
+            return (values[middle - 1] + values[middle]) / 2
+        if self._weight_sum <= 0:
+            return None
+        return self._sum / self._weight_sum
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the members' current readings, for diagnostics."""
+        return {"aggregation": self.aggregation, "members": dict(self._values)}
+
+
+def build_aggregate(hass: HomeAssistant, sensor: SensorRecord) -> Aggregate:
+    """Build an aggregate for a sensor from the members' current states."""
+    aggregate = Aggregate(sensor.aggregation, sensor.weights, sensor.max_age)
+    for member in sensor.members:
+        reading = member_reading(hass.states.get(member))
+        if reading is not None:
+            aggregate.update(member, *reading)
+    return aggregate
+
+
+class AggregateTracker:
+    """Maintains the aggregates of a config entry's aggregate sensors.
+
+    One state change subscription covers every member entity. Sensors are
+    (re)built from the state machine when their aggregate settings change,
+    which the tracker notices after every storage save.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage: VenstarTranslatorStorage) -> None:
+        """Initialize the tracker.
+
+        Args:
+            hass: Home Assistant instance
+            storage: Storage of the config entry
+        """
+        self.hass = hass
+        self._storage = storage
+        self._aggregates: dict[int, Aggregate] = {}
+        self._settings: dict[int, tuple] = {}
+        self._members: dict[str, list[int]] = {}
+        self._listeners: list[Callable[[int], None]] = []
+        self._remove_listener: Any = None
+        self._unsubscribe_states: Any = None
+
+    def __contains__(self, sensor_id: object) -> bool:
+        """Return True if the tracker maintains a sensor's aggregate."""
+        return sensor_id in self._aggregates
+
+    def start(self) -> None:
+        """Build the aggregates and follow storage and member changes."""
+        self._remove_listener = self._storage.async_add_listener(self.sync)
+        self.sync()
+
+    def stop(self) -> None:
+        """Unsubscribe from storage and member changes."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._unsubscribe_states is not None:
+            self._unsubscribe_states()
+            self._unsubscribe_states = None
+
+    def async_add_listener(self, listener: Callable[[int], None]) -> Callable[[], None]:
+        """Call a listener with the sensor ID whenever an aggregate's members change.
+
+        Returns:
+            Function removing the listener
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def sync(self) -> None:
+        """Match the aggregates to the configured aggregate sensors."""
+        from homeassistant.helpers.event import async_track_state_change_event
+
+        aggregates = {}
+        settings = {}
+        members: dict[str, list[int]] = {}
+        for sensor in self._storage.sensors:
+            if sensor.source != SOURCE_AGGREGATE:
+                continue
+            sensor_id = sensor.sensor_id
+            settings[sensor_id] = (
+                tuple(sensor.members),
+                sensor.aggregation,
+                tuple(sorted(sensor.weights.items())),
+                sensor.max_age,
+            )
+            aggregate = self._aggregates.get(sensor_id)
+            if aggregate is None or settings[sensor_id] != self._settings.get(sensor_id):
+                aggregate = build_aggregate(self.hass, sensor)
+            aggregates[sensor_id] = aggregate
+            for member in sensor.members:
+                members.setdefault(member, []).append(sensor_id)
+        self._aggregates = aggregates
+        self._settings = settings
+
+        if members.keys() != self._members.keys():
+            if self._unsubscribe_states is not None:
+                self._unsubscribe_states()
+                self._unsubscribe_states = None
+            if members:
+                self._unsubscribe_states = async_track_state_change_event(
+                    self.hass, list(members), self._on_state_change
+                )
+        self._members = members
+
+    def _on_state_change(self, event: Event) -> None:
+        """Apply a member entity's new reading to its aggregates."""
+        member = event.data["entity_id"]
+        reading = member_reading(event.data.get("new_state"))
+        for sensor_id in self._members.get(member, ()):
+            if reading is None:
+                self._aggregates[sensor_id].update(member, None)
+            else:
+                self._aggregates[sensor_id].update(member, *reading)
+            for listener in list(self._listeners):
+                listener(sensor_id)
+
+    def _refresh(self, member: str) -> tuple[float, float] | None:
+        """Look up a member's current reading before it is dropped as stale."""
+        return member_reading(self.hass.states.get(member))
+
+    def value(self, sensor_id: int) -> float | None:
+        """Return a sensor's current aggregate, or None without member readings."""
+        aggregate = self._aggregates.get(sensor_id)
+        if aggregate is None:
+            return None
+        return aggregate.value(time.time(), self._refresh)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every aggregate's members and value, for diagnostics."""
+        return {
+            str(sensor_id): {"value": self.value(sensor_id), **aggregate.as_dict()}
+            for sensor_id, aggregate in self._aggregates.items()
+        }
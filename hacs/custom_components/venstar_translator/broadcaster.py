@@ -0,0 +1,361 @@
+"""Single send path for all Venstar Translator packets."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .registry import SensorRecord
+    from .storage import VenstarTranslatorStorage
+
+from .const import (
+    BROADCAST_REPEAT_COUNT,
+    PURPOSE_REMOTE,
+    RATE_LIMIT_MODE_WARN,
+    SETTING_RATE_LIMIT_MODE,
+    UDP_PORT,
+)
+from .delivery import DeliveryTracker
+from .events import BroadcastEventStream
+from .packet_trace import (
+    KIND_DATA,
+    KIND_NAMES,
+    KIND_PAIRING,
+    KIND_RESEND,
+    RESULT_ERROR,
+    RESULT_OK,
+    PacketTrace,
+)
+from .priority import PriorityLanes
+from .ratelimit import SendLedger, get_broadcast_interval
+from .stats import SensorStats
+from .venstar_sensor import broadcast_udp_packet
+from .wire import DecodeError, decode_sensor_message
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Broadcaster:
+    """Sends packets for every sensor of a config entry and records each send.
+
+    Coordinators, services and the options flow all send through here, so
+    the rate limit ledger and the packet trace see every packet that leaves
+    the integration.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage: VenstarTranslatorStorage,
+        send: Callable[[bytes, int, int], None] = broadcast_udp_packet,
+    ) -> None:
+        """Initialize the broadcaster.
+
+        Args:
+            hass: Home Assistant instance
+            storage: Storage holding sensor purposes and settings
+            send: Blocking function putting (packet, port, repeat count) on
+                the wire, run in the executor (replaced by the replay harness)
+        """
+        self.hass = hass
+        self._storage = storage
+        self._send = send
+        self.trace = PacketTrace()
+        self.events = BroadcastEventStream(hass)
+        self.lanes = PriorityLanes()
+        self.stats: dict[int, SensorStats] = {}
+        self.ledgers: dict[int, SendLedger] = {}
+        self.delivery: dict[int, DeliveryTracker] = {}
+
+    def restore(self, sensors: Iterable[SensorRecord]) -> None:
+        """Seed each sensor's statistics from its persisted last packet.
+
+        Makes the last broadcast, sequence and temperature index entities
+        show the pre-restart values until the first new broadcast.
+        """
+        for sensor in sensors:
+            if sensor.last_packet is None:
+                continue
+            try:
+                message = decode_sensor_message(sensor.last_packet)
+            except DecodeError:
+                continue
+            self.stats_for(sensor.sensor_id).restore(
+                sensor.last_broadcast, message.sequence, message.temperature
+            )
+
+    def forget(self, sensor_id: int) -> None:
+        """Drop the statistics and send ledger of a deleted sensor."""
+        self.stats.pop(sensor_id, None)
+        self.ledgers.pop(sensor_id, None)
+        self.delivery.pop(sensor_id, None)
+
+    def delivery_for(self, sensor_id: int) -> DeliveryTracker:
+        """Get (creating if needed) the delivery tracker for a sensor."""
+        tracker = self.delivery.get(sensor_id)
+        if tracker is None:
+            tracker = self.delivery[sensor_id] = DeliveryTracker()
+        return tracker
+
+    def on_response(self, sensor_id: int, sequence: int | None, success: bool) -> None:
+        """Record a thermostat SUCCESS/FAILURE response (called by the listener)."""
+        self.delivery_for(sensor_id).on_response(sequence, success)
+
+    def ledger_for(self, sensor_id: int) -> SendLedger:
+        """Get (creating if needed) the send ledger for a sensor."""
+        ledger = self.ledgers.get(sensor_id)
+        if ledger is None:
+            ledger = self.ledgers[sensor_id] = SendLedger()
+        return ledger
+
+    def stats_for(self, sensor_id: int) -> SensorStats:
+        """Get (creating if needed) the statistics for a sensor."""
+        stats = self.stats.get(sensor_id)
+        if stats is None:
+            stats = self.stats[sensor_id] = SensorStats()
+        return stats
+
+    async def async_send(
+        self,
+        sensor_id: int,
+        packet: bytes,
+        kind: int,
+        sequence: int | None = None,
+        temp_index: int | None = None,
+        temperature: float | None = None,
+        send: Callable[[bytes, int, int], None] | None = None,
+    ) -> bool:
+        """Broadcast a packet via UDP once the rate limit allows it.
+
+        Sends that would follow the sensor's previous send too closely are
+        deferred (or only counted and logged in warn mode). The deferral is
+        waited out without holding the sensor's lock, so it never holds up
+        other sends, and is re-checked once the lock is taken. Resends that
+        would be deferred are dropped: by the time one was allowed it would
+        collide with the next scheduled broadcast, which carries the same
+        reading. Pairing packets are never deferred, since the user is
+        waiting at the thermostat. Failed sends are not entered in the rate
+        limit ledger.
+
+        Args:
+            sensor_id: Sensor ID the packet belongs to
+            packet: Serialized protobuf packet
+            kind: Packet kind (see packet_trace.KIND_*)
+            sequence: Sequence number carried by the packet, if known
+            temp_index: Temperature index carried by the packet, if known
+            temperature: Source temperature the packet was built from, if known
+            send: Blocking send function to use instead of the broadcaster's
+                own (a pairing session's open socket)
+
+        Returns:
+            False if a resend was dropped by the rate limit, True once sent
+
+        Raises:
+            OSError: If the packet could not be sent (after being recorded)
+        """
+        ledger = self.ledger_for(sensor_id)
+        loop = asyncio.get_running_loop()
+        deferred = 0.0
+        while True:
+            wait = self._deferral(ledger, sensor_id, kind)
+            if wait > 0:
+                if kind == KIND_RESEND:
+                    ledger.dropped += 1
+                    _LOGGER.info(
+                        "Sensor %s: dropping resend, its rate limit allows the next packet in %.1f s",
+                        sensor_id, wait,
+                    )
+                    return False
+                _LOGGER.info(
+                    "Sensor %s: deferring %s packet by %.1f s to respect its rate limit",
+                    sensor_id, KIND_NAMES[kind], wait,
+                )
+                deferred += wait
+                await asyncio.sleep(wait)
+
+            async with ledger.lock:
+                # Another send may have gone out while this one waited
+                if self._deferral(ledger, sensor_id, kind) > 0:
+                    continue
+                if deferred:
+                    ledger.deferred += 1
+                    ledger.deferred_seconds += deferred
+                self._count_violation(ledger, sensor_id, kind)
+                started = loop.time()
+                await self._async_transmit(
+                    sensor_id, packet, kind, sequence, temp_index, temperature, send
+                )
+                # Only packets that went out count, so a retry isn't held back
+                ledger.record(started)
+                return True
+
+    def _purpose(self, sensor_id: int) -> str:
+        """Return a sensor's purpose (Remote if it no longer exists)."""
+        sensor = self._storage.get_sensor(sensor_id)
+        return sensor.purpose if sensor is not None else PURPOSE_REMOTE
+
+    def _deferral(self, ledger: SendLedger, sensor_id: int, kind: int) -> float:
+        """Seconds a send has to wait for the rate limit (0 if it needn't wait).
+
+        Pairing packets and sends in warn mode never wait.
+        """
+        if (
+            kind == KIND_PAIRING
+            or self._storage.settings[SETTING_RATE_LIMIT_MODE] == RATE_LIMIT_MODE_WARN
+        ):
+            return 0.0
+        return ledger.time_until_allowed(
+            asyncio.get_running_loop().time(), self._purpose(sensor_id)
+        )
+
+    def _count_violation(self, ledger: SendLedger, sensor_id: int, kind: int) -> None:
+        """Count a send that goes out before the rate limit allows it."""
+        purpose = self._purpose(sensor_id)
+        wait = ledger.time_until_allowed(asyncio.get_running_loop().time(), purpose)
+        if wait <= 0:
+            return
+
+        ledger.violations += 1
+        interval = get_broadcast_interval(purpose)
+        if kind == KIND_PAIRING:
+            # Pairing sessions repeat their bursts on purpose; count quietly
+            _LOGGER.debug(
+                "Sensor %s: pairing packet sent %.1f s before its %s s rate limit allows",
+                sensor_id, wait, interval,
+            )
+            return
+        _LOGGER.warning(
+            "Sensor %s: %s packet sent %.1f s before its %s s rate limit allows",
+            sensor_id, KIND_NAMES[kind], wait, interval,
+        )
+
+    async def _async_transmit(
+        self,
+        sensor_id: int,
+        packet: bytes,
+        kind: int,
+        sequence: int | None,
+        temp_index: int | None,
+        temperature: float | None,
+        send: Callable[[bytes, int, int], None] | None = None,
+    ) -> None:
+        """Send a packet and record the result in stats, trace and event stream."""
+        # Data packets use the sensor's adaptive repeat count; pairing and
+        # resends always use the protocol's full count
+        repeat_count = BROADCAST_REPEAT_COUNT
+        if kind == KIND_DATA and sequence is not None:
+            tracker = self.delivery_for(sensor_id)
+            tracker.on_sent(sequence)
+            repeat_count = tracker.repeat_count
+
+        timestamp = time.time()
+        started = time.monotonic()
+        result = RESULT_ERROR
+        try:
+            # Run in executor to avoid blocking the event loop
+            await self.hass.async_add_executor_job(
+                send or self._send, packet, UDP_PORT, repeat_count
+            )
+            result = RESULT_OK
+        finally:
+            self._record(
+                sensor_id,
+                len(packet),
+                kind,
+                sequence,
+                temp_index,
+                temperature,
+                timestamp,
+                time.monotonic() - started,
+                result,
+            )
+
+    def record_external_send(
+        self,
+        sensor_id: int,
+        packet: bytes,
+        sequence: int,
+        temp_index: int,
+        temperature: float,
+        timestamp: float,
+        duration: float,
+        success: bool,
+    ) -> None:
+        """Record a data packet the broadcast worker sent on its own.
+
+        The send is entered in the rate limit ledger, delivery tracker,
+        stats, trace and event stream as if it had gone through async_send.
+
+        Args:
+            sensor_id: Sensor ID the packet belongs to
+            packet: Serialized protobuf packet
+            sequence: Sequence number carried by the packet
+            temp_index: Temperature index carried by the packet
+            temperature: Source temperature the packet was built from
+            timestamp: Wall-clock time the send started
+            duration: Seconds the send took
+            success: Whether the packet was sent
+        """
+        if success:
+            self.ledger_for(sensor_id).record(asyncio.get_running_loop().time())
+        self.delivery_for(sensor_id).on_sent(sequence)
+        self._record(
+            sensor_id,
+            len(packet),
+            KIND_DATA,
+            sequence,
+            temp_index,
+            temperature,
+            timestamp,
+            duration,
+            RESULT_OK if success else RESULT_ERROR,
+        )
+
+    def _record(
+        self,
+        sensor_id: int,
+        size: int,
+        kind: int,
+        sequence: int | None,
+        temp_index: int | None,
+        temperature: float | None,
+        timestamp: float,
+        duration: float,
+        result: int,
+    ) -> None:
+        """Record a send's result in stats, trace and event stream."""
+        stats = self.stats_for(sensor_id)
+        if result == RESULT_OK:
+            stats.record_success(
+                timestamp, duration, sequence, temp_index, kind == KIND_DATA
+            )
+        else:
+            stats.record_failure(duration)
+        self.trace.record(
+            timestamp,
+            duration,
+            sensor_id,
+            kind,
+            sequence,
+            temp_index,
+            result,
+            size,
+        )
+        if self.events.has_subscribers:
+            self.events.publish(
+                {
+                    "sensor_id": sensor_id,
+                    "kind": KIND_NAMES[kind],
+                    "sequence": sequence,
+                    "temperature": temperature,
+                    "temperature_index": temp_index,
+                    "timestamp": timestamp,
+                    "duration_ms": round(duration * 1000, 3),
+                    "result": "ok" if result == RESULT_OK else "error",
+                }
+            )
@@ -0,0 +1,125 @@
+"""Adaptive broadcast cadence driven by the temperature index.
+
+A sensor's coordinator still wakes at its purpose's interval (1 or 5
+minutes, the fastest the thermostat allows), reads the source and builds
+the packet. It only sends the packet if the temperature index changed
+since the last broadcast, or if the sensor has been quiet for its current
+keepalive interval. That interval starts at the purpose's interval and grows
+by one interval with every broadcast that repeats the previous index, up to
+the keepalive ceiling. It drops back to the purpose's interval as soon as the
+index changes or a send fails. A change is therefore still sent at the next
+wake-up, while a steady sensor sends less often.
+
+A keepalive that is lost on the way (no listener can tell for sure) leaves a
+gap of two keepalive intervals, so the ceiling is kept low enough for two of
+them, plus an interval of lateness, to fit inside the thermostat's sensor
+timeout.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    DEFAULT_SENSOR_TIMEOUT,
+    OUTDOOR_SENSOR_TIMEOUT,
+    PURPOSE_OUTDOOR,
+    SCHEDULE_SLACK,
+)
+from .ratelimit import get_broadcast_interval
+
+
+def get_keepalive_ceiling(purpose: str, adaptive: bool) -> int:
+    """Return the longest gap (seconds) between a steady sensor's broadcasts.
+
+    Args:
+        purpose: Sensor purpose
+        adaptive: adaptive_keepalive setting (False disables stretching)
+
+    Returns:
+        The longest whole number of the purpose's intervals for which two
+        ceilings and one interval fit in the thermostat's sensor timeout,
+        and never less than the interval; just the interval if not adaptive
+    """
+    interval = get_broadcast_interval(purpose)
+    if not adaptive:
+        return interval
+    timeout = OUTDOOR_SENSOR_TIMEOUT if purpose == PURPOSE_OUTDOOR else DEFAULT_SENSOR_TIMEOUT
+    # Broadcasts only go out on the interval's ticks, so round down to one
+    safe = (timeout - interval) // 2 // interval * interval
+    return max(safe, interval)
+
+
+class AdaptiveCadence:
+    """Decides which of a sensor's scheduled broadcasts can be skipped."""
+
+    __slots__ = (
+        "base",
+        "ceiling",
+        "keepalive",
+        "_last_index",
+        "_last_sent",
+        "sent",
+        "skipped",
+        "changes",
+    )
+
+    def __init__(self, base: float, ceiling: float) -> None:
+        """Initialize the cadence.
+
+        Args:
+            base: The purpose's broadcast interval, in seconds
+            ceiling: Longest keepalive interval, in seconds
+        """
+        self.base = base
+        self.ceiling = ceiling
+        self.keepalive = base  # Current keepalive interval
+        self._last_index: int | None = None  # Index of the last broadcast
+        self._last_sent: float | None = None  # Event-loop time of the last broadcast
+        self.sent = 0
+        self.skipped = 0
+        self.changes = 0  # Broadcasts that carried a new index
+
+    def should_skip(self, temperature_index: int, now: float) -> bool:
+        """Return True if a due broadcast can be skipped.
+
+        Args:
+            temperature_index: Index the packet would carry
+            now: Current event-loop time
+        """
+        if self._last_index is None or temperature_index != self._last_index:
+            return False
+        if now - self._last_sent >= min(self.keepalive, self.ceiling) - SCHEDULE_SLACK:
+            return False
+        self.skipped += 1
+        return True
+
+    def record_send(self, temperature_index: int, sent_at: float) -> None:
+        """Record a broadcast and adjust the keepalive interval.
+
+        Args:
+            temperature_index: Index the packet carried
+            sent_at: Event-loop time the send started
+        """
+        if temperature_index == self._last_index:
+            self.keepalive = min(self.keepalive + self.base, self.ceiling)
+        else:
+            self.keepalive = self.base
+            self.changes += 1
+        self._last_index = temperature_index
+        self._last_sent = sent_at
+        self.sent += 1
+
+    def record_failure(self) -> None:
+        """Go back to the purpose's interval after a send was lost."""
+        self.keepalive = self.base
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the cadence for diagnostics."""
+        return {
+            "interval": self.base,
+            "keepalive_interval": min(self.keepalive, self.ceiling),
+            "keepalive_ceiling": self.ceiling,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "index_changes": self.changes,
+        }
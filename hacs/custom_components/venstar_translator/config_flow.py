@@ -10,20 +10,74 @@ import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .const import (
+    AGGREGATE_MEAN,
+    DEFAULT_SMOOTHING_SAMPLES,
     DOMAIN,
+    MAX_HYSTERESIS,
     MAX_NAME_LENGTH,
     MAX_SENSORS,
+    MAX_SMOOTHING_SAMPLES,
+    SETTING_ADAPTIVE_KEEPALIVE,
+    SETTING_BROADCAST_MODE,
+    SETTING_RATE_LIMIT_MODE,
+    SIGNAL_SENSOR_ADDED,
+    SIGNAL_SENSOR_REMOVED,
+    SIGNAL_SENSOR_UPDATED,
+    SMOOTHING_NONE,
+    SOURCE_AGGREGATE,
+    SOURCE_ENTITY,
+    SOURCE_HTTP_JSON,
+    VALID_AGGREGATIONS,
+    VALID_BROADCAST_MODES,
     VALID_PURPOSES,
+    VALID_RATE_LIMIT_MODES,
     VALID_SCALES,
+    VALID_SMOOTHING,
+    VALID_SOURCES,
 )
-from .coordinator import VenstarSensorCoordinator
-from .venstar_sensor import VenstarSensor, broadcast_udp_packet
+from .coordinator import async_start_coordinators, async_stop_coordinators
+from .jsonpath import JsonPathError, compile_json_path
+from .pairing import async_start_pairing_session
+from .registry import SensorRecord, parse_weights
+from .sources import SourceError, async_read_http_temperature
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _parse_headers(text: str) -> dict[str, str]:
+    """Parse "Name: value" lines into a header dict.
+
+    Raises:
+        ValueError: If a non-empty line has no colon or an empty name
+    """
+    headers = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        name, sep, value = line.partition(":")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid header line: {line!r}")
+        headers[name.strip()] = value.strip()
+    return headers
+
+
+def _filtering_settings(data: dict[str, Any]) -> dict[str, Any]:
+    """Pick the smoothing and hysteresis settings out of the sensor form."""
+    return {
+        "smoothing": data.get("smoothing", SMOOTHING_NONE),
+        "smoothing_samples": int(data.get("smoothing_samples", DEFAULT_SMOOTHING_SAMPLES)),
+        "hysteresis": float(data.get("hysteresis") or 0.0),
+    }
+
+
+def _format_headers(headers: dict[str, str]) -> str:
+    """Format a header dict as "Name: value" lines."""
+    return "\n".join(f"{name}: {value}" for name, value in headers.items())
+
+
 class VenstarTranslatorConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Venstar Translator."""
 
@@ -77,6 +131,8 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
         self.config_entry = config_entry
         self._sensor_to_edit: int | None = None
         self._sensor_to_delete: int | None = None
+        # Add/edit form input waiting for the http_source or aggregate_source step
+        self._pending_sensor: dict[str, Any] = {}
 
     @property
     def _storage(self):
@@ -107,6 +163,8 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
                 return await self.async_step_select_sensor_to_edit()
             elif action == "delete_sensor":
                 return await self.async_step_select_sensor_to_delete()
+            elif action == "settings":
+                return await self.async_step_settings()
 
         # Build sensor list description
         sensor_count = len(storage.sensors)
@@ -114,10 +172,10 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
             description = "No sensors configured yet. Click 'Add Sensor' to get started."
         else:
             sensor_lines = []
-            for sensor_id, config in sorted(storage.sensors.items(), key=lambda x: int(x[0])):
-                status = "✓ Enabled" if config.get("enabled", True) else "✗ Disabled"
+            for sensor in storage.sensors:
+                status = "✓ Enabled" if sensor.enabled else "✗ Disabled"
                 sensor_lines.append(
-                    f"  [{sensor_id}] {config['name']} - {config['purpose']} - {status}"
+                    f"  [{sensor.sensor_id}] {sensor.name} - {sensor.purpose} - {status}"
                 )
             sensor_list = "\n".join(sensor_lines)
             description = f"Configured sensors ({sensor_count}/{MAX_SENSORS}):\n\n{sensor_list}"
@@ -125,7 +183,7 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
         menu_options = ["add_sensor"]
         if sensor_count > 0:
             menu_options.extend(["edit_sensor", "delete_sensor"])
-        menu_options.append("done")
+        menu_options.extend(["settings", "done"])
 
         return self.async_show_menu(
             step_id="sensor_list",
@@ -141,45 +199,24 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
         storage = self._storage
 
         if user_input is not None:
-            try:
-                # Validate sensor name length
-                name = user_input["name"].strip()
-                if len(name) > MAX_NAME_LENGTH:
-                    errors["name"] = "name_too_long"
-                elif not name:
-                    errors["name"] = "name_required"
-                else:
-                    # Add sensor to storage
-                    sensor_id = storage.add_sensor(
-                        entity_id=user_input["entity_id"],
-                        name=name,
-                        purpose=user_input["purpose"],
-                        scale=user_input.get("scale", "F"),
-                        enabled=user_input.get("enabled", True),
-                    )
-                    await storage.async_save()
-
-                    # Start coordinator for this sensor if enabled
-                    if user_input.get("enabled", True):
-                        coordinator = VenstarSensorCoordinator(
-                            self.hass, self.config_entry.entry_id, sensor_id
-                        )
-                        await coordinator.start()
-                        self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinators"][
-                            sensor_id
-                        ] = coordinator
-
-                    _LOGGER.info(f"Added sensor {sensor_id}: {name}")
+            name = user_input["name"].strip()
+            errors = self._validate_sensor_input(user_input, name, None)
+            if not errors:
+                data = {**user_input, "name": name}
+                if data["source"] == SOURCE_HTTP_JSON:
+                    # URL, JSONPath and headers are asked for in a second step
+                    self._pending_sensor = data
+                    self._sensor_to_edit = None
+                    return await self.async_step_http_source()
+                if data["source"] == SOURCE_AGGREGATE:
+                    self._pending_sensor = data
+                    self._sensor_to_edit = None
+                    return await self.async_step_aggregate_source()
+                try:
+                    await self._async_add_sensor(data)
                     return await self.async_step_sensor_list()
-
-            except ValueError as e:
-                if "already exists" in str(e):
-                    errors["name"] = "name_duplicate"
-                elif "maximum" in str(e):
-                    errors["base"] = "max_sensors_reached"
-                else:
-                    errors["base"] = "unknown"
-                    _LOGGER.error(f"Error adding sensor: {e}")
+                except ValueError as e:
+                    errors = self._errors_for(e)
 
         # Check if we can add more sensors
         if storage.get_next_sensor_id() is None:
@@ -187,28 +224,322 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
 
         return self.async_show_form(
             step_id="add_sensor",
+            data_schema=self._sensor_schema(None),
+            errors=errors,
+        )
+
+    async def async_step_http_source(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Configure the JSON endpoint of an HTTP JSON sensor."""
+        errors = {}
+        record = (
+            self._storage.get_sensor(self._sensor_to_edit)
+            if self._sensor_to_edit is not None
+            else None
+        )
+
+        if user_input is not None:
+            http = {
+                "url": user_input["url"].strip(),
+                "json_path": user_input["json_path"].strip(),
+                "ignore_ssl_errors": user_input.get("ignore_ssl_errors", False),
+            }
+            try:
+                compile_json_path(http["json_path"])
+            except JsonPathError:
+                errors["json_path"] = "invalid_json_path"
+            try:
+                http["headers"] = _parse_headers(user_input.get("headers", ""))
+            except ValueError:
+                errors["headers"] = "invalid_headers"
+
+            if not errors:
+                # Read the endpoint once so mistakes show up here, not in the log
+                try:
+                    temperature = await async_read_http_temperature(
+                        self.hass.data[DOMAIN][self.config_entry.entry_id]["http"],
+                        http["url"],
+                        http["json_path"],
+                        http["headers"],
+                        verify_ssl=not http["ignore_ssl_errors"],
+                    )
+                except SourceError as e:
+                    _LOGGER.warning(f"HTTP source test failed: {e}")
+                    errors["base"] = "cannot_fetch"
+                except JsonPathError as e:
+                    _LOGGER.warning(f"HTTP source test failed: {e}")
+                    errors["json_path"] = "json_path_no_match"
+                except ValueError as e:
+                    _LOGGER.warning(f"HTTP source test failed: {e}")
+                    errors["json_path"] = "not_a_number"
+                else:
+                    _LOGGER.info(f"HTTP source test read {temperature} from {http['url']}")
+
+            if not errors:
+                data = self._pending_sensor
+                try:
+                    if record is None:
+                        await self._async_add_sensor(data, http)
+                    else:
+                        await self._async_update_sensor(record.sensor_id, data, http)
+                    return await self.async_step_sensor_list()
+                except ValueError as e:
+                    errors = self._errors_for(e)
+
+        is_http = record is not None and record.source == SOURCE_HTTP_JSON
+        return self.async_show_form(
+            step_id="http_source",
             data_schema=vol.Schema({
-                vol.Required("entity_id"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor", "climate"])
+                vol.Required("url", default=record.url if is_http else ""): selector.TextSelector(
+                    selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
                 ),
-                vol.Required("name"): str,
-                vol.Required("purpose"): selector.SelectSelector(
+                vol.Required(
+                    "json_path", default=record.json_path if is_http else "$.temperature"
+                ): str,
+                vol.Optional(
+                    "headers", default=_format_headers(record.headers) if is_http else ""
+                ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+                vol.Optional(
+                    "ignore_ssl_errors", default=record.ignore_ssl_errors if is_http else False
+                ): bool,
+            }),
+            errors=errors,
+        )
+
+    async def async_step_aggregate_source(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Configure the member entities and aggregation of an aggregate sensor."""
+        errors = {}
+        record = (
+            self._storage.get_sensor(self._sensor_to_edit)
+            if self._sensor_to_edit is not None
+            else None
+        )
+
+        if user_input is not None:
+            max_age = user_input.get("max_age") or 0
+            aggregate = {
+                "members": list(dict.fromkeys(user_input.get("members") or [])),
+                "aggregation": user_input["aggregation"],
+                "max_age": max_age * 60 if max_age > 0 else None,
+            }
+            if not aggregate["members"]:
+                errors["members"] = "members_required"
+            try:
+                aggregate["weights"] = parse_weights(
+                    _parse_headers(user_input.get("weights", ""))
+                )
+            except ValueError:
+                errors["weights"] = "invalid_weights"
+
+            if not errors:
+                data = self._pending_sensor
+                try:
+                    if record is None:
+                        await self._async_add_sensor(data, aggregate=aggregate)
+                    else:
+                        await self._async_update_sensor(
+                            record.sensor_id, data, aggregate=aggregate
+                        )
+                    return await self.async_step_sensor_list()
+                except ValueError as e:
+                    errors = self._errors_for(e)
+
+        is_aggregate = record is not None and record.source == SOURCE_AGGREGATE
+        weights = _format_headers(
+            {member: f"{weight:g}" for member, weight in record.weights.items()}
+        ) if is_aggregate else ""
+        return self.async_show_form(
+            step_id="aggregate_source",
+            data_schema=vol.Schema({
+                vol.Required(
+                    "members", default=record.members if is_aggregate else []
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["sensor", "climate"], multiple=True)
+                ),
+                vol.Required(
+                    "aggregation", default=record.aggregation if is_aggregate else AGGREGATE_MEAN
+                ): selector.SelectSelector(
                     selector.SelectSelectorConfig(
-                        options=VALID_PURPOSES,
-                        mode=selector.SelectSelectorMode.DROPDOWN
+                        options=VALID_AGGREGATIONS,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                        translation_key="aggregation",
                     )
                 ),
-                vol.Optional("scale", default="F"): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=VALID_SCALES,
-                        mode=selector.SelectSelectorMode.DROPDOWN
+                vol.Optional("weights", default=weights): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+                vol.Optional(
+                    "max_age",
+                    default=round(record.max_age / 60) if is_aggregate and record.max_age else 0,
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=1440, unit_of_measurement="min",
+                        mode=selector.NumberSelectorMode.BOX,
                     )
                 ),
-                vol.Optional("enabled", default=True): bool,
             }),
             errors=errors,
         )
 
+    def _validate_sensor_input(
+        self, user_input: dict[str, Any], name: str, sensor_id: int | None
+    ) -> dict[str, str]:
+        """Validate the add/edit sensor form, returning form errors."""
+        errors = {}
+        owner = self._storage.sensors.id_for_name(name)
+        if len(name) > MAX_NAME_LENGTH:
+            errors["name"] = "name_too_long"
+        elif not name:
+            errors["name"] = "name_required"
+        elif owner is not None and owner != sensor_id:
+            errors["name"] = "name_duplicate"
+        if user_input["source"] == SOURCE_ENTITY and not user_input.get("entity_id"):
+            errors["entity_id"] = "entity_required"
+        healthcheck_url = user_input.get("healthcheck_url", "").strip()
+        if healthcheck_url and not healthcheck_url.startswith(("http://", "https://")):
+            errors["healthcheck_url"] = "invalid_url"
+        return errors
+
+    @staticmethod
+    def _errors_for(error: ValueError) -> dict[str, str]:
+        """Map a storage error to form errors."""
+        if "already exists" in str(error):
+            return {"name": "name_duplicate"}
+        if "maximum" in str(error):
+            return {"base": "max_sensors_reached"}
+        _LOGGER.error(f"Error saving sensor: {error}")
+        return {"base": "unknown"}
+
+    @staticmethod
+    def _sensor_schema(sensor_config: SensorRecord | None) -> vol.Schema:
+        """Build the add/edit sensor form, prefilled when editing."""
+        defaults = {
+            "source": SOURCE_ENTITY,
+            "name": "",
+            "scale": "F",
+            "enabled": True,
+            "smoothing": SMOOTHING_NONE,
+            "smoothing_samples": DEFAULT_SMOOTHING_SAMPLES,
+            "hysteresis": 0.0,
+        }
+        if sensor_config is not None:
+            defaults = {
+                "source": sensor_config.source,
+                "name": sensor_config.name,
+                "purpose": sensor_config.purpose,
+                "scale": sensor_config.scale,
+                "enabled": sensor_config.enabled,
+                "smoothing": sensor_config.smoothing,
+                "smoothing_samples": sensor_config.smoothing_samples,
+                "hysteresis": sensor_config.hysteresis,
+            }
+            if sensor_config.entity_id:
+                defaults["entity_id"] = sensor_config.entity_id
+            if sensor_config.healthcheck_url:
+                defaults["healthcheck_url"] = sensor_config.healthcheck_url
+
+        def _key(marker, key):
+            if key in defaults:
+                return marker(key, default=defaults[key])
+            return marker(key)
+
+        return vol.Schema({
+            _key(vol.Required, "source"): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=VALID_SOURCES,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key="source",
+                )
+            ),
+            _key(vol.Optional, "entity_id"): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor", "climate"])
+            ),
+            _key(vol.Required, "name"): str,
+            _key(vol.Required, "purpose"): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=VALID_PURPOSES,
+                    mode=selector.SelectSelectorMode.DROPDOWN
+                )
+            ),
+            _key(vol.Optional, "scale"): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=VALID_SCALES,
+                    mode=selector.SelectSelectorMode.DROPDOWN
+                )
+            ),
+            _key(vol.Optional, "enabled"): bool,
+            _key(vol.Optional, "healthcheck_url"): selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+            ),
+            _key(vol.Optional, "smoothing"): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=VALID_SMOOTHING,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key="smoothing",
+                )
+            ),
+            _key(vol.Optional, "smoothing_samples"): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=2, max=MAX_SMOOTHING_SAMPLES, step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            _key(vol.Optional, "hysteresis"): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0, max=MAX_HYSTERESIS, step=0.1, unit_of_measurement="°",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+        })
+
+    async def _async_add_sensor(
+        self,
+        data: dict[str, Any],
+        http: dict[str, Any] | None = None,
+        aggregate: dict[str, Any] | None = None,
+    ) -> None:
+        """Save a new sensor and start broadcasting it.
+
+        Raises:
+            ValueError: If the name is taken or all sensor IDs are in use
+        """
+        storage = self._storage
+        sensor_id = storage.add_sensor(
+            entity_id=data.get("entity_id", ""),
+            name=data["name"],
+            purpose=data["purpose"],
+            scale=data.get("scale", "F"),
+            enabled=data.get("enabled", True),
+            source=data["source"],
+            http=http,
+            aggregate=aggregate,
+            healthcheck_url=data.get("healthcheck_url", "").strip(),
+            filtering=_filtering_settings(data),
+        )
+        await storage.async_save()
+
+        # Create the statistics entities for the new sensor
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_SENSOR_ADDED.format(self.config_entry.entry_id),
+            storage.get_sensor(sensor_id),
+        )
+
+        # Start coordinator for this sensor if enabled
+        if data.get("enabled", True):
+            await self._async_start_coordinator(sensor_id)
+
+        _LOGGER.info(f"Added sensor {sensor_id}: {data['name']}")
+
+    async def _async_start_coordinator(self, sensor_id: int) -> None:
+        """Start a sensor's coordinator (nothing to start in worker mode)."""
+        await async_start_coordinators(self.hass, self.config_entry.entry_id, [sensor_id])
+
+    async def _async_stop_coordinator(self, sensor_id: int) -> None:
+        """Stop a sensor's coordinator, if it is running."""
+        await async_stop_coordinators(self.hass, self.config_entry.entry_id, [sensor_id])
+
     async def async_step_select_sensor_to_edit(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -224,8 +555,8 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
 
         # Build sensor selection options
         sensor_options = [
-            {"label": f"[{sid}] {config['name']}", "value": sid}
-            for sid, config in sorted(storage.sensors.items(), key=lambda x: int(x[0]))
+            {"label": f"[{sensor.sensor_id}] {sensor.name}", "value": str(sensor.sensor_id)}
+            for sensor in storage.sensors
         ]
 
         return self.async_show_form(
@@ -253,93 +584,84 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
             return await self.async_step_sensor_list()
 
         if user_input is not None:
-            try:
-                # Validate name length
-                name = user_input["name"].strip()
-                if len(name) > MAX_NAME_LENGTH:
-                    errors["name"] = "name_too_long"
-                elif not name:
-                    errors["name"] = "name_required"
-                else:
-                    # Update sensor
-                    old_enabled = sensor_config.get("enabled", True)
-                    old_purpose = sensor_config.get("purpose")
-                    new_enabled = user_input.get("enabled", True)
-                    new_purpose = user_input["purpose"]
-
-                    storage.update_sensor(
-                        sensor_id=sensor_id,
-                        entity_id=user_input["entity_id"],
-                        name=name,
-                        purpose=new_purpose,
-                        scale=user_input.get("scale", "F"),
-                        enabled=new_enabled,
-                    )
-                    await storage.async_save()
-
-                    # Handle coordinator lifecycle
-                    coordinators = self.hass.data[DOMAIN][self.config_entry.entry_id][
-                        "coordinators"
-                    ]
-
-                    if old_enabled and not new_enabled:
-                        # Disabling: stop coordinator
-                        if sensor_id in coordinators:
-                            await coordinators[sensor_id].stop()
-                            del coordinators[sensor_id]
-                    elif not old_enabled and new_enabled:
-                        # Enabling: start coordinator
-                        coordinator = VenstarSensorCoordinator(
-                            self.hass, self.config_entry.entry_id, sensor_id
-                        )
-                        await coordinator.start()
-                        coordinators[sensor_id] = coordinator
-                    elif new_enabled and old_purpose != new_purpose:
-                        # Purpose changed while enabled: restart to pick up new interval
-                        if sensor_id in coordinators:
-                            await coordinators[sensor_id].stop()
-                            del coordinators[sensor_id]
-                        coordinator = VenstarSensorCoordinator(
-                            self.hass, self.config_entry.entry_id, sensor_id
-                        )
-                        await coordinator.start()
-                        coordinators[sensor_id] = coordinator
-
-                    _LOGGER.info(f"Updated sensor {sensor_id}: {name}")
+            name = user_input["name"].strip()
+            errors = self._validate_sensor_input(user_input, name, sensor_id)
+            if not errors:
+                data = {**user_input, "name": name}
+                if data["source"] == SOURCE_HTTP_JSON:
+                    self._pending_sensor = data
+                    return await self.async_step_http_source()
+                if data["source"] == SOURCE_AGGREGATE:
+                    self._pending_sensor = data
+                    return await self.async_step_aggregate_source()
+                try:
+                    await self._async_update_sensor(sensor_id, data)
                     return await self.async_step_sensor_list()
-
-            except ValueError as e:
-                if "already exists" in str(e):
-                    errors["name"] = "name_duplicate"
-                else:
-                    errors["base"] = "unknown"
-                    _LOGGER.error(f"Error updating sensor: {e}")
+                except ValueError as e:
+                    errors = self._errors_for(e)
 
         return self.async_show_form(
             step_id="edit_sensor",
-            data_schema=vol.Schema({
-                vol.Required("entity_id", default=sensor_config["entity_id"]): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor", "climate"])
-                ),
-                vol.Required("name", default=sensor_config["name"]): str,
-                vol.Required("purpose", default=sensor_config["purpose"]): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=VALID_PURPOSES,
-                        mode=selector.SelectSelectorMode.DROPDOWN
-                    )
-                ),
-                vol.Optional("scale", default=sensor_config.get("scale", "F")): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=VALID_SCALES,
-                        mode=selector.SelectSelectorMode.DROPDOWN
-                    )
-                ),
-                vol.Optional("enabled", default=sensor_config.get("enabled", True)): bool,
-            }),
+            data_schema=self._sensor_schema(sensor_config),
             errors=errors,
             description_placeholders={"sensor_id": str(sensor_id)}
         )
 
+    async def _async_update_sensor(
+        self,
+        sensor_id: int,
+        data: dict[str, Any],
+        http: dict[str, Any] | None = None,
+        aggregate: dict[str, Any] | None = None,
+    ) -> None:
+        """Save an edited sensor and start/stop/restart its coordinator.
+
+        Raises:
+            ValueError: If the new name is taken
+        """
+        storage = self._storage
+        sensor_config = storage.get_sensor(sensor_id)
+        old_enabled = sensor_config.enabled
+        old_purpose = sensor_config.purpose
+        new_enabled = data.get("enabled", True)
+        new_purpose = data["purpose"]
+
+        storage.update_sensor(
+            sensor_id=sensor_id,
+            entity_id=data.get("entity_id", ""),
+            name=data["name"],
+            purpose=new_purpose,
+            scale=data.get("scale", "F"),
+            enabled=new_enabled,
+            source=data["source"],
+            http=http,
+            aggregate=aggregate,
+            healthcheck_url=data.get("healthcheck_url", "").strip(),
+            filtering=_filtering_settings(data),
+        )
+        await storage.async_save()
+
+        # Rename the sensor's device if the name changed
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_SENSOR_UPDATED.format(self.config_entry.entry_id),
+            storage.get_sensor(sensor_id),
+        )
+
+        # Handle coordinator lifecycle
+        if old_enabled and not new_enabled:
+            # Disabling: stop coordinator
+            await self._async_stop_coordinator(sensor_id)
+        elif not old_enabled and new_enabled:
+            # Enabling: start coordinator
+            await self._async_start_coordinator(sensor_id)
+        elif new_enabled and old_purpose != new_purpose:
+            # Purpose changed while enabled: restart to pick up new interval
+            await self._async_stop_coordinator(sensor_id)
+            await self._async_start_coordinator(sensor_id)
+
+        _LOGGER.info(f"Updated sensor {sensor_id}: {data['name']}")
+
     async def async_step_select_sensor_to_delete(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -355,8 +677,8 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
 
         # Build sensor selection options
         sensor_options = [
-            {"label": f"[{sid}] {config['name']}", "value": sid}
-            for sid, config in sorted(storage.sensors.items(), key=lambda x: int(x[0]))
+            {"label": f"[{sensor.sensor_id}] {sensor.name}", "value": str(sensor.sensor_id)}
+            for sensor in storage.sensors
         ]
 
         return self.async_show_form(
@@ -385,18 +707,23 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
         if user_input is not None:
             if user_input.get("confirm"):
                 # Stop coordinator if running
-                coordinators = self.hass.data[DOMAIN][self.config_entry.entry_id][
-                    "coordinators"
-                ]
-                if sensor_id in coordinators:
-                    await coordinators[sensor_id].stop()
-                    del coordinators[sensor_id]
+                await self._async_stop_coordinator(sensor_id)
 
                 # Delete sensor
                 storage.delete_sensor(sensor_id)
                 await storage.async_save()
+                self.hass.data[DOMAIN][self.config_entry.entry_id]["broadcaster"].forget(
+                    sensor_id
+                )
+
+                # Remove the statistics entities of the deleted sensor
+                async_dispatcher_send(
+                    self.hass,
+                    SIGNAL_SENSOR_REMOVED.format(self.config_entry.entry_id),
+                    sensor_id,
+                )
 
-                _LOGGER.info(f"Deleted sensor {sensor_id}: {sensor_config['name']}")
+                _LOGGER.info(f"Deleted sensor {sensor_id}: {sensor_config.name}")
 
             return await self.async_step_sensor_list()
 
@@ -406,94 +733,92 @@ class VenstarTranslatorOptionsFlow(OptionsFlow):
                 vol.Required("confirm", default=False): bool,
             }),
             description_placeholders={
-                "sensor_name": sensor_config["name"],
+                "sensor_name": sensor_config.name,
                 "sensor_id": str(sensor_id),
             }
         )
 
-    async def async_step_pair_all_sensors(
+    async def async_step_settings(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Send pairing packets for all configured sensors."""
+        """Edit integration-wide settings."""
         storage = self._storage
 
-        paired_count = 0
-        failed_sensors = []
-
-        for sensor_id_str, sensor_config in storage.sensors.items():
-            if not sensor_config.get("enabled", True):
-                continue
-
-            sensor_id = int(sensor_id_str)
+        if user_input is not None:
+            old_mode = storage.settings[SETTING_BROADCAST_MODE]
+            storage.settings[SETTING_RATE_LIMIT_MODE] = user_input[SETTING_RATE_LIMIT_MODE]
+            storage.settings[SETTING_BROADCAST_MODE] = user_input[SETTING_BROADCAST_MODE]
+            # Running coordinators pick the new ceiling up at their next deadline
+            storage.settings[SETTING_ADAPTIVE_KEEPALIVE] = user_input[SETTING_ADAPTIVE_KEEPALIVE]
+            await storage.async_save()
+
+            _LOGGER.info(f"Updated settings: {storage.settings}")
+            if storage.settings[SETTING_BROADCAST_MODE] != old_mode:
+                # Coordinators and the worker are set up with the entry
+                self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+            return await self.async_step_sensor_list()
 
-            try:
-                # Get current temperature
-                state = self.hass.states.get(sensor_config["entity_id"])
-                if not state or state.state in ("unknown", "unavailable"):
-                    _LOGGER.warning(
-                        f"Skipping pairing for sensor {sensor_id}: temperature unavailable"
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema({
+                vol.Required(
+                    SETTING_RATE_LIMIT_MODE,
+                    default=storage.settings[SETTING_RATE_LIMIT_MODE],
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=VALID_RATE_LIMIT_MODES,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                        translation_key=SETTING_RATE_LIMIT_MODE,
                     )
-                    failed_sensors.append(sensor_config["name"])
-                    continue
-
-                temperature = float(state.state)
-
-                # Send pairing packet
-                await self._send_pairing_packet(
-                    sensor_id, sensor_config, storage.mac_prefix, temperature
-                )
-
-                paired_count += 1
-                _LOGGER.info(f"Paired sensor {sensor_id} ({sensor_config['name']})")
+                ),
+                vol.Required(
+                    SETTING_BROADCAST_MODE,
+                    default=storage.settings[SETTING_BROADCAST_MODE],
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=VALID_BROADCAST_MODES,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                        translation_key=SETTING_BROADCAST_MODE,
+                    )
+                ),
+                vol.Required(
+                    SETTING_ADAPTIVE_KEEPALIVE,
+                    default=storage.settings[SETTING_ADAPTIVE_KEEPALIVE],
+                ): bool,
+            }),
+        )
 
-            except Exception as e:
-                _LOGGER.error(f"Failed to pair sensor {sensor_id}: {e}")
-                failed_sensors.append(sensor_config.get("name", str(sensor_id)))
+    async def async_step_pair_all_sensors(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Start a pairing session for all enabled sensors."""
+        session = await async_start_pairing_session(self.hass, self.config_entry.entry_id)
+        minutes = str(round(session.duration / 60))
 
         # Show results
-        if paired_count == 0:
+        if not session.running:
             return self.async_abort(
                 reason="pairing_failed",
                 description_placeholders={
                     "message": "No sensors could be paired. Check that temperature entities are available."
                 }
             )
-        elif failed_sensors:
+        elif session.skipped:
+            storage = self._storage
             return self.async_abort(
                 reason="pairing_partial",
                 description_placeholders={
-                    "paired": str(paired_count),
-                    "failed": ", ".join(failed_sensors)
+                    "paired": str(len(session.sensors)),
+                    "minutes": minutes,
+                    "failed": ", ".join(
+                        sensor.name if (sensor := storage.get_sensor(sensor_id)) else str(sensor_id)
+                        for sensor_id in session.skipped
+                    ),
                 }
             )
         else:
             return self.async_create_entry(
                 title="",
                 data={},
-                description_placeholders={"count": str(paired_count)}
+                description_placeholders={"count": str(len(session.sensors)), "minutes": minutes}
             )
-
-    async def _send_pairing_packet(
-        self,
-        sensor_id: int,
-        sensor_config: dict,
-        mac_prefix: str,
-        temperature: float,
-    ) -> None:
-        """Send a pairing packet for a sensor."""
-        sensor = VenstarSensor(
-            sensor_id=sensor_id,
-            mac_prefix=mac_prefix,
-            name=sensor_config["name"],
-            purpose=sensor_config["purpose"],
-            scale=sensor_config.get("scale", "F"),
-            sequence=1,
-        )
-
-        packet = sensor.build_pairing_packet(temperature)
-        await self.hass.async_add_executor_job(broadcast_udp_packet, packet)
-
-        # Reset stored sequence to 1 after pairing (matches C# behavior)
-        storage = self._storage
-        storage.update_sequence(sensor_id, 1)
-        await storage.async_save()
@@ -5,6 +5,7 @@ DOMAIN = "venstar_translator"
 # Storage
 STORAGE_VERSION = 1
 STORAGE_KEY = "venstar_translator"
+STORAGE_SAVE_DELAY = 5  # Seconds sequence updates after broadcasts are batched before a write
 
 # Sensor limits
 MAX_SENSORS = 20
@@ -15,10 +16,120 @@ UDP_PORT = 5001
 BROADCAST_ADDRESS = "255.255.255.255"
 BROADCAST_REPEAT_COUNT = 5
 
+# Adaptive repeat count bounds, used once the thermostat has acknowledged a sensor
+MIN_REPEAT_COUNT = 1
+MAX_REPEAT_COUNT = 8
+REPEAT_DECREASE_STREAK = 5  # Consecutive acknowledged packets before dropping a repeat
+REPEAT_LOSS_STEP = 2  # Repeats added after an unacknowledged or failed packet
+
+# Number of broadcast events kept in the in-memory packet trace
+PACKET_TRACE_SIZE = 512
+
+# Rate limit enforcement: what to do with a send that would follow the
+# previous send of the same sensor sooner than its broadcast interval allows
+RATE_LIMIT_MODE_DEFER = "defer"
+RATE_LIMIT_MODE_WARN = "warn"
+
+VALID_RATE_LIMIT_MODES = [
+    RATE_LIMIT_MODE_DEFER,
+    RATE_LIMIT_MODE_WARN,
+]
+
+RATE_LIMIT_WINDOW = 3600  # Seconds of send history kept per sensor
+
+# Where scheduled broadcasts are built and sent: in Home Assistant's event
+# loop, or in a supervised child process fed over a pipe (see worker.py)
+BROADCAST_MODE_IN_PROCESS = "in_process"
+BROADCAST_MODE_WORKER = "worker"
+
+VALID_BROADCAST_MODES = [
+    BROADCAST_MODE_IN_PROCESS,
+    BROADCAST_MODE_WORKER,
+]
+
+# Adaptive intervals: while a sensor's temperature index does not change,
+# its broadcasts are stretched, one broadcast interval at a time, up to the
+# longest gap for which two of them (one lost keepalive) plus an interval
+# stay inside the time after which the thermostat reports a sensor error: 2
+# minutes for 1-minute sensors, while 5-minute Outdoor sensors never stretch.
+# The adaptive_keepalive setting turns this on or off.
+DEFAULT_ADAPTIVE_KEEPALIVE = True
+
+# Integration-wide settings (persisted in storage) and their defaults
+SETTING_RATE_LIMIT_MODE = "rate_limit_mode"
+SETTING_BROADCAST_MODE = "broadcast_mode"
+SETTING_ADAPTIVE_KEEPALIVE = "adaptive_keepalive"
+
+DEFAULT_SETTINGS = {
+    SETTING_RATE_LIMIT_MODE: RATE_LIMIT_MODE_DEFER,
+    SETTING_BROADCAST_MODE: BROADCAST_MODE_IN_PROCESS,
+    SETTING_ADAPTIVE_KEEPALIVE: DEFAULT_ADAPTIVE_KEEPALIVE,
+}
+
+# Broadcast worker supervision
+WORKER_HEARTBEAT_INTERVAL = 5.0  # Seconds between worker heartbeats (and watchdog checks)
+WORKER_HEARTBEAT_TIMEOUT = 30.0  # Seconds of silence before the worker is killed
+WORKER_RESTART_BACKOFF = 1.0  # Seconds before the first restart
+WORKER_RESTART_BACKOFF_MAX = 60.0
+WORKER_STABLE_TIME = 300.0  # Seconds a worker must run to reset the restart backoff
+WORKER_STOP_TIMEOUT = 5.0  # Seconds a worker gets to exit after its stdin closes
+
+# Seconds before its deadline a scheduled broadcast's packet is built, so
+# only the send itself happens at the deadline
+PACKET_PREPARE_LEAD = 2.0
+
+# Warm start: if a sensor's source has no reading yet when its coordinator
+# starts (typical during Home Assistant boot), its first broadcast reuses the
+# last broadcast temperature, provided that is at most this many seconds old
+WARM_START_MAX_AGE = 3600
+
+# Scheduled broadcasts never go out closer than (interval - SCHEDULE_SLACK)
+# seconds after the previous one, even when catching up after a late send
+SCHEDULE_SLACK = 1.0
+
+# A data packet whose send fails is retried after RETRY_INITIAL_DELAY
+# seconds, doubling up to RETRY_MAX_DELAY, until it goes out or the sensor's
+# next packet supersedes it
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 16.0
+
+# Timing metrics
+METRICS_WINDOW_SIZE = 256  # Samples kept per lateness/lag window
+LOOP_LAG_PROBE_INTERVAL = 1.0  # Seconds between event-loop lag probes
+LOOP_STALL_THRESHOLD = 0.5  # Lag/lateness (seconds) worth remembering for attribution
+
+# Seconds between batched deliveries of the live broadcast event stream
+EVENT_STREAM_TICK = 0.5
+
+# Minimum seconds between state writes of the broadcast statistics entities
+STATS_UPDATE_INTERVAL = 30
+
+# Pairing sessions repeat a pairing burst per sensor every
+# PAIRING_SESSION_INTERVAL seconds for PAIRING_SESSION_DURATION seconds, so
+# the thermostat need not be on its add sensor screen at one exact moment
+PAIRING_SESSION_DURATION = 300
+PAIRING_SESSION_INTERVAL = 10.0
+
+# Priority lanes: Supply and Return readings feed the thermostat's staging
+# logic, so when broadcasts coincide (or the loop is behind) they go first;
+# Outdoor and Remote broadcasts wait for them at most this many seconds
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"
+LOW_PRIORITY_MAX_DEFER = 2.0
+
+# Dispatcher signals (format with the config entry ID)
+SIGNAL_SENSOR_ADDED = f"{DOMAIN}_sensor_added_{{}}"
+SIGNAL_SENSOR_REMOVED = f"{DOMAIN}_sensor_removed_{{}}"
+SIGNAL_SENSOR_UPDATED = f"{DOMAIN}_sensor_updated_{{}}"
+
 # Broadcast intervals (seconds)
 OUTDOOR_INTERVAL = 300  # 5 minutes
 DEFAULT_INTERVAL = 60   # 1 minute
 
+# Silence after which the thermostat reports a sensor error (seconds)
+OUTDOOR_SENSOR_TIMEOUT = 1200  # 20 minutes
+DEFAULT_SENSOR_TIMEOUT = 300   # 5 minutes
+
 # Sensor purposes
 PURPOSE_OUTDOOR = "Outdoor"
 PURPOSE_REMOTE = "Remote"
@@ -32,6 +143,62 @@ VALID_PURPOSES = [
     PURPOSE_SUPPLY,
 ]
 
+# Temperature sources
+SOURCE_ENTITY = "entity"
+SOURCE_HTTP_JSON = "http_json"
+SOURCE_AGGREGATE = "aggregate"
+
+VALID_SOURCES = [
+    SOURCE_ENTITY,
+    SOURCE_HTTP_JSON,
+    SOURCE_AGGREGATE,
+]
+
+# Aggregate sources: one value computed from several entities
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+AGGREGATE_MEDIAN = "median"
+AGGREGATE_WEIGHTED = "weighted"
+
+VALID_AGGREGATIONS = [
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    AGGREGATE_MAX,
+    AGGREGATE_MEDIAN,
+    AGGREGATE_WEIGHTED,
+]
+
+# Input filtering: optional smoothing of a sensor's readings (once per
+# broadcast) and hysteresis on its temperature index
+SMOOTHING_NONE = "none"
+SMOOTHING_EMA = "ema"
+SMOOTHING_MEDIAN = "median"
+
+VALID_SMOOTHING = [
+    SMOOTHING_NONE,
+    SMOOTHING_EMA,
+    SMOOTHING_MEDIAN,
+]
+
+DEFAULT_SMOOTHING_SAMPLES = 3
+MAX_SMOOTHING_SAMPLES = 10
+MAX_HYSTERESIS = 2.0  # Degrees, in the sensor's scale
+
+# HTTP JSON sources: documents are shared by every sensor reading the same
+# URL for this many seconds, then revalidated with ETag/Last-Modified
+HTTP_SOURCE_CACHE_TTL = 30
+HTTP_SOURCE_TIMEOUT = 10  # Seconds per request
+
+# healthchecks.io pings: outcomes are collected for a short window and sent
+# as one batch; failed pings are retried with exponential backoff
+HEALTHCHECK_BATCH_WINDOW = 5.0  # Seconds
+HEALTHCHECK_TIMEOUT = 10  # Seconds per request
+HEALTHCHECK_RETRY_QUEUE_SIZE = 40  # Checks waiting for a retry
+HEALTHCHECK_MAX_ATTEMPTS = 5  # Send attempts before a ping is dropped
+HEALTHCHECK_RETRY_BACKOFF = 10.0  # Seconds before the first retry
+HEALTHCHECK_RETRY_BACKOFF_MAX = 300.0
+
 # Temperature scales
 SCALE_FAHRENHEIT = "F"
 SCALE_CELSIUS = "C"
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import TYPE_CHECKING
 
@@ -10,16 +11,77 @@ if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
 from .const import (
-    DEFAULT_INTERVAL,
     DOMAIN,
-    OUTDOOR_INTERVAL,
-    PURPOSE_OUTDOOR,
+    PACKET_PREPARE_LEAD,
+    PRIORITY_HIGH,
+    RETRY_INITIAL_DELAY,
+    RETRY_MAX_DELAY,
+    SCHEDULE_SLACK,
+    SETTING_ADAPTIVE_KEEPALIVE,
+    SOURCE_AGGREGATE,
+    SOURCE_ENTITY,
+    WARM_START_MAX_AGE,
 )
-from .venstar_sensor import VenstarSensor, broadcast_udp_packet
+from .cadence import AdaptiveCadence, get_keepalive_ceiling
+from .filtering import ReadingFilter
+from .packet_trace import KIND_DATA
+from .priority import get_priority
+from .ratelimit import get_broadcast_interval
+from .registry import SensorRecord
+from .sources import (
+    async_get_temperature,
+    describe_source,
+    read_aggregate_temperature,
+    read_entity_temperature,
+)
+from .venstar_sensor import VenstarSensor, get_temperature_index
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _PreparedPacket:
+    """A signed data packet built ahead of its broadcast deadline."""
+
+    __slots__ = (
+        "temperature",
+        "temperature_index",
+        "sequence",
+        "next_sequence",
+        "packet",
+        "config",
+        "cached",
+    )
+
+    def __init__(
+        self,
+        temperature: float,
+        temperature_index: int,
+        sequence: int,
+        next_sequence: int,
+        packet: bytes,
+        config: tuple,
+        cached: bool = False,
+    ) -> None:
+        """Initialize a prepared packet.
+
+        Args:
+            temperature: Source temperature the packet was built from
+            temperature_index: Temperature index carried by the packet
+            sequence: Sequence number carried by the packet
+            next_sequence: Sequence to store once the packet is sent
+            packet: Serialized, signed packet
+            config: Sensor settings the packet was built with
+            cached: True if built from the persisted reading (warm start)
+        """
+        self.temperature = temperature
+        self.temperature_index = temperature_index
+        self.sequence = sequence
+        self.next_sequence = next_sequence
+        self.packet = packet
+        self.config = config
+        self.cached = cached
+
+
 class VenstarSensorCoordinator:
     """Manages broadcast scheduling and execution for a single sensor."""
 
@@ -41,6 +103,11 @@ class VenstarSensorCoordinator:
         self.sensor_id = sensor_id
         self._task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
+        self._started: float | None = None  # Event-loop time of start()
+        self._filter: ReadingFilter | None = None  # Smoothing/hysteresis, if configured
+        self.cadence: AdaptiveCadence | None = None  # Set up by start()
+        # Hold the record itself; storage updates it in place
+        self._sensor: SensorRecord | None = self._storage.get_sensor(sensor_id)
 
     @property
     def _storage(self):
@@ -48,9 +115,9 @@ class VenstarSensorCoordinator:
         return self.hass.data[DOMAIN][self.entry_id]["storage"]
 
     @property
-    def _sensor_config(self) -> dict:
-        """Get sensor configuration from storage."""
-        return self._storage.get_sensor(self.sensor_id)
+    def _broadcaster(self):
+        """Get broadcaster instance from hass.data."""
+        return self.hass.data[DOMAIN][self.entry_id]["broadcaster"]
 
     async def start(self) -> None:
         """Start the broadcast scheduler."""
@@ -58,28 +125,26 @@ class VenstarSensorCoordinator:
             _LOGGER.warning(f"Coordinator for sensor {self.sensor_id} already running")
             return
 
-        sensor_config = self._sensor_config
-        if not sensor_config:
+        sensor_config = self._sensor
+        if sensor_config is None:
             _LOGGER.error(f"Cannot start coordinator: sensor {self.sensor_id} not found")
             return
 
-        if not sensor_config.get("enabled", True):
+        if not sensor_config.enabled:
             _LOGGER.debug(f"Sensor {self.sensor_id} is disabled, not starting coordinator")
             return
 
         # Determine broadcast interval based on sensor purpose
-        interval = (
-            OUTDOOR_INTERVAL
-            if sensor_config["purpose"] == PURPOSE_OUTDOOR
-            else DEFAULT_INTERVAL
-        )
+        interval = get_broadcast_interval(sensor_config.purpose)
 
         _LOGGER.info(
             f"Starting coordinator for sensor {self.sensor_id} "
-            f"({sensor_config['name']}), interval={interval}s"
+            f"({sensor_config.name}), interval={interval}s"
         )
 
+        self.cadence = AdaptiveCadence(interval, self._keepalive_ceiling())
         self._stop_event.clear()
+        self._started = asyncio.get_running_loop().time()
         self._task = asyncio.create_task(self._broadcast_loop(interval))
 
     async def stop(self) -> None:
@@ -96,123 +161,461 @@ class VenstarSensorCoordinator:
         except asyncio.CancelledError:
             pass
         self._task = None
+        self._broadcaster.lanes.release(self.sensor_id)
 
     async def _broadcast_loop(self, interval: int) -> None:
         """Main broadcast loop.
 
+        Each cycle reads the source and builds the packet PACKET_PREPARE_LEAD
+        seconds before its deadline; at the deadline the packet is only
+        re-checked against the latest entity state and sent, and the
+        sequence update is saved afterwards. A packet carrying the same
+        temperature index as the last broadcast is skipped until the
+        sensor's adaptive keepalive interval is up. A packet whose send fails is
+        retried until the next one is due. High priority (Supply/Return)
+        sensors announce each deadline to the priority lanes; low priority
+        ones let due high priority broadcasts go first.
+
         Args:
             interval: Broadcast interval in seconds
         """
-        sensor_config = self._sensor_config
+        sensor_config = self._sensor
+        lanes = self._broadcaster.lanes
+        loop = asyncio.get_running_loop()
+        # A restarted sensor (edited, or after a pairing session) waits out
+        # its rate limit, so its schedule starts where the first send can go
+        deadline = loop.time() + self._broadcaster.ledger_for(self.sensor_id).time_until_allowed(
+            loop.time(), sensor_config.purpose
+        )
 
-        while not self._stop_event.is_set():
+        first_cycle = True
+        while True:
+            high_priority = get_priority(sensor_config.purpose) == PRIORITY_HIGH
+            if high_priority:
+                lanes.expect(self.sensor_id, deadline)
+            # Already due (the loop is behind): build after the due high
+            # priority packets as well as sending after them
+            waited = not high_priority and loop.time() >= deadline
+            if waited:
+                await lanes.async_wait_turn()
+
+            prepared = None
+            error = None
             try:
-                # Get current temperature from HA entity
+                # Get current temperature from the sensor's source
                 temperature = await self._get_current_temperature()
-
                 if temperature is not None:
-                    await self._broadcast_sensor(temperature)
+                    prepared = self._prepare_packet(self._filter_reading(temperature))
+                elif first_cycle:
+                    # Source not ready yet (e.g. HA still booting)
+                    prepared = self._prepare_cached_packet()
+            except Exception as e:
+                error = e
+            first_cycle = False
+
+            if not await self._async_sleep_until(deadline):
+                return
+            if not high_priority and not waited:
+                await lanes.async_wait_turn()
+
+            sent_at = None
+            failed = None
+            try:
+                if error is not None:
+                    raise error
+
+                if prepared is not None:
+                    prepared = self._refresh_packet(prepared)
+                    cadence = self.cadence
+                    cadence.ceiling = self._keepalive_ceiling()
+                    if cadence.should_skip(prepared.temperature_index, loop.time()):
+                        if _LOGGER.isEnabledFor(logging.DEBUG):
+                            _LOGGER.debug(
+                                "Sensor %s: index %s unchanged, skipping broadcast "
+                                "(keepalive every %s s)",
+                                self.sensor_id, prepared.temperature_index,
+                                min(cadence.keepalive, cadence.ceiling),
+                            )
+                    else:
+                        try:
+                            sent_at = await self._send_packet(prepared, deadline)
+                        except OSError:
+                            failed = prepared
+                            raise
+                        cadence.record_send(prepared.temperature_index, sent_at)
+                    self._report_health(True)
                 else:
+                    message = f"temperature unavailable from {describe_source(sensor_config)}"
                     _LOGGER.warning(
-                        f"Sensor {self.sensor_id} ({sensor_config['name']}): "
-                        f"temperature unavailable from entity {sensor_config['entity_id']}"
+                        f"Sensor {self.sensor_id} ({sensor_config.name}): {message}"
                     )
+                    self._report_health(False, message)
 
             except Exception as e:
+                # broadcast_udp_packet already logged the traceback of a failed send
                 _LOGGER.error(
                     f"Error broadcasting sensor {self.sensor_id} "
-                    f"({sensor_config['name']}): {e}",
-                    exc_info=True
+                    f"({sensor_config.name}): {e}"
+                    f"{', retrying' if failed is not None else ''}",
+                    exc_info=failed is None
                 )
+                self._report_health(False, f"{type(e).__name__}: {e}")
+            if high_priority:
+                lanes.release(self.sensor_id)
+
+            # Schedule against the intended deadline so lateness doesn't
+            # accumulate, but never closer than the interval to the last send
+            deadline += interval
+            if failed is not None:
+                # Retry until the packet goes out or the next one supersedes it
+                sent_at = await self._async_retry(failed, deadline - PACKET_PREPARE_LEAD)
+                if self._stop_event.is_set():
+                    return
+            if sent_at is not None:
+                deadline = max(deadline, sent_at + interval - SCHEDULE_SLACK)
+
+            # Wait until it's time to prepare the next packet
+            if not await self._async_sleep_until(deadline - PACKET_PREPARE_LEAD):
+                return
+
+    async def _async_retry(self, prepared: _PreparedPacket, until: float) -> float | None:
+        """Resend a data packet whose send failed, with exponential backoff.
+
+        Only the sensor's latest packet is ever retried: each attempt
+        refreshes it against the current reading, and the retries end at
+        ``until``, when the next scheduled packet supersedes it. A transient
+        network error (e.g. ENETUNREACH while Wi-Fi reassociates) so costs
+        seconds rather than a whole interval.
 
-            # Wait for next broadcast interval
+        Args:
+            prepared: Packet whose send failed
+            until: Event-loop time after which no attempt starts
+
+        Returns:
+            Event-loop time the successful send started, or None if the
+            packet was dropped (superseded, or the coordinator stopped)
+        """
+        sensor_config = self._sensor
+        stats = self._broadcaster.stats_for(self.sensor_id)
+        loop = asyncio.get_running_loop()
+        delay = RETRY_INITIAL_DELAY
+        attempts = 0
+        while loop.time() + delay < until:
+            if not await self._async_sleep_until(loop.time() + delay):
+                break
+            attempts += 1
+            stats.retries += 1
+            prepared = self._refresh_packet(prepared)
             try:
-                await asyncio.wait_for(
-                    self._stop_event.wait(),
-                    timeout=interval
+                sent_at = await self._send_packet(prepared)
+            except OSError as e:
+                _LOGGER.debug(
+                    "Sensor %s: retry %s failed: %s", self.sensor_id, attempts, e
                 )
-            except asyncio.TimeoutError:
-                # Timeout is expected - continue loop
-                pass
+                delay = min(delay * 2, RETRY_MAX_DELAY)
+                continue
+            stats.retry_recoveries += 1
+            self.cadence.record_send(prepared.temperature_index, sent_at)
+            _LOGGER.info(
+                f"Sensor {self.sensor_id} ({sensor_config.name}): packet sent "
+                f"after {attempts} {'retry' if attempts == 1 else 'retries'}"
+            )
+            self._report_health(True)
+            return sent_at
+
+        stats.retry_drops += 1
+        self.cadence.record_failure()
+        if not self._stop_event.is_set():
+            _LOGGER.warning(
+                f"Sensor {self.sensor_id} ({sensor_config.name}): dropping failed packet "
+                f"after {attempts} {'retry' if attempts == 1 else 'retries'}"
+            )
+        return None
+
+    async def _async_sleep_until(self, when: float) -> bool:
+        """Sleep until an event-loop time.
+
+        Returns:
+            False if the coordinator was stopped before (or while) sleeping
+        """
+        if self._stop_event.is_set():
+            return False
+        delay = when - asyncio.get_running_loop().time()
+        if delay <= 0:
+            return True
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            # Timeout is expected - time to continue
+            return True
+        return False
+
+    def _keepalive_ceiling(self) -> int:
+        """Return the sensor's keepalive ceiling under the current settings."""
+        return get_keepalive_ceiling(
+            self._sensor.purpose, self._storage.settings[SETTING_ADAPTIVE_KEEPALIVE]
+        )
+
+    def _report_health(self, success: bool, body: str = "") -> None:
+        """Queue a healthchecks.io ping for a scheduled broadcast, if configured."""
+        url = self._sensor.healthcheck_url
+        if url:
+            self.hass.data[DOMAIN][self.entry_id]["healthchecks"].ping(url, success, body)
 
     async def _get_current_temperature(self) -> float | None:
-        """Get current temperature from HA entity.
+        """Get current temperature from the sensor's source.
 
         Returns:
             Temperature value, or None if unavailable
         """
-        sensor_config = self._sensor_config
-        state = self.hass.states.get(sensor_config["entity_id"])
+        data = self.hass.data[DOMAIN][self.entry_id]
+        return await async_get_temperature(
+            self.hass, data["http"], self._sensor, data["aggregates"]
+        )
 
-        if state is None:
-            _LOGGER.debug(f"Entity {sensor_config['entity_id']} not found")
-            return None
+    def _filter_reading(self, temperature: float) -> float:
+        """Pass a reading through the sensor's smoothing and hysteresis, if any.
 
-        if state.state in ("unknown", "unavailable"):
-            _LOGGER.debug(
-                f"Entity {sensor_config['entity_id']} state is {state.state}"
-            )
-            return None
+        The filter is rebuilt (and starts over) when its settings change.
 
-        try:
-            return float(state.state)
-        except (ValueError, TypeError) as e:
-            _LOGGER.error(
-                f"Invalid temperature value from {sensor_config['entity_id']}: "
-                f"{state.state} - {e}"
-            )
-            return None
+        Args:
+            temperature: Raw source reading
 
-    async def _broadcast_sensor(self, temperature: float) -> None:
-        """Build packet and broadcast via UDP.
+        Returns:
+            Reading to build the packet from
+        """
+        sensor_config = self._sensor
+        reading_filter = self._filter
+        if reading_filter is None or reading_filter.settings != ReadingFilter.settings_of(
+            sensor_config
+        ):
+            reading_filter = self._filter = ReadingFilter.for_sensor(sensor_config)
+            if reading_filter is None:
+                return temperature
+
+        filtered, suppressed = reading_filter.apply(temperature)
+        if suppressed:
+            self._broadcaster.stats_for(self.sensor_id).index_flips_suppressed += 1
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Sensor %s: holding temperature index, reading %s (filtered from %s)",
+                    self.sensor_id, filtered, temperature,
+                )
+        return filtered
+
+    def _packet_config(self) -> tuple:
+        """Return the settings a built packet depends on, besides the temperature."""
+        sensor_config = self._sensor
+        return (
+            sensor_config.sequence,
+            sensor_config.name,
+            sensor_config.purpose,
+            sensor_config.scale,
+            self._storage.mac_prefix,
+        )
+
+    def _prepare_packet(self, temperature: float) -> _PreparedPacket:
+        """Build and sign the next data packet without sending it.
 
         Args:
             temperature: Current temperature reading
-        """
-        sensor_config = self._sensor_config
-        storage = self._storage
 
-        # Create sensor instance
+        Returns:
+            Packet ready to send
+        """
+        sensor_config = self._sensor
         sensor = VenstarSensor(
             sensor_id=self.sensor_id,
-            mac_prefix=storage.mac_prefix,
-            name=sensor_config["name"],
-            purpose=sensor_config["purpose"],
-            scale=sensor_config.get("scale", "F"),
-            sequence=sensor_config["sequence"],
+            mac_prefix=self._storage.mac_prefix,
+            name=sensor_config.name,
+            purpose=sensor_config.purpose,
+            scale=sensor_config.scale,
+            sequence=sensor_config.sequence,
         )
-
-        # Build packet
+        config = self._packet_config()
+        sequence = sensor.sequence
         packet = sensor.build_data_packet(temperature)
+        return _PreparedPacket(
+            temperature, sensor.temperature_index, sequence, sensor.sequence, packet, config
+        )
+
+    def _prepare_cached_packet(self) -> _PreparedPacket | None:
+        """Build a fresh-sequence packet from the last broadcast temperature.
+
+        Returns:
+            Packet ready to send, or None if there is no recent enough reading
+        """
+        sensor_config = self._sensor
+        if sensor_config.last_temperature is None or sensor_config.last_broadcast is None:
+            return None
+        age = time.time() - sensor_config.last_broadcast
+        if age > WARM_START_MAX_AGE:
+            return None
+
+        _LOGGER.info(
+            f"Sensor {self.sensor_id} ({sensor_config.name}): source not ready, "
+            f"broadcasting cached reading {sensor_config.last_temperature} from {age:.0f} s ago"
+        )
+        prepared = self._prepare_packet(sensor_config.last_temperature)
+        prepared.cached = True
+        return prepared
+
+    def _refresh_packet(self, prepared: _PreparedPacket) -> _PreparedPacket:
+        """Rebuild a prepared packet if it went stale before its deadline.
+
+        Entity and aggregate sources are re-read (a state machine lookup, or
+        the tracker's current aggregate) and the packet is only rebuilt if
+        the temperature index on the wire would change. HTTP
+        sources are not re-read: their document is cached far longer than the
+        preparation lead, so a re-read can't return anything newer. Neither
+        are filtered sensors, whose packet carries the filtered reading.
+        """
+        sensor_config = self._sensor
+        if self._packet_config() != prepared.config:
+            # Renamed, re-paired or another send took the sequence meanwhile
+            refreshed = self._prepare_packet(prepared.temperature)
+            refreshed.cached = prepared.cached
+            prepared = refreshed
+        if self._filter is not None and not prepared.cached:
+            return prepared
+
+        temperature = None
+        if sensor_config.source == SOURCE_ENTITY:
+            temperature = read_entity_temperature(self.hass, sensor_config.entity_id)
+        elif sensor_config.source == SOURCE_AGGREGATE:
+            temperature = read_aggregate_temperature(
+                self.hass, sensor_config, self.hass.data[DOMAIN][self.entry_id]["aggregates"]
+            )
+        if temperature is not None and prepared.cached:
+            temperature = self._filter_reading(temperature)
+        if temperature is not None and (
+            prepared.cached or temperature != prepared.temperature
+        ):
+            if get_temperature_index(temperature, sensor_config.scale) != prepared.temperature_index:
+                return self._prepare_packet(temperature)
+            prepared.temperature = temperature
+            prepared.cached = False
+
+        return prepared
+
+    async def _send_packet(
+        self, prepared: _PreparedPacket, deadline: float | None = None
+    ) -> float:
+        """Broadcast a prepared packet, then record its sequence.
 
-        # Broadcast UDP (run in executor to avoid blocking)
-        await self.hass.async_add_executor_job(broadcast_udp_packet, packet)
+        Args:
+            prepared: Packet to send
+            deadline: Event-loop time the broadcast was scheduled for, if any
 
-        # Update sequence number and cache packet in storage
-        storage.update_sequence(self.sensor_id, sensor.sequence)
-        storage.update_last_packet(self.sensor_id, packet)
-        await storage.async_save()
+        Returns:
+            Event-loop time the send started
+        """
+        sensor_config = self._sensor
+
+        # Record how late the send goes out relative to its schedule
+        sent_at = asyncio.get_running_loop().time()
+        if deadline is not None:
+            stats = self._broadcaster.stats_for(self.sensor_id)
+            stats.record_lateness(max(sent_at - deadline, 0.0))
+            if stats.first_broadcast_delay is None and self._started is not None:
+                stats.record_first_broadcast(sent_at - self._started, prepared.cached)
+                _LOGGER.info(
+                    f"Sensor {self.sensor_id} ({sensor_config.name}): first broadcast "
+                    f"{(sent_at - self._started) * 1000:.0f} ms after start"
+                    f"{' (cached reading)' if prepared.cached else ''}"
+                )
 
-        _LOGGER.debug(
-            f"Broadcast sensor {self.sensor_id} ({sensor_config['name']}): "
-            f"{temperature}°{sensor_config['scale']} "
-            f"(seq={sensor.sequence-1})"
+        # Broadcast UDP
+        await self._broadcaster.async_send(
+            self.sensor_id,
+            prepared.packet,
+            KIND_DATA,
+            prepared.sequence,
+            prepared.temperature_index,
+            prepared.temperature,
         )
+        if deadline is not None:
+            self._broadcaster.lanes.record_lateness(
+                sensor_config.purpose, asyncio.get_running_loop().time() - deadline
+            )
+
+        # Update sequence number and cache packet on the record; the write
+        # to disk is batched and happens after the send
+        sensor_config.sequence = prepared.next_sequence
+        sensor_config.last_packet = prepared.packet
+        sensor_config.last_temperature = prepared.temperature
+        sensor_config.last_broadcast = time.time()
+        self._storage.async_schedule_save()
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Broadcast sensor %s (%s): %s°%s (seq=%s)",
+                self.sensor_id, sensor_config.name, prepared.temperature,
+                sensor_config.scale, prepared.sequence,
+            )
+
+        return sent_at
+
+    async def _broadcast_sensor(
+        self, temperature: float, deadline: float | None = None
+    ) -> float:
+        """Build packet and broadcast via UDP.
+
+        Args:
+            temperature: Current temperature reading
+            deadline: Event-loop time the broadcast was scheduled for, if any
+
+        Returns:
+            Event-loop time the send started
+        """
+        return await self._send_packet(self._prepare_packet(temperature), deadline)
 
     async def trigger_broadcast(self) -> None:
         """Manually trigger a broadcast immediately (for testing/pairing).
 
         This doesn't wait for the scheduled interval.
         """
-        sensor_config = self._sensor_config
-        if not sensor_config:
+        if self._sensor is None:
             _LOGGER.error(f"Cannot broadcast: sensor {self.sensor_id} not found")
             return
 
         temperature = await self._get_current_temperature()
         if temperature is not None:
-            await self._broadcast_sensor(temperature)
+            await self._broadcast_sensor(self._filter_reading(temperature))
         else:
             _LOGGER.warning(
                 f"Cannot broadcast sensor {self.sensor_id}: temperature unavailable"
             )
+
+
+async def async_start_coordinators(
+    hass: HomeAssistant, entry_id: str, sensor_ids: list[int]
+) -> None:
+    """Start the coordinators of the enabled sensors among sensor_ids together.
+
+    In the worker broadcast mode there are no coordinators; the worker
+    supervisor picks up sensor changes when storage is saved.
+    """
+    data = hass.data[DOMAIN][entry_id]
+    if data["worker"] is not None:
+        return
+    storage = data["storage"]
+    coordinators = [
+        VenstarSensorCoordinator(hass, entry_id, sensor_id)
+        for sensor_id in sensor_ids
+        if (sensor := storage.get_sensor(sensor_id)) is not None and sensor.enabled
+    ]
+    await asyncio.gather(*(coordinator.start() for coordinator in coordinators))
+    for coordinator in coordinators:
+        data["coordinators"][coordinator.sensor_id] = coordinator
+
+
+async def async_stop_coordinators(
+    hass: HomeAssistant, entry_id: str, sensor_ids: list[int]
+) -> None:
+    """Stop the running coordinators among sensor_ids together."""
+    running = hass.data[DOMAIN][entry_id]["coordinators"]
+    coordinators = [
+        running.pop(sensor_id) for sensor_id in sensor_ids if sensor_id in running
+    ]
+    await asyncio.gather(*(coordinator.stop() for coordinator in coordinators))
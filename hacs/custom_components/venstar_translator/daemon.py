@@ -0,0 +1,674 @@
+"""Standalone headless broadcaster, independent of Home Assistant.
+
+Runs the same packet building and broadcasting as the integration as a
+small asyncio daemon, for an always-on box next to the thermostats::
+
+    python -m custom_components.venstar_translator.daemon --config venstar.json
+
+The config file is JSON::
+
+    {
+      "mac_prefix": "0123456789",
+      "state_file": "venstar_state.json",
+      "sensors": [
+        {"sensor_id": 0, "name": "Outside", "purpose": "Outdoor", "scale": "F",
+         "source": {"type": "file", "path": "/run/outdoor_temp", "max_age": 900}},
+        {"sensor_id": 1, "name": "Kitchen", "purpose": "Remote", "scale": "F",
+         "source": {"type": "http", "url": "http://pi.local/kitchen", "key": "temperature"}},
+        {"sensor_id": 2, "name": "Garage", "purpose": "Remote", "scale": "C",
+         "source": {"type": "stdin"}}
+      ]
+    }
+
+Sequence numbers are persisted to ``state_file`` (relative paths are
+resolved against the config file) a few seconds after broadcasts and on
+exit. Only the standard library and protobuf are required.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+from .const import (
+    MAX_NAME_LENGTH,
+    MAX_SENSORS,
+    PRIORITY_HIGH,
+    SCHEDULE_SLACK,
+    STORAGE_SAVE_DELAY,
+    VALID_PURPOSES,
+    VALID_SCALES,
+)
+from .priority import PriorityLanes, get_priority
+from .ratelimit import get_broadcast_interval
+from .venstar_sensor import VenstarSensor, broadcast_udp_packet
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+HTTP_TIMEOUT = 10  # Seconds
+
+
+class ConfigError(ValueError):
+    """Raised when the daemon config file is invalid."""
+
+
+def _process_start() -> float:
+    """Return when this process started, on the perf_counter() clock.
+
+    Read from /proc where available, so interpreter start-up and the
+    package's imports (protobuf included) count towards startup time.
+    Elsewhere this falls back to now, i.e. after the imports.
+    """
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat", "rb") as file:
+            stat = file.read()
+        # starttime is field 22; fields after the command name start at 3
+        start_ticks = int(stat.rsplit(b")", 1)[1].split()[19])
+        elapsed = time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return now
+    return now - max(elapsed, 0.0)
+
+
+# Baseline for startup measurements
+_STARTED = _process_start()
+
+
+def _max_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MB, if known."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _extract(value: Any, key: str | None) -> float:
+    """Pull a temperature out of a number or a JSON document.
+
+    Args:
+        value: Raw text or already-parsed JSON
+        key: Dotted path into the JSON document (e.g. "sensors.0.temp"), or
+            None if the value itself is the temperature
+
+    Raises:
+        ValueError: If the value cannot be interpreted as a temperature
+    """
+    if key is None:
+        return float(value)
+    if isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    for part in key.split("."):
+        if isinstance(value, list):
+            value = value[int(part)]
+        else:
+            value = value[part]
+    return float(value)
+
+
+class TemperatureSource(ABC):
+    """Base class of the daemon's temperature sources.
+
+    Sources are created from the ``source`` object of a sensor's config;
+    register new ones in SOURCE_TYPES.
+    """
+
+    def __init__(self, options: dict[str, Any], sensor_id: int) -> None:
+        """Initialize the source.
+
+        Args:
+            options: The sensor's ``source`` config
+            sensor_id: Sensor the source feeds
+        """
+        self.options = options
+        self.sensor_id = sensor_id
+
+    async def async_start(self) -> None:
+        """Prepare the source (called once before the first read)."""
+
+    @abstractmethod
+    async def async_read(self) -> float | None:
+        """Return the current temperature, or None if unavailable."""
+
+    def close(self) -> None:
+        """Release the source's resources."""
+
+
+class FileSource(TemperatureSource):
+    """Reads a temperature from a file.
+
+    Options: ``path``; optional ``key`` (dotted path if the file is JSON) and
+    ``max_age`` (seconds since the file was last modified before it is
+    considered stale).
+    """
+
+    def __init__(self, options: dict[str, Any], sensor_id: int) -> None:
+        """Initialize the source."""
+        super().__init__(options, sensor_id)
+        if "path" not in options:
+            raise ConfigError(f"Sensor {sensor_id}: file source requires 'path'")
+        self._path = Path(options["path"])
+        self._key = options.get("key")
+        self._max_age = options.get("max_age")
+
+    def _read(self) -> float | None:
+        """Read the file (runs in the executor)."""
+        try:
+            if self._max_age is not None:
+                age = time.time() - self._path.stat().st_mtime
+                if age > self._max_age:
+                    _LOGGER.warning(f"Sensor {self.sensor_id}: {self._path} is stale ({age:.0f}s old)")
+                    return None
+            return _extract(self._path.read_text().strip(), self._key)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            _LOGGER.warning(f"Sensor {self.sensor_id}: cannot read temperature from {self._path}: {e}")
+            return None
+
+    async def async_read(self) -> float | None:
+        """Return the temperature in the file."""
+        return await asyncio.get_running_loop().run_in_executor(None, self._read)
+
+
+class HttpSource(TemperatureSource):
+    """Fetches a temperature over HTTP.
+
+    Options: ``url``; optional ``key`` (dotted path into a JSON response,
+    otherwise the body is the temperature) and ``headers``.
+    """
+
+    def __init__(self, options: dict[str, Any], sensor_id: int) -> None:
+        """Initialize the source."""
+        super().__init__(options, sensor_id)
+        if "url" not in options:
+            raise ConfigError(f"Sensor {sensor_id}: http source requires 'url'")
+        self._url = options["url"]
+        self._key = options.get("key")
+        self._headers = options.get("headers", {})
+
+    def _fetch(self) -> float | None:
+        """Fetch the URL (runs in the executor)."""
+        request = urllib.request.Request(self._url, headers=self._headers)
+        try:
+            with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+                body = response.read()
+            return _extract(body.decode("utf-8").strip(), self._key)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            _LOGGER.warning(f"Sensor {self.sensor_id}: cannot fetch temperature from {self._url}: {e}")
+            return None
+
+    async def async_read(self) -> float | None:
+        """Return the temperature served at the URL."""
+        return await asyncio.get_running_loop().run_in_executor(None, self._fetch)
+
+
+class StdinSource(TemperatureSource):
+    """Takes temperatures written to the daemon's standard input.
+
+    Each line is ``<sensor_id> <temperature>``; the latest value per sensor
+    is used. Optional ``max_age`` (seconds) marks values stale. All stdin
+    sources share one reader.
+    """
+
+    _latest: dict[int, tuple[float, float]] = {}  # sensor_id -> (temperature, monotonic time)
+    _reader_task: asyncio.Task | None = None
+
+    def __init__(self, options: dict[str, Any], sensor_id: int) -> None:
+        """Initialize the source."""
+        super().__init__(options, sensor_id)
+        self._max_age = options.get("max_age")
+
+    async def async_start(self) -> None:
+        """Start the shared stdin reader if it isn't running yet."""
+        if StdinSource._reader_task is None:
+            StdinSource._reader_task = asyncio.create_task(self._async_read_stdin())
+
+    @staticmethod
+    async def _async_read_stdin() -> None:
+        """Read ``<sensor_id> <temperature>`` lines until EOF."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        while line := await reader.readline():
+            try:
+                sensor_id, temperature = line.split()
+                StdinSource._latest[int(sensor_id)] = (float(temperature), time.monotonic())
+            except ValueError:
+                _LOGGER.warning(f"Ignoring malformed stdin line: {line!r}")
+        _LOGGER.info("Standard input closed; stdin sensors keep their last value")
+
+    async def async_read(self) -> float | None:
+        """Return the latest temperature written for this sensor."""
+        latest = StdinSource._latest.get(self.sensor_id)
+        if latest is None:
+            return None
+        temperature, received = latest
+        if self._max_age is not None and time.monotonic() - received > self._max_age:
+            return None
+        return temperature
+
+    def close(self) -> None:
+        """Stop the shared reader."""
+        if StdinSource._reader_task is not None:
+            StdinSource._reader_task.cancel()
+            StdinSource._reader_task = None
+
+
+SOURCE_TYPES: dict[str, type[TemperatureSource]] = {
+    "file": FileSource,
+    "http": HttpSource,
+    "stdin": StdinSource,
+}
+
+
+def load_config(path: Path) -> dict[str, Any]:
+    """Load and validate the daemon config file.
+
+    Args:
+        path: Path to the JSON config file
+
+    Returns:
+        The config, with ``state_file`` resolved to an absolute path
+
+    Raises:
+        ConfigError: If the file is missing, malformed or invalid
+    """
+    try:
+        config = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"Cannot read config {path}: {e}") from e
+    if not isinstance(config, dict):
+        raise ConfigError(f"Config {path} must be a JSON object")
+
+    mac_prefix = str(config.get("mac_prefix", ""))
+    if len(mac_prefix) != 10 or any(c not in "0123456789abcdefABCDEF" for c in mac_prefix):
+        raise ConfigError("'mac_prefix' must be 10 hex characters")
+    config["mac_prefix"] = mac_prefix.lower()
+
+    sensors = config.get("sensors")
+    if not sensors:
+        raise ConfigError("No sensors configured")
+    if not isinstance(sensors, list):
+        raise ConfigError("'sensors' must be a list")
+    seen: set[int] = set()
+    for sensor in sensors:
+        if not isinstance(sensor, dict):
+            raise ConfigError(f"Each sensor must be an object, got {sensor!r}")
+        sensor_id = sensor.get("sensor_id")
+        if not isinstance(sensor_id, int) or not 0 <= sensor_id < MAX_SENSORS:
+            raise ConfigError(f"sensor_id must be 0-{MAX_SENSORS - 1}, got {sensor_id!r}")
+        if sensor_id in seen:
+            raise ConfigError(f"Sensor {sensor_id} configured twice")
+        seen.add(sensor_id)
+        name = sensor.get("name", "")
+        if not name or len(name) > MAX_NAME_LENGTH:
+            raise ConfigError(f"Sensor {sensor_id}: name must be 1-{MAX_NAME_LENGTH} characters")
+        if sensor.get("purpose") not in VALID_PURPOSES:
+            raise ConfigError(f"Sensor {sensor_id}: purpose must be one of {VALID_PURPOSES}")
+        if sensor.get("scale") not in VALID_SCALES:
+            raise ConfigError(f"Sensor {sensor_id}: scale must be one of {VALID_SCALES}")
+        source = sensor.get("source")
+        if not isinstance(source, dict) or source.get("type") not in SOURCE_TYPES:
+            raise ConfigError(f"Sensor {sensor_id}: source type must be one of {list(SOURCE_TYPES)}")
+
+    config["state_file"] = str(path.parent / config.get("state_file", "venstar_state.json"))
+    return config
+
+
+class SequenceState:
+    """Sequence numbers persisted in a local JSON file."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the state.
+
+        Args:
+            path: State file, created on first save
+        """
+        self._path = path
+        self.sequences: dict[int, int] = {}
+
+    def load(self) -> None:
+        """Load sequences, starting fresh if the file doesn't exist."""
+        try:
+            data = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            _LOGGER.warning(f"Cannot read state {self._path}, sequences start at 1: {e}")
+            return
+        self.sequences = {int(k): int(v) for k, v in data.get("sequences", {}).items()}
+
+    def save(self, sequences: dict[int, int] | None = None) -> None:
+        """Write sequences atomically, so a crash never leaves a torn file.
+
+        Args:
+            sequences: Sequences to write instead of ``sequences``; saves run
+                in the executor write a copy taken on the event loop
+        """
+        if sequences is None:
+            sequences = self.sequences
+        data = {
+            "version": STATE_VERSION,
+            "sequences": {str(k): v for k, v in sorted(sequences.items())},
+        }
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, self._path)
+
+
+class BroadcastDaemon:
+    """Broadcasts every configured sensor on its schedule."""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize the daemon.
+
+        Args:
+            config: Validated config from load_config; without a
+                ``state_file`` sequences are not persisted
+        """
+        self._config = config
+        state_file = config.get("state_file")
+        self._state = SequenceState(Path(state_file)) if state_file else None
+        self._stop_event = asyncio.Event()
+        self.sensors: dict[int, VenstarSensor] = {}
+        self.sources: dict[int, TemperatureSource] = {}
+        self.lanes = PriorityLanes()
+        self.first_broadcast: float | None = None  # perf_counter() of the first send
+        self._save_handle: asyncio.TimerHandle | None = None  # Pending batched save
+        self._save_task: asyncio.Future | None = None  # Batched save in the executor
+
+    def _create_sensors(self) -> None:
+        """Create sensors and sources from the config."""
+        sequences = {}
+        if self._state is not None:
+            self._state.load()
+            sequences = self._state.sequences
+        for sensor_config in self._config["sensors"]:
+            sensor_id = sensor_config["sensor_id"]
+            self.sensors[sensor_id] = VenstarSensor(
+                sensor_id=sensor_id,
+                mac_prefix=self._config["mac_prefix"],
+                name=sensor_config["name"],
+                purpose=sensor_config["purpose"],
+                scale=sensor_config["scale"],
+                sequence=sequences.get(sensor_id, 1),
+            )
+            options = sensor_config["source"]
+            self.sources[sensor_id] = SOURCE_TYPES[options["type"]](options, sensor_id)
+
+    def stop(self) -> None:
+        """Ask all broadcast loops to finish."""
+        self._stop_event.set()
+
+    async def async_run(self) -> None:
+        """Run until stop() is called."""
+        self._create_sensors()
+        for source in self.sources.values():
+            await source.async_start()
+
+        tasks = [
+            asyncio.create_task(self._broadcast_loop(sensor))
+            for sensor in self.sensors.values()
+        ]
+        _LOGGER.info(f"Broadcasting {len(tasks)} sensors")
+        try:
+            await self._stop_event.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for source in self.sources.values():
+                source.close()
+            if self._save_handle is not None:
+                self._save_handle.cancel()
+                self._save_handle = None
+            if self._save_task is not None:
+                await self._save_task
+            self._save_state()
+
+    async def async_pair(self, sensor_id: int) -> bool:
+        """Send a single pairing packet for a sensor.
+
+        Returns:
+            True if the pairing packet was sent
+        """
+        self._create_sensors()
+        sensor = self.sensors.get(sensor_id)
+        if sensor is None:
+            _LOGGER.error(f"Sensor {sensor_id} not configured")
+            return False
+
+        source = self.sources[sensor_id]
+        await source.async_start()
+        temperature = await source.async_read()
+        source.close()
+        if temperature is None:
+            _LOGGER.error(f"Cannot pair sensor {sensor_id}: temperature unavailable")
+            return False
+
+        packet = sensor.build_pairing_packet(temperature)
+        await asyncio.get_running_loop().run_in_executor(None, broadcast_udp_packet, packet)
+        self._save_state()
+        return True
+
+    async def _broadcast_loop(self, sensor: VenstarSensor, delay: float = 0.0) -> None:
+        """Broadcast one sensor on its interval, like the integration's coordinator.
+
+        Args:
+            sensor: Sensor to broadcast
+            delay: Seconds before the first broadcast
+        """
+        interval = get_broadcast_interval(sensor.purpose)
+        high_priority = get_priority(sensor.purpose) == PRIORITY_HIGH
+        source = self.sources[sensor.sensor_id]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + delay
+
+        while True:
+            if high_priority:
+                self.lanes.expect(sensor.sensor_id, deadline)
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=max(deadline - loop.time(), 0))
+                self.lanes.release(sensor.sensor_id)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if not high_priority:
+                # Let due Supply/Return broadcasts go first
+                await self.lanes.async_wait_turn()
+
+            sent_at = None
+            try:
+                temperature = await source.async_read()
+                if temperature is not None:
+                    sent_at = await self._async_broadcast(
+                        sensor, temperature, max(loop.time() - deadline, 0.0)
+                    )
+                else:
+                    self._report_unavailable(sensor)
+            except Exception as e:
+                _LOGGER.error(f"Error broadcasting sensor {sensor.sensor_id} ({sensor.name}): {e}", exc_info=True)
+            if high_priority:
+                self.lanes.release(sensor.sensor_id)
+
+            deadline += interval
+            if sent_at is not None:
+                deadline = max(deadline, sent_at + interval - SCHEDULE_SLACK)
+
+    async def _async_broadcast(
+        self, sensor: VenstarSensor, temperature: float, lateness: float
+    ) -> float | None:
+        """Build, send and persist one scheduled data packet.
+
+        Args:
+            sensor: Sensor to broadcast
+            temperature: Current source temperature
+            lateness: Seconds the send starts after its deadline
+
+        Returns:
+            Event-loop time the packet's send started, or None if none went out
+        """
+        loop = asyncio.get_running_loop()
+        sequence = sensor.sequence
+        packet = sensor.build_data_packet(temperature)
+        sent_at = loop.time()
+        try:
+            await loop.run_in_executor(None, broadcast_udp_packet, packet)
+        except OSError as e:
+            # The next packet reuses the sequence, as in the integration
+            sensor.sequence = sequence
+            _LOGGER.error(f"Error broadcasting sensor {sensor.sensor_id} ({sensor.name}): {e}")
+            return None
+        if self.first_broadcast is None:
+            self.first_broadcast = time.perf_counter()
+            _LOGGER.info(
+                f"First broadcast {(self.first_broadcast - _STARTED) * 1000:.0f} ms "
+                f"after start, peak RSS {_max_rss_mb() or 0:.1f} MB"
+            )
+        self._schedule_save()
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Broadcast sensor %s (%s): %s°%s (index=%s)",
+                sensor.sensor_id, sensor.name, temperature, sensor.scale,
+                sensor.temperature_index,
+            )
+        return sent_at
+
+    def _report_unavailable(self, sensor: VenstarSensor) -> None:
+        """Handle a scheduled broadcast skipped for lack of a temperature."""
+        _LOGGER.warning(f"Sensor {sensor.sensor_id} ({sensor.name}): temperature unavailable")
+
+    def _schedule_save(self) -> None:
+        """Persist sequences after STORAGE_SAVE_DELAY, batching broadcasts.
+
+        The write runs in the executor so a slow disk never delays a
+        broadcast. A crash loses at most the last few seconds of sequence
+        updates, which the thermostat tolerates like a restart.
+        """
+        if self._state is None or self._save_handle is not None:
+            return
+        self._save_handle = asyncio.get_running_loop().call_later(
+            STORAGE_SAVE_DELAY, self._start_save
+        )
+
+    def _start_save(self) -> None:
+        """Write the batched sequence updates in the executor."""
+        self._save_handle = None
+        if self._save_task is not None and not self._save_task.done():
+            # Still writing the previous batch; try again later
+            self._schedule_save()
+            return
+        sequences = {sensor_id: sensor.sequence for sensor_id, sensor in self.sensors.items()}
+        self._state.sequences.update(sequences)
+        self._save_task = asyncio.get_running_loop().run_in_executor(
+            None, self._write_state, sequences
+        )
+
+    def _write_state(self, sequences: dict[int, int]) -> None:
+        """Write a sequence snapshot (runs in the executor)."""
+        try:
+            self._state.save(sequences)
+        except OSError as e:
+            _LOGGER.error(f"Cannot save state: {e}")
+
+    def _save_state(self) -> None:
+        """Persist the current sequence of every sensor now."""
+        if self._state is None:
+            return
+        for sensor_id, sensor in self.sensors.items():
+            self._state.sequences[sensor_id] = sensor.sequence
+        try:
+            self._state.save()
+        except OSError as e:
+            _LOGGER.error(f"Cannot save state: {e}")
+
+
+def benchmark(config: dict[str, Any], started: float) -> dict[str, Any]:
+    """Measure startup cost without sending anything.
+
+    Creates every sensor and builds one data packet per sensor (a fixed
+    20°C/68°F, so no source is read), which loads the protobuf runtime the
+    same way the first real broadcast does.
+
+    Args:
+        config: Validated config
+        started: perf_counter() reading of when the process started
+
+    Returns:
+        Startup time to ready-to-send in ms and peak RSS in MB
+    """
+    daemon = BroadcastDaemon(config)
+    daemon._create_sensors()
+    for sensor in daemon.sensors.values():
+        sensor.build_data_packet(20.0 if sensor.scale == "C" else 68.0)
+    return {
+        "sensors": len(daemon.sensors),
+        "startup_ms": round((time.perf_counter() - started) * 1000, 1),
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the daemon from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.venstar_translator.daemon",
+        description="Broadcast emulated Venstar sensors without Home Assistant.",
+    )
+    parser.add_argument("--config", "-c", required=True, type=Path, help="JSON config file")
+    parser.add_argument("--pair", type=int, metavar="SENSOR_ID", help="Send one pairing packet and exit")
+    parser.add_argument("--benchmark", action="store_true", help="Report startup time and memory, then exit")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    try:
+        config = load_config(args.config)
+    except ConfigError as e:
+        _LOGGER.error(str(e))
+        return 2
+
+    if args.benchmark:
+        print(json.dumps(benchmark(config, _STARTED)))
+        return 0
+
+    daemon = BroadcastDaemon(config)
+    if args.pair is not None:
+        return 0 if asyncio.run(daemon.async_pair(args.pair)) else 1
+
+    async def _run() -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, daemon.stop)
+            except NotImplementedError:  # Windows
+                pass
+        await daemon.async_run()
+
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Per-sensor delivery evidence and adaptive repeat count."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from .const import (
+    BROADCAST_REPEAT_COUNT,
+    MAX_REPEAT_COUNT,
+    MIN_REPEAT_COUNT,
+    REPEAT_DECREASE_STREAK,
+    REPEAT_LOSS_STEP,
+)
+
+
+class DeliveryTracker:
+    """Correlates thermostat responses with a sensor's data packets.
+
+    Starts at the protocol's fixed BROADCAST_REPEAT_COUNT and only adapts
+    once the thermostat has acknowledged at least one packet, since
+    silence is otherwise indistinguishable from a thermostat (or network)
+    that never answers. After that, each data packet that goes unanswered
+    before the next one is sent, or is answered with FAILURE, raises the
+    repeat count by REPEAT_LOSS_STEP; every REPEAT_DECREASE_STREAK
+    consecutive acknowledged packets lower it by one.
+    """
+
+    __slots__ = (
+        "repeat_count",
+        "successes",
+        "failures",
+        "losses",
+        "stale_responses",
+        "last_response",
+        "_pending_sequence",
+        "_streak",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self.repeat_count = BROADCAST_REPEAT_COUNT
+        self.successes = 0
+        self.failures = 0
+        self.losses = 0  # Data packets that got no response before the next send
+        self.stale_responses = 0  # Responses for a sequence we weren't waiting on
+        self.last_response: float | None = None  # Wall-clock time
+        self._pending_sequence: int | None = None
+        self._streak = 0
+
+    @property
+    def adaptive(self) -> bool:
+        """True once the thermostat has been heard acknowledging this sensor."""
+        return self.successes > 0
+
+    def on_sent(self, sequence: int) -> None:
+        """Record that a data packet is about to be sent.
+
+        A retry of the packet already pending (same sequence, after a
+        failed send) is not a new packet, so it doesn't count as a loss.
+
+        Args:
+            sequence: Sequence number of the packet
+        """
+        if sequence == self._pending_sequence:
+            return
+        if self._pending_sequence is not None and self.adaptive:
+            # Previous packet was never answered
+            self.losses += 1
+            self._on_loss()
+        self._pending_sequence = sequence
+
+    def on_response(self, sequence: int | None, success: bool) -> None:
+        """Record a SUCCESS/FAILURE response from the thermostat.
+
+        Args:
+            sequence: Sequence number echoed by the response, if any
+            success: True for SUCCESS, False for FAILURE
+        """
+        self.last_response = time.time()
+        if sequence is not None and sequence != self._pending_sequence:
+            self.stale_responses += 1
+            return
+
+        self._pending_sequence = None
+        if success:
+            self.successes += 1
+            self._streak += 1
+            if self._streak >= REPEAT_DECREASE_STREAK:
+                self._streak = 0
+                self.repeat_count = max(self.repeat_count - 1, MIN_REPEAT_COUNT)
+        else:
+            self.failures += 1
+            self._on_loss()
+
+    def _on_loss(self) -> None:
+        """Back off toward more repeats after missing delivery evidence."""
+        self._streak = 0
+        self.repeat_count = min(self.repeat_count + REPEAT_LOSS_STEP, MAX_REPEAT_COUNT)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize delivery evidence for diagnostics."""
+        return {
+            "repeat_count": self.repeat_count,
+            "adaptive": self.adaptive,
+            "successes": self.successes,
+            "failures": self.failures,
+            "losses": self.losses,
+            "stale_responses": self.stale_responses,
+            "last_response": self.last_response,
+        }
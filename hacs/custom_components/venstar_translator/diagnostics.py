@@ -0,0 +1,67 @@
+"""Diagnostics support for Venstar Translator."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# The HMAC signing key is derived from the MAC address alone; HTTP source
+# URLs and headers may carry credentials
+TO_REDACT = {"mac_prefix", "url", "headers"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    storage = data["storage"]
+    broadcaster = data["broadcaster"]
+    coordinators = data["coordinators"]
+    worker = data["worker"]
+
+    sensors = {}
+    for sensor in storage.sensors:
+        stats = broadcaster.stats.get(sensor.sensor_id)
+        ledger = broadcaster.ledgers.get(sensor.sensor_id)
+        delivery = broadcaster.delivery.get(sensor.sensor_id)
+        coordinator = coordinators.get(sensor.sensor_id)
+        cadence = coordinator.cadence if coordinator is not None else None
+        sensors[str(sensor.sensor_id)] = {
+            "name": sensor.name,
+            "source": sensor.source,
+            "healthcheck": bool(sensor.healthcheck_url),
+            "purpose": sensor.purpose,
+            "scale": sensor.scale,
+            "enabled": sensor.enabled,
+            "smoothing": sensor.smoothing,
+            "smoothing_samples": sensor.smoothing_samples,
+            "hysteresis": sensor.hysteresis,
+            "running": (
+                worker.is_broadcasting(sensor.sensor_id)
+                if worker is not None
+                else sensor.sensor_id in coordinators
+            ),
+            "stats": stats.as_dict() if stats is not None else None,
+            "rate_limit": ledger.as_dict() if ledger is not None else None,
+            "cadence": cadence.as_dict() if cadence is not None else None,
+            "delivery": delivery.as_dict() if delivery is not None else None,
+        }
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "settings": storage.settings,
+        "sensors": sensors,
+        "event_loop": data["loop_lag"].as_dict(),
+        "priority_lanes": broadcaster.lanes.as_dict(),
+        "listener": data["listener"].as_dict(),
+        "http": data["http"].as_dict(),
+        "healthchecks": data["healthchecks"].as_dict(),
+        "aggregates": data["aggregates"].as_dict(),
+        "worker": worker.as_dict() if worker is not None else None,
+        "pairing": data["pairing"].as_dict() if data["pairing"] is not None else None,
+    }
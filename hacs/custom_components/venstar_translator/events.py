@@ -0,0 +1,79 @@
+"""Live stream of broadcast events for websocket subscribers."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+from .const import EVENT_STREAM_TICK
+
+
+class BroadcastEventStream:
+    """Fan out broadcast events to subscribers, batched per tick.
+
+    Publishers must check has_subscribers before building an event, so the
+    stream costs a single attribute check per broadcast when nobody listens.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the stream.
+
+        Args:
+            hass: Home Assistant instance
+        """
+        self.hass = hass
+        self._subscribers: list[Callable[[list[dict[str, Any]]], None]] = []
+        self._pending: list[dict[str, Any]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def has_subscribers(self) -> bool:
+        """Return True if at least one subscriber is listening."""
+        return bool(self._subscribers)
+
+    def subscribe(
+        self, subscriber: Callable[[list[dict[str, Any]]], None]
+    ) -> Callable[[], None]:
+        """Add a subscriber that receives lists of events once per tick.
+
+        Args:
+            subscriber: Callback run in the event loop with each batch of events
+
+        Returns:
+            Function that removes the subscriber
+        """
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            self._subscribers.remove(subscriber)
+            if not self._subscribers:
+                self._cancel_flush()
+
+        return unsubscribe
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Queue an event for delivery at the end of the current tick.
+
+        Args:
+            event: Event payload (must be JSON serializable)
+        """
+        self._pending.append(event)
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(EVENT_STREAM_TICK, self._flush)
+
+    def _flush(self) -> None:
+        """Deliver all queued events to every subscriber in one batch."""
+        self._flush_handle = None
+        events, self._pending = self._pending, []
+        for subscriber in list(self._subscribers):
+            subscriber(events)
+
+    def _cancel_flush(self) -> None:
+        """Drop queued events once the last subscriber is gone."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending = []
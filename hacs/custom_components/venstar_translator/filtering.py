@@ -0,0 +1,129 @@
+"""Per-sensor input filtering ahead of the temperature index.
+
+A noisy source that hovers on a rounding boundary (72.49, 72.51, 72.48 °F)
+flips the temperature index at every broadcast, and the thermostat's staging
+logic chatters along with it. A sensor can optionally smooth its readings
+(exponential moving average or median of the last N readings) and hold its
+current index until the smoothed reading has moved a set margin past it
+(hysteresis).
+
+The filter runs once per scheduled broadcast, on the reading the packet is
+built from, so N counts broadcasts rather than source updates. State is
+kept in memory only and starts over when the coordinator or settings change.
+In the worker broadcast mode the worker process runs the filter instead.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+from .const import SMOOTHING_EMA, SMOOTHING_MEDIAN, SMOOTHING_NONE
+from .registry import SensorRecord
+from .venstar_sensor import get_temperature_index
+
+
+def _index_or_none(temperature: float, scale: str) -> int | None:
+    """Return a temperature's index, or None if it is out of range."""
+    try:
+        return get_temperature_index(temperature, scale)
+    except ValueError:
+        return None
+
+
+class ReadingFilter:
+    """Smooths a sensor's readings and applies hysteresis to its index."""
+
+    __slots__ = (
+        "settings",
+        "_smoothing",
+        "_alpha",
+        "_hysteresis",
+        "_scale",
+        "_average",
+        "_window",
+        "_output",
+        "_index",
+    )
+
+    def __init__(self, smoothing: str, samples: int, hysteresis: float, scale: str) -> None:
+        """Initialize the filter.
+
+        Args:
+            smoothing: none, ema or median
+            samples: Readings the average or median spans
+            hysteresis: Degrees (in the sensor's scale) a reading must move
+                past the current index before the index changes; 0 disables
+            scale: Temperature scale (F or C)
+        """
+        self.settings = (smoothing, samples, hysteresis, scale)
+        self._smoothing = smoothing
+        # An N-reading EMA weighs the newest reading 2 / (N + 1)
+        self._alpha = 2 / (samples + 1)
+        self._hysteresis = hysteresis
+        self._scale = scale
+        self._average: float | None = None
+        self._window: deque[float] = deque(maxlen=samples)
+        self._output: float | None = None  # Last reading passed on
+        self._index: int | None = None  # Its temperature index
+
+    @staticmethod
+    def settings_of(sensor: SensorRecord) -> tuple:
+        """Return the filter settings of a sensor, as stored in ``settings``."""
+        return (sensor.smoothing, sensor.smoothing_samples, sensor.hysteresis, sensor.scale)
+
+    @classmethod
+    def for_sensor(cls, sensor: SensorRecord) -> ReadingFilter | None:
+        """Build the filter a sensor is configured for, or None if it has none."""
+        return cls.from_settings(cls.settings_of(sensor))
+
+    @classmethod
+    def from_settings(cls, settings: tuple) -> ReadingFilter | None:
+        """Build a filter from settings_of() output, or None if they filter nothing."""
+        smoothing, _, hysteresis, _ = settings
+        if smoothing == SMOOTHING_NONE and not hysteresis:
+            return None
+        return cls(*settings)
+
+    def _smooth(self, temperature: float) -> float:
+        """Feed a reading to the average or median and return its current value."""
+        if self._smoothing == SMOOTHING_EMA:
+            if self._average is None:
+                self._average = temperature
+            else:
+                self._average += self._alpha * (temperature - self._average)
+            return round(self._average, 2)
+        if self._smoothing == SMOOTHING_MEDIAN:
+            self._window.append(temperature)
+            ordered = sorted(self._window)
+            middle = len(ordered) // 2
+            if len(ordered) % 2:
+                return ordered[middle]
+            return round((ordered[middle - 1] + ordered[middle]) / 2, 2)
+        return temperature
+
+    def apply(self, temperature: float) -> tuple[float, bool]:
+        """Filter one reading.
+
+        The smoothed reading is passed on unless its index differs from the
+        current one while the current index is still within ``hysteresis``
+        degrees of it; then the previous reading is passed on again, so the
+        packet keeps the current index.
+
+        Args:
+            temperature: Raw source reading
+
+        Returns:
+            Reading to broadcast, and whether an index change was suppressed
+        """
+        value = self._smooth(temperature)
+        index = _index_or_none(value, self._scale)
+        held = self._index
+        if self._hysteresis and held is not None and index is not None and index != held:
+            # The index is monotonic in the temperature, so the current index
+            # is within the margin if it lies between the margin's ends
+            low = _index_or_none(value - self._hysteresis, self._scale)
+            high = _index_or_none(value + self._hysteresis, self._scale)
+            if (low if low is not None else index) <= held <= (high if high is not None else index):
+                return self._output, True
+        self._output = value
+        self._index = index
+        return value, False
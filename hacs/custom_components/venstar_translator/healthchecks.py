@@ -0,0 +1,224 @@
+"""Batched healthchecks.io pings for broadcast monitoring."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import aiohttp
+
+from .const import (
+    HEALTHCHECK_BATCH_WINDOW,
+    HEALTHCHECK_MAX_ATTEMPTS,
+    HEALTHCHECK_RETRY_BACKOFF,
+    HEALTHCHECK_RETRY_BACKOFF_MAX,
+    HEALTHCHECK_RETRY_QUEUE_SIZE,
+    HEALTHCHECK_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Ping:
+    """Latest outcome to report to one check."""
+
+    __slots__ = ("url", "success", "body", "attempt", "due")
+
+    def __init__(self, url: str, success: bool, body: str) -> None:
+        """Initialize a ping."""
+        self.url = url
+        self.success = success
+        self.body = body
+        self.attempt = 0  # Failed send attempts so far
+        self.due = 0.0  # Event-loop time of the next retry
+
+
+class HealthChecksPinger:
+    """Reports broadcast outcomes to healthchecks.io-style ping URLs.
+
+    ping() only records the outcome and never waits, so it is safe to call
+    from the broadcast path. Outcomes are collected for a short window and
+    then sent together through one keep-alive client session; several
+    outcomes for the same check within a window collapse into one request
+    (a failure wins over successes, so it isn't hidden by a later retry
+    of the broadcast). Requests that fail with a network error, 429 or 5xx
+    go to a bounded retry queue with exponential backoff; a newer outcome
+    for the same check replaces a queued retry instead of queueing behind it.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        window: float = HEALTHCHECK_BATCH_WINDOW,
+        max_retries: int = HEALTHCHECK_RETRY_QUEUE_SIZE,
+    ) -> None:
+        """Initialize the pinger.
+
+        Args:
+            session: Client session to send pings through
+            window: Seconds outcomes are collected before a batch is sent
+            max_retries: Maximum number of checks waiting for a retry
+        """
+        self._session = session
+        self._window = window
+        self._max_retries = max_retries
+        self._timeout = aiohttp.ClientTimeout(total=HEALTHCHECK_TIMEOUT)
+        self._pending: dict[str, _Ping] = {}
+        self._retries: dict[str, _Ping] = {}  # Insertion order, oldest first
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.sent = 0
+        self.merged = 0  # Outcomes folded into an already pending ping
+        self.batches = 0
+        self.retried = 0
+        self.dropped = 0  # Pings given up on (attempts exhausted or queue full)
+        self.failures = 0  # Failed requests, including ones retried later
+
+    @property
+    def queued_retries(self) -> int:
+        """Return the number of checks waiting for a retry."""
+        return len(self._retries)
+
+    def ping(self, url: str, success: bool, body: str = "") -> None:
+        """Record a broadcast outcome for a check.
+
+        Args:
+            url: Ping URL of the check (``/fail`` is appended for failures)
+            success: Whether the broadcast succeeded
+            body: Failure details sent with a failure ping
+        """
+        pending = self._pending.get(url)
+        if pending is not None:
+            self.merged += 1
+            if pending.success or not success:
+                pending.success = success
+                pending.body = body
+        else:
+            self._pending[url] = _Ping(url, success, body)
+        # The new outcome supersedes whatever was waiting to be retried
+        self._retries.pop(url, None)
+        self._schedule(self._window)
+
+    def _schedule(self, delay: float) -> None:
+        """Make sure a flush runs within delay seconds."""
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        if self._timer is not None:
+            if self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """Send the pending batch and due retries in the background."""
+        self._timer = None
+        if self._task is not None:
+            # The previous batch is still in flight; _async_flush reschedules
+            return
+        self._task = asyncio.get_running_loop().create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        """Send one batch and queue retries for the requests that failed."""
+        loop = asyncio.get_running_loop()
+        try:
+            now = loop.time()
+            batch = list(self._pending.values())
+            self._pending = {}
+            for url, ping in list(self._retries.items()):
+                if ping.due <= now:
+                    del self._retries[url]
+                    batch.append(ping)
+                    self.retried += 1
+
+            if batch:
+                self.batches += 1
+                results = await asyncio.gather(*(self._async_send(ping) for ping in batch))
+                for ping, delivered in zip(batch, results):
+                    if not delivered:
+                        self._queue_retry(ping, loop.time())
+        finally:
+            self._task = None
+
+        if self._pending:
+            self._schedule(self._window)
+        elif self._retries:
+            next_due = min(ping.due for ping in self._retries.values())
+            self._schedule(max(next_due - loop.time(), 0.0))
+
+    def _queue_retry(self, ping: _Ping, now: float) -> None:
+        """Queue a failed ping for a retry with exponential backoff."""
+        if ping.url in self._pending:
+            # A newer outcome arrived while this one was in flight
+            return
+        ping.attempt += 1
+        if ping.attempt >= HEALTHCHECK_MAX_ATTEMPTS:
+            self.dropped += 1
+            _LOGGER.warning(f"Giving up on healthchecks ping to {ping.url} after {ping.attempt} attempts")
+            return
+        if len(self._retries) >= self._max_retries:
+            oldest = next(iter(self._retries))
+            del self._retries[oldest]
+            self.dropped += 1
+            _LOGGER.warning(f"Healthchecks retry queue full, dropping ping to {oldest}")
+        ping.due = now + min(
+            HEALTHCHECK_RETRY_BACKOFF * 2 ** (ping.attempt - 1), HEALTHCHECK_RETRY_BACKOFF_MAX
+        )
+        self._retries[ping.url] = ping
+
+    async def _async_send(self, ping: _Ping) -> bool:
+        """Send one ping.
+
+        Returns:
+            False if the ping should be retried, True otherwise
+        """
+        try:
+            if ping.success:
+                request = self._session.get(ping.url, timeout=self._timeout)
+            else:
+                request = self._session.post(
+                    f"{ping.url.rstrip('/')}/fail", data=ping.body.encode(), timeout=self._timeout
+                )
+            async with request as response:
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.failures += 1
+            _LOGGER.debug(f"Healthchecks ping to {ping.url} failed: {e!r}")
+            return False
+
+        if status == 429 or status >= 500:
+            self.failures += 1
+            _LOGGER.debug(f"Healthchecks ping to {ping.url} returned {status}")
+            return False
+        if status >= 400:
+            # A wrong URL won't fix itself; retrying only adds load
+            self.failures += 1
+            _LOGGER.warning(f"Healthchecks ping to {ping.url} rejected with HTTP {status}")
+            return True
+
+        self.sent += 1
+        return True
+
+    async def async_stop(self) -> None:
+        """Cancel the flush timer and any batch in flight."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize pinger counters for diagnostics."""
+        return {
+            "sent": self.sent,
+            "merged": self.merged,
+            "batches": self.batches,
+            "retried": self.retried,
+            "queued_retries": self.queued_retries,
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
@@ -0,0 +1,524 @@
+"""Translate recorder history into the temperature indexes a thermostat saw.
+
+Streams source entity states out of Home Assistant's recorder SQLite
+database in chunks, converts them to Venstar temperature indexes with the
+rules of get_temperature_index and writes a compact per-sensor timeline.
+
+Usage (from the directory containing custom_components)::
+
+    python -m custom_components.venstar_translator.history home-assistant_v2.db \\
+        --storage .storage/venstar_translator --since 2026-10-12 --output week.csv
+
+    python -m custom_components.venstar_translator.history home-assistant_v2.db \\
+        --entity sensor.outdoor_temperature --scale F --days 90
+
+Each row is a run of consecutive readings the thermostat saw the same way,
+from ``start`` until ``end`` (POSIX seconds):
+one temperature index, readings outside the -40.0°C to 86.5°C range
+(``out_of_range``), or no reading at all (``unavailable``, which includes
+non-numeric states). Index rows carry the temperature the thermostat
+displays for the index and the largest quantization error (source reading
+minus displayed temperature) within the run.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import sqlite3
+import sys
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Any, TextIO
+
+from .const import SCALE_FAHRENHEIT, SOURCE_ENTITY, VALID_SCALES
+from .venstar_sensor import get_temperature_index
+
+HISTORY_CHUNK_SIZE = 10000  # Rows fetched from the database at a time
+
+EVENT_INDEX = "index"
+EVENT_OUT_OF_RANGE = "out_of_range"
+EVENT_UNAVAILABLE = "unavailable"
+
+HISTORY_FIELDS = (
+    "start",
+    "end",
+    "sensor_id",
+    "entity_id",
+    "event",
+    "temperature_index",
+    "displayed",
+    "readings",
+    "min",
+    "max",
+    "max_error",
+)
+_END = HISTORY_FIELDS.index("end")
+_READINGS = HISTORY_FIELDS.index("readings")
+_MIN = HISTORY_FIELDS.index("min")
+_MAX = HISTORY_FIELDS.index("max")
+_MAX_ERROR = HISTORY_FIELDS.index("max_error")
+
+_STATES_QUERY = (
+    "SELECT last_updated_ts, state FROM states "
+    "WHERE metadata_id = ? AND last_updated_ts >= ? AND last_updated_ts < ? "
+    "ORDER BY last_updated_ts"
+)
+
+
+class HistoryError(ValueError):
+    """Raised when a recorder database cannot be read."""
+
+
+def index_temperature(index: int, scale: str) -> float:
+    """Return the temperature a thermostat displays for a temperature index.
+
+    The inverse of get_temperature_index: indexes are 0.5°C steps from
+    -40.0°C, and Fahrenheit displays round the converted value half up
+    (by magnitude for negative values).
+    """
+    celsius = index / 2 - 40.0
+    if scale != SCALE_FAHRENHEIT:
+        return celsius
+    fahrenheit = Decimal(str(celsius * 9 / 5 + 32))
+    rounded = abs(fahrenheit).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+    return float(-rounded if fahrenheit < 0 else rounded)
+
+
+class IndexConverter:
+    """Converts recorder states to temperature indexes in batches.
+
+    A source entity's states repeat heavily (months of 0.1° readings hold a
+    few hundred distinct values), so every distinct state string goes
+    through get_temperature_index once and a batch costs one dict lookup
+    per reading.
+    """
+
+    __slots__ = ("scale", "_cache", "_displayed")
+
+    def __init__(self, scale: str) -> None:
+        """Initialize the converter.
+
+        Args:
+            scale: "F" or "C"
+        """
+        self.scale = scale
+        # state -> (event, index, temperature, quantization error)
+        self._cache: dict[str, tuple[str, int | None, float | None, float | None]] = {}
+        self._displayed: dict[int, float] = {}
+
+    @property
+    def distinct_states(self) -> int:
+        """Return the number of distinct states converted so far."""
+        return len(self._cache)
+
+    def displayed(self, index: int) -> float:
+        """Return the displayed temperature of an index."""
+        displayed = self._displayed.get(index)
+        if displayed is None:
+            displayed = self._displayed[index] = index_temperature(index, self.scale)
+        return displayed
+
+    def _convert(self, state: str) -> tuple[str, int | None, float | None, float | None]:
+        """Convert one distinct state and cache the result."""
+        try:
+            temperature = float(state)
+        except ValueError:
+            converted = (EVENT_UNAVAILABLE, None, None, None)
+        else:
+            if not math.isfinite(temperature):
+                converted = (EVENT_UNAVAILABLE, None, None, None)
+            else:
+                try:
+                    index = get_temperature_index(temperature, self.scale)
+                except ValueError:
+                    converted = (EVENT_OUT_OF_RANGE, None, temperature, None)
+                else:
+                    error = round(temperature - self.displayed(index), 3)
+                    converted = (EVENT_INDEX, index, temperature, error)
+        self._cache[state] = converted
+        return converted
+
+    def convert(
+        self, states: Iterable[str]
+    ) -> list[tuple[str, int | None, float | None, float | None]]:
+        """Convert a batch of states.
+
+        Returns:
+            (event, index, temperature, quantization error) per state
+        """
+        cache = self._cache
+        convert = self._convert
+        return [cache.get(state) or convert(state) for state in states]
+
+
+def _iso(timestamp: float) -> str:
+    """Format a POSIX timestamp as an ISO 8601 UTC time."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+class SensorHistory:
+    """Run-length timeline of what one sensor's thermostat saw."""
+
+    __slots__ = (
+        "sensor_id",
+        "entity_id",
+        "name",
+        "converter",
+        "rows",
+        "_run",
+        "_run_key",
+        "readings",
+        "runs",
+        "unavailable",
+        "out_of_range",
+        "_error_sum",
+        "max_error",
+        "indexes",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        scale: str,
+        sensor_id: int | None = None,
+        name: str | None = None,
+    ) -> None:
+        """Initialize an empty timeline.
+
+        Args:
+            entity_id: Source entity
+            scale: Sensor scale, "F" or "C"
+            sensor_id: Emulated sensor ID, if any
+            name: Emulated sensor name, if any
+        """
+        self.sensor_id = sensor_id
+        self.entity_id = entity_id
+        self.name = name
+        self.converter = IndexConverter(scale)
+        self.rows: list[list[Any]] = []  # Finished runs, in HISTORY_FIELDS order
+        self._run: list[Any] | None = None
+        self._run_key: Any = None
+        self.readings = 0
+        self.runs = 0
+        self.unavailable = 0
+        self.out_of_range = 0
+        self._error_sum = 0.0
+        self.max_error = 0.0
+        self.indexes: set[int] = set()
+
+    def add_batch(self, rows: list[tuple[float, str]]) -> None:
+        """Add a chunk of (timestamp, state) rows, in time order."""
+        converted = self.converter.convert([state for _, state in rows])
+        displayed = self.converter.displayed
+        append = self.rows.append
+        run = self._run
+        run_key = self._run_key
+        skipped = {EVENT_UNAVAILABLE: 0, EVENT_OUT_OF_RANGE: 0}
+        error_sum = 0.0
+        max_error = self.max_error
+        for (timestamp, _), (event, index, temperature, error) in zip(rows, converted):
+            key = index if index is not None else event
+            if key != run_key or run is None:
+                if run is not None:
+                    run[_END] = round(timestamp)
+                    append(run)
+                if index is not None:
+                    self.indexes.add(index)
+                run = [
+                    round(timestamp), None, self.sensor_id, self.entity_id, event, index,
+                    displayed(index) if index is not None else None, 0, temperature, temperature, error,
+                ]
+                run_key = key
+                self.runs += 1
+            run[_READINGS] += 1
+            if error is None:
+                skipped[event] += 1
+                if temperature is None:
+                    continue
+            else:
+                error_sum += abs(error)
+                if abs(error) > abs(run[_MAX_ERROR]):
+                    run[_MAX_ERROR] = error
+                    if abs(error) > abs(max_error):
+                        max_error = error
+            if temperature < run[_MIN]:
+                run[_MIN] = temperature
+            elif temperature > run[_MAX]:
+                run[_MAX] = temperature
+
+        self._run = run
+        self._run_key = run_key
+        self.readings += len(rows)
+        self.unavailable += skipped[EVENT_UNAVAILABLE]
+        self.out_of_range += skipped[EVENT_OUT_OF_RANGE]
+        self._error_sum += error_sum
+        self.max_error = max_error
+
+    def finish(self, end: float) -> None:
+        """Close the last run at the end of the queried period."""
+        if self._run is not None:
+            self._run[_END] = round(end)
+            self.rows.append(self._run)
+            self._run = None
+            self._run_key = None
+
+    def drain(self) -> list[list[Any]]:
+        """Return the finished runs and forget them."""
+        rows = self.rows
+        self.rows = []
+        return rows
+
+    def summary(self) -> dict[str, Any]:
+        """Return the timeline's counters."""
+        indexed = self.readings - self.unavailable - self.out_of_range
+        return {
+            "sensor_id": self.sensor_id,
+            "name": self.name,
+            "entity_id": self.entity_id,
+            "scale": self.converter.scale,
+            "readings": self.readings,
+            "runs": self.runs,
+            "distinct_states": self.converter.distinct_states,
+            "distinct_indexes": len(self.indexes),
+            "unavailable": self.unavailable,
+            "out_of_range": self.out_of_range,
+            "mean_abs_error": round(self._error_sum / indexed, 3) if indexed else None,
+            "max_error": self.max_error if indexed else None,
+        }
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a recorder database read-only.
+
+    Raises:
+        HistoryError: If the file is not a recorder database with the
+            states_meta schema (Home Assistant 2023.4 or later)
+    """
+    if not Path(path).is_file():
+        raise HistoryError(f"{path}: no such file")
+    try:
+        db = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    except sqlite3.Error as e:
+        raise HistoryError(f"{path}: cannot open database ({e})") from e
+    if not {"states", "states_meta"} <= tables:
+        db.close()
+        raise HistoryError(f"{path}: not a recorder database (Home Assistant 2023.4 or later)")
+    return db
+
+
+def read_history(
+    db: sqlite3.Connection,
+    history: SensorHistory,
+    since: float,
+    until: float,
+    chunk_size: int = HISTORY_CHUNK_SIZE,
+    flush: Callable[[list[list[Any]]], None] | None = None,
+) -> None:
+    """Stream an entity's states between two timestamps into its timeline.
+
+    The state in effect at ``since`` (the last one recorded before it) is
+    included from ``since``, so the first run doesn't start late.
+
+    Args:
+        db: Connection from connect()
+        history: Timeline to fill
+        since: Start of the period (POSIX timestamp)
+        until: End of the period (POSIX timestamp)
+        chunk_size: Rows fetched and converted at a time
+        flush: Receives the finished runs after every chunk, which are then
+            dropped from the timeline (default: keep them in ``rows``)
+    """
+    row = db.execute(
+        "SELECT metadata_id FROM states_meta WHERE entity_id = ?", (history.entity_id,)
+    ).fetchone()
+    if row is None:
+        history.finish(until)
+        return
+    metadata_id = row[0]
+
+    previous = db.execute(
+        "SELECT state FROM states WHERE metadata_id = ? AND last_updated_ts < ? "
+        "ORDER BY last_updated_ts DESC LIMIT 1",
+        (metadata_id, since),
+    ).fetchone()
+    if previous is not None:
+        history.add_batch([(since, previous[0])])
+
+    cursor = db.execute(_STATES_QUERY, (metadata_id, since, until))
+    while rows := cursor.fetchmany(chunk_size):
+        history.add_batch(rows)
+        if flush is not None:
+            flush(history.drain())
+    history.finish(until)
+    if flush is not None:
+        flush(history.drain())
+
+
+def load_storage_sensors(path: str, sensor_ids: list[int] | None = None) -> list[dict[str, Any]]:
+    """Read the entity-sourced sensors from the integration's storage file.
+
+    Args:
+        path: ``.storage/venstar_translator`` in the config directory
+        sensor_ids: Only these sensors (default: all entity-sourced sensors)
+
+    Raises:
+        HistoryError: If the file cannot be read or a sensor is missing
+    """
+    try:
+        data = json.loads(Path(path).read_text())["data"]
+    except (OSError, ValueError, KeyError) as e:
+        raise HistoryError(f"Cannot read storage {path}: {e}") from e
+    sensors = {int(sensor_id): sensor for sensor_id, sensor in data.get("sensors", {}).items()}
+    if sensor_ids:
+        missing = [sensor_id for sensor_id in sensor_ids if sensor_id not in sensors]
+        if missing:
+            raise HistoryError(f"Sensors {missing} not in {path}")
+        sensors = {sensor_id: sensors[sensor_id] for sensor_id in sensor_ids}
+    return [
+        {**sensor, "sensor_id": sensor_id}
+        for sensor_id, sensor in sorted(sensors.items())
+        if sensor.get("source", SOURCE_ENTITY) == SOURCE_ENTITY and sensor.get("entity_id")
+    ]
+
+
+def export_history(
+    db_path: str,
+    sensors: list[dict[str, Any]],
+    since: float,
+    until: float,
+    output: TextIO,
+    output_format: str = "csv",
+    chunk_size: int = HISTORY_CHUNK_SIZE,
+) -> dict[str, Any]:
+    """Translate the history of several sensors and write their timelines.
+
+    CSV rows are written as runs finish, so only the database cursor's
+    current chunk is held in memory; JSON keeps every sensor's runs.
+
+    Args:
+        db_path: Recorder SQLite database
+        sensors: Sensors with ``entity_id``, ``scale`` and optionally
+            ``sensor_id`` and ``name`` (SensorRecord.as_dict layout)
+        since: Start of the period (POSIX timestamp)
+        until: End of the period (POSIX timestamp)
+        output: Text stream to write to
+        output_format: "csv" or "json"
+        chunk_size: Rows fetched and converted at a time
+
+    Returns:
+        Period, elapsed time and per-sensor summaries
+
+    Raises:
+        HistoryError: If the database cannot be read
+    """
+    started = time.perf_counter()
+    flush = None
+    if output_format == "csv":
+        writer = csv.writer(output)
+        writer.writerow(HISTORY_FIELDS)
+        flush = writer.writerows
+
+    db = connect(db_path)
+    histories = []
+    try:
+        for sensor in sensors:
+            history = SensorHistory(
+                sensor["entity_id"],
+                sensor.get("scale", SCALE_FAHRENHEIT),
+                sensor.get("sensor_id"),
+                sensor.get("name"),
+            )
+            try:
+                read_history(db, history, since, until, chunk_size, flush)
+            except sqlite3.Error as e:
+                raise HistoryError(f"{db_path}: cannot read history of {history.entity_id} ({e})") from e
+            histories.append(history)
+    finally:
+        db.close()
+
+    result = {
+        "since": _iso(since),
+        "until": _iso(until),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "sensors": [history.summary() for history in histories],
+    }
+    if output_format == "json":
+        for summary, history in zip(result["sensors"], histories):
+            summary["timeline"] = [dict(zip(HISTORY_FIELDS, row)) for row in history.rows]
+        json.dump(result, output, indent=2)
+        output.write("\n")
+    return result
+
+
+def _parse_time(value: str) -> float:
+    """Parse an ISO 8601 date or time (local time unless it has an offset)."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid date/time {value!r}") from e
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the translation from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.venstar_translator.history",
+        description="Translate recorder history into the Venstar temperature indexes a thermostat saw.",
+    )
+    parser.add_argument("database", help="Recorder SQLite database (home-assistant_v2.db)")
+    parser.add_argument("--storage", help="Integration storage file (.storage/venstar_translator)")
+    parser.add_argument("--sensor", type=int, action="append", help="Sensor ID from --storage (repeatable)")
+    parser.add_argument("--entity", help="Source entity, instead of --storage")
+    parser.add_argument("--scale", choices=VALID_SCALES, default=SCALE_FAHRENHEIT, help="Scale of --entity")
+    parser.add_argument("--since", type=_parse_time, help="Start (ISO 8601, default: --days ago)")
+    parser.add_argument("--until", type=_parse_time, help="End (ISO 8601, default: now)")
+    parser.add_argument("--days", type=float, default=7.0, help="Length of the period without --since")
+    parser.add_argument("--chunk-size", type=int, default=HISTORY_CHUNK_SIZE)
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if (args.storage is None) == (args.entity is None):
+        parser.error("give either --storage or --entity")
+
+    until = args.until if args.until is not None else time.time()
+    since = args.since if args.since is not None else until - timedelta(days=args.days).total_seconds()
+
+    try:
+        if args.storage is not None:
+            sensors = load_storage_sensors(args.storage, args.sensor)
+        else:
+            sensors = [{"entity_id": args.entity, "scale": args.scale}]
+        output = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            result = export_history(
+                args.database, sensors, since, until, output, args.format, args.chunk_size
+            )
+        finally:
+            if args.output:
+                output.close()
+    except (HistoryError, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    print(f"{result['since']} to {result['until']} in {result['elapsed_s']} s", file=sys.stderr)
+    for summary in result["sensors"]:
+        label = summary["entity_id"]
+        if summary["sensor_id"] is not None:
+            label = f"sensor {summary['sensor_id']} ({summary['name']}), {label}"
+        print(
+            f"  {label}: {summary['readings']} readings, {summary['runs']} runs, "
+            f"{summary['distinct_indexes']} indexes, {summary['out_of_range']} out of range, "
+            f"{summary['unavailable']} unavailable, max error {summary['max_error']}°{summary['scale']}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
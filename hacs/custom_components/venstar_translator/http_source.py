@@ -0,0 +1,158 @@
+"""Shared, coalescing fetcher for HTTP JSON temperature sources."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from .const import HTTP_SOURCE_CACHE_TTL, HTTP_SOURCE_TIMEOUT
+from .sources import SourceError
+
+_LOGGER = logging.getLogger(__name__)
+
+# (url, sorted header items, verify SSL)
+_CacheKey = tuple[str, tuple[tuple[str, str], ...], bool]
+
+
+class _CachedDocument:
+    """A fetched JSON document and the validators to revalidate it."""
+
+    __slots__ = ("document", "fetched", "etag", "last_modified")
+
+    def __init__(
+        self, document: Any, fetched: float, etag: str | None, last_modified: str | None
+    ) -> None:
+        """Initialize the cache entry."""
+        self.document = document
+        self.fetched = fetched  # time.monotonic() of the last 200/304
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class HttpJsonFetcher:
+    """Fetches JSON documents for every HTTP source of a config entry.
+
+    All requests go through one pooled client session. Sensors reading the
+    same URL (with the same headers) share one document: reads within
+    cache_ttl seconds of the last fetch are served from memory, concurrent
+    reads while a request is in flight wait for that request instead of
+    starting their own, and expired documents are revalidated with
+    If-None-Match/If-Modified-Since so an unchanged document costs a 304.
+    """
+
+    def __init__(
+        self, session: aiohttp.ClientSession, cache_ttl: float = HTTP_SOURCE_CACHE_TTL
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            session: Client session to send requests through
+            cache_ttl: Seconds a fetched document is served without a request
+        """
+        self._session = session
+        self._cache_ttl = cache_ttl
+        self._timeout = aiohttp.ClientTimeout(total=HTTP_SOURCE_TIMEOUT)
+        self._cache: dict[_CacheKey, _CachedDocument] = {}
+        self._inflight: dict[_CacheKey, asyncio.Future[Any]] = {}
+        self.requests = 0
+        self.cache_hits = 0
+        self.coalesced = 0  # Reads that joined an in-flight request
+        self.not_modified = 0
+        self.errors = 0
+
+    async def async_get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        verify_ssl: bool = True,
+    ) -> Any:
+        """Return the parsed JSON document served at a URL.
+
+        Args:
+            url: Endpoint to fetch
+            headers: Extra request headers
+            verify_ssl: Verify the server's certificate
+
+        Returns:
+            Parsed JSON document
+
+        Raises:
+            SourceError: If the request fails or the body is not JSON
+        """
+        key: _CacheKey = (url, tuple(sorted(headers.items())) if headers else (), verify_ssl)
+
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached.fetched < self._cache_ttl:
+            self.cache_hits += 1
+            return cached.document
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._async_fetch(key, url, headers, verify_ssl, cached))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda future: self._fetch_done(key, future))
+        else:
+            self.coalesced += 1
+
+        # Shielded so one cancelled reader doesn't cancel the shared request
+        return await asyncio.shield(inflight)
+
+    def _fetch_done(self, key: _CacheKey, future: asyncio.Future[Any]) -> None:
+        """Forget a finished request, retrieving its error if nobody awaited it."""
+        self._inflight.pop(key, None)
+        if not future.cancelled():
+            future.exception()
+
+    async def _async_fetch(
+        self,
+        key: _CacheKey,
+        url: str,
+        headers: dict[str, str] | None,
+        verify_ssl: bool,
+        cached: _CachedDocument | None,
+    ) -> Any:
+        """Send one (conditional) request and update the cache."""
+        request_headers = dict(headers) if headers else {}
+        if cached is not None:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        self.requests += 1
+        try:
+            async with self._session.get(
+                url, headers=request_headers, ssl=verify_ssl, timeout=self._timeout
+            ) as response:
+                if response.status == 304 and cached is not None:
+                    self.not_modified += 1
+                    cached.fetched = time.monotonic()
+                    return cached.document
+
+                response.raise_for_status()
+                document = json.loads(await response.read())
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.errors += 1
+            raise SourceError(f"Cannot fetch {url}: {e}") from e
+
+        self._cache[key] = _CachedDocument(document, time.monotonic(), etag, last_modified)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Fetched %s (etag=%s, last_modified=%s)", url, etag, last_modified)
+        return document
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize fetcher counters for diagnostics."""
+        return {
+            "cached_documents": len(self._cache),
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+        }
@@ -0,0 +1,116 @@
+"""Precompiled JSONPath expressions for HTTP JSON temperature sources.
+
+Supports the single-value subset that temperature lookups need: an
+optional root ``$``, dotted member names, bracketed quoted member names and
+(negative) array indexes, e.g. ``$.channels[2].temp`` or
+``$['outdoor']['temperature']``. Expressions are compiled once into a
+tuple of steps, so evaluating one is a plain walk over the document.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+_DOTTED_NAME = re.compile(r"[^.\[\]]+")
+_BRACKET = re.compile(r"""\[\s*(?:(-?\d+)|'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)")\s*\]""")
+
+
+class JsonPathError(ValueError):
+    """Raised for invalid expressions and for documents that don't match."""
+
+
+class JsonPath:
+    """A compiled JSONPath expression."""
+
+    __slots__ = ("expression", "steps")
+
+    def __init__(self, expression: str, steps: tuple[str | int, ...]) -> None:
+        """Initialize a compiled expression.
+
+        Args:
+            expression: Source expression, for error messages
+            steps: Member names (str) and array indexes (int) to follow
+        """
+        self.expression = expression
+        self.steps = steps
+
+    def find(self, document: Any) -> Any:
+        """Return the value the expression selects in a document.
+
+        Raises:
+            JsonPathError: If the document has no value at the path
+        """
+        value = document
+        for step in self.steps:
+            # Indexes only apply to arrays and names only to objects
+            container = list if isinstance(step, int) else dict
+            if not isinstance(value, container):
+                raise JsonPathError(f"{self.expression}: no match at {step!r}")
+            try:
+                value = value[step]
+            except (KeyError, IndexError):
+                raise JsonPathError(f"{self.expression}: no match at {step!r}") from None
+        return value
+
+    def __repr__(self) -> str:
+        """Return a debug representation."""
+        return f"JsonPath({self.expression!r})"
+
+
+@lru_cache(maxsize=64)
+def compile_json_path(expression: str) -> JsonPath:
+    """Compile a JSONPath expression.
+
+    Args:
+        expression: Expression such as ``$.sensors[0].temperature``
+
+    Returns:
+        Compiled expression (cached per expression string)
+
+    Raises:
+        JsonPathError: If the expression is empty or uses unsupported syntax
+            (wildcards, filters, slices, recursive descent)
+    """
+    text = expression.strip()
+    if not text:
+        raise JsonPathError("JSONPath is empty")
+
+    pos = 1 if text.startswith("$") else 0
+    steps: list[str | int] = []
+    # A leading member name may omit the dot ("a.b" is the same as "$.a.b")
+    expect_name = pos == 0
+
+    while pos < len(text):
+        char = text[pos]
+        if char == "." or expect_name:
+            if char == ".":
+                pos += 1
+                if text.startswith(".", pos):
+                    raise JsonPathError(f"{expression}: recursive descent is not supported")
+            expect_name = False
+            match = _DOTTED_NAME.match(text, pos)
+            if match is None:
+                raise JsonPathError(f"{expression}: expected a member name at position {pos}")
+            name = match.group()
+            if name == "*":
+                raise JsonPathError(f"{expression}: wildcards are not supported")
+            steps.append(name)
+            pos = match.end()
+        elif char == "[":
+            match = _BRACKET.match(text, pos)
+            if match is None:
+                raise JsonPathError(
+                    f"{expression}: only indexes and quoted names are supported in brackets"
+                )
+            index, single, double = match.groups()
+            if index is not None:
+                steps.append(int(index))
+            else:
+                quoted = single if single is not None else double
+                steps.append(re.sub(r"\\(.)", r"\1", quoted))
+            pos = match.end()
+        else:
+            raise JsonPathError(f"{expression}: unexpected {char!r} at position {pos}")
+
+    return JsonPath(expression, tuple(steps))
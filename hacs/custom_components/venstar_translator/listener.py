@@ -0,0 +1,155 @@
+"""UDP listener for thermostat responses to emulated sensors."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from .const import MAX_SENSORS, UDP_PORT
+from .wire import (
+    COMMAND_FAILURE,
+    COMMAND_SENSORDATA,
+    COMMAND_SENSORPAIR,
+    COMMAND_SUCCESS,
+    DecodeError,
+    decode_sensor_message,
+)
+
+if TYPE_CHECKING:
+    from .storage import VenstarTranslatorStorage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ResponseListener(asyncio.DatagramProtocol):
+    """Decodes inbound SensorMessages on the sensor port.
+
+    SUCCESS/FAILURE responses that carry the MAC address of one of our
+    configured sensors are handed to on_response. Our own broadcasts
+    looping back, and packets about real or unconfigured sensors, are only
+    counted.
+    """
+
+    def __init__(
+        self,
+        storage: VenstarTranslatorStorage,
+        on_response: Callable[[int, int | None, bool], None],
+    ) -> None:
+        """Initialize the listener.
+
+        Args:
+            storage: Storage holding the MAC prefix and configured sensors
+            on_response: Called with (sensor_id, sequence, success) per response
+        """
+        self._storage = storage
+        self._mac_prefix = storage.mac_prefix.lower()
+        self._on_response = on_response
+        self._transport: asyncio.DatagramTransport | None = None
+        self.received = 0
+        self.malformed = 0
+        self.echoes = 0  # Our own data/pairing broadcasts
+        self.foreign = 0  # Packets about sensors that aren't configured here
+        self.responses = 0
+        self.unattributed = 0  # Responses without a MAC
+
+    async def async_start(self) -> bool:
+        """Bind the sensor port and start listening.
+
+        Returns:
+            True if listening, False if the port could not be bound
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sock.setblocking(False)
+            sock.bind(("0.0.0.0", UDP_PORT))
+        except OSError as e:
+            sock.close()
+            _LOGGER.warning(
+                f"Cannot listen for thermostat responses on UDP {UDP_PORT}: {e}. "
+                f"Sensors will use the fixed repeat count."
+            )
+            return False
+
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, sock=sock)
+        _LOGGER.info(f"Listening for thermostat responses on UDP {UDP_PORT}")
+        return True
+
+    def stop(self) -> None:
+        """Stop listening."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Keep the transport so it can be closed on stop."""
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Decode and route one inbound packet."""
+        self.received += 1
+        try:
+            message = decode_sensor_message(data)
+        except DecodeError:
+            self.malformed += 1
+            return
+
+        sensor_id = self._our_sensor_id(message.mac)
+
+        if message.command in (COMMAND_SENSORDATA, COMMAND_SENSORPAIR):
+            if sensor_id is None:
+                self.foreign += 1
+            else:
+                self.echoes += 1
+            return
+
+        if message.command not in (COMMAND_SUCCESS, COMMAND_FAILURE):
+            return
+
+        self.responses += 1
+        if sensor_id is None:
+            if message.mac is not None:
+                self.foreign += 1
+                return
+            self.unattributed += 1
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Unattributed thermostat response from %s: command=%s, mac=%s",
+                    addr[0], message.command, message.mac,
+                )
+            return
+
+        self._on_response(sensor_id, message.sequence, message.command == COMMAND_SUCCESS)
+
+    def _our_sensor_id(self, mac: str | None) -> int | None:
+        """Return the sensor ID if the MAC belongs to one of our configured sensors."""
+        if mac is None or len(mac) != len(self._mac_prefix) + 2:
+            return None
+        mac = mac.lower()
+        if not mac.startswith(self._mac_prefix):
+            return None
+        try:
+            sensor_id = int(mac[-2:], 16)
+        except ValueError:
+            return None
+        if not 0 <= sensor_id < MAX_SENSORS or self._storage.get_sensor(sensor_id) is None:
+            return None
+        return sensor_id
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize listener counters for diagnostics."""
+        return {
+            "listening": self._transport is not None,
+            "received": self.received,
+            "malformed": self.malformed,
+            "echoes": self.echoes,
+            "foreign": self.foreign,
+            "responses": self.responses,
+            "unattributed": self.unattributed,
+        }
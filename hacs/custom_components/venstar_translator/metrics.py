@@ -0,0 +1,118 @@
+"""Timing metrics for Venstar Translator: broadcast lateness and event-loop lag."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any
+
+from .const import (
+    LOOP_LAG_PROBE_INTERVAL,
+    LOOP_STALL_THRESHOLD,
+    METRICS_WINDOW_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of recent stalls remembered for attribution
+_MAX_STALLS = 20
+
+
+class SampleWindow:
+    """Fixed-size window of recent samples with percentiles computed on read.
+
+    Recording is an O(1) append; sorting only happens when a summary is
+    requested (diagnostics), never on the broadcast path.
+    """
+
+    __slots__ = ("_samples", "count", "max")
+
+    def __init__(self, size: int = METRICS_WINDOW_SIZE) -> None:
+        """Initialize the window.
+
+        Args:
+            size: Number of most recent samples kept
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0  # Total samples ever recorded
+        self.max = 0.0  # Largest sample ever recorded
+
+    def add(self, value: float) -> None:
+        """Record a sample."""
+        self._samples.append(value)
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the window as p50/p90/p99/max in milliseconds."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count}
+
+        def percentile(p: float) -> float:
+            # Nearest-rank percentile
+            rank = max(math.ceil(p / 100 * len(samples)) - 1, 0)
+            return round(samples[rank] * 1000, 1)
+
+        return {
+            "count": self.count,
+            "p50_ms": percentile(50),
+            "p90_ms": percentile(90),
+            "p99_ms": percentile(99),
+            "window_max_ms": round(samples[-1] * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class LoopLagProbe:
+    """Measures how late the event loop wakes up a periodic sleep.
+
+    A sleep of LOOP_LAG_PROBE_INTERVAL that returns late means something
+    else held the loop; the overshoot is the lag any timer (including a
+    broadcast deadline) would have suffered at that moment.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the probe."""
+        self.lag = SampleWindow()
+        self.stalls: deque[dict[str, float]] = deque(maxlen=_MAX_STALLS)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start probing."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Probe loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_PROBE_INTERVAL
+            await asyncio.sleep(LOOP_LAG_PROBE_INTERVAL)
+            lag = max(loop.time() - expected, 0.0)
+            self.lag.add(lag)
+            if lag >= LOOP_STALL_THRESHOLD:
+                # Wall-clock time lets stalls be matched against late broadcasts
+                self.stalls.append({"timestamp": time.time(), "lag_ms": round(lag * 1000, 1)})
+                _LOGGER.debug("Event loop stalled for %.0f ms", lag * 1000)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize loop lag and recent stalls for diagnostics."""
+        return {
+            "lag": self.lag.summary(),
+            "recent_stalls": list(self.stalls),
+        }
@@ -0,0 +1,124 @@
+"""Fixed-size ring buffer of recent broadcast events."""
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+from .const import PACKET_TRACE_SIZE
+
+# Packet kinds
+KIND_DATA = 0
+KIND_PAIRING = 1
+KIND_RESEND = 2
+
+KIND_NAMES = {
+    KIND_DATA: "data",
+    KIND_PAIRING: "pairing",
+    KIND_RESEND: "resend",
+}
+
+# Send results
+RESULT_OK = 0
+RESULT_ERROR = 1
+
+# Stored in place of the sequence/temperature index when they aren't known (resends)
+NO_SEQUENCE = 0
+NO_INDEX = 0xFF
+
+# timestamp, send duration, sensor ID, kind, sequence, temperature index, result, size
+_EVENT = struct.Struct("<dfBBHBBH")
+
+
+class PacketTrace:
+    """Always-on binary ring buffer of broadcast events.
+
+    Each event is packed into a preallocated bytearray, so recording costs a
+    single struct pack and never allocates. Events are only decoded into dicts
+    when the buffer is dumped.
+    """
+
+    __slots__ = ("_buffer", "_capacity", "_next", "_count")
+
+    def __init__(self, capacity: int = PACKET_TRACE_SIZE) -> None:
+        """Initialize the trace.
+
+        Args:
+            capacity: Maximum number of events kept before the oldest is overwritten
+        """
+        self._buffer = bytearray(_EVENT.size * capacity)
+        self._capacity = capacity
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of events currently held."""
+        return self._count
+
+    def record(
+        self,
+        timestamp: float,
+        duration: float,
+        sensor_id: int,
+        kind: int,
+        sequence: int | None,
+        temp_index: int | None,
+        result: int,
+        size: int,
+    ) -> None:
+        """Record a broadcast event, overwriting the oldest one when full.
+
+        Args:
+            timestamp: Wall-clock time the send started (seconds since epoch)
+            duration: Time spent sending, in seconds
+            sensor_id: Sensor ID (0-19)
+            kind: KIND_DATA, KIND_PAIRING or KIND_RESEND
+            sequence: Sequence number carried by the packet, if known
+            temp_index: Temperature index carried by the packet, if known
+            result: RESULT_OK or RESULT_ERROR
+            size: Packet size in bytes
+        """
+        _EVENT.pack_into(
+            self._buffer,
+            self._next * _EVENT.size,
+            timestamp,
+            duration,
+            sensor_id,
+            kind,
+            NO_SEQUENCE if sequence is None else sequence,
+            NO_INDEX if temp_index is None else temp_index,
+            result,
+            size,
+        )
+        self._next = (self._next + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def dump(self) -> list[dict[str, Any]]:
+        """Decode all held events, oldest first."""
+        start = (self._next - self._count) % self._capacity
+        events = []
+        for i in range(self._count):
+            offset = ((start + i) % self._capacity) * _EVENT.size
+            (
+                timestamp,
+                duration,
+                sensor_id,
+                kind,
+                sequence,
+                temp_index,
+                result,
+                size,
+            ) = _EVENT.unpack_from(self._buffer, offset)
+            events.append(
+                {
+                    "timestamp": timestamp,
+                    "duration_ms": round(duration * 1000, 3),
+                    "sensor_id": sensor_id,
+                    "kind": KIND_NAMES.get(kind, str(kind)),
+                    "sequence": None if sequence == NO_SEQUENCE else sequence,
+                    "temperature_index": None if temp_index == NO_INDEX else temp_index,
+                    "result": "ok" if result == RESULT_OK else "error",
+                    "size": size,
+                }
+            )
+        return events
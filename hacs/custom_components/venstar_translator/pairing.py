@@ -0,0 +1,291 @@
+"""Time-boxed pairing sessions.
+
+A single pairing burst only pairs a sensor if the thermostat happens to be
+on its add sensor screen at that moment. A pairing session instead repeats
+a burst for each selected sensor every few seconds for a limited time, so
+the user can walk over to the thermostat and pair every sensor in one go.
+
+Each sensor's pairing packet is built once, when the session starts, and
+every burst goes out through one open broadcast socket. The sensors' data
+broadcasts pause for the session; when it ends (or is cancelled) their
+sequences are reset to 1, as after any pairing, and data broadcasts resume.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import DOMAIN, PAIRING_SESSION_DURATION, PAIRING_SESSION_INTERVAL
+from .coordinator import async_start_coordinators, async_stop_coordinators
+from .packet_trace import KIND_PAIRING
+from .sources import async_get_temperature, describe_source
+from .venstar_sensor import BroadcastSocket, VenstarSensor
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_RUNNING = "running"
+STATE_COMPLETED = "completed"
+STATE_CANCELLED = "cancelled"
+STATE_FAILED = "failed"  # Nothing could be paired
+
+
+class _PairingSensor:
+    """A sensor's prebuilt pairing packet and burst counts."""
+
+    __slots__ = ("name", "packet", "temperature", "temperature_index", "bursts", "errors", "last_error")
+
+    def __init__(self, name: str, packet: bytes, temperature: float, temperature_index: int) -> None:
+        """Initialize with the packet every burst of the session sends."""
+        self.name = name
+        self.packet = packet
+        self.temperature = temperature
+        self.temperature_index = temperature_index
+        self.bursts = 0
+        self.errors = 0
+        self.last_error: str | None = None
+
+
+class PairingSession:
+    """Repeats pairing bursts for a set of sensors for a limited time."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        duration: float = PAIRING_SESSION_DURATION,
+        interval: float = PAIRING_SESSION_INTERVAL,
+    ) -> None:
+        """Initialize a session.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry ID
+            duration: Seconds the session runs
+            interval: Seconds between a sensor's bursts
+        """
+        self.hass = hass
+        self.entry_id = entry_id
+        self.duration = duration
+        self.interval = interval
+        self.state = STATE_RUNNING
+        self.sensors: dict[int, _PairingSensor] = {}
+        self.skipped: dict[int, str] = {}  # Sensor ID -> reason
+        self.started_at: float | None = None  # Wall-clock times
+        self.ended_at: float | None = None
+        self._ends = 0.0  # Event-loop time the session ends
+        self._socket: BroadcastSocket | None = None
+        self._task: asyncio.Task | None = None
+        self._resume = True  # Restart data broadcasts when the session ends
+
+    @property
+    def _data(self) -> dict[str, Any]:
+        """Get the config entry's objects from hass.data."""
+        return self.hass.data[DOMAIN][self.entry_id]
+
+    @property
+    def running(self) -> bool:
+        """Return True until the session has ended."""
+        return self.state == STATE_RUNNING
+
+    async def async_start(self, sensor_ids: list[int] | None = None) -> None:
+        """Build the pairing packets, pause data broadcasts and start the bursts.
+
+        Sensors that are not configured, or whose temperature is unavailable,
+        are skipped. If no sensor is left the session ends as failed.
+
+        Args:
+            sensor_ids: Sensors to pair (default: every enabled sensor)
+        """
+        data = self._data
+        storage = data["storage"]
+        if sensor_ids is None:
+            sensor_ids = [sensor.sensor_id for sensor in storage.sensors if sensor.enabled]
+
+        for sensor_id in sensor_ids:
+            record = storage.get_sensor(sensor_id)
+            if record is None:
+                self.skipped[sensor_id] = "not configured"
+                continue
+            temperature = await async_get_temperature(
+                self.hass, data["http"], record, data["aggregates"]
+            )
+            if temperature is None:
+                self.skipped[sensor_id] = f"temperature unavailable from {describe_source(record)}"
+                continue
+            sensor = VenstarSensor(
+                sensor_id=sensor_id,
+                mac_prefix=storage.mac_prefix,
+                name=record.name,
+                purpose=record.purpose,
+                scale=record.scale,
+                sequence=1,
+            )
+            packet = sensor.build_pairing_packet(temperature)
+            self.sensors[sensor_id] = _PairingSensor(
+                record.name, packet, temperature, sensor.temperature_index
+            )
+
+        for sensor_id, reason in self.skipped.items():
+            _LOGGER.warning(f"Pairing session: skipping sensor {sensor_id}: {reason}")
+        self.started_at = time.time()
+        if not self.sensors:
+            self._end(STATE_FAILED)
+            return
+        try:
+            self._socket = BroadcastSocket()
+        except OSError as e:
+            _LOGGER.error(f"Pairing session: cannot open broadcast socket: {e}")
+            self.skipped.update((sensor_id, str(e)) for sensor_id in self.sensors)
+            self.sensors.clear()
+            self._end(STATE_FAILED)
+            return
+
+        ids = list(self.sensors)
+        await async_stop_coordinators(self.hass, self.entry_id, ids)
+        if data["worker"] is not None:
+            data["worker"].pause(ids)
+
+        self._ends = asyncio.get_running_loop().time() + self.duration
+        self._task = asyncio.create_task(self._run())
+        _LOGGER.info(
+            f"Pairing session: sending pairing packets for sensors {ids} every "
+            f"{self.interval:.0f} s for {self.duration:.0f} s"
+        )
+
+    async def async_cancel(self, resume: bool = True) -> None:
+        """End the session early.
+
+        Args:
+            resume: Restart the sensors' data broadcasts (False while unloading)
+        """
+        if self._task is None:
+            return
+        self._resume = resume
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        """Send a burst for every sensor each interval until the session ends."""
+        loop = asyncio.get_running_loop()
+        state = STATE_CANCELLED
+        try:
+            while True:
+                await self._async_burst()
+                if loop.time() + self.interval >= self._ends:
+                    break
+                await asyncio.sleep(self.interval)
+            state = STATE_COMPLETED
+        finally:
+            await self._async_finish(state)
+
+    async def _async_burst(self) -> None:
+        """Send one pairing burst per sensor through the session's socket."""
+        broadcaster = self._data["broadcaster"]
+        for sensor_id, sensor in self.sensors.items():
+            try:
+                await broadcaster.async_send(
+                    sensor_id,
+                    sensor.packet,
+                    KIND_PAIRING,
+                    1,
+                    sensor.temperature_index,
+                    sensor.temperature,
+                    send=self._socket.send,
+                )
+                sensor.bursts += 1
+            except OSError as e:
+                sensor.errors += 1
+                sensor.last_error = str(e)
+
+    async def _async_finish(self, state: str) -> None:
+        """Reset the sequences and resume the sensors' data broadcasts."""
+        self._socket.close()
+        data = self._data
+        storage = data["storage"]
+        ids = [sensor_id for sensor_id in self.sensors if storage.get_sensor(sensor_id) is not None]
+        for sensor_id in ids:
+            storage.update_sequence(sensor_id, 1)
+        await storage.async_save()
+
+        if self._resume:
+            # A sensor edited meanwhile may have had its coordinator restarted
+            await async_stop_coordinators(self.hass, self.entry_id, ids)
+            await async_start_coordinators(self.hass, self.entry_id, ids)
+        if data["worker"] is not None:
+            data["worker"].resume(ids)
+
+        self._end(state)
+        _LOGGER.info(
+            f"Pairing session {state}: "
+            + ", ".join(
+                f"sensor {sensor_id} {sensor.bursts} bursts"
+                + (f" ({sensor.errors} failed)" if sensor.errors else "")
+                for sensor_id, sensor in self.sensors.items()
+            )
+        )
+
+    def _end(self, state: str) -> None:
+        """Record how the session ended."""
+        self.state = state
+        self.ended_at = time.time()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session's status, for the status service and diagnostics."""
+        remaining = None
+        if self.running and self._task is not None:
+            remaining = round(max(self._ends - asyncio.get_running_loop().time(), 0.0), 1)
+        return {
+            "state": self.state,
+            "interval": self.interval,
+            "duration": self.duration,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "remaining": remaining,
+            "sensors": {
+                str(sensor_id): {
+                    "name": sensor.name,
+                    "temperature": sensor.temperature,
+                    "bursts": sensor.bursts,
+                    "errors": sensor.errors,
+                    "last_error": sensor.last_error,
+                }
+                for sensor_id, sensor in self.sensors.items()
+            },
+            "skipped": {str(sensor_id): reason for sensor_id, reason in self.skipped.items()},
+        }
+
+
+async def async_start_pairing_session(
+    hass: HomeAssistant,
+    entry_id: str,
+    sensor_ids: list[int] | None = None,
+    duration: float = PAIRING_SESSION_DURATION,
+    interval: float = PAIRING_SESSION_INTERVAL,
+) -> PairingSession:
+    """Start a pairing session, replacing (cancelling) any running one.
+
+    Args:
+        hass: Home Assistant instance
+        entry_id: Config entry ID
+        sensor_ids: Sensors to pair (default: every enabled sensor)
+        duration: Seconds the session runs
+        interval: Seconds between a sensor's bursts
+
+    Returns:
+        The new session (failed if no sensor could be paired)
+    """
+    data = hass.data[DOMAIN][entry_id]
+    current = data["pairing"]
+    if current is not None and current.running:
+        await current.async_cancel()
+    session = data["pairing"] = PairingSession(hass, entry_id, duration, interval)
+    await session.async_start(sensor_ids)
+    return session
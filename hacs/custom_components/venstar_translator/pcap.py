@@ -0,0 +1,532 @@
+"""Offline decoder for captured Venstar sensor traffic.
+
+Streams a pcap or pcapng capture through a memory map, decodes every
+SensorMessage sent to or from UDP 5001, verifies HMAC signatures and emits
+per-sensor timelines of sequence numbers, temperature indexes, gaps and
+duplicates.
+
+Usage (from the directory containing custom_components)::
+
+    python -m custom_components.venstar_translator.pcap capture.pcapng \\
+        --mac-prefix 0123456789 --format csv --output timeline.csv
+
+Each row is one distinct packet. The copies a sensor repeats back-to-back
+are folded into the row's ``copies`` count rather than listed separately.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import csv
+import hashlib
+import hmac
+import json
+import mmap
+import struct
+import sys
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+from .const import UDP_PORT
+from .venstar_sensor import get_signature_key
+from .wire import (
+    COMMAND_FAILURE,
+    COMMAND_SENSORDATA,
+    COMMAND_SENSORPAIR,
+    COMMAND_SUCCESS,
+    DecodeError,
+    decode_sensor_message,
+)
+
+# VenstarSensor wraps the sequence back to 1 when it reaches this value
+SEQUENCE_WRAP = 65000
+
+# A drop from near the wrap point to near 1 is a wrap, anything else a reset
+_WRAP_WINDOW = 1000
+
+COMMAND_NAMES = {
+    COMMAND_SENSORDATA: "data",
+    COMMAND_SENSORPAIR: "pair",
+    COMMAND_SUCCESS: "success",
+    COMMAND_FAILURE: "failure",
+}
+
+CSV_FIELDS = (
+    "time",
+    "sensor_id",
+    "mac",
+    "name",
+    "command",
+    "sequence",
+    "temperature_index",
+    "copies",
+    "gap",
+    "duplicate",
+    "reset",
+    "hmac",
+)
+_COPIES = CSV_FIELDS.index("copies")
+
+# Link-layer types (https://www.tcpdump.org/linktypes.html)
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+_DLT_RAW = (12, 14)  # Platform-specific aliases of LINKTYPE_RAW
+
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPE_VLAN = (0x8100, 0x88A8, 0x9100)
+
+_PCAP_MAGIC_US = 0xA1B2C3D4
+_PCAP_MAGIC_NS = 0xA1B23C4D
+_PCAPNG_SHB = 0x0A0D0D0A
+_PCAPNG_BYTE_ORDER = 0x1A2B3C4D
+_PCAPNG_IDB = 1
+_PCAPNG_SPB = 3
+_PCAPNG_EPB = 6
+_PCAPNG_OPT_TSRESOL = 9
+
+_IPV4_HEADER = struct.Struct("!B5xHxB")
+_UDP_HEADER = struct.Struct("!HHHH")
+_ETHERTYPE = struct.Struct("!H")
+
+
+class CaptureError(ValueError):
+    """Raised when a file is not a readable pcap or pcapng capture."""
+
+
+def _udp_payload(frame: memoryview, linktype: int) -> memoryview | None:
+    """Return the UDP payload of a frame if it is IPv4 UDP to or from the sensor port."""
+    if linktype == LINKTYPE_ETHERNET:
+        offset = 12
+        if len(frame) < offset + 2:
+            return None
+        ethertype = _ETHERTYPE.unpack_from(frame, offset)[0]
+        while ethertype in _ETHERTYPE_VLAN:
+            offset += 4
+            if len(frame) < offset + 2:
+                return None
+            ethertype = _ETHERTYPE.unpack_from(frame, offset)[0]
+        if ethertype != _ETHERTYPE_IPV4:
+            return None
+        offset += 2
+    elif linktype == LINKTYPE_LINUX_SLL:
+        if len(frame) < 16 or _ETHERTYPE.unpack_from(frame, 14)[0] != _ETHERTYPE_IPV4:
+            return None
+        offset = 16
+    elif linktype == LINKTYPE_LINUX_SLL2:
+        if len(frame) < 20 or _ETHERTYPE.unpack_from(frame, 0)[0] != _ETHERTYPE_IPV4:
+            return None
+        offset = 20
+    elif linktype == LINKTYPE_RAW or linktype in _DLT_RAW:
+        offset = 0
+    elif linktype == LINKTYPE_NULL:
+        offset = 4
+    else:
+        return None
+
+    # IPv4 header: version/IHL, flags/fragment offset, protocol
+    if len(frame) < offset + 20:
+        return None
+    version_ihl, fragment, protocol = _IPV4_HEADER.unpack_from(frame, offset)
+    if version_ihl >> 4 != 4 or protocol != 17:  # Not IPv4 UDP
+        return None
+    if fragment & 0x3FFF:
+        # Fragmented; sensor messages are far smaller than any MTU
+        return None
+    offset += (version_ihl & 0x0F) * 4
+
+    if len(frame) < offset + 8:
+        return None
+    src_port, dst_port, length, _ = _UDP_HEADER.unpack_from(frame, offset)
+    if dst_port != UDP_PORT and src_port != UDP_PORT:
+        return None
+    end = min(offset + length, len(frame))
+    return frame[offset + 8:end]
+
+
+def _iter_pcap(buf: memoryview, byte_order: str, ts_scale: float) -> Iterator[tuple[float, memoryview, int]]:
+    """Yield (timestamp, frame, linktype) from a classic pcap file."""
+    linktype = struct.unpack_from(byte_order + "I", buf, 20)[0] & 0x0FFFFFFF
+    record = struct.Struct(byte_order + "IIII")
+    pos = 24
+    end = len(buf)
+    while pos + 16 <= end:
+        ts_sec, ts_frac, captured, _ = record.unpack_from(buf, pos)
+        pos += 16
+        if pos + captured > end:
+            break  # Truncated final record
+        yield ts_sec + ts_frac * ts_scale, buf[pos:pos + captured], linktype
+        pos += captured
+
+
+def _tsresol(options: memoryview, byte_order: str) -> float:
+    """Return the timestamp resolution from an IDB's options (default microseconds)."""
+    option = struct.Struct(byte_order + "HH")
+    pos = 0
+    while pos + 4 <= len(options):
+        code, length = option.unpack_from(options, pos)
+        if code == 0:
+            break
+        if code == _PCAPNG_OPT_TSRESOL and length >= 1:
+            value = options[pos + 4]
+            if value & 0x80:
+                return 2.0 ** -(value & 0x7F)
+            return 10.0 ** -value
+        pos += 4 + ((length + 3) & ~3)
+    return 1e-6
+
+
+def _iter_pcapng(buf: memoryview) -> Iterator[tuple[float, memoryview, int]]:
+    """Yield (timestamp, frame, linktype) from a pcapng file."""
+    pos = 0
+    end = len(buf)
+    byte_order = "<"
+    header = struct.Struct("<II")  # Block type, block length
+    epb = struct.Struct("<IIIII")  # Interface, timestamp high/low, captured, original
+    interfaces: list[tuple[int, float]] = []  # (linktype, timestamp resolution)
+
+    while pos + 12 <= end:
+        if struct.unpack_from("<I", buf, pos)[0] == _PCAPNG_SHB:
+            # New section: byte order and interface list start over
+            magic = struct.unpack_from("<I", buf, pos + 8)[0]
+            byte_order = "<" if magic == _PCAPNG_BYTE_ORDER else ">"
+            header = struct.Struct(byte_order + "II")
+            epb = struct.Struct(byte_order + "IIIII")
+            interfaces = []
+
+        block_type, block_length = header.unpack_from(buf, pos)
+        if block_length < 12 or pos + block_length > end:
+            break  # Truncated or corrupt; keep what we have
+
+        body = pos + 8
+        if block_type == _PCAPNG_EPB:
+            interface, ts_high, ts_low, captured, _ = epb.unpack_from(buf, body)
+            if interface < len(interfaces):
+                linktype, resolution = interfaces[interface]
+                data = body + 20
+                yield ((ts_high << 32) | ts_low) * resolution, buf[data:data + captured], linktype
+        elif block_type == _PCAPNG_IDB:
+            linktype = struct.unpack_from(byte_order + "H", buf, body)[0]
+            interfaces.append((linktype, _tsresol(buf[body + 8:pos + block_length - 4], byte_order)))
+        elif block_type == _PCAPNG_SPB and interfaces:
+            # Simple packets carry no timestamp
+            original = struct.unpack_from(byte_order + "I", buf, body)[0]
+            captured = min(original, block_length - 16)
+            yield 0.0, buf[body + 4:body + 4 + captured], interfaces[0][0]
+
+        pos += block_length
+
+
+def iter_frames(buf: memoryview) -> Iterator[tuple[float, memoryview, int]]:
+    """Yield (timestamp, frame, linktype) for every frame in a capture.
+
+    Args:
+        buf: Whole capture file (typically a memory map)
+
+    Raises:
+        CaptureError: If the buffer is neither pcap nor pcapng
+    """
+    if len(buf) < 24:
+        raise CaptureError("File too short to be a capture")
+
+    magic_le = struct.unpack_from("<I", buf, 0)[0]
+    magic_be = struct.unpack_from(">I", buf, 0)[0]
+    if magic_le == _PCAPNG_SHB:
+        return _iter_pcapng(buf)
+    if magic_le in (_PCAP_MAGIC_US, _PCAP_MAGIC_NS):
+        return _iter_pcap(buf, "<", 1e-9 if magic_le == _PCAP_MAGIC_NS else 1e-6)
+    if magic_be in (_PCAP_MAGIC_US, _PCAP_MAGIC_NS):
+        return _iter_pcap(buf, ">", 1e-9 if magic_be == _PCAP_MAGIC_NS else 1e-6)
+    raise CaptureError("Not a pcap or pcapng file")
+
+
+class SensorTimeline:
+    """Timeline and counters of the packets captured for one sensor MAC."""
+
+    __slots__ = (
+        "mac",
+        "sensor_id",
+        "name",
+        "rows",
+        "packets",
+        "missing",
+        "duplicates",
+        "resets",
+        "hmac_failures",
+        "responses",
+        "_last_sequence",
+        "_seen",
+    )
+
+    def __init__(self, mac: str) -> None:
+        """Initialize an empty timeline."""
+        self.mac = mac
+        self.sensor_id: int | None = None
+        self.name: str | None = None
+        self.rows: list[list[Any]] = []  # Values in CSV_FIELDS order
+        self.packets = 0  # Including repeated copies
+        self.missing = 0  # Sequence numbers never seen
+        self.duplicates = 0  # Sequences seen again after other packets
+        self.resets = 0  # Sequence went backwards (pairing, restart)
+        self.hmac_failures = 0
+        self.responses = 0
+        self._last_sequence: int | None = None
+        self._seen: set[int] = set()
+
+    def add(
+        self,
+        timestamp: float,
+        command: int,
+        sequence: int | None,
+        temperature_index: int | None,
+        hmac_result: str,
+    ) -> list[Any]:
+        """Append a distinct packet and return its row."""
+        gap = 0
+        duplicate = False
+        reset = False
+        last = self._last_sequence
+        if sequence is not None:
+            if command == COMMAND_SENSORPAIR:
+                # Pairing restarts the sequence at 1
+                reset = last is not None
+                self._seen.clear()
+            elif sequence in self._seen:
+                # Resent or replayed; doesn't move the timeline forward
+                duplicate = True
+            elif last is not None:
+                if sequence > last:
+                    gap = sequence - last - 1
+                elif last >= SEQUENCE_WRAP - _WRAP_WINDOW and sequence <= _WRAP_WINDOW:
+                    gap = (SEQUENCE_WRAP - 1 - last) + (sequence - 1)
+                    self._seen.clear()
+                else:
+                    reset = True
+                    self._seen.clear()
+            if not duplicate:
+                self._seen.add(sequence)
+                self._last_sequence = sequence
+
+        self.missing += gap
+        self.duplicates += duplicate
+        self.resets += reset
+        if hmac_result == "bad":
+            self.hmac_failures += 1
+
+        row = [
+            round(timestamp, 6),
+            self.sensor_id,
+            self.mac,
+            self.name,
+            COMMAND_NAMES.get(command, str(command)),
+            sequence,
+            temperature_index,
+            1,
+            gap,
+            duplicate,
+            reset,
+            hmac_result,
+        ]
+        self.rows.append(row)
+        return row
+
+    def summary(self) -> dict[str, Any]:
+        """Return the timeline's counters."""
+        return {
+            "sensor_id": self.sensor_id,
+            "name": self.name,
+            "packets": self.packets,
+            "distinct_packets": len(self.rows),
+            "missing": self.missing,
+            "duplicates": self.duplicates,
+            "resets": self.resets,
+            "hmac_failures": self.hmac_failures,
+            "responses": self.responses,
+        }
+
+
+class CaptureDecoder:
+    """Builds per-sensor timelines from captured UDP payloads."""
+
+    def __init__(self, mac_prefix: str | None = None) -> None:
+        """Initialize the decoder.
+
+        Args:
+            mac_prefix: Only include sensors whose MAC starts with this prefix
+        """
+        self._mac_prefix = mac_prefix.lower() if mac_prefix else None
+        self.timelines: dict[str, SensorTimeline] = {}
+        self.frames = 0
+        self.payloads = 0
+        self.malformed = 0
+        self._keys: dict[str, bytes] = {}
+        self._last_payload = b""
+        self._last_row: list[Any] | None = None
+        self._last_timeline: SensorTimeline | None = None
+
+    def _verify(self, mac: str, command: int, signature: str | None, info: memoryview | None) -> str:
+        """Verify a packet's signature, returning "ok", "bad" or "" if unsigned."""
+        if signature is None or info is None:
+            return ""
+        key = self._keys.get(mac)
+        if key is None:
+            key = self._keys[mac] = get_signature_key(mac).encode("ascii")
+        if command == COMMAND_SENSORPAIR:
+            # Pairing packets carry the key itself
+            return "ok" if hmac.compare_digest(signature.encode("ascii", "replace"), key) else "bad"
+        expected = base64.b64encode(hmac.new(base64.b64decode(key), info, hashlib.sha256).digest())
+        return "ok" if hmac.compare_digest(signature.encode("ascii", "replace"), expected) else "bad"
+
+    def feed(self, timestamp: float, payload: memoryview) -> None:
+        """Decode one UDP payload into the timelines."""
+        self.payloads += 1
+
+        # Sensors repeat each packet back-to-back; fold identical copies
+        data = payload.tobytes()
+        if self._last_row is not None and data == self._last_payload:
+            self._last_row[_COPIES] += 1
+            self._last_timeline.packets += 1
+            return
+        self._last_row = None
+
+        try:
+            message = decode_sensor_message(payload)
+        except DecodeError:
+            self.malformed += 1
+            return
+
+        mac = message.mac.lower() if message.mac else None
+        if mac is None or (self._mac_prefix and not mac.startswith(self._mac_prefix)):
+            return
+
+        timeline = self.timelines.get(mac)
+        if timeline is None:
+            timeline = self.timelines[mac] = SensorTimeline(mac)
+        if message.sensor_id is not None:
+            timeline.sensor_id = message.sensor_id
+        if message.name is not None:
+            timeline.name = message.name
+
+        if message.command not in (COMMAND_SENSORDATA, COMMAND_SENSORPAIR):
+            timeline.responses += 1
+            return
+
+        timeline.packets += 1
+        hmac_result = self._verify(mac, message.command, message.signature, message.info)
+        self._last_row = timeline.add(
+            timestamp, message.command, message.sequence, message.temperature, hmac_result
+        )
+        self._last_timeline = timeline
+        self._last_payload = data
+
+    def decode_file(self, path: str) -> None:
+        """Decode every sensor packet in a pcap or pcapng file.
+
+        Raises:
+            CaptureError: If the file is not a capture
+            OSError: If the file cannot be read
+        """
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            buf = memoryview(mapped)
+            try:
+                feed = self.feed
+                last_frame = b""
+                for timestamp, frame, linktype in iter_frames(buf):
+                    self.frames += 1
+                    # Fast path for repeated copies whose frames are byte-identical,
+                    # skipping header parsing entirely; feed() still folds copies
+                    # that differ only below UDP (e.g. IP identification)
+                    raw = frame.tobytes()
+                    frame.release()
+                    if raw == last_frame and self._last_row is not None:
+                        self.payloads += 1
+                        self._last_row[_COPIES] += 1
+                        self._last_timeline.packets += 1
+                        continue
+
+                    # Unrelated traffic in between doesn't break folding
+                    payload = _udp_payload(memoryview(raw), linktype)
+                    if payload is not None:
+                        feed(timestamp, payload)
+                        last_frame = raw if self._last_row is not None else b""
+            finally:
+                buf.release()
+
+    def summary(self) -> dict[str, Any]:
+        """Return capture-wide and per-sensor counters."""
+        return {
+            "frames": self.frames,
+            "sensor_payloads": self.payloads,
+            "malformed": self.malformed,
+            "sensors": {mac: timeline.summary() for mac, timeline in sorted(self.timelines.items())},
+        }
+
+
+def write_csv(decoder: CaptureDecoder, output: TextIO) -> None:
+    """Write all timelines as CSV, grouped by sensor."""
+    writer = csv.writer(output)
+    writer.writerow(CSV_FIELDS)
+    for _, timeline in sorted(decoder.timelines.items()):
+        writer.writerows(timeline.rows)
+
+
+def write_json(decoder: CaptureDecoder, output: TextIO) -> None:
+    """Write the summary and all timelines as JSON."""
+    result = decoder.summary()
+    for mac, timeline in decoder.timelines.items():
+        result["sensors"][mac]["timeline"] = [dict(zip(CSV_FIELDS, row)) for row in timeline.rows]
+    json.dump(result, output, indent=2)
+    output.write("\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the decoder from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.venstar_translator.pcap",
+        description="Decode Venstar sensor packets from pcap/pcapng captures of UDP 5001.",
+    )
+    parser.add_argument("captures", nargs="+", help="pcap or pcapng files, decoded in order")
+    parser.add_argument("--mac-prefix", help="Only include sensors with this 10-character MAC prefix")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    decoder = CaptureDecoder(args.mac_prefix)
+    for path in args.captures:
+        try:
+            decoder.decode_file(path)
+        except (CaptureError, OSError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            return 1
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(decoder, output)
+        else:
+            write_json(decoder, output)
+    finally:
+        if args.output:
+            output.close()
+
+    summary = decoder.summary()
+    print(
+        f"{summary['frames']} frames, {summary['sensor_payloads']} sensor payloads, "
+        f"{summary['malformed']} malformed, {len(summary['sensors'])} sensors",
+        file=sys.stderr,
+    )
+    for mac, counters in summary["sensors"].items():
+        print(
+            f"  {mac} (sensor {counters['sensor_id']}, {counters['name']}): "
+            f"{counters['distinct_packets']} packets, {counters['missing']} missing, "
+            f"{counters['duplicates']} duplicates, {counters['resets']} resets, "
+            f"{counters['hmac_failures']} HMAC failures",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Purpose-aware priority lanes for scheduled broadcasts.
+
+Every sensor broadcasts from its own loop, and sensors started together
+share their deadlines, so several broadcasts are routinely due at once; after
+an event-loop stall, every overdue one wakes in the same loop iteration.
+Supply and Return sensors are in the high priority lane: each announces its
+next deadline, and a low priority (Outdoor or Remote) broadcast reaching its
+own deadline while a high priority one is due but not yet sent waits for it,
+for at most LOW_PRIORITY_MAX_DEFER seconds, then builds and sends its packet.
+Per lane, lateness is measured up to the end of the send, since sends that
+start together still queue for the executor; that way the effect shows in
+diagnostics.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from .const import (
+    LOW_PRIORITY_MAX_DEFER,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PURPOSE_RETURN,
+    PURPOSE_SUPPLY,
+)
+from .metrics import SampleWindow
+
+
+def get_priority(purpose: str) -> str:
+    """Return the priority lane of a sensor purpose."""
+    return PRIORITY_HIGH if purpose in (PURPOSE_SUPPLY, PURPOSE_RETURN) else PRIORITY_LOW
+
+
+class PriorityLanes:
+    """Orders the scheduled broadcasts of a set of sensors by priority lane."""
+
+    __slots__ = ("_due", "_sent", "lateness", "deferred", "deferred_seconds")
+
+    def __init__(self) -> None:
+        """Initialize the lanes with no announced deadlines."""
+        self._due: dict[int, float] = {}  # High priority sensor -> deadline of its next send
+        self._sent = asyncio.Event()  # Set (and replaced) whenever one is released
+        self.lateness = {PRIORITY_HIGH: SampleWindow(), PRIORITY_LOW: SampleWindow()}
+        self.deferred = 0  # Low priority broadcasts that waited
+        self.deferred_seconds = 0.0
+
+    def expect(self, sensor_id: int, deadline: float) -> None:
+        """Announce a high priority sensor's next broadcast deadline.
+
+        Args:
+            sensor_id: High priority sensor
+            deadline: Event-loop time of the broadcast
+        """
+        self._due[sensor_id] = deadline
+
+    def release(self, sensor_id: int) -> None:
+        """Mark a high priority sensor's broadcast as done (sent, skipped or stopped)."""
+        if self._due.pop(sensor_id, None) is not None:
+            self._sent.set()
+            self._sent = asyncio.Event()
+
+    def _pending(self, now: float) -> bool:
+        """Return True if a high priority broadcast is due but not yet done."""
+        return any(deadline <= now for deadline in self._due.values())
+
+    async def async_wait_turn(self, max_wait: float = LOW_PRIORITY_MAX_DEFER) -> float:
+        """Wait while high priority broadcasts are due (low priority sensors only).
+
+        Returns immediately, without yielding, when none is due.
+
+        Args:
+            max_wait: Most seconds to wait
+
+        Returns:
+            Seconds waited
+        """
+        loop = asyncio.get_running_loop()
+        now = started = loop.time()
+        if not self._pending(now):
+            return 0.0
+
+        limit = started + max_wait
+        while now < limit and self._pending(now):
+            try:
+                await asyncio.wait_for(self._sent.wait(), timeout=limit - now)
+            except asyncio.TimeoutError:
+                break
+            now = loop.time()
+        waited = loop.time() - started
+        self.deferred += 1
+        self.deferred_seconds += waited
+        return waited
+
+    def record_lateness(self, purpose: str, lateness: float) -> None:
+        """Record a scheduled broadcast's lateness in its sensor's lane.
+
+        Args:
+            purpose: Sensor purpose
+            lateness: Seconds between the intended deadline and the end of the send
+        """
+        self.lateness[get_priority(purpose)].add(max(lateness, 0.0))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize lateness per lane and low priority deferrals for diagnostics."""
+        return {
+            "lateness": {lane: window.summary() for lane, window in self.lateness.items()},
+            "deferred": self.deferred,
+            "deferred_seconds": round(self.deferred_seconds, 3),
+        }
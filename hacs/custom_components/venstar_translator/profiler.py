@@ -0,0 +1,206 @@
+"""On-demand profiling of the integration's code on the event loop.
+
+The profile_integration service profiles the event loop thread for a
+bounded window and writes the integration's functions (broadcast loops,
+packet builders, storage saves and everything else under this package) with
+their cumulative time to the config directory. Nothing is installed outside
+a run, so profiling costs nothing while off.
+
+Two modes:
+
+- sampling (the default): a background thread looks at the event loop
+  thread's stack every few milliseconds and counts the package functions on
+  it. Each sample is one walk of that stack, so it is safe on a struggling
+  system, but there are no call counts. The sampler needs the GIL to take
+  a sample, and a busy event loop thread only hands it over every switch
+  interval (5 ms by default), so work in bursts shorter than that is
+  under-counted.
+- deterministic: cProfile traces every call on the event loop thread, giving
+  exact call counts and own/cumulative times. Tracing slows the whole loop
+  (Home Assistant included) while it runs; the report keeps only this
+  package's functions.
+
+Both measure time on the event loop thread only; a coroutine that is
+suspended (sleeping, awaiting a send in the executor) is not counted. The
+UDP send itself runs in the executor and is covered by the send latency
+statistics.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Any
+
+MODE_DETERMINISTIC = "deterministic"
+MODE_SAMPLING = "sampling"
+VALID_MODES = [MODE_DETERMINISTIC, MODE_SAMPLING]
+
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+DEFAULT_DURATION = 60  # Seconds profiled when the service call doesn't say
+MIN_DURATION = 1
+MAX_DURATION = 600  # Bounds deterministic tracing's slowdown of Home Assistant
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+class ProfileError(RuntimeError):
+    """Raised when a profile cannot be taken (e.g. another profiler is active)."""
+
+
+def _in_package(filename: str) -> bool:
+    """Return True if a code object's file belongs to this package."""
+    return filename.startswith(_PACKAGE_DIR)
+
+
+def _function_name(filename: str, lineno: int, name: str) -> str:
+    """Format a function as module:line(name), relative to the package."""
+    return f"{filename[len(_PACKAGE_DIR):]}:{lineno}({name})"
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's stack and counts the package functions on it."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        """Initialize the sampler.
+
+        Args:
+            thread_id: Thread to sample (the event loop thread)
+            interval: Seconds between samples
+        """
+        super().__init__(name="venstar_translator_profiler", daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._finished = threading.Event()
+        self.samples = 0
+        self.elapsed = 0.0
+        # (file, first line, name) -> samples on the stack / innermost
+        self.cumulative: dict[tuple[str, int, str], int] = {}
+        self.own: dict[tuple[str, int, str], int] = {}
+
+    def run(self) -> None:
+        """Sample until stop() is called."""
+        started = time.perf_counter()
+        cumulative = self.cumulative
+        own = self.own
+        while not self._finished.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            self.samples += 1
+            seen = set()
+            innermost = True
+            while frame is not None:
+                code = frame.f_code
+                if _in_package(code.co_filename):
+                    key = (code.co_filename, code.co_firstlineno, code.co_name)
+                    if innermost:
+                        own[key] = own.get(key, 0) + 1
+                        innermost = False
+                    if key not in seen:
+                        seen.add(key)
+                        cumulative[key] = cumulative.get(key, 0) + 1
+                frame = frame.f_back
+        self.elapsed = time.perf_counter() - started
+
+    def stop(self) -> None:
+        """Ask the sampler to finish."""
+        self._finished.set()
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Return the sampled package functions, by cumulative time."""
+        seconds = self.elapsed / self.samples if self.samples else 0.0
+        rows = [
+            {
+                "function": _function_name(*key),
+                "calls": None,
+                "own_seconds": round(self.own.get(key, 0) * seconds, 6),
+                "cumulative_seconds": round(count * seconds, 6),
+                "samples": count,
+            }
+            for key, count in self.cumulative.items()
+        ]
+        rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+        return rows
+
+
+def _deterministic_rows(profiler: cProfile.Profile) -> list[dict[str, Any]]:
+    """Return the package functions of a cProfile run, by cumulative time."""
+    rows = [
+        {
+            "function": _function_name(filename, lineno, name),
+            "calls": calls,
+            "own_seconds": round(own, 6),
+            "cumulative_seconds": round(cumulative, 6),
+            "samples": None,
+        }
+        for (filename, lineno, name), (_, calls, own, cumulative, _) in pstats.Stats(
+            profiler
+        ).stats.items()
+        if _in_package(filename)
+    ]
+    rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return rows
+
+
+async def async_profile(mode: str, duration: float) -> list[dict[str, Any]]:
+    """Profile the integration's code on the running event loop for a while.
+
+    Args:
+        mode: deterministic or sampling
+        duration: Seconds to profile
+
+    Returns:
+        One row per package function seen, by cumulative time
+
+    Raises:
+        ProfileError: If another profiler is already active
+    """
+    if mode == MODE_DETERMINISTIC:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:  # Another profiling tool is already active
+            raise ProfileError(str(e)) from e
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+        return _deterministic_rows(profiler)
+
+    sampler = _StackSampler(threading.get_ident())
+    sampler.start()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        sampler.stop()
+        await asyncio.get_running_loop().run_in_executor(None, sampler.join)
+    return sampler.rows()
+
+
+def write_profile(path: str, mode: str, duration: float, rows: list[dict[str, Any]]) -> None:
+    """Write a profile as a tab-separated table with a comment header.
+
+    Args:
+        path: File to write
+        mode: deterministic or sampling
+        duration: Seconds profiled
+        rows: Rows from async_profile
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"# Venstar Translator profile: {mode}, {duration:g} s\n")
+        if mode == MODE_SAMPLING:
+            file.write(
+                "# Sampled every "
+                f"{SAMPLE_INTERVAL * 1000:g} ms; own time includes library calls made by the function\n"
+            )
+        file.write("cumulative_seconds\town_seconds\tcalls\tsamples\tfunction\n")
+        for row in rows:
+            file.write(
+                f"{row['cumulative_seconds']:.6f}\t{row['own_seconds']:.6f}\t"
+                f"{'' if row['calls'] is None else row['calls']}\t"
+                f"{'' if row['samples'] is None else row['samples']}\t"
+                f"{row['function']}\n"
+            )
@@ -0,0 +1,92 @@
+"""Per-sensor send ledger enforcing the thermostat's broadcast rate limits."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any
+
+from .const import (
+    DEFAULT_INTERVAL,
+    OUTDOOR_INTERVAL,
+    PURPOSE_OUTDOOR,
+    RATE_LIMIT_WINDOW,
+    SCHEDULE_SLACK,
+)
+from .metrics import SampleWindow
+
+
+def get_broadcast_interval(purpose: str) -> int:
+    """Return the broadcast interval (seconds) the thermostat expects for a purpose."""
+    return OUTDOOR_INTERVAL if purpose == PURPOSE_OUTDOOR else DEFAULT_INTERVAL
+
+
+class SendLedger:
+    """Tracks the actual gaps between sends of one sensor.
+
+    The minimum allowed gap is the purpose's broadcast interval less
+    SCHEDULE_SLACK, matching the tolerance of the coordinator's scheduler,
+    so on-schedule broadcasts never trip it.
+    """
+
+    __slots__ = (
+        "lock",
+        "_sends",
+        "gaps",
+        "sends",
+        "violations",
+        "deferred",
+        "deferred_seconds",
+        "dropped",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty ledger."""
+        self.lock = asyncio.Lock()  # Serializes check-and-send per sensor
+        self._sends: deque[float] = deque()  # Event-loop times of sends in the window
+        self.gaps = SampleWindow()  # Seconds between consecutive sends
+        self.sends = 0
+        self.violations = 0  # Sends that went out too soon (warn mode or exempt kinds)
+        self.deferred = 0  # Sends held back until they were allowed
+        self.deferred_seconds = 0.0
+        self.dropped = 0  # Resends dropped instead of deferred
+
+    @staticmethod
+    def min_gap(purpose: str) -> float:
+        """Smallest allowed gap between two sends for a purpose, in seconds."""
+        return get_broadcast_interval(purpose) - SCHEDULE_SLACK
+
+    def time_until_allowed(self, now: float, purpose: str) -> float:
+        """Seconds until a send would respect the minimum gap (0 if allowed now).
+
+        Args:
+            now: Current event-loop time
+            purpose: Sensor purpose
+        """
+        if not self._sends:
+            return 0.0
+        return max(self._sends[-1] + self.min_gap(purpose) - now, 0.0)
+
+    def record(self, now: float) -> None:
+        """Record a send at the given event-loop time."""
+        sends = self._sends
+        if sends:
+            self.gaps.add(now - sends[-1])
+        sends.append(now)
+        self.sends += 1
+
+        # Keep only the sliding window (but always the last send)
+        cutoff = now - RATE_LIMIT_WINDOW
+        while len(sends) > 1 and sends[0] < cutoff:
+            sends.popleft()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the ledger for diagnostics."""
+        return {
+            "sends": self.sends,
+            "sends_in_window": len(self._sends),
+            "violations": self.violations,
+            "deferred": self.deferred,
+            "deferred_seconds": round(self.deferred_seconds, 1),
+            "dropped": self.dropped,
+            "gaps": self.gaps.summary(),
+        }
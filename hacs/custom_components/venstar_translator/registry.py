@@ -0,0 +1,487 @@
+"""In-memory sensor registry for Venstar Translator."""
+from __future__ import annotations
+
+import base64
+from collections.abc import Iterator
+from typing import Any
+
+from .const import (
+    AGGREGATE_MEAN,
+    DEFAULT_SMOOTHING_SAMPLES,
+    MAX_HYSTERESIS,
+    MAX_NAME_LENGTH,
+    MAX_SENSORS,
+    MAX_SMOOTHING_SAMPLES,
+    SCALE_FAHRENHEIT,
+    SMOOTHING_NONE,
+    SOURCE_AGGREGATE,
+    SOURCE_ENTITY,
+    SOURCE_HTTP_JSON,
+    VALID_AGGREGATIONS,
+    VALID_PURPOSES,
+    VALID_SCALES,
+    VALID_SMOOTHING,
+    VALID_SOURCES,
+)
+from .jsonpath import JsonPathError, compile_json_path
+
+_ALL_IDS_MASK = (1 << MAX_SENSORS) - 1
+
+
+class SensorRecord:
+    """Configuration and runtime state of a single emulated sensor.
+
+    Records are mutated in place, so coordinators and the config flow can
+    hold a reference for the lifetime of the sensor instead of looking the
+    sensor up again on every access.
+    """
+
+    __slots__ = (
+        "sensor_id",
+        "entity_id",
+        "name",
+        "purpose",
+        "scale",
+        "enabled",
+        "sequence",
+        "last_packet",
+        "source",
+        "url",
+        "json_path",
+        "headers",
+        "ignore_ssl_errors",
+        "members",
+        "aggregation",
+        "weights",
+        "max_age",
+        "healthcheck_url",
+        "smoothing",
+        "smoothing_samples",
+        "hysteresis",
+        "last_temperature",
+        "last_broadcast",
+    )
+
+    def __init__(
+        self,
+        sensor_id: int,
+        entity_id: str,
+        name: str,
+        purpose: str,
+        scale: str = SCALE_FAHRENHEIT,
+        enabled: bool = True,
+        sequence: int = 1,
+        last_packet: bytes | None = None,
+        source: str = SOURCE_ENTITY,
+        url: str | None = None,
+        json_path: str | None = None,
+        headers: dict[str, str] | None = None,
+        ignore_ssl_errors: bool = False,
+        members: list[str] | None = None,
+        aggregation: str = AGGREGATE_MEAN,
+        weights: dict[str, float] | None = None,
+        max_age: float | None = None,
+        healthcheck_url: str | None = None,
+        smoothing: str = SMOOTHING_NONE,
+        smoothing_samples: int = DEFAULT_SMOOTHING_SAMPLES,
+        hysteresis: float = 0.0,
+        last_temperature: float | None = None,
+        last_broadcast: float | None = None,
+    ) -> None:
+        """Initialize a sensor record.
+
+        Args:
+            sensor_id: Sensor ID (0-19)
+            entity_id: Home Assistant entity ID to monitor (entity source)
+            name: Sensor name (max 14 characters)
+            purpose: Sensor purpose (Outdoor, Remote, Return, Supply)
+            scale: Temperature scale (F or C)
+            enabled: Whether sensor broadcasts are enabled
+            sequence: Next sequence number to broadcast
+            last_packet: Raw bytes of the last broadcast packet, if any
+            source: Where the temperature comes from (entity or http_json)
+            url: JSON endpoint to fetch (http_json source)
+            json_path: JSONPath of the temperature in the document (http_json source)
+            headers: Extra request headers (http_json source)
+            ignore_ssl_errors: Skip certificate verification (http_json source)
+            members: Entity IDs to aggregate (aggregate source)
+            aggregation: mean, min, max, median or weighted (aggregate source)
+            weights: Member weights for the weighted mean (aggregate source)
+            max_age: Seconds after which a silent member is dropped (aggregate source)
+            healthcheck_url: healthchecks.io ping URL for broadcast outcomes, if any
+            smoothing: Reading filter (none, ema or median)
+            smoothing_samples: Readings the average or median spans
+            hysteresis: Degrees a reading must move past the current
+                temperature index before it changes (0 disables)
+            last_temperature: Source temperature of the last data broadcast, if any
+            last_broadcast: Wall-clock time of the last data broadcast, if any
+        """
+        self.sensor_id = sensor_id
+        self.entity_id = entity_id
+        self.name = name
+        self.purpose = purpose
+        self.scale = scale
+        self.enabled = enabled
+        self.sequence = sequence
+        self.last_packet = last_packet
+        self.source = source
+        self.url = url
+        self.json_path = json_path
+        self.headers = headers or {}
+        self.ignore_ssl_errors = ignore_ssl_errors
+        self.members = members or []
+        self.aggregation = aggregation
+        self.weights = weights or {}
+        self.max_age = max_age
+        self.healthcheck_url = healthcheck_url
+        self.smoothing = smoothing
+        self.smoothing_samples = smoothing_samples
+        self.hysteresis = hysteresis
+        self.last_temperature = last_temperature
+        self.last_broadcast = last_broadcast
+
+    @classmethod
+    def from_dict(cls, sensor_id: int, data: dict[str, Any]) -> SensorRecord:
+        """Create a record from its persisted JSON layout.
+
+        Args:
+            sensor_id: Sensor ID (0-19)
+            data: Sensor dict as stored under "sensors" in the store
+
+        Returns:
+            New sensor record
+        """
+        encoded = data.get("last_packet")
+        return cls(
+            sensor_id=sensor_id,
+            entity_id=data.get("entity_id", ""),
+            name=data["name"],
+            purpose=data["purpose"],
+            scale=data.get("scale", SCALE_FAHRENHEIT),
+            enabled=data.get("enabled", True),
+            sequence=data.get("sequence", 1),
+            last_packet=base64.b64decode(encoded) if encoded is not None else None,
+            source=data.get("source", SOURCE_ENTITY),
+            url=data.get("url"),
+            json_path=data.get("json_path"),
+            headers=data.get("headers"),
+            ignore_ssl_errors=data.get("ignore_ssl_errors", False),
+            members=data.get("members"),
+            aggregation=data.get("aggregation", AGGREGATE_MEAN),
+            weights=data.get("weights"),
+            max_age=data.get("max_age"),
+            healthcheck_url=data.get("healthcheck_url"),
+            smoothing=data.get("smoothing", SMOOTHING_NONE),
+            smoothing_samples=data.get("smoothing_samples", DEFAULT_SMOOTHING_SAMPLES),
+            hysteresis=data.get("hysteresis", 0.0),
+            last_temperature=data.get("last_temperature"),
+            last_broadcast=data.get("last_broadcast"),
+        )
+
+    def config(self) -> dict[str, Any]:
+        """Return the sensor's settings, without sequence or cached broadcast state.
+
+        This is the layout parse_sensor_config accepts, so exported sensors
+        can be imported again.
+        """
+        data: dict[str, Any] = {
+            "entity_id": self.entity_id,
+            "name": self.name,
+            "purpose": self.purpose,
+            "scale": self.scale,
+            "enabled": self.enabled,
+            "source": self.source,
+        }
+        if self.source == SOURCE_HTTP_JSON:
+            data["url"] = self.url
+            data["json_path"] = self.json_path
+            data["headers"] = self.headers
+            data["ignore_ssl_errors"] = self.ignore_ssl_errors
+        if self.source == SOURCE_AGGREGATE:
+            data["members"] = self.members
+            data["aggregation"] = self.aggregation
+            if self.weights:
+                data["weights"] = self.weights
+            if self.max_age is not None:
+                data["max_age"] = self.max_age
+        if self.healthcheck_url:
+            data["healthcheck_url"] = self.healthcheck_url
+        if self.smoothing != SMOOTHING_NONE:
+            data["smoothing"] = self.smoothing
+            data["smoothing_samples"] = self.smoothing_samples
+        if self.hysteresis:
+            data["hysteresis"] = self.hysteresis
+        return data
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the record to its persisted JSON layout.
+
+        The settings of config() plus the sequence and the cached broadcast
+        state; the default entity source is left out.
+        """
+        data = self.config()
+        if self.source == SOURCE_ENTITY:
+            del data["source"]
+        data["sequence"] = self.sequence
+        if self.last_packet is not None:
+            data["last_packet"] = base64.b64encode(self.last_packet).decode("utf-8")
+        if self.last_broadcast is not None:
+            data["last_temperature"] = self.last_temperature
+            data["last_broadcast"] = self.last_broadcast
+        return data
+
+
+def parse_weights(weights: Any) -> dict[str, float]:
+    """Validate aggregate member weights.
+
+    Raises:
+        ValueError: If weights is not a mapping of entity IDs to positive numbers
+    """
+    if not isinstance(weights, dict):
+        raise ValueError("weights must be a mapping of entity IDs to numbers")
+    parsed = {}
+    for member, weight in weights.items():
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid weight {weight!r} for {member}") from None
+        if not weight > 0:
+            raise ValueError(f"weight for {member} must be positive")
+        parsed[str(member)] = weight
+    return parsed
+
+
+def parse_sensor_config(data: Any) -> dict[str, Any]:
+    """Validate one imported sensor and fill in defaults.
+
+    Applies the checks of the add/edit sensor form to a dict in the
+    SensorRecord.config layout, optionally with a "sensor_id".
+
+    Returns:
+        Keyword arguments for SensorRecord plus "sensor_id" (None if absent)
+
+    Raises:
+        ValueError: Describing every invalid field
+    """
+    if not isinstance(data, dict):
+        raise ValueError("expected a mapping")
+
+    errors = []
+    sensor_id = data.get("sensor_id")
+    if sensor_id is not None:
+        try:
+            sensor_id = int(sensor_id)
+        except (TypeError, ValueError):
+            errors.append(f"invalid sensor_id {sensor_id!r}")
+        else:
+            if not 0 <= sensor_id < MAX_SENSORS:
+                errors.append(f"sensor_id {sensor_id} is out of range")
+
+    name = str(data.get("name") or "").strip()
+    if not name:
+        errors.append("name is required")
+    elif len(name) > MAX_NAME_LENGTH:
+        errors.append(f"name '{name}' is longer than {MAX_NAME_LENGTH} characters")
+
+    purpose = data.get("purpose")
+    if purpose not in VALID_PURPOSES:
+        errors.append(f"invalid purpose {purpose!r}")
+    scale = data.get("scale", SCALE_FAHRENHEIT)
+    if scale not in VALID_SCALES:
+        errors.append(f"invalid scale {scale!r}")
+    source = data.get("source", SOURCE_ENTITY)
+    if source not in VALID_SOURCES:
+        errors.append(f"invalid source {source!r}")
+
+    config: dict[str, Any] = {
+        "sensor_id": sensor_id,
+        "entity_id": str(data.get("entity_id") or ""),
+        "name": name,
+        "purpose": purpose,
+        "scale": scale,
+        "enabled": bool(data.get("enabled", True)),
+        "source": source,
+        "url": None,
+        "json_path": None,
+        "headers": {},
+        "ignore_ssl_errors": False,
+        "members": [],
+        "aggregation": AGGREGATE_MEAN,
+        "weights": {},
+        "max_age": None,
+        "healthcheck_url": str(data.get("healthcheck_url") or "").strip() or None,
+        "smoothing": data.get("smoothing", SMOOTHING_NONE),
+        "smoothing_samples": DEFAULT_SMOOTHING_SAMPLES,
+        "hysteresis": 0.0,
+    }
+    if source == SOURCE_ENTITY and not config["entity_id"]:
+        errors.append("entity_id is required")
+    elif source == SOURCE_HTTP_JSON:
+        config["url"] = str(data.get("url") or "").strip()
+        config["json_path"] = str(data.get("json_path") or "").strip()
+        config["ignore_ssl_errors"] = bool(data.get("ignore_ssl_errors", False))
+        if not config["url"].startswith(("http://", "https://")):
+            errors.append("url must start with http:// or https://")
+        try:
+            compile_json_path(config["json_path"])
+        except JsonPathError as e:
+            errors.append(f"invalid json_path: {e}")
+        headers = data.get("headers") or {}
+        if isinstance(headers, dict):
+            config["headers"] = {str(key): str(value) for key, value in headers.items()}
+        else:
+            errors.append("headers must be a mapping")
+    elif source == SOURCE_AGGREGATE:
+        members = data.get("members")
+        if not isinstance(members, list) or not members:
+            errors.append("members must be a non-empty list of entity IDs")
+        else:
+            config["members"] = list(dict.fromkeys(str(member) for member in members))
+        aggregation = data.get("aggregation", AGGREGATE_MEAN)
+        if aggregation in VALID_AGGREGATIONS:
+            config["aggregation"] = aggregation
+        else:
+            errors.append(f"invalid aggregation {aggregation!r}")
+        try:
+            config["weights"] = parse_weights(data.get("weights") or {})
+        except ValueError as e:
+            errors.append(str(e))
+        max_age = data.get("max_age")
+        if max_age is not None:
+            try:
+                config["max_age"] = float(max_age)
+            except (TypeError, ValueError):
+                errors.append(f"invalid max_age {max_age!r}")
+            else:
+                if config["max_age"] <= 0:
+                    errors.append("max_age must be positive")
+    if config["smoothing"] not in VALID_SMOOTHING:
+        errors.append(f"invalid smoothing {config['smoothing']!r}")
+    samples = data.get("smoothing_samples", DEFAULT_SMOOTHING_SAMPLES)
+    try:
+        config["smoothing_samples"] = int(samples)
+    except (TypeError, ValueError):
+        errors.append(f"invalid smoothing_samples {samples!r}")
+    else:
+        if not 2 <= config["smoothing_samples"] <= MAX_SMOOTHING_SAMPLES:
+            errors.append(f"smoothing_samples must be between 2 and {MAX_SMOOTHING_SAMPLES}")
+    hysteresis = data.get("hysteresis") or 0.0
+    try:
+        config["hysteresis"] = float(hysteresis)
+    except (TypeError, ValueError):
+        errors.append(f"invalid hysteresis {hysteresis!r}")
+    else:
+        if not 0 <= config["hysteresis"] <= MAX_HYSTERESIS:
+            errors.append(f"hysteresis must be between 0 and {MAX_HYSTERESIS:g} degrees")
+    healthcheck_url = config["healthcheck_url"]
+    if healthcheck_url and not healthcheck_url.startswith(("http://", "https://")):
+        errors.append("healthcheck_url must start with http:// or https://")
+
+    if errors:
+        raise ValueError(", ".join(errors))
+    return config
+
+
+class SensorRegistry:
+    """Sensor records keyed by integer ID, with a name index and free-ID bitmap."""
+
+    __slots__ = ("_records", "_ids_by_name", "_used_ids")
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._records: dict[int, SensorRecord] = {}
+        self._ids_by_name: dict[str, int] = {}
+        self._used_ids = 0  # Bit N set means sensor ID N is in use
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, Any]]) -> SensorRegistry:
+        """Build a registry from the persisted "sensors" mapping.
+
+        Args:
+            data: Mapping of string sensor IDs to sensor dicts
+
+        Returns:
+            Populated registry
+        """
+        registry = cls()
+        for sensor_id_str, sensor_data in data.items():
+            registry.add(SensorRecord.from_dict(int(sensor_id_str), sensor_data))
+        return registry
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Serialize all records to the persisted "sensors" mapping."""
+        return {str(record.sensor_id): record.as_dict() for record in self}
+
+    def __len__(self) -> int:
+        """Return the number of configured sensors."""
+        return len(self._records)
+
+    def __contains__(self, sensor_id: object) -> bool:
+        """Return True if a sensor with this ID exists."""
+        return sensor_id in self._records
+
+    def __iter__(self) -> Iterator[SensorRecord]:
+        """Iterate over records in sensor ID order."""
+        records = self._records
+        return (records[sensor_id] for sensor_id in sorted(records))
+
+    def get(self, sensor_id: int) -> SensorRecord | None:
+        """Get a record by sensor ID."""
+        return self._records.get(sensor_id)
+
+    def id_for_name(self, name: str) -> int | None:
+        """Get the sensor ID that uses a name, or None if the name is free."""
+        return self._ids_by_name.get(name)
+
+    def next_free_id(self) -> int | None:
+        """Return the lowest unused sensor ID, or None if all slots are full."""
+        if self._used_ids == _ALL_IDS_MASK:
+            return None
+        # Isolate the lowest clear bit of the bitmap
+        free_bit = ~self._used_ids & (self._used_ids + 1)
+        return free_bit.bit_length() - 1
+
+    def add(self, record: SensorRecord) -> None:
+        """Insert a record.
+
+        Raises:
+            ValueError: If the ID or name is already taken or out of range
+        """
+        if not 0 <= record.sensor_id < MAX_SENSORS:
+            raise ValueError(f"Sensor ID {record.sensor_id} is out of range")
+        if record.sensor_id in self._records:
+            raise ValueError(f"Sensor {record.sensor_id} already exists")
+        if record.name in self._ids_by_name:
+            raise ValueError(f"Sensor name '{record.name}' already exists")
+
+        self._records[record.sensor_id] = record
+        self._ids_by_name[record.name] = record.sensor_id
+        self._used_ids |= 1 << record.sensor_id
+
+    def rename(self, record: SensorRecord, name: str) -> None:
+        """Change a record's name, keeping the name index in sync.
+
+        Raises:
+            ValueError: If another sensor already uses the name
+        """
+        owner = self._ids_by_name.get(name)
+        if owner is not None and owner != record.sensor_id:
+            raise ValueError(f"Sensor name '{name}' already exists")
+
+        del self._ids_by_name[record.name]
+        record.name = name
+        self._ids_by_name[name] = record.sensor_id
+
+    def remove(self, sensor_id: int) -> SensorRecord:
+        """Remove and return a record.
+
+        Raises:
+            ValueError: If the sensor ID doesn't exist
+        """
+        record = self._records.pop(sensor_id, None)
+        if record is None:
+            raise ValueError(f"Sensor {sensor_id} does not exist")
+
+        del self._ids_by_name[record.name]
+        self._used_ids &= ~(1 << sensor_id)
+        return record
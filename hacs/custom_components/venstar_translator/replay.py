@@ -0,0 +1,606 @@
+"""Deterministic replay of sensor timelines under a virtual clock.
+
+Runs the real coordinators, broadcaster and rate limit ledger against a
+recorded (see timeline.py) or synthetic timeline of source readings. The
+event loop's clock is virtual: whenever the loop would wait, the clock jumps
+to the next timer instead, so a day of broadcasts replays in seconds.
+Packets are captured instead of sent and checked for count (sent plus
+skipped by the adaptive cadence), sequence continuity, spacing, keepalive
+gaps and lateness.
+
+Usage (from the directory containing custom_components)::
+
+    python -m custom_components.venstar_translator.replay recording.jsonl.gz
+    python -m custom_components.venstar_translator.replay --synthetic 20 --hours 24
+
+The exit status is 1 if any check fails, so scheduler and rate limit changes
+can be regression-tested from a script.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import selectors
+import sys
+import time
+from bisect import bisect_left
+from typing import Any
+
+from .broadcaster import Broadcaster
+from .cadence import get_keepalive_ceiling
+from .const import (
+    DEFAULT_SETTINGS,
+    DOMAIN,
+    PACKET_PREPARE_LEAD,
+    SCHEDULE_SLACK,
+    SETTING_ADAPTIVE_KEEPALIVE,
+    SOURCE_ENTITY,
+    VALID_PURPOSES,
+    WARM_START_MAX_AGE,
+)
+from .coordinator import VenstarSensorCoordinator
+from .packet_trace import KIND_DATA
+from .pcap import SEQUENCE_WRAP
+from .ratelimit import get_broadcast_interval
+from .registry import SensorRecord, SensorRegistry
+from .timeline import Timeline, TimelineError
+from .wire import COMMAND_SENSORDATA, DecodeError, decode_sensor_message
+
+_LOGGER = logging.getLogger(__name__)
+
+_ENTRY_ID = "replay"
+
+# Seconds after its first recorded broadcast (or the start) a replayed
+# coordinator starts, so readings recorded at the same instant apply first
+_START_OFFSET = 0.001
+
+# Default pass/fail threshold for the lateness of a data broadcast
+DEFAULT_MAX_LATENESS = 1.0
+
+
+class _VirtualSelector(selectors.BaseSelector):
+    """Selector that advances the virtual clock instead of blocking."""
+
+    def __init__(self) -> None:
+        """Initialize the selector at virtual time zero."""
+        self._selector = selectors.DefaultSelector()
+        self.now = 0.0
+
+    def register(self, fileobj: Any, events: int, data: Any = None) -> selectors.SelectorKey:
+        """Register a file object (the loop's self-pipe)."""
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj: Any) -> selectors.SelectorKey:
+        """Unregister a file object."""
+        return self._selector.unregister(fileobj)
+
+    def select(self, timeout: float | None = None) -> list[tuple[selectors.SelectorKey, int]]:
+        """Poll without blocking; if nothing is ready, skip ahead by timeout.
+
+        Raises:
+            RuntimeError: If the loop would wait forever (nothing scheduled)
+        """
+        ready = self._selector.select(0)
+        if not ready and timeout:
+            self.now += timeout
+        elif not ready and timeout is None:
+            raise RuntimeError("Replay stalled: nothing is scheduled")
+        return ready
+
+    def get_map(self) -> Any:
+        """Return the mapping of registered file objects."""
+        return self._selector.get_map()
+
+    def close(self) -> None:
+        """Close the underlying selector."""
+        self._selector.close()
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time() only advances when the loop has nothing to do."""
+
+    def __init__(self) -> None:
+        """Initialize the loop at virtual time zero."""
+        self._virtual = _VirtualSelector()
+        super().__init__(self._virtual)
+
+    def time(self) -> float:
+        """Return the virtual time."""
+        return self._virtual.now
+
+
+class _State:
+    """State object as returned by hass.states.get()."""
+
+    __slots__ = ("state",)
+
+    def __init__(self, state: str) -> None:
+        """Initialize the state."""
+        self.state = state
+
+
+class ReplayStates:
+    """Entity states driven by the timeline's readings."""
+
+    def __init__(self) -> None:
+        """Initialize with no entities."""
+        self._states: dict[str, _State] = {}
+
+    def get(self, entity_id: str) -> _State | None:
+        """Get an entity's current state."""
+        return self._states.get(entity_id)
+
+    def set(self, entity_id: str, value: float | None) -> None:
+        """Apply a reading (None makes the entity unavailable)."""
+        self._states[entity_id] = _State("unavailable" if value is None else str(value))
+
+
+class ReplayHass:
+    """The parts of HomeAssistant the coordinator and broadcaster use.
+
+    Also used by the tests to run coordinators without Home Assistant.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, send_latency: float) -> None:
+        """Initialize the stand-in.
+
+        Args:
+            loop: Virtual clock loop
+            send_latency: Virtual seconds each executor job takes
+        """
+        self.loop = loop
+        self.data: dict[str, Any] = {}
+        self.states = ReplayStates()
+        self._send_latency = send_latency
+
+    def add_entry(
+        self, entry_id: str, storage: ReplayStorage, broadcaster: Broadcaster
+    ) -> dict[int, VenstarSensorCoordinator]:
+        """Set up an entry's hass.data the way async_setup_entry does.
+
+        Sources are entities only, and healthchecks pings are not sent.
+
+        Returns:
+            The entry's coordinators, by sensor ID
+        """
+        coordinators: dict[int, VenstarSensorCoordinator] = {}
+        self.data.setdefault(DOMAIN, {})[entry_id] = {
+            "storage": storage,
+            "broadcaster": broadcaster,
+            "http": None,
+            "aggregates": None,
+            "healthchecks": None,
+            "coordinators": coordinators,
+        }
+        return coordinators
+
+    def async_add_executor_job(self, func: Any, *args: Any) -> asyncio.Future[Any]:
+        """Run a job in the loop, completing after the simulated latency."""
+        future = self.loop.create_future()
+
+        def run() -> None:
+            try:
+                future.set_result(func(*args))
+            except Exception as e:  # noqa: BLE001 - handed to the awaiting caller
+                future.set_exception(e)
+
+        if self._send_latency:
+            self.loop.call_later(self._send_latency, run)
+        else:
+            run()
+        return future
+
+
+class ReplayStorage:
+    """The parts of VenstarTranslatorStorage the coordinator and broadcaster use."""
+
+    def __init__(self, mac_prefix: str, sensors: SensorRegistry) -> None:
+        """Initialize the stand-in."""
+        self.mac_prefix = mac_prefix
+        self.sensors = sensors
+        self.settings: dict[str, Any] = dict(DEFAULT_SETTINGS)
+        self.saves = 0
+
+    def get_sensor(self, sensor_id: int) -> SensorRecord | None:
+        """Get a sensor record."""
+        return self.sensors.get(sensor_id)
+
+    async def async_save(self) -> None:
+        """Count a save; nothing is persisted."""
+        self.saves += 1
+
+    def async_schedule_save(self) -> None:
+        """Count a save; nothing is persisted."""
+        self.saves += 1
+
+
+class ReplayHarness:
+    """Replays a timeline against the coordinators and checks the broadcasts."""
+
+    def __init__(
+        self,
+        timeline: Timeline,
+        send_latency: float = 0.0,
+        max_lateness: float = DEFAULT_MAX_LATENESS,
+        adaptive_keepalive: bool = DEFAULT_SETTINGS[SETTING_ADAPTIVE_KEEPALIVE],
+    ) -> None:
+        """Initialize the harness.
+
+        Args:
+            timeline: Readings (and optionally recorded broadcasts) to replay
+            send_latency: Virtual seconds each UDP send takes
+            max_lateness: Lateness (seconds) above which a broadcast fails the run
+            adaptive_keepalive: adaptive_keepalive setting (False sends every deadline)
+        """
+        self.timeline = timeline
+        self.send_latency = send_latency
+        self.max_lateness = max_lateness
+        self.adaptive_keepalive = adaptive_keepalive
+        self._sent: list[tuple[float, bytes]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._origin = 0.0
+
+    def _record_send(self, packet: bytes, port: int, repeat_count: int) -> None:
+        """Capture a packet instead of broadcasting it."""
+        self._sent.append((self._loop.time() - self._origin, packet))
+
+    async def async_run(self) -> dict[str, Any]:
+        """Replay the whole timeline.
+
+        Returns:
+            Report with per-sensor results and the list of failed checks
+        """
+        loop = self._loop = asyncio.get_running_loop()
+        self._origin = origin = loop.time()
+        timeline = self.timeline
+
+        registry = SensorRegistry()
+        for sensor_id, data in timeline.sensors.items():
+            record = SensorRecord.from_dict(sensor_id, data)
+            # Every source replays as an entity fed by the recorded readings
+            record.source = SOURCE_ENTITY
+            record.entity_id = f"sensor.replay_{sensor_id}"
+            record.healthcheck_url = None
+            registry.add(record)
+
+        hass = ReplayHass(loop, self.send_latency)
+        storage = ReplayStorage(timeline.mac_prefix, registry)
+        storage.settings[SETTING_ADAPTIVE_KEEPALIVE] = self.adaptive_keepalive
+        broadcaster = Broadcaster(hass, storage, send=self._record_send)
+        coordinators = hass.add_entry(_ENTRY_ID, storage, broadcaster)
+
+        for t, sensor_id, value in timeline.readings:
+            entity_id = f"sensor.replay_{sensor_id}"
+            if t <= 0:
+                hass.states.set(entity_id, value)
+            else:
+                loop.call_at(origin + t, hass.states.set, entity_id, value)
+
+        starts = self._start_times()
+        # Sensors whose first broadcast may use their cached reading
+        warm = {
+            record.sensor_id
+            for record in registry
+            if record.last_temperature is not None
+            and record.last_broadcast is not None
+            and time.time() - record.last_broadcast <= WARM_START_MAX_AGE
+        }
+
+        def start(sensor_id: int) -> None:
+            coordinator = VenstarSensorCoordinator(hass, _ENTRY_ID, sensor_id)
+            coordinators[sensor_id] = coordinator
+            loop.create_task(coordinator.start())
+
+        for sensor_id, at in starts.items():
+            loop.call_at(origin + at, start, sensor_id)
+
+        await asyncio.sleep(timeline.duration)
+        for coordinator in coordinators.values():
+            await coordinator.stop()
+
+        return self._report(registry, broadcaster, coordinators, starts, warm)
+
+    def _start_times(self) -> dict[int, float]:
+        """Start each enabled sensor when it first broadcast in the recording."""
+        first: dict[int, float] = {}
+        for t, sensor_id, kind, _, _ in self.timeline.broadcasts:
+            if kind == KIND_DATA and sensor_id not in first:
+                first[sensor_id] = t
+        return {
+            sensor_id: max(first.get(sensor_id, 0.0), 0.0) + _START_OFFSET
+            for sensor_id, data in self.timeline.sensors.items()
+            if data.get("enabled", True)
+        }
+
+    def _available_deadlines(
+        self, sensor_id: int, start: float, interval: int, warm: bool
+    ) -> list[float]:
+        """Return the deadlines at which the sensor's source had a reading.
+
+        The coordinator reads the source when it prepares the packet,
+        PACKET_PREPARE_LEAD seconds before the deadline (right away for the
+        first one), so that is when a reading must be available. With warm
+        set, the first deadline always counts (the cached reading is
+        broadcast if the source has none).
+        """
+        readings = [(t, value) for t, sid, value in self.timeline.readings if sid == sensor_id]
+        available = []
+        index = -1
+        deadline = start
+        while deadline < self.timeline.duration:
+            prepared = max(deadline - PACKET_PREPARE_LEAD, start)
+            while index + 1 < len(readings) and readings[index + 1][0] <= prepared:
+                index += 1
+            if (index >= 0 and readings[index][1] is not None) or (warm and deadline == start):
+                available.append(deadline)
+            deadline += interval
+        return available
+
+    def _report(
+        self,
+        registry: SensorRegistry,
+        broadcaster: Broadcaster,
+        coordinators: dict[int, VenstarSensorCoordinator],
+        starts: dict[int, float],
+        warm: set[int],
+    ) -> dict[str, Any]:
+        """Check the captured packets and summarize the run."""
+        sent: dict[int, list[tuple[float, int, int]]] = {}
+        for t, packet in self._sent:
+            try:
+                message = decode_sensor_message(packet)
+            except DecodeError:
+                continue
+            if message.command == COMMAND_SENSORDATA:
+                sent.setdefault(message.sensor_id, []).append(
+                    (t, message.sequence, message.temperature)
+                )
+
+        recorded: dict[int, list[int]] = {}
+        for _, sensor_id, kind, _, temp_index in self.timeline.broadcasts:
+            if kind == KIND_DATA:
+                recorded.setdefault(sensor_id, []).append(temp_index)
+
+        failures = []
+        sensors = {}
+        for sensor_id, start in starts.items():
+            record = registry.get(sensor_id)
+            interval = get_broadcast_interval(record.purpose)
+            packets = sent.get(sensor_id, [])
+            stats = broadcaster.stats_for(sensor_id).as_dict()
+            available = self._available_deadlines(sensor_id, start, interval, sensor_id in warm)
+            expected = len(available)
+            cadence = coordinators[sensor_id].cadence
+            skipped = cadence.skipped if cadence is not None else 0
+            ceiling = get_keepalive_ceiling(record.purpose, self.adaptive_keepalive)
+
+            sequence_breaks = 0
+            close_gaps = 0
+            long_gaps = 0
+            lateness = []
+            previous = None
+            for t, sequence, _ in packets:
+                slot = math.floor((t - start) / interval + 1e-9)
+                deadline = start + slot * interval
+                lateness.append(t - deadline)
+                if previous is not None:
+                    if t - previous[0] < interval - SCHEDULE_SLACK:
+                        close_gaps += 1
+                    if t - previous[0] > ceiling + SCHEDULE_SLACK:
+                        # Only a gap past a deadline with a reading is too long;
+                        # deadlines without one are skipped by design
+                        due = bisect_left(available, previous[2] + ceiling - interval / 2)
+                        if due < len(available) and available[due] < deadline - interval / 2:
+                            long_gaps += 1
+                    if sequence != previous[1] + 1 and not (
+                        sequence == 1 and previous[1] == SEQUENCE_WRAP - 1
+                    ):
+                        sequence_breaks += 1
+                previous = (t, sequence, deadline)
+
+            lateness.sort()
+            max_lateness = lateness[-1] if lateness else 0.0
+            result: dict[str, Any] = {
+                "name": record.name,
+                "interval": interval,
+                "expected": expected,
+                "packets": len(packets),
+                "skipped": skipped,
+                "keepalive_ceiling": ceiling,
+                "sequence_breaks": sequence_breaks,
+                "close_gaps": close_gaps,
+                "long_gaps": long_gaps,
+                "max_lateness_ms": round(max_lateness * 1000, 3),
+                "p99_lateness_ms": round(
+                    lateness[min(len(lateness) - 1, int(len(lateness) * 0.99))] * 1000, 3
+                ) if lateness else 0.0,
+                "deferred": broadcaster.ledger_for(sensor_id).deferred,
+                "first_broadcast_ms": stats["first_broadcast_ms"],
+                "first_broadcast_cached": stats["first_broadcast_cached"],
+            }
+            if sensor_id in recorded:
+                replayed = [temp_index for _, _, temp_index in packets]
+                original = recorded[sensor_id]
+                result["recorded_packets"] = len(original)
+                result["index_mismatches"] = sum(
+                    1 for a, b in zip(replayed, original) if a != b
+                )
+            sensors[str(sensor_id)] = result
+
+            label = f"sensor {sensor_id} ({record.name})"
+            if len(packets) + skipped != expected:
+                failures.append(
+                    f"{label}: {len(packets)} packets and {skipped} skipped, expected {expected}"
+                )
+            if sequence_breaks:
+                failures.append(f"{label}: {sequence_breaks} sequence breaks")
+            if close_gaps:
+                failures.append(f"{label}: {close_gaps} broadcasts closer than the rate limit allows")
+            if long_gaps:
+                failures.append(f"{label}: {long_gaps} gaps longer than the keepalive ceiling")
+            if max_lateness > self.max_lateness:
+                failures.append(f"{label}: broadcast {max_lateness:.3f} s late")
+
+        return {
+            "virtual_seconds": round(self.timeline.duration, 3),
+            "packets": len(self._sent),
+            "sensors": sensors,
+            "failures": failures,
+        }
+
+
+def synthetic_timeline(
+    sensors: int, hours: float, seed: int = 0, dropout: float = 0.0
+) -> Timeline:
+    """Generate readings for a set of sensors.
+
+    Each sensor's temperature does a random walk with a reading every 30
+    seconds (at a per-sensor offset, so readings never coincide with
+    deadlines), and with probability dropout a reading is unavailable.
+
+    Args:
+        sensors: Number of sensors (1-20)
+        hours: Duration of the timeline
+        seed: Random seed, so runs are reproducible
+        dropout: Probability that a reading is unavailable
+
+    Returns:
+        Timeline without recorded broadcasts
+    """
+    rng = random.Random(seed)
+    timeline = Timeline(
+        "".join(rng.choice("0123456789ABCDEF") for _ in range(10)),
+        {
+            sensor_id: SensorRecord(
+                sensor_id,
+                f"sensor.synthetic_{sensor_id}",
+                f"Synthetic {sensor_id}",
+                VALID_PURPOSES[sensor_id % len(VALID_PURPOSES)],
+            ).as_dict()
+            for sensor_id in range(sensors)
+        },
+    )
+    timeline.duration = hours * 3600
+
+    for sensor_id in range(sensors):
+        temperature = rng.uniform(40.0, 75.0)
+        timeline.readings.append((0.0, sensor_id, round(temperature, 2)))
+        t = rng.uniform(0.1, 29.9)
+        while t < timeline.duration:
+            temperature += rng.gauss(0.0, 0.2)
+            value = None if rng.random() < dropout else round(temperature, 2)
+            timeline.readings.append((round(t, 3), sensor_id, value))
+            t += 30.0
+    timeline.readings.sort(key=lambda reading: reading[0])
+    return timeline
+
+
+def run_replay(
+    timeline: Timeline,
+    send_latency: float = 0.0,
+    max_lateness: float = DEFAULT_MAX_LATENESS,
+    adaptive_keepalive: bool = DEFAULT_SETTINGS[SETTING_ADAPTIVE_KEEPALIVE],
+) -> dict[str, Any]:
+    """Replay a timeline on a fresh virtual clock loop.
+
+    Returns:
+        Report from ReplayHarness.async_run, plus the wall-clock time taken
+    """
+    harness = ReplayHarness(timeline, send_latency, max_lateness, adaptive_keepalive)
+    loop = VirtualClockLoop()
+    started = time.perf_counter()
+    try:
+        report = loop.run_until_complete(harness.async_run())
+    finally:
+        loop.close()
+    wall = time.perf_counter() - started
+    report["wall_seconds"] = round(wall, 3)
+    report["speedup"] = round(timeline.duration / wall) if wall else None
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the replay harness from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.venstar_translator.replay",
+        description="Replay sensor timelines against the broadcast scheduler under a virtual clock.",
+    )
+    parser.add_argument("timeline", nargs="?", help="Timeline file recorded by the record_timeline service")
+    parser.add_argument("--synthetic", type=int, metavar="SENSORS", help="Generate readings for this many sensors")
+    parser.add_argument("--hours", type=float, default=24.0, help="Synthetic timeline length (default: 24)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic timeline random seed")
+    parser.add_argument("--dropout", type=float, default=0.0, help="Probability a synthetic reading is unavailable")
+    parser.add_argument("--save", help="Write the synthetic timeline to this file")
+    parser.add_argument("--send-latency", type=float, default=0.0, metavar="MS", help="Simulated UDP send time")
+    parser.add_argument(
+        "--max-lateness", type=float, default=DEFAULT_MAX_LATENESS, metavar="SECONDS",
+        help=f"Fail if a broadcast is later than this (default: {DEFAULT_MAX_LATENESS})",
+    )
+    parser.add_argument(
+        "--adaptive-keepalive", action=argparse.BooleanOptionalAction,
+        default=DEFAULT_SETTINGS[SETTING_ADAPTIVE_KEEPALIVE],
+        help="adaptive_keepalive setting; --no-adaptive-keepalive broadcasts at every deadline "
+        f"(default: {'on' if DEFAULT_SETTINGS[SETTING_ADAPTIVE_KEEPALIVE] else 'off'})",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write the full report as JSON ('-' for stdout)")
+    parser.add_argument("--debug", action="store_true", help="Show coordinator logging")
+    args = parser.parse_args(argv)
+
+    if (args.timeline is None) == (args.synthetic is None):
+        parser.error("give either a timeline file or --synthetic")
+    if args.synthetic is not None and not 1 <= args.synthetic <= 20:
+        parser.error("--synthetic must be between 1 and 20")
+
+    # Unavailable readings log a warning per deadline; only show them when asked
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.ERROR)
+
+    if args.synthetic is not None:
+        timeline = synthetic_timeline(args.synthetic, args.hours, args.seed, args.dropout)
+        if args.save:
+            timeline.write(args.save)
+    else:
+        try:
+            timeline = Timeline.read(args.timeline)
+        except (TimelineError, OSError) as e:
+            print(f"{args.timeline}: {e}", file=sys.stderr)
+            return 1
+
+    report = run_replay(
+        timeline, args.send_latency / 1000, args.max_lateness, args.adaptive_keepalive
+    )
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+    print(
+        f"Replayed {report['virtual_seconds'] / 3600:.1f} h of {len(report['sensors'])} sensors "
+        f"in {report['wall_seconds']:.2f} s ({report['speedup']}x), {report['packets']} packets",
+        file=sys.stderr,
+    )
+    for sensor_id, result in report["sensors"].items():
+        line = (
+            f"  sensor {sensor_id} ({result['name']}): {result['packets']}/{result['expected']} packets "
+            f"({result['skipped']} skipped), "
+            f"max lateness {result['max_lateness_ms']} ms, {result['sequence_breaks']} sequence breaks"
+        )
+        if "recorded_packets" in result:
+            line += (
+                f", {result['recorded_packets']} recorded, "
+                f"{result['index_mismatches']} index mismatches"
+            )
+        print(line, file=sys.stderr)
+    for failure in report["failures"]:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""Broadcast statistics sensors for Venstar Translator."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN,
+    SIGNAL_SENSOR_ADDED,
+    SIGNAL_SENSOR_REMOVED,
+    SIGNAL_SENSOR_UPDATED,
+    STATS_UPDATE_INTERVAL,
+)
+from .registry import SensorRecord
+from .stats import SensorStats
+from .venstar_sensor import get_mac_address
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class VenstarStatsSensorEntityDescription(SensorEntityDescription):
+    """Describes a broadcast statistics sensor."""
+
+    value_fn: Callable[[SensorStats], Any]
+
+
+def _last_broadcast(stats: SensorStats) -> datetime | None:
+    """Convert the last broadcast time to a timezone-aware datetime."""
+    if stats.last_broadcast is None:
+        return None
+    return datetime.fromtimestamp(stats.last_broadcast, tz=timezone.utc)
+
+
+def _last_latency_ms(stats: SensorStats) -> float | None:
+    """Convert the last send latency to milliseconds."""
+    if stats.last_latency is None:
+        return None
+    return round(stats.last_latency * 1000, 1)
+
+
+SENSOR_DESCRIPTIONS: tuple[VenstarStatsSensorEntityDescription, ...] = (
+    VenstarStatsSensorEntityDescription(
+        key="last_broadcast",
+        translation_key="last_broadcast",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_last_broadcast,
+    ),
+    VenstarStatsSensorEntityDescription(
+        key="sequence",
+        translation_key="sequence",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.sequence,
+    ),
+    VenstarStatsSensorEntityDescription(
+        key="temperature_index",
+        translation_key="temperature_index",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.temperature_index,
+    ),
+    VenstarStatsSensorEntityDescription(
+        key="broadcasts_per_hour",
+        translation_key="broadcasts_per_hour",
+        native_unit_of_measurement="broadcasts/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.broadcasts_per_hour,
+    ),
+    VenstarStatsSensorEntityDescription(
+        key="send_failures",
+        translation_key="send_failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.send_failures,
+    ),
+    VenstarStatsSensorEntityDescription(
+        key="last_send_latency",
+        translation_key="last_send_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_last_latency_ms,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up broadcast statistics sensors for every configured sensor."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    storage = data["storage"]
+    broadcaster = data["broadcaster"]
+    entities: list[VenstarStatsSensor] = []
+
+    @callback
+    def _async_add_sensor(sensor: SensorRecord) -> None:
+        """Create the statistics entities for one emulated sensor."""
+        stats = broadcaster.stats_for(sensor.sensor_id)
+        new_entities = [
+            VenstarStatsSensor(sensor, storage.mac_prefix, stats, description)
+            for description in SENSOR_DESCRIPTIONS
+        ]
+        entities.extend(new_entities)
+        async_add_entities(new_entities)
+
+    @callback
+    def _async_remove_sensor(sensor_id: int) -> None:
+        """Remove the device (and with it the entities) of a deleted sensor."""
+        entities[:] = [entity for entity in entities if entity.sensor_id != sensor_id]
+
+        device_registry = dr.async_get(hass)
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, get_mac_address(storage.mac_prefix, sensor_id))}
+        )
+        if device is not None:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+
+    @callback
+    def _async_update_sensor(sensor: SensorRecord) -> None:
+        """Rename the device of an edited sensor.
+
+        Device info is only read when an entity is first added, so a rename
+        has to go through the device registry. A name the user set in the UI
+        (name_by_user) still takes precedence.
+        """
+        device_registry = dr.async_get(hass)
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, get_mac_address(storage.mac_prefix, sensor.sensor_id))}
+        )
+        if device is not None and device.name != sensor.name:
+            device_registry.async_update_device(device.id, name=sensor.name)
+
+    @callback
+    def _async_write_changed_states(now: datetime) -> None:
+        """Write state for entities whose value changed since the last tick.
+
+        Broadcasts only update the in-memory statistics; state writes are
+        coalesced here so the recorder sees at most one write per entity per
+        interval, and none at all for values that didn't change.
+        """
+        for entity in entities:
+            if entity.hass is not None:
+                entity.async_refresh_from_stats()
+
+    for sensor in storage.sensors:
+        _async_add_sensor(sensor)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_SENSOR_ADDED.format(entry.entry_id), _async_add_sensor
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_SENSOR_REMOVED.format(entry.entry_id), _async_remove_sensor
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_SENSOR_UPDATED.format(entry.entry_id), _async_update_sensor
+        )
+    )
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_write_changed_states, timedelta(seconds=STATS_UPDATE_INTERVAL)
+        )
+    )
+
+
+class VenstarStatsSensor(SensorEntity):
+    """A single broadcast statistic of an emulated Venstar sensor."""
+
+    entity_description: VenstarStatsSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        sensor: SensorRecord,
+        mac_prefix: str,
+        stats: SensorStats,
+        description: VenstarStatsSensorEntityDescription,
+    ) -> None:
+        """Initialize the entity.
+
+        Args:
+            sensor: Sensor record the statistic belongs to
+            mac_prefix: MAC prefix used to derive the sensor's MAC address
+            stats: Live statistics object updated by the broadcaster
+            description: Which statistic this entity exposes
+        """
+        self.entity_description = description
+        self.sensor_id = sensor.sensor_id
+        self._stats = stats
+
+        mac_address = get_mac_address(mac_prefix, sensor.sensor_id)
+        self._attr_unique_id = f"{mac_address}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, mac_address)},
+            name=sensor.name,
+            manufacturer="Venstar",
+            model="ACC-TSENWIFIPRO (emulated)",
+        )
+        self._attr_native_value = description.value_fn(stats)
+
+    @callback
+    def async_refresh_from_stats(self) -> None:
+        """Pull the latest value from the statistics and write it if changed."""
+        value = self.entity_description.value_fn(self._stats)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
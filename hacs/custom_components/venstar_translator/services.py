@@ -0,0 +1,436 @@
+"""Service handlers for Venstar Translator."""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    PAIRING_SESSION_DURATION,
+    PAIRING_SESSION_INTERVAL,
+    SIGNAL_SENSOR_ADDED,
+    SIGNAL_SENSOR_REMOVED,
+    SIGNAL_SENSOR_UPDATED,
+    SOURCE_ENTITY,
+)
+from .coordinator import async_start_coordinators, async_stop_coordinators
+from .history import HistoryError, export_history
+from .packet_trace import KIND_PAIRING, KIND_RESEND
+from .pairing import async_start_pairing_session
+from .profiler import (
+    DEFAULT_DURATION,
+    MAX_DURATION,
+    MIN_DURATION,
+    MODE_SAMPLING,
+    VALID_MODES,
+    ProfileError,
+    async_profile,
+    write_profile,
+)
+from .sources import async_get_temperature, describe_source
+from .timeline import TimelineRecorder
+from .venstar_sensor import VenstarSensor
+
+if TYPE_CHECKING:
+    from .broadcaster import Broadcaster
+    from .http_source import HttpJsonFetcher
+    from .storage import VenstarTranslatorStorage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def async_register_services(
+    hass: HomeAssistant,
+    entry_id: str,
+    storage: VenstarTranslatorStorage,
+    broadcaster: Broadcaster,
+    http: HttpJsonFetcher,
+) -> None:
+    """Register the integration's services.
+
+    Args:
+        hass: Home Assistant instance
+        entry_id: Config entry ID
+        storage: Storage manager of the config entry
+        broadcaster: Broadcaster of the config entry
+        http: HTTP JSON fetcher of the config entry
+    """
+    # Register pair_sensor service
+    async def handle_pair_sensor(call):
+        """Handle the pair_sensor service call."""
+        sensor_id = int(call.data.get("sensor_id"))
+
+        sensor_config = storage.get_sensor(sensor_id)
+        if sensor_config is None:
+            _LOGGER.error(f"Sensor {sensor_id} not configured")
+            return
+
+        # Get current temperature
+        temperature = await async_get_temperature(
+            hass, http, sensor_config, hass.data[DOMAIN][entry_id]["aggregates"]
+        )
+        if temperature is None:
+            _LOGGER.error(
+                f"Cannot pair sensor {sensor_id}: temperature unavailable from "
+                f"{describe_source(sensor_config)}"
+            )
+            return
+
+        try:
+            # Create sensor instance
+            sensor = VenstarSensor(
+                sensor_id=sensor_id,
+                mac_prefix=storage.mac_prefix,
+                name=sensor_config.name,
+                purpose=sensor_config.purpose,
+                scale=sensor_config.scale,
+                sequence=1,
+            )
+
+            # Build and broadcast pairing packet
+            packet = sensor.build_pairing_packet(temperature)
+            await broadcaster.async_send(
+                sensor_id, packet, KIND_PAIRING, 1, sensor.temperature_index, temperature
+            )
+
+            # Reset stored sequence to 1 after pairing (matches C# behavior)
+            storage.update_sequence(sensor_id, 1)
+            await storage.async_save()
+
+            _LOGGER.info(
+                f"Pairing packet sent for sensor {sensor_id} ({sensor_config.name})"
+            )
+
+        except Exception as e:
+            _LOGGER.error(f"Failed to send pairing packet for sensor {sensor_id}: {e}")
+
+    hass.services.async_register(DOMAIN, "pair_sensor", handle_pair_sensor)
+
+    # Register start_pairing_session service
+    async def handle_start_pairing_session(call: ServiceCall) -> ServiceResponse:
+        """Handle the start_pairing_session service call."""
+        sensor_ids = call.data.get("sensor_ids")
+        if isinstance(sensor_ids, (int, str)):
+            sensor_ids = [sensor_ids]
+        if sensor_ids is not None:
+            sensor_ids = [int(sensor_id) for sensor_id in sensor_ids]
+        session = await async_start_pairing_session(
+            hass,
+            entry_id,
+            sensor_ids,
+            float(call.data.get("duration", PAIRING_SESSION_DURATION / 60)) * 60,
+            float(call.data.get("interval", PAIRING_SESSION_INTERVAL)),
+        )
+        if not session.running:
+            _LOGGER.error("Pairing session not started: no sensor could be paired")
+        return session.as_dict() if call.return_response else None
+
+    hass.services.async_register(
+        DOMAIN,
+        "start_pairing_session",
+        handle_start_pairing_session,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # Register cancel_pairing_session service
+    async def handle_cancel_pairing_session(call: ServiceCall) -> None:
+        """Handle the cancel_pairing_session service call."""
+        session = hass.data[DOMAIN][entry_id]["pairing"]
+        if session is None or not session.running:
+            _LOGGER.warning("No pairing session is running")
+            return
+        await session.async_cancel()
+
+    hass.services.async_register(DOMAIN, "cancel_pairing_session", handle_cancel_pairing_session)
+
+    # Register pairing_session_status service
+    async def handle_pairing_session_status(call: ServiceCall) -> ServiceResponse:
+        """Handle the pairing_session_status service call."""
+        session = hass.data[DOMAIN][entry_id]["pairing"]
+        return {"session": session.as_dict() if session is not None else None}
+
+    hass.services.async_register(
+        DOMAIN,
+        "pairing_session_status",
+        handle_pairing_session_status,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # Register resend_last_packet service
+    async def handle_resend_last_packet(call):
+        """Handle the resend_last_packet service call."""
+        sensor_id = int(call.data.get("sensor_id"))
+
+        sensor_config = storage.get_sensor(sensor_id)
+        if sensor_config is None:
+            _LOGGER.error(f"Sensor {sensor_id} not configured")
+            return
+
+        packet = storage.get_last_packet(sensor_id)
+        if packet is None:
+            _LOGGER.error(
+                f"Sensor {sensor_id}: no cached packet to resend "
+                f"(sensor has never broadcast)"
+            )
+            return
+
+        try:
+            if not await broadcaster.async_send(sensor_id, packet, KIND_RESEND):
+                return  # Dropped by the rate limit (logged by the broadcaster)
+            _LOGGER.info(
+                f"Resent last packet for sensor {sensor_id} "
+                f"({sensor_config.name}), "
+                f"{len(packet)} bytes"
+            )
+        except Exception as e:
+            _LOGGER.error(f"Failed to resend packet for sensor {sensor_id}: {e}")
+
+    hass.services.async_register(DOMAIN, "resend_last_packet", handle_resend_last_packet)
+
+    # Register dump_packet_trace service
+    async def handle_dump_packet_trace(call: ServiceCall) -> ServiceResponse:
+        """Handle the dump_packet_trace service call."""
+        events = broadcaster.trace.dump()
+
+        if not call.return_response:
+            for event in events:
+                _LOGGER.info(f"Packet trace: {event}")
+            return None
+
+        return {"events": events}
+
+    hass.services.async_register(
+        DOMAIN,
+        "dump_packet_trace",
+        handle_dump_packet_trace,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # Register record_timeline service
+    async def handle_record_timeline(call: ServiceCall) -> None:
+        """Handle the record_timeline service call."""
+        data = hass.data[DOMAIN][entry_id]
+        if data["recording"] is not None:
+            _LOGGER.error("A timeline recording is already running")
+            return
+
+        minutes = int(call.data.get("duration", 60))
+        path = hass.config.path(
+            f"venstar_translator_timeline_{datetime.now():%Y%m%d_%H%M%S}.jsonl.gz"
+        )
+        recorder = TimelineRecorder(hass, storage, broadcaster)
+        recorder.start()
+        _LOGGER.info(f"Recording timeline for {minutes} minutes to {path}")
+
+        async def async_finish(_now) -> None:
+            data["recording"] = None
+            timeline = recorder.stop()
+            try:
+                await hass.async_add_executor_job(timeline.write, path)
+            except OSError as e:
+                _LOGGER.error(f"Failed to write timeline {path}: {e}")
+                return
+            _LOGGER.info(
+                f"Wrote timeline {path}: {len(timeline.readings)} readings, "
+                f"{len(timeline.broadcasts)} broadcasts"
+            )
+
+        cancel_finish = async_call_later(hass, minutes * 60, async_finish)
+
+        def cancel() -> None:
+            """Stop the recording without writing it (the entry is unloading)."""
+            cancel_finish()
+            recorder.stop()
+            _LOGGER.info(f"Timeline recording to {path} cancelled")
+
+        data["recording"] = cancel
+
+    hass.services.async_register(DOMAIN, "record_timeline", handle_record_timeline)
+
+    # Register export_index_history service
+    async def handle_export_index_history(call: ServiceCall) -> ServiceResponse:
+        """Handle the export_index_history service call."""
+        from homeassistant.components.recorder import get_instance
+
+        db_url = get_instance(hass).db_url
+        if not db_url.startswith("sqlite:///"):
+            _LOGGER.error("Index history export needs the recorder's SQLite database")
+            return None
+
+        sensor_id = call.data.get("sensor_id")
+        sensors = [
+            {**sensor.as_dict(), "sensor_id": sensor.sensor_id}
+            for sensor in storage.sensors
+            if sensor.source == SOURCE_ENTITY
+            and sensor.entity_id
+            and (sensor_id is None or sensor.sensor_id == int(sensor_id))
+        ]
+        if not sensors:
+            _LOGGER.error("No entity-sourced sensors to export history for")
+            return None
+
+        until = time.time()
+        since = until - float(call.data.get("days", 7)) * 86400
+        path = hass.config.path(
+            f"venstar_translator_history_{datetime.now():%Y%m%d_%H%M%S}.csv"
+        )
+
+        def export() -> dict:
+            with open(path, "w", newline="", encoding="utf-8") as output:
+                return export_history(db_url[len("sqlite:///"):], sensors, since, until, output)
+
+        try:
+            result = await hass.async_add_executor_job(export)
+        except (HistoryError, OSError) as e:
+            _LOGGER.error(f"Failed to export index history to {path}: {e}")
+            return None
+
+        _LOGGER.info(
+            f"Wrote index history {path} for {len(sensors)} sensors in {result['elapsed_s']} s"
+        )
+        if not call.return_response:
+            return None
+        return {"path": path, **result}
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_index_history",
+        handle_export_index_history,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # Register export_sensors service
+    async def handle_export_sensors(call: ServiceCall) -> ServiceResponse:
+        """Handle the export_sensors service call."""
+        document = {"sensors": storage.export_sensors()}
+        if call.return_response:
+            return document
+
+        path = hass.config.path(
+            f"venstar_translator_sensors_{datetime.now():%Y%m%d_%H%M%S}.json"
+        )
+
+        def write() -> None:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(document, file, indent=2)
+                file.write("\n")
+
+        try:
+            await hass.async_add_executor_job(write)
+        except OSError as e:
+            _LOGGER.error(f"Failed to write sensor export {path}: {e}")
+            return None
+        _LOGGER.info(f"Exported {len(document['sensors'])} sensors to {path}")
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_sensors",
+        handle_export_sensors,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # Register import_sensors service
+    async def handle_import_sensors(call: ServiceCall) -> ServiceResponse:
+        """Handle the import_sensors service call."""
+        entries = call.data["sensors"]
+        # Accept the export_sensors document as well as its sensor list
+        if isinstance(entries, dict):
+            entries = entries.get("sensors", [])
+        if not isinstance(entries, list):
+            _LOGGER.error("Cannot import sensors: expected a list of sensors")
+            return None
+
+        try:
+            added, updated, removed = storage.import_sensors(
+                entries, bool(call.data.get("replace", False))
+            )
+        except ValueError as e:
+            _LOGGER.error(f"Cannot import sensors: {e}")
+            return None
+
+        # Restarted coordinators pick up new purposes, sources and enabled flags
+        await async_stop_coordinators(hass, entry_id, removed + updated)
+        await storage.async_save()
+        for sensor_id in removed:
+            broadcaster.forget(sensor_id)
+            async_dispatcher_send(hass, SIGNAL_SENSOR_REMOVED.format(entry_id), sensor_id)
+        for sensor_id in added:
+            async_dispatcher_send(
+                hass, SIGNAL_SENSOR_ADDED.format(entry_id), storage.get_sensor(sensor_id)
+            )
+        for sensor_id in updated:
+            async_dispatcher_send(
+                hass, SIGNAL_SENSOR_UPDATED.format(entry_id), storage.get_sensor(sensor_id)
+            )
+        await async_start_coordinators(hass, entry_id, added + updated)
+
+        if not call.return_response:
+            return None
+        return {"added": added, "updated": updated, "removed": removed}
+
+    hass.services.async_register(
+        DOMAIN,
+        "import_sensors",
+        handle_import_sensors,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # Register profile_integration service
+    profiling: list[str] = []
+
+    async def handle_profile_integration(call: ServiceCall) -> ServiceResponse:
+        """Handle the profile_integration service call."""
+        if profiling:
+            _LOGGER.error("A profile is already running")
+            return None
+
+        mode = call.data.get("mode", MODE_SAMPLING)
+        if mode not in VALID_MODES:
+            _LOGGER.error(f"Unknown profile mode {mode}, expected one of {VALID_MODES}")
+            return None
+        duration = float(call.data.get("duration", DEFAULT_DURATION))
+        if not MIN_DURATION <= duration <= MAX_DURATION:
+            clamped = min(max(duration, MIN_DURATION), MAX_DURATION)
+            _LOGGER.warning(
+                f"Profile duration {duration:g} s is outside {MIN_DURATION}-{MAX_DURATION} s, "
+                f"using {clamped:g} s"
+            )
+            duration = clamped
+        path = hass.config.path(
+            f"venstar_translator_profile_{datetime.now():%Y%m%d_%H%M%S}.tsv"
+        )
+        profiling.append(mode)
+        _LOGGER.info(f"Profiling the integration ({mode}) for {duration:g} seconds")
+        try:
+            rows = await async_profile(mode, duration)
+        except ProfileError as e:
+            _LOGGER.error(f"Cannot profile the integration: {e}")
+            return None
+        finally:
+            profiling.clear()
+
+        try:
+            await hass.async_add_executor_job(write_profile, path, mode, duration, rows)
+        except OSError as e:
+            _LOGGER.error(f"Failed to write profile {path}: {e}")
+            return None
+        _LOGGER.info(f"Wrote profile {path}: {len(rows)} functions")
+
+        if not call.return_response:
+            return None
+        return {"path": path, "mode": mode, "duration": duration, "functions": rows[:20]}
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile_integration",
+        handle_profile_integration,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
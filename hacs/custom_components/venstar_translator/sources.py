@@ -0,0 +1,135 @@
+"""Temperature sources for emulated sensors."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from .aggregate import build_aggregate
+from .const import SOURCE_AGGREGATE, SOURCE_HTTP_JSON
+from .jsonpath import JsonPathError, compile_json_path
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .aggregate import AggregateTracker
+    from .http_source import HttpJsonFetcher
+    from .registry import SensorRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SourceError(Exception):
+    """Raised when a temperature source cannot be read."""
+
+
+def describe_source(sensor: SensorRecord) -> str:
+    """Describe where a sensor's temperature comes from, for log messages."""
+    if sensor.source == SOURCE_HTTP_JSON:
+        return f"URL {sensor.url} ({sensor.json_path})"
+    if sensor.source == SOURCE_AGGREGATE:
+        return f"{sensor.aggregation} of {', '.join(sensor.members)}"
+    return f"entity {sensor.entity_id}"
+
+
+async def async_read_http_temperature(
+    fetcher: HttpJsonFetcher,
+    url: str,
+    json_path: str,
+    headers: dict[str, str] | None = None,
+    verify_ssl: bool = True,
+) -> float:
+    """Fetch a JSON document and extract the temperature at a JSONPath.
+
+    Raises:
+        SourceError: If the request fails
+        JsonPathError: If the path is invalid or doesn't match the document
+        ValueError: If the matched value is not a number
+    """
+    path = compile_json_path(json_path)
+    document = await fetcher.async_get(url, headers, verify_ssl=verify_ssl)
+    value = path.find(document)
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{json_path} selects {type(value).__name__}, not a number")
+    return float(value)
+
+
+async def async_get_temperature(
+    hass: HomeAssistant,
+    fetcher: HttpJsonFetcher | None,
+    sensor: SensorRecord,
+    aggregates: AggregateTracker | None = None,
+) -> float | None:
+    """Read a sensor's current temperature from its configured source.
+
+    Args:
+        hass: Home Assistant instance
+        fetcher: HTTP fetcher of the config entry (for http_json sources)
+        sensor: Sensor to read
+        aggregates: Aggregate tracker of the config entry (for aggregate sources)
+
+    Returns:
+        Temperature value, or None if unavailable
+    """
+    if sensor.source == SOURCE_HTTP_JSON:
+        if fetcher is None:
+            return None
+        try:
+            return await async_read_http_temperature(
+                fetcher,
+                sensor.url,
+                sensor.json_path or "",
+                sensor.headers,
+                verify_ssl=not sensor.ignore_ssl_errors,
+            )
+        except (SourceError, JsonPathError, ValueError) as e:
+            _LOGGER.error(f"Sensor {sensor.sensor_id}: cannot read temperature: {e}")
+            return None
+
+    if sensor.source == SOURCE_AGGREGATE:
+        return read_aggregate_temperature(hass, sensor, aggregates)
+
+    return read_entity_temperature(hass, sensor.entity_id)
+
+
+def read_aggregate_temperature(
+    hass: HomeAssistant,
+    sensor: SensorRecord,
+    aggregates: AggregateTracker | None = None,
+) -> float | None:
+    """Read an aggregate source.
+
+    Synchronous, like read_entity_temperature. Uses the tracker's
+    incrementally maintained value when it follows the sensor, and
+    otherwise aggregates the members' current states once.
+
+    Returns:
+        Aggregate value, or None if no member has a reading
+    """
+    if aggregates is not None and sensor.sensor_id in aggregates:
+        return aggregates.value(sensor.sensor_id)
+    return build_aggregate(hass, sensor).value()
+
+
+def read_entity_temperature(hass: HomeAssistant, entity_id: str) -> float | None:
+    """Read a temperature from an entity's current state.
+
+    Synchronous (a state machine lookup), so it can run right before a send.
+
+    Returns:
+        Temperature value, or None if unavailable
+    """
+    state = hass.states.get(entity_id)
+
+    if state is None:
+        _LOGGER.debug(f"Entity {entity_id} not found")
+        return None
+
+    if state.state in ("unknown", "unavailable"):
+        _LOGGER.debug(f"Entity {entity_id} state is {state.state}")
+        return None
+
+    try:
+        return float(state.state)
+    except (ValueError, TypeError) as e:
+        _LOGGER.error(f"Invalid temperature value from {entity_id}: {state.state} - {e}")
+        return None
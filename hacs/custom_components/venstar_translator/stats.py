@@ -0,0 +1,171 @@
+"""Per-sensor broadcast statistics for Venstar Translator."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any
+
+from .const import LOOP_STALL_THRESHOLD
+from .metrics import SampleWindow
+
+# Window used for the broadcasts-per-hour rate
+RATE_WINDOW = 3600
+
+# Number of recent late broadcasts remembered for attribution
+_MAX_LATE_BROADCASTS = 20
+
+
+class SensorStats:
+    """Running broadcast statistics for a single sensor.
+
+    Updated by the broadcaster on every send; read by the diagnostic
+    entities, which poll it on their own throttled schedule.
+    """
+
+    __slots__ = (
+        "last_broadcast",
+        "sequence",
+        "temperature_index",
+        "send_failures",
+        "retries",
+        "retry_recoveries",
+        "retry_drops",
+        "index_flips_suppressed",
+        "last_latency",
+        "lateness",
+        "late_broadcasts",
+        "first_broadcast_delay",
+        "first_broadcast_cached",
+        "_recent",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.last_broadcast: float | None = None  # Wall-clock time of last successful send
+        self.sequence: int | None = None
+        self.temperature_index: int | None = None
+        self.send_failures = 0
+        self.retries = 0  # Resends of a failed data packet
+        self.retry_recoveries = 0  # Failed data packets a retry got out
+        self.retry_drops = 0  # Failed data packets given up (superseded or stopped)
+        self.index_flips_suppressed = 0  # Index changes held back by hysteresis
+        self.last_latency: float | None = None  # Seconds
+        self.lateness = SampleWindow()  # Scheduled broadcast lateness, seconds
+        self.late_broadcasts: deque[dict[str, float]] = deque(maxlen=_MAX_LATE_BROADCASTS)
+        # Seconds from coordinator start to the first scheduled broadcast, and
+        # whether that broadcast used the cached reading (warm start)
+        self.first_broadcast_delay: float | None = None
+        self.first_broadcast_cached = False
+        self._recent: deque[float] = deque()  # Monotonic times of recent data broadcasts
+
+    def record_success(
+        self,
+        timestamp: float,
+        latency: float,
+        sequence: int | None,
+        temp_index: int | None,
+        is_data: bool,
+    ) -> None:
+        """Record a successful send.
+
+        Args:
+            timestamp: Wall-clock time the send started
+            latency: Time spent sending, in seconds
+            sequence: Sequence number carried by the packet, if known
+            temp_index: Temperature index carried by the packet, if known
+            is_data: True for scheduled data packets (counted in the hourly rate)
+        """
+        self.last_broadcast = timestamp
+        self.last_latency = latency
+        if sequence is not None:
+            self.sequence = sequence
+        if temp_index is not None:
+            self.temperature_index = temp_index
+        if is_data:
+            now = time.monotonic()
+            self._recent.append(now)
+            self._prune(now)
+
+    def restore(
+        self, last_broadcast: float | None, sequence: int | None, temp_index: int | None
+    ) -> None:
+        """Seed the statistics from state persisted before a restart.
+
+        Args:
+            last_broadcast: Wall-clock time of the last broadcast, if known
+            sequence: Sequence number of the cached packet, if any
+            temp_index: Temperature index of the cached packet, if any
+        """
+        self.last_broadcast = last_broadcast
+        self.sequence = sequence
+        self.temperature_index = temp_index
+
+    def record_first_broadcast(self, delay: float, cached: bool) -> None:
+        """Record how long after its coordinator started a sensor first broadcast.
+
+        Args:
+            delay: Seconds since the coordinator started
+            cached: True if the broadcast used the cached reading
+        """
+        self.first_broadcast_delay = delay
+        self.first_broadcast_cached = cached
+
+    def record_failure(self, latency: float) -> None:
+        """Record a failed send.
+
+        Args:
+            latency: Time spent before the send failed, in seconds
+        """
+        self.send_failures += 1
+        self.last_latency = latency
+
+    def record_lateness(self, lateness: float) -> None:
+        """Record how late a scheduled broadcast went out.
+
+        Args:
+            lateness: Seconds between the intended deadline and the send
+        """
+        self.lateness.add(lateness)
+        if lateness >= LOOP_STALL_THRESHOLD:
+            # Wall-clock time lets this be matched against event-loop stalls
+            self.late_broadcasts.append(
+                {"timestamp": time.time(), "lateness_ms": round(lateness * 1000, 1)}
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the statistics for diagnostics."""
+        return {
+            "last_broadcast": self.last_broadcast,
+            "sequence": self.sequence,
+            "temperature_index": self.temperature_index,
+            "broadcasts_per_hour": self.broadcasts_per_hour,
+            "send_failures": self.send_failures,
+            "retries": self.retries,
+            "retry_recoveries": self.retry_recoveries,
+            "retry_drops": self.retry_drops,
+            "index_flips_suppressed": self.index_flips_suppressed,
+            "last_latency_ms": (
+                None if self.last_latency is None else round(self.last_latency * 1000, 1)
+            ),
+            "lateness": self.lateness.summary(),
+            "recent_late_broadcasts": list(self.late_broadcasts),
+            "first_broadcast_ms": (
+                None
+                if self.first_broadcast_delay is None
+                else round(self.first_broadcast_delay * 1000, 1)
+            ),
+            "first_broadcast_cached": self.first_broadcast_cached,
+        }
+
+    @property
+    def broadcasts_per_hour(self) -> int:
+        """Number of data broadcasts in the last hour."""
+        self._prune(time.monotonic())
+        return len(self._recent)
+
+    def _prune(self, now: float) -> None:
+        """Drop broadcast times that fell out of the rate window."""
+        recent = self._recent
+        cutoff = now - RATE_WINDOW
+        while recent and recent[0] < cutoff:
+            recent.popleft()
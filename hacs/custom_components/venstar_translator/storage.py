@@ -1,19 +1,27 @@
 """Storage management for Venstar Translator."""
 from __future__ import annotations
 
-import base64
 import logging
 import secrets
+from collections.abc import Callable
 from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
 
 from .const import (
+    AGGREGATE_MEAN,
+    DEFAULT_SETTINGS,
     MAX_SENSORS,
+    SETTING_ADAPTIVE_KEEPALIVE,
+    SOURCE_AGGREGATE,
+    SOURCE_ENTITY,
+    SOURCE_HTTP_JSON,
     STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
     STORAGE_VERSION,
 )
+from .registry import SensorRecord, SensorRegistry, parse_sensor_config
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,7 +38,23 @@ class VenstarTranslatorStorage:
         self.hass = hass
         self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
         self.mac_prefix: str | None = None
-        self.sensors: dict[str, dict[str, Any]] = {}
+        self.sensors = SensorRegistry()
+        self.settings: dict[str, Any] = dict(DEFAULT_SETTINGS)
+        self._listeners: list[Callable[[], None]] = []
+
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call a listener after every async_save.
+
+        Configuration changes (adding, editing, deleting and pairing sensors)
+        are saved right away with async_save, while broadcast sequence
+        updates use async_schedule_save, so listeners only hear about the
+        former.
+
+        Returns:
+            Function removing the listener
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
 
     async def async_load(self, mac_prefix: str | None = None) -> None:
         """Load data from storage.
@@ -45,11 +69,17 @@ class VenstarTranslatorStorage:
             _LOGGER.info("No existing storage found, initializing new storage")
             # Use the MAC prefix from config entry if provided, otherwise generate
             self.mac_prefix = mac_prefix or self._generate_mac_prefix()
-            self.sensors = {}
+            self.sensors = SensorRegistry()
+            self.settings = dict(DEFAULT_SETTINGS)
             await self.async_save()
         else:
             self.mac_prefix = data.get("mac_prefix")
-            self.sensors = data.get("sensors", {})
+            self.sensors = SensorRegistry.from_dict(data.get("sensors", {}))
+            settings = data.get("settings", {})
+            if "keepalive_multiple" in settings:
+                # Saved while the keepalive ceiling was a multiple; 1 meant off
+                settings[SETTING_ADAPTIVE_KEEPALIVE] = settings.pop("keepalive_multiple") > 1
+            self.settings = {**DEFAULT_SETTINGS, **settings}
             _LOGGER.info(
                 f"Loaded storage: MAC prefix={self.mac_prefix}, "
                 f"{len(self.sensors)} sensors configured"
@@ -57,12 +87,27 @@ class VenstarTranslatorStorage:
 
     async def async_save(self) -> None:
         """Save data to storage."""
-        data = {
+        await self._store.async_save(self._data_to_save())
+        _LOGGER.debug(f"Saved storage: {len(self.sensors)} sensors")
+        for listener in list(self._listeners):
+            listener()
+
+    def async_schedule_save(self) -> None:
+        """Save data to storage soon, without waiting for the write.
+
+        Used after broadcasts: every sensor's sequence update within the
+        delay is written in a single save, and the broadcast loop never waits
+        on disk I/O. Home Assistant flushes a pending save on shutdown.
+        """
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Build the persisted data layout."""
+        return {
             "mac_prefix": self.mac_prefix,
-            "sensors": self.sensors,
+            "sensors": self.sensors.as_dict(),
+            "settings": self.settings,
         }
-        await self._store.async_save(data)
-        _LOGGER.debug(f"Saved storage: {len(self.sensors)} sensors")
 
     def get_next_sensor_id(self) -> int | None:
         """Find the next available sensor ID (0-19).
@@ -70,11 +115,7 @@ class VenstarTranslatorStorage:
         Returns:
             Next available sensor ID, or None if all 20 slots are full
         """
-        used_ids = {int(sensor_id) for sensor_id in self.sensors.keys()}
-        for sensor_id in range(MAX_SENSORS):
-            if sensor_id not in used_ids:
-                return sensor_id
-        return None
+        return self.sensors.next_free_id()
 
     def add_sensor(
         self,
@@ -83,6 +124,11 @@ class VenstarTranslatorStorage:
         purpose: str,
         scale: str = "F",
         enabled: bool = True,
+        source: str = SOURCE_ENTITY,
+        http: dict[str, Any] | None = None,
+        aggregate: dict[str, Any] | None = None,
+        healthcheck_url: str | None = None,
+        filtering: dict[str, Any] | None = None,
     ) -> int:
         """Add a new sensor configuration.
 
@@ -92,6 +138,11 @@ class VenstarTranslatorStorage:
             purpose: Sensor purpose (Outdoor, Remote, Return, Supply)
             scale: Temperature scale (F or C)
             enabled: Whether sensor broadcasts are enabled
+            source: Temperature source (entity or http_json)
+            http: url, json_path, headers and ignore_ssl_errors (http_json source)
+            aggregate: members, aggregation, weights and max_age (aggregate source)
+            healthcheck_url: healthchecks.io ping URL for broadcast outcomes
+            filtering: smoothing, smoothing_samples and hysteresis (optional)
 
         Returns:
             Assigned sensor ID
@@ -100,24 +151,30 @@ class VenstarTranslatorStorage:
             ValueError: If no sensor IDs available or name already exists
         """
         # Check if name already exists
-        for sensor_config in self.sensors.values():
-            if sensor_config["name"] == name:
-                raise ValueError(f"Sensor name '{name}' already exists")
+        if self.sensors.id_for_name(name) is not None:
+            raise ValueError(f"Sensor name '{name}' already exists")
 
         # Get next available ID
-        sensor_id = self.get_next_sensor_id()
+        sensor_id = self.sensors.next_free_id()
         if sensor_id is None:
             raise ValueError(f"Cannot add sensor: maximum {MAX_SENSORS} sensors reached")
 
-        # Add sensor configuration
-        self.sensors[str(sensor_id)] = {
-            "entity_id": entity_id,
-            "name": name,
-            "purpose": purpose,
-            "scale": scale,
-            "enabled": enabled,
-            "sequence": 1,  # Initial sequence number
-        }
+        # Add sensor record (sequence starts at 1)
+        self.sensors.add(
+            SensorRecord(
+                sensor_id=sensor_id,
+                entity_id=entity_id,
+                name=name,
+                purpose=purpose,
+                scale=scale,
+                enabled=enabled,
+                source=source,
+                healthcheck_url=healthcheck_url or None,
+                **(filtering or {}),
+                **(http or {}),
+                **(aggregate or {}),
+            )
+        )
 
         _LOGGER.info(f"Added sensor {sensor_id}: {name} ({purpose})")
         return sensor_id
@@ -130,6 +187,11 @@ class VenstarTranslatorStorage:
         purpose: str | None = None,
         scale: str | None = None,
         enabled: bool | None = None,
+        source: str | None = None,
+        http: dict[str, Any] | None = None,
+        aggregate: dict[str, Any] | None = None,
+        healthcheck_url: str | None = None,
+        filtering: dict[str, Any] | None = None,
     ) -> None:
         """Update an existing sensor configuration.
 
@@ -140,34 +202,52 @@ class VenstarTranslatorStorage:
             purpose: New purpose (optional)
             scale: New scale (optional)
             enabled: New enabled state (optional)
+            source: New temperature source (optional); switching sources
+                clears the settings of the previous one
+            http: New url, json_path, headers and ignore_ssl_errors (optional)
+            aggregate: New members, aggregation, weights and max_age (optional)
+            healthcheck_url: New ping URL (optional); an empty string clears it
+            filtering: New smoothing, smoothing_samples and hysteresis (optional)
 
         Raises:
             ValueError: If sensor ID doesn't exist or new name conflicts
         """
-        sensor_id_str = str(sensor_id)
-        if sensor_id_str not in self.sensors:
+        record = self.sensors.get(sensor_id)
+        if record is None:
             raise ValueError(f"Sensor {sensor_id} does not exist")
 
-        # Check for name conflicts
+        # Rename first so a name conflict leaves the record untouched
         if name is not None:
-            for sid, config in self.sensors.items():
-                if sid != sensor_id_str and config["name"] == name:
-                    raise ValueError(f"Sensor name '{name}' already exists")
+            self.sensors.rename(record, name)
 
         # Update fields
-        sensor_config = self.sensors[sensor_id_str]
         if entity_id is not None:
-            sensor_config["entity_id"] = entity_id
-        if name is not None:
-            sensor_config["name"] = name
+            record.entity_id = entity_id
         if purpose is not None:
-            sensor_config["purpose"] = purpose
+            record.purpose = purpose
         if scale is not None:
-            sensor_config["scale"] = scale
+            record.scale = scale
         if enabled is not None:
-            sensor_config["enabled"] = enabled
-
-        _LOGGER.info(f"Updated sensor {sensor_id}: {sensor_config['name']}")
+            record.enabled = enabled
+        if source is not None:
+            record.source = source
+            if source != SOURCE_HTTP_JSON:
+                http = {"url": None, "json_path": None, "headers": {}, "ignore_ssl_errors": False}
+            if source != SOURCE_AGGREGATE:
+                aggregate = {
+                    "members": [],
+                    "aggregation": AGGREGATE_MEAN,
+                    "weights": {},
+                    "max_age": None,
+                }
+        for settings in (http, aggregate, filtering):
+            if settings is not None:
+                for field, value in settings.items():
+                    setattr(record, field, value)
+        if healthcheck_url is not None:
+            record.healthcheck_url = healthcheck_url or None
+
+        _LOGGER.info(f"Updated sensor {sensor_id}: {record.name}")
 
     def delete_sensor(self, sensor_id: int) -> None:
         """Delete a sensor configuration.
@@ -178,24 +258,115 @@ class VenstarTranslatorStorage:
         Raises:
             ValueError: If sensor ID doesn't exist
         """
-        sensor_id_str = str(sensor_id)
-        if sensor_id_str not in self.sensors:
-            raise ValueError(f"Sensor {sensor_id} does not exist")
+        record = self.sensors.remove(sensor_id)
+        _LOGGER.info(f"Deleted sensor {sensor_id}: {record.name}")
+
+    def export_sensors(self) -> list[dict[str, Any]]:
+        """Export every sensor's settings in the import_sensors layout."""
+        return [{"sensor_id": record.sensor_id, **record.config()} for record in self.sensors]
 
-        name = self.sensors[sensor_id_str]["name"]
-        del self.sensors[sensor_id_str]
-        _LOGGER.info(f"Deleted sensor {sensor_id}: {name}")
+    def import_sensors(
+        self, entries: list[dict[str, Any]], replace: bool = False
+    ) -> tuple[list[int], list[int], list[int]]:
+        """Add and update sensors from an exported document, all or nothing.
 
-    def get_sensor(self, sensor_id: int) -> dict[str, Any] | None:
-        """Get sensor configuration by ID.
+        An entry with a sensor_id configures that ID; one without updates the
+        sensor with the same name or is added under the lowest free ID.
+        Updated sensors keep their sequence and cached packet. Nothing is
+        saved; call async_save once afterwards.
+
+        Args:
+            entries: Sensor settings (export_sensors layout)
+            replace: Delete the sensors the document does not mention
+
+        Returns:
+            IDs of the added, updated (settings changed) and removed sensors
+
+        Raises:
+            ValueError: Listing every invalid entry; storage is left untouched
+        """
+        current = self.sensors
+        configs: dict[int, dict[str, Any]] = {}
+        unplaced: list[tuple[int, dict[str, Any]]] = []
+        errors = []
+        for position, entry in enumerate(entries):
+            try:
+                config = parse_sensor_config(entry)
+            except ValueError as e:
+                errors.append(f"entry {position}: {e}")
+                continue
+            sensor_id = config.pop("sensor_id")
+            if sensor_id is None:
+                sensor_id = current.id_for_name(config["name"])
+            if sensor_id is None:
+                unplaced.append((position, config))
+            elif sensor_id in configs:
+                errors.append(f"entry {position}: sensor {sensor_id} is listed twice")
+            else:
+                configs[sensor_id] = config
+
+        # Lay the result out in a scratch registry first; its name index and
+        # ID bitmap catch conflicts without touching the live records
+        layout = SensorRegistry()
+        kept = [] if replace else [record for record in current if record.sensor_id not in configs]
+        for record in kept:
+            layout.add(SensorRecord(record.sensor_id, "", record.name, record.purpose))
+        for sensor_id, config in configs.items():
+            try:
+                layout.add(SensorRecord(sensor_id, "", config["name"], config["purpose"]))
+            except ValueError as e:
+                errors.append(f"sensor {sensor_id}: {e}")
+        for position, config in unplaced:
+            sensor_id = layout.next_free_id()
+            if sensor_id is None:
+                errors.append(f"entry {position}: maximum {MAX_SENSORS} sensors reached")
+                continue
+            try:
+                layout.add(SensorRecord(sensor_id, "", config["name"], config["purpose"]))
+            except ValueError as e:
+                errors.append(f"entry {position}: {e}")
+                continue
+            configs[sensor_id] = config
+
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        # Records are updated in place, so running coordinators keep theirs
+        registry = SensorRegistry()
+        added, updated = [], []
+        for record in kept:
+            registry.add(record)
+        for sensor_id, config in sorted(configs.items()):
+            record = current.get(sensor_id)
+            if record is None:
+                record = SensorRecord(sensor_id=sensor_id, **config)
+                added.append(sensor_id)
+            else:
+                before = record.config()
+                for field, value in config.items():
+                    setattr(record, field, value)
+                if record.config() != before:
+                    updated.append(sensor_id)
+            registry.add(record)
+        removed = [record.sensor_id for record in current if record.sensor_id not in registry]
+        self.sensors = registry
+
+        _LOGGER.info(
+            f"Imported {len(entries)} sensors: {len(added)} added, "
+            f"{len(updated)} updated, {len(removed)} removed"
+        )
+        return added, updated, removed
+
+    def get_sensor(self, sensor_id: int) -> SensorRecord | None:
+        """Get sensor record by ID.
 
         Args:
             sensor_id: Sensor ID
 
         Returns:
-            Sensor configuration dict, or None if not found
+            Sensor record, or None if not found
         """
-        return self.sensors.get(str(sensor_id))
+        return self.sensors.get(sensor_id)
 
     def update_sequence(self, sensor_id: int, sequence: int) -> None:
         """Update sequence number for a sensor.
@@ -207,11 +378,11 @@ class VenstarTranslatorStorage:
         Raises:
             ValueError: If sensor ID doesn't exist
         """
-        sensor_id_str = str(sensor_id)
-        if sensor_id_str not in self.sensors:
+        record = self.sensors.get(sensor_id)
+        if record is None:
             raise ValueError(f"Sensor {sensor_id} does not exist")
 
-        self.sensors[sensor_id_str]["sequence"] = sequence
+        record.sequence = sequence
 
     def update_last_packet(self, sensor_id: int, packet: bytes) -> None:
         """Cache the last broadcast packet for a sensor.
@@ -220,11 +391,12 @@ class VenstarTranslatorStorage:
             sensor_id: Sensor ID
             packet: Raw packet bytes to cache
         """
-        sensor_id_str = str(sensor_id)
-        if sensor_id_str not in self.sensors:
+        record = self.sensors.get(sensor_id)
+        if record is None:
             raise ValueError(f"Sensor {sensor_id} does not exist")
 
-        self.sensors[sensor_id_str]["last_packet"] = base64.b64encode(packet).decode("utf-8")
+        # Kept as raw bytes in memory; base64-encoded only when saved
+        record.last_packet = packet
 
     def get_last_packet(self, sensor_id: int) -> bytes | None:
         """Get the cached last broadcast packet for a sensor.
@@ -235,15 +407,11 @@ class VenstarTranslatorStorage:
         Returns:
             Raw packet bytes, or None if no packet has been cached
         """
-        sensor_id_str = str(sensor_id)
-        if sensor_id_str not in self.sensors:
-            return None
-
-        encoded = self.sensors[sensor_id_str].get("last_packet")
-        if encoded is None:
+        record = self.sensors.get(sensor_id)
+        if record is None:
             return None
 
-        return base64.b64decode(encoded)
+        return record.last_packet
 
     @staticmethod
     def _generate_mac_prefix() -> str:
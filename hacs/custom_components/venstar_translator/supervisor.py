@@ -0,0 +1,598 @@
+"""Supervision of the out-of-process broadcast worker."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    DOMAIN,
+    HTTP_SOURCE_CACHE_TTL,
+    SETTING_ADAPTIVE_KEEPALIVE,
+    SOURCE_AGGREGATE,
+    SOURCE_ENTITY,
+    SOURCE_HTTP_JSON,
+    WORKER_HEARTBEAT_INTERVAL,
+    WORKER_HEARTBEAT_TIMEOUT,
+    WORKER_RESTART_BACKOFF,
+    WORKER_RESTART_BACKOFF_MAX,
+    WORKER_STABLE_TIME,
+    WORKER_STOP_TIMEOUT,
+)
+from .ratelimit import get_broadcast_interval
+from .sources import (
+    async_get_temperature,
+    describe_source,
+    read_aggregate_temperature,
+    read_entity_temperature,
+)
+from .worker import (
+    MSG_CONFIG,
+    MSG_REPEAT_COUNT,
+    MSG_SENT,
+    MSG_SKIPPED,
+    MSG_TEMPERATURE,
+    MSG_UNAVAILABLE,
+    encode_message,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+
+    from .registry import SensorRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# The directory holding custom_components/, so the worker can import this package
+_PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _next_sequence(sequence: int) -> int:
+    """Return the sequence following another, wrapping like VenstarSensor."""
+    sequence += 1
+    return 1 if sequence >= 65000 else sequence
+
+
+class WorkerSupervisor:
+    """Runs the broadcast worker (worker.py) for a config entry.
+
+    Replaces the coordinators in the worker broadcast mode. The worker
+    schedules and sends every enabled sensor on its own; the supervisor
+    pushes it the sensor configuration (on start and after every
+    configuration save) and each source reading as it changes, and applies
+    the worker's send reports to storage, statistics and healthchecks pings
+    just like a coordinator would. Smoothing, hysteresis and the adaptive
+    cadence run in the worker; the delivery trackers stay here, fed by the
+    response listener, and each repeat count change is pushed to the worker
+    with the next report of that sensor.
+
+    Storage stays the authority on sequences. Each sensor has a generation
+    that changes whenever its settings change or its sequence is changed
+    outside the worker (pairing resets it to 1); the worker restarts the
+    sensor from the stored sequence, and reports sent under an older
+    generation don't touch the stored sequence.
+
+    A worker that exits, or stays silent for WORKER_HEARTBEAT_TIMEOUT
+    seconds, is restarted with exponential backoff. A crashed worker may
+    have sent a packet it never reported, so each sensor skips one sequence
+    number on restart rather than risk reusing one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry ID
+        """
+        self.hass = hass
+        self.entry_id = entry_id
+        self._process: asyncio.subprocess.Process | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: asyncio.Task | None = None
+        self._stopping = False
+        self._started: float | None = None  # Event-loop time of async_start()
+        self._spawned_at = 0.0  # Event-loop time the current worker started
+        self._last_message = 0.0  # Event-loop time of the worker's last message
+        self._generations: dict[int, int] = {}
+        # Settings and sequence each sensor was last configured with, for
+        # the sensors the worker broadcasts
+        self._settings: dict[int, tuple] = {}
+        self._expected: dict[int, int] = {}
+        self._repeat_counts: dict[int, int] = {}  # Last repeat count pushed per sensor
+        self._entity_sensors: dict[str, list[int]] = {}
+        self._http_values: dict[int, float | None] = {}
+        self._http_tasks: dict[int, asyncio.Task] = {}
+        self._remove_listener: Any = None
+        self._remove_aggregate_listener: Any = None
+        self._unsubscribe_states: Any = None
+        self.paused: set[int] = set()  # Sensors in a pairing session
+        self.restarts = 0
+        self.watchdog_kills = 0
+        self.reports = 0
+        self.skips = 0  # Broadcasts the worker's cadence skipped
+        self.stale_reports = 0  # Reports for a superseded generation
+
+    @property
+    def _data(self) -> dict[str, Any]:
+        """Get the config entry's objects from hass.data."""
+        return self.hass.data[DOMAIN][self.entry_id]
+
+    @property
+    def _storage(self):
+        """Get storage instance from hass.data."""
+        return self._data["storage"]
+
+    @property
+    def _broadcaster(self):
+        """Get broadcaster instance from hass.data."""
+        return self._data["broadcaster"]
+
+    @property
+    def running(self) -> bool:
+        """Return True while a worker process is alive."""
+        return self._process is not None and self._process.returncode is None
+
+    def is_broadcasting(self, sensor_id: int) -> bool:
+        """Return True if the running worker broadcasts a sensor."""
+        return self.running and sensor_id in self._settings
+
+    async def async_start(self) -> None:
+        """Start the worker and keep it running until async_stop."""
+        loop = asyncio.get_running_loop()
+        self._stopping = False
+        self._started = loop.time()
+        self._remove_listener = self._storage.async_add_listener(self.sync)
+        self._remove_aggregate_listener = self._data["aggregates"].async_add_listener(
+            self._on_aggregate_change
+        )
+        self._task = loop.create_task(self._supervise())
+        self._watchdog = loop.create_task(self._watch())
+
+    async def async_stop(self) -> None:
+        """Stop the worker, applying the reports it writes before exiting."""
+        self._stopping = True
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._remove_aggregate_listener is not None:
+            self._remove_aggregate_listener()
+            self._remove_aggregate_listener = None
+        if self._unsubscribe_states is not None:
+            self._unsubscribe_states()
+            self._unsubscribe_states = None
+        self._entity_sensors = {}
+        for task in (self._watchdog, *self._http_tasks.values()):
+            if task is not None:
+                task.cancel()
+        self._http_tasks = {}
+
+        process = self._process
+        if process is not None and process.returncode is None:
+            # The worker exits when its stdin closes
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), WORKER_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Broadcast worker did not exit, killing it")
+                process.kill()
+                await process.wait()
+        elif self._task is not None:
+            # Waiting to restart; nothing left to apply
+            self._task.cancel()
+
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, WORKER_STOP_TIMEOUT)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+    async def _supervise(self) -> None:
+        """Start the worker, and restart it whenever it exits."""
+        loop = asyncio.get_running_loop()
+        backoff = WORKER_RESTART_BACKOFF
+        crashed = False
+        while not self._stopping:
+            try:
+                process = await self._async_spawn(crashed)
+            except OSError as e:
+                _LOGGER.error(f"Cannot start broadcast worker, retrying in {backoff:.0f} s: {e}")
+            else:
+                readers = [
+                    loop.create_task(self._read_reports(process.stdout)),
+                    loop.create_task(self._read_log(process.stderr)),
+                ]
+                try:
+                    # Both pipes reach EOF when the worker exits
+                    await asyncio.gather(*readers)
+                    returncode = await process.wait()
+                finally:
+                    for reader in readers:
+                        reader.cancel()
+                    if process.returncode is None:
+                        process.kill()
+                if self._stopping:
+                    return
+                if loop.time() - self._spawned_at >= WORKER_STABLE_TIME:
+                    backoff = WORKER_RESTART_BACKOFF
+                _LOGGER.warning(
+                    f"Broadcast worker exited with code {returncode}, restarting in {backoff:.0f} s"
+                )
+
+            self.restarts += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, WORKER_RESTART_BACKOFF_MAX)
+            crashed = True
+
+    async def _async_spawn(self, crashed: bool) -> asyncio.subprocess.Process:
+        """Start a worker process and configure it.
+
+        Args:
+            crashed: True if a previous worker exited unexpectedly
+
+        Raises:
+            OSError: If the process cannot be started
+        """
+        storage = self._storage
+        # Read HTTP sources first so their first broadcast isn't skipped
+        await asyncio.gather(
+            *(
+                self._async_read_http(sensor)
+                for sensor in storage.sensors
+                if sensor.enabled
+                and sensor.source == SOURCE_HTTP_JSON
+                and sensor.sensor_id not in self._http_values
+            )
+        )
+
+        # Same interpreter and import path, so protobuf resolves as it does here
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join([str(_PACKAGE_ROOT), *(path for path in sys.path if path)])
+        args = [sys.executable, "-m", f"{__package__}.worker"]
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            args.append("--debug")
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=_PACKAGE_ROOT,
+            env=env,
+        )
+        self._process = process
+        self._spawned_at = self._last_message = asyncio.get_running_loop().time()
+        _LOGGER.info(f"Started broadcast worker (pid {process.pid})")
+
+        if crashed:
+            # The old worker may have sent a packet it never reported
+            for sensor in storage.sensors:
+                if sensor.sensor_id in self._settings:
+                    sensor.sequence = _next_sequence(sensor.sequence)
+            storage.async_schedule_save()
+        # The new worker has no sensors; every sensor gets a new generation
+        self._settings = {}
+        self.sync()
+        return process
+
+    def sync(self) -> None:
+        """Push the sensor configuration and current readings to the worker.
+
+        Called when the worker starts and after every configuration save.
+        """
+        storage = self._storage
+        broadcaster = self._broadcaster
+        now = asyncio.get_running_loop().time()
+
+        entries = []
+        enabled = []
+        for sensor in storage.sensors:
+            sensor_id = sensor.sensor_id
+            if not sensor.enabled or sensor_id in self.paused:
+                continue
+            enabled.append(sensor)
+            settings = (sensor.name, sensor.purpose, sensor.scale, storage.mac_prefix)
+            if settings != self._settings.get(sensor_id) or sensor.sequence != self._expected.get(sensor_id):
+                self._generations[sensor_id] = self._generations.get(sensor_id, 0) + 1
+                self._settings[sensor_id] = settings
+                self._expected[sensor_id] = sensor.sequence
+            # A (re)started sensor waits out its rate limit, e.g. after a crash
+            delay = broadcaster.ledger_for(sensor_id).time_until_allowed(now, sensor.purpose)
+            repeat_count = self._repeat_counts[sensor_id] = broadcaster.delivery_for(
+                sensor_id
+            ).repeat_count
+            entries.append([
+                sensor_id,
+                self._generations[sensor_id],
+                sensor.name,
+                sensor.purpose,
+                sensor.scale,
+                sensor.sequence,
+                round(delay, 3),
+                self._reading(sensor),
+                sensor.smoothing,
+                sensor.smoothing_samples,
+                sensor.hysteresis,
+                storage.settings[SETTING_ADAPTIVE_KEEPALIVE],
+                repeat_count,
+            ])
+
+        enabled_ids = {sensor.sensor_id for sensor in enabled}
+        for sensor_id in list(self._settings):
+            if sensor_id not in enabled_ids:
+                del self._settings[sensor_id]
+                self._expected.pop(sensor_id, None)
+                self._repeat_counts.pop(sensor_id, None)
+
+        self._update_sources(enabled)
+        self._write(MSG_CONFIG, storage.mac_prefix, entries)
+
+    def pause(self, sensor_ids: list[int]) -> None:
+        """Stop broadcasting sensors' data packets until resume() (pairing sessions)."""
+        self.paused.update(sensor_ids)
+        self.sync()
+
+    def resume(self, sensor_ids: list[int]) -> None:
+        """Broadcast paused sensors again, from their stored sequence."""
+        self.paused.difference_update(sensor_ids)
+        self.sync()
+
+    def _reading(self, sensor: SensorRecord) -> float | None:
+        """Return the latest reading of a sensor's source."""
+        if sensor.source == SOURCE_HTTP_JSON:
+            return self._http_values.get(sensor.sensor_id)
+        if sensor.source == SOURCE_AGGREGATE:
+            return read_aggregate_temperature(self.hass, sensor, self._data["aggregates"])
+        return read_entity_temperature(self.hass, sensor.entity_id)
+
+    def _update_sources(self, sensors: list[SensorRecord]) -> None:
+        """Follow the sources of the broadcast sensors.
+
+        Entity sources are pushed on state changes; HTTP sources are polled
+        (through the entry's shared fetcher) and pushed. Aggregate sources
+        are pushed by _on_aggregate_change and _watch.
+        """
+        from homeassistant.helpers.event import async_track_state_change_event
+
+        entity_sensors: dict[str, list[int]] = {}
+        http_ids = set()
+        for sensor in sensors:
+            if sensor.source == SOURCE_HTTP_JSON:
+                http_ids.add(sensor.sensor_id)
+            elif sensor.source == SOURCE_ENTITY and sensor.entity_id:
+                entity_sensors.setdefault(sensor.entity_id, []).append(sensor.sensor_id)
+
+        if entity_sensors.keys() != self._entity_sensors.keys():
+            if self._unsubscribe_states is not None:
+                self._unsubscribe_states()
+                self._unsubscribe_states = None
+            if entity_sensors:
+                self._unsubscribe_states = async_track_state_change_event(
+                    self.hass, list(entity_sensors), self._on_state_change
+                )
+        self._entity_sensors = entity_sensors
+
+        for sensor_id in list(self._http_tasks):
+            if sensor_id not in http_ids:
+                self._http_tasks.pop(sensor_id).cancel()
+                self._http_values.pop(sensor_id, None)
+        loop = asyncio.get_running_loop()
+        for sensor_id in http_ids - self._http_tasks.keys():
+            self._http_tasks[sensor_id] = loop.create_task(self._poll_http(sensor_id))
+
+    def _on_state_change(self, event: Event) -> None:
+        """Push a source entity's new reading."""
+        entity_id = event.data["entity_id"]
+        temperature = read_entity_temperature(self.hass, entity_id)
+        for sensor_id in self._entity_sensors.get(entity_id, ()):
+            self._write(MSG_TEMPERATURE, sensor_id, temperature)
+
+    def _on_aggregate_change(self, sensor_id: int) -> None:
+        """Push an aggregate source's new value."""
+        if sensor_id in self._settings:
+            self._write(MSG_TEMPERATURE, sensor_id, self._data["aggregates"].value(sensor_id))
+
+    def _push_expiring_aggregates(self) -> None:
+        """Push aggregates whose stale members may have been dropped since the last event."""
+        for sensor in self._storage.sensors:
+            if (
+                sensor.source == SOURCE_AGGREGATE
+                and sensor.max_age is not None
+                and sensor.sensor_id in self._settings
+            ):
+                self._on_aggregate_change(sensor.sensor_id)
+
+    async def _async_read_http(self, sensor: SensorRecord) -> float | None:
+        """Read an HTTP source and remember the reading."""
+        temperature = await async_get_temperature(self.hass, self._data["http"], sensor)
+        self._http_values[sensor.sensor_id] = temperature
+        return temperature
+
+    async def _poll_http(self, sensor_id: int) -> None:
+        """Poll an HTTP source and push each reading."""
+        while (sensor := self._storage.get_sensor(sensor_id)) is not None:
+            temperature = await self._async_read_http(sensor)
+            self._write(MSG_TEMPERATURE, sensor_id, temperature)
+            await asyncio.sleep(min(get_broadcast_interval(sensor.purpose), HTTP_SOURCE_CACHE_TTL))
+
+    def _write(self, *fields: Any) -> None:
+        """Send one message to the worker, if it is running."""
+        process = self._process
+        if process is None or process.returncode is not None or process.stdin.is_closing():
+            return
+        process.stdin.write(encode_message(*fields))
+
+    async def _read_reports(self, stream: asyncio.StreamReader) -> None:
+        """Apply the worker's messages until its stdout closes."""
+        loop = asyncio.get_running_loop()
+        while line := await stream.readline():
+            self._last_message = loop.time()
+            try:
+                message = json.loads(line)
+                tag = message[0]
+                if tag == MSG_SENT:
+                    self._on_sent(message)
+                elif tag == MSG_SKIPPED:
+                    self._on_skipped(message[1], message[2])
+                elif tag == MSG_UNAVAILABLE:
+                    self._on_unavailable(message[1])
+                # Heartbeats only refresh _last_message
+            except (ValueError, IndexError, TypeError, KeyError) as e:
+                _LOGGER.warning(f"Ignoring malformed worker message {line!r}: {e}")
+
+    async def _read_log(self, stream: asyncio.StreamReader) -> None:
+        """Relay the worker's log lines into Home Assistant's log."""
+        level = logging.WARNING
+        while line := await stream.readline():
+            text = line.decode("utf-8", errors="replace").rstrip()
+            level_name, _, message = text.partition(" ")
+            line_level = logging.getLevelName(level_name)
+            if isinstance(line_level, int):
+                level = line_level
+            else:
+                # A traceback line continues the previous record
+                message = text
+            _LOGGER.log(level, "Worker: %s", message)
+
+    def _on_sent(self, message: list[Any]) -> None:
+        """Apply a send report."""
+        (
+            _,
+            sensor_id,
+            generation,
+            sequence,
+            next_sequence,
+            temp_index,
+            temperature,
+            timestamp,
+            duration,
+            lateness,
+            packet,
+            error,
+            suppressed,
+            retry,
+            dropped,
+        ) = message
+        sensor = self._storage.get_sensor(sensor_id)
+        if sensor is None:
+            return
+        self.reports += 1
+        packet = base64.b64decode(packet)
+
+        broadcaster = self._broadcaster
+        broadcaster.record_external_send(
+            sensor_id, packet, sequence, temp_index, temperature, timestamp, duration, error is None
+        )
+        self._push_repeat_count(sensor_id)
+        stats = broadcaster.stats_for(sensor_id)
+        if retry:
+            stats.retries += 1
+            if error is None:
+                stats.retry_recoveries += 1
+        else:
+            if suppressed:
+                stats.index_flips_suppressed += 1
+            stats.record_lateness(lateness)
+            broadcaster.lanes.record_lateness(sensor.purpose, lateness + duration)
+        if dropped:
+            stats.retry_drops += 1
+        if stats.first_broadcast_delay is None and self._started is not None:
+            stats.record_first_broadcast(asyncio.get_running_loop().time() - self._started, False)
+
+        if sensor_id in self._settings and generation == self._generations.get(sensor_id):
+            sensor.sequence = self._expected[sensor_id] = next_sequence
+            if error is None:
+                sensor.last_packet = packet
+                sensor.last_temperature = temperature
+                sensor.last_broadcast = timestamp
+            self._storage.async_schedule_save()
+        else:
+            self.stale_reports += 1
+
+        if error is None:
+            self._report_health(sensor, True)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Worker broadcast sensor %s (%s): %s°%s (seq=%s)",
+                    sensor_id, sensor.name, temperature, sensor.scale, sequence,
+                )
+        else:
+            self._report_health(sensor, False, f"OSError: {error}")
+
+    def _on_skipped(self, sensor_id: int, suppressed: bool) -> None:
+        """Handle a broadcast the worker skipped because its index was unchanged."""
+        sensor = self._storage.get_sensor(sensor_id)
+        if sensor is None:
+            return
+        self.skips += 1
+        if suppressed:
+            self._broadcaster.stats_for(sensor_id).index_flips_suppressed += 1
+        self._push_repeat_count(sensor_id)
+        self._report_health(sensor, True)
+
+    def _push_repeat_count(self, sensor_id: int) -> None:
+        """Send the worker a sensor's repeat count if its delivery tracker changed it."""
+        if sensor_id not in self._repeat_counts:
+            return
+        repeat_count = self._broadcaster.delivery_for(sensor_id).repeat_count
+        if repeat_count != self._repeat_counts[sensor_id]:
+            self._repeat_counts[sensor_id] = repeat_count
+            self._write(MSG_REPEAT_COUNT, sensor_id, repeat_count)
+
+    def _on_unavailable(self, sensor_id: int) -> None:
+        """Handle a broadcast the worker skipped for lack of a reading."""
+        sensor = self._storage.get_sensor(sensor_id)
+        if sensor is None:
+            return
+        message = f"temperature unavailable from {describe_source(sensor)}"
+        _LOGGER.warning(f"Sensor {sensor_id} ({sensor.name}): {message}")
+        self._report_health(sensor, False, message)
+
+    def _report_health(self, sensor: SensorRecord, success: bool, body: str = "") -> None:
+        """Queue a healthchecks.io ping for a scheduled broadcast, if configured."""
+        if sensor.healthcheck_url:
+            self._data["healthchecks"].ping(sensor.healthcheck_url, success, body)
+
+    async def _watch(self) -> None:
+        """Kill a worker that stopped sending heartbeats (the supervisor restarts it)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(WORKER_HEARTBEAT_INTERVAL)
+            self._push_expiring_aggregates()
+            now = loop.time()
+            if now - before > 2 * WORKER_HEARTBEAT_INTERVAL:
+                # Home Assistant's own loop stalled; let the readers catch up first
+                continue
+            process = self._process
+            silence = now - self._last_message
+            if process is None or process.returncode is not None or silence <= WORKER_HEARTBEAT_TIMEOUT:
+                continue
+            self.watchdog_kills += 1
+            _LOGGER.warning(f"Broadcast worker silent for {silence:.0f} s, killing it")
+            self._last_message = now
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the worker's state for diagnostics."""
+        running = self.running
+        now = asyncio.get_running_loop().time()
+        return {
+            "running": running,
+            "pid": self._process.pid if running else None,
+            "uptime": round(now - self._spawned_at, 1) if running else None,
+            "last_message_age": round(now - self._last_message, 1) if running else None,
+            "restarts": self.restarts,
+            "watchdog_kills": self.watchdog_kills,
+            "reports": self.reports,
+            "skips": self.skips,
+            "stale_reports": self.stale_reports,
+        }
@@ -0,0 +1,236 @@
+"""Compact recordings of source readings and broadcasts, for replay.
+
+A timeline file is gzip-compressed JSON lines: a header object with the MAC
+prefix and sensor configuration, followed by one array per event, ordered by
+time (seconds since the recording started)::
+
+    [t, "r", sensor_id, temperature or null]                  source reading
+    [t, "b", sensor_id, kind, sequence, temperature_index]    broadcast
+
+The recorder below captures a live system; replay.py replays a file against
+the real coordinator under a virtual clock.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import SOURCE_ENTITY
+from .packet_trace import KIND_DATA, KIND_NAMES
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+
+    from .broadcaster import Broadcaster
+    from .storage import VenstarTranslatorStorage
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMELINE_FORMAT = "venstar-timeline"
+TIMELINE_VERSION = 1
+
+EVENT_READING = "r"
+EVENT_BROADCAST = "b"
+
+_KIND_IDS = {name: kind for kind, name in KIND_NAMES.items()}
+
+
+class TimelineError(ValueError):
+    """Raised when a timeline file is malformed or has an unsupported version."""
+
+
+class Timeline:
+    """Source readings and broadcasts of a set of sensors over time."""
+
+    __slots__ = ("mac_prefix", "sensors", "duration", "readings", "broadcasts")
+
+    def __init__(self, mac_prefix: str, sensors: dict[int, dict[str, Any]]) -> None:
+        """Initialize an empty timeline.
+
+        Args:
+            mac_prefix: MAC prefix the sensors broadcast with
+            sensors: Sensor configuration (SensorRecord.as_dict layout) by ID
+        """
+        self.mac_prefix = mac_prefix
+        self.sensors = sensors
+        self.duration = 0.0
+        # (time, sensor ID, temperature or None)
+        self.readings: list[tuple[float, int, float | None]] = []
+        # (time, sensor ID, kind, sequence, temperature index)
+        self.broadcasts: list[tuple[float, int, int, int | None, int | None]] = []
+
+    def write(self, path: str) -> None:
+        """Write the timeline to a gzip-compressed JSON lines file."""
+        events = [
+            (t, EVENT_READING, sensor_id, value) for t, sensor_id, value in self.readings
+        ]
+        events.extend(
+            (t, EVENT_BROADCAST, sensor_id, KIND_NAMES[kind], sequence, temp_index)
+            for t, sensor_id, kind, sequence, temp_index in self.broadcasts
+        )
+        events.sort(key=lambda event: event[0])
+
+        header = {
+            "format": TIMELINE_FORMAT,
+            "version": TIMELINE_VERSION,
+            "mac_prefix": self.mac_prefix,
+            "duration": round(self.duration, 3),
+            "sensors": {str(sensor_id): data for sensor_id, data in self.sensors.items()},
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps(header, separators=(",", ":")))
+            file.write("\n")
+            for event in events:
+                file.write(json.dumps([round(event[0], 3), *event[1:]], separators=(",", ":")))
+                file.write("\n")
+
+    @classmethod
+    def read(cls, path: str) -> Timeline:
+        """Read a timeline file.
+
+        Raises:
+            TimelineError: If the file is not a supported timeline
+            OSError: If the file cannot be read
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                header = json.loads(file.readline())
+            except ValueError as e:
+                raise TimelineError(f"{path}: not a timeline file ({e})") from e
+            if not isinstance(header, dict) or header.get("format") != TIMELINE_FORMAT:
+                raise TimelineError(f"{path}: not a timeline file")
+            if header.get("version") != TIMELINE_VERSION:
+                raise TimelineError(f"{path}: unsupported version {header.get('version')}")
+
+            timeline = cls(
+                header["mac_prefix"],
+                {int(sensor_id): data for sensor_id, data in header["sensors"].items()},
+            )
+            timeline.duration = header.get("duration", 0.0)
+            readings = timeline.readings
+            broadcasts = timeline.broadcasts
+            for line_number, line in enumerate(file, 2):
+                try:
+                    event = json.loads(line)
+                    if event[1] == EVENT_READING:
+                        readings.append((event[0], event[2], event[3]))
+                    elif event[1] == EVENT_BROADCAST:
+                        broadcasts.append(
+                            (event[0], event[2], _KIND_IDS[event[3]], event[4], event[5])
+                        )
+                except (ValueError, IndexError, KeyError, TypeError) as e:
+                    raise TimelineError(f"{path}:{line_number}: malformed event ({e})") from e
+
+        if timeline.duration == 0.0 and (readings or broadcasts):
+            timeline.duration = max(
+                readings[-1][0] if readings else 0.0,
+                broadcasts[-1][0] if broadcasts else 0.0,
+            )
+        return timeline
+
+
+class TimelineRecorder:
+    """Records a live config entry's source readings and broadcasts.
+
+    Entity readings come from state change events. HTTP JSON sources have no
+    events, so the temperature carried by each data broadcast is recorded as
+    their reading instead.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage: VenstarTranslatorStorage,
+        broadcaster: Broadcaster,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            hass: Home Assistant instance
+            storage: Storage of the config entry being recorded
+            broadcaster: Broadcaster of the config entry being recorded
+        """
+        self.hass = hass
+        self._broadcaster = broadcaster
+        self._started = time.time()
+        self._entity_sensors: dict[str, list[int]] = {}
+        self._unsubscribers: list[Any] = []
+
+        sensors = {}
+        for sensor in storage.sensors:
+            data = sensor.as_dict()
+            # Replays start cold; warm start state is wall-clock dependent
+            for key in ("last_packet", "last_temperature", "last_broadcast"):
+                data.pop(key, None)
+            sensors[sensor.sensor_id] = data
+            if sensor.source == SOURCE_ENTITY and sensor.entity_id:
+                self._entity_sensors.setdefault(sensor.entity_id, []).append(sensor.sensor_id)
+        self.timeline = Timeline(storage.mac_prefix, sensors)
+
+    @property
+    def recording(self) -> bool:
+        """Return True while the recorder is subscribed."""
+        return bool(self._unsubscribers)
+
+    def start(self) -> None:
+        """Record the current readings and subscribe to changes."""
+        from homeassistant.helpers.event import async_track_state_change_event
+
+        self._started = time.time()
+        for entity_id in self._entity_sensors:
+            self._record_state(entity_id, self.hass.states.get(entity_id))
+
+        self._unsubscribers.append(self._broadcaster.events.subscribe(self._on_broadcasts))
+        if self._entity_sensors:
+            self._unsubscribers.append(
+                async_track_state_change_event(
+                    self.hass, list(self._entity_sensors), self._on_state_change
+                )
+            )
+
+    def stop(self) -> Timeline:
+        """Unsubscribe and return the recorded timeline."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        self.timeline.duration = time.time() - self._started
+        return self.timeline
+
+    def _on_state_change(self, event: Event) -> None:
+        """Record a source entity state change."""
+        self._record_state(event.data["entity_id"], event.data.get("new_state"))
+
+    def _record_state(self, entity_id: str, state: Any) -> None:
+        """Record the reading an entity state gives its sensors."""
+        try:
+            value = float(state.state) if state is not None else None
+        except ValueError:
+            value = None
+        t = time.time() - self._started
+        for sensor_id in self._entity_sensors[entity_id]:
+            self.timeline.readings.append((t, sensor_id, value))
+
+    def _on_broadcasts(self, events: list[dict[str, Any]]) -> None:
+        """Record a batch of broadcast events."""
+        timeline = self.timeline
+        for event in events:
+            if event["result"] != "ok":
+                continue
+            t = event["timestamp"] - self._started
+            sensor_id = event["sensor_id"]
+            kind = _KIND_IDS[event["kind"]]
+            temperature = event["temperature"]
+            sensor = timeline.sensors.get(sensor_id)
+            if (
+                kind == KIND_DATA
+                and temperature is not None
+                and sensor is not None
+                and sensor.get("source", SOURCE_ENTITY) != SOURCE_ENTITY
+            ):
+                timeline.readings.append((t, sensor_id, temperature))
+            timeline.broadcasts.append(
+                (t, sensor_id, kind, event["sequence"], event["temperature_index"])
+            )
@@ -100,6 +100,21 @@ def get_temperature_index(temperature: float, scale: str) -> int:
     return index
 
 
+def get_mac_address(mac_prefix: str, sensor_id: int) -> str:
+    """Build a sensor's MAC address from the MAC prefix and sensor ID."""
+    return f"{mac_prefix}{sensor_id:02x}".lower()
+
+
+def get_signature_key(mac_address: str) -> str:
+    """Derive a sensor's HMAC key from its MAC address (SHA256 hash, base64 encoded).
+
+    Pairing packets carry this key as their signature; data packets are
+    signed with HMAC-SHA256 using the decoded key.
+    """
+    sha256_hash = hashlib.sha256(mac_address.encode('utf-8')).digest()
+    return base64.b64encode(sha256_hash).decode('utf-8')
+
+
 class VenstarSensor:
     """Represents a Venstar wireless temperature sensor.
 
@@ -131,18 +146,18 @@ class VenstarSensor:
         self.purpose = purpose
         self.scale = scale
         self.sequence = sequence
+        # Temperature index carried by the most recently built packet
+        self.temperature_index: int | None = None
 
     @property
     def mac_address(self) -> str:
         """Generate MAC address from prefix and sensor ID."""
-        return f"{self.mac_prefix}{self.sensor_id:02x}".lower()
+        return get_mac_address(self.mac_prefix, self.sensor_id)
 
     @property
     def signature_key(self) -> str:
         """Generate HMAC key from MAC address (SHA256 hash, base64 encoded)."""
-        mac_bytes = self.mac_address.encode('utf-8')
-        sha256_hash = hashlib.sha256(mac_bytes).digest()
-        return base64.b64encode(sha256_hash).decode('utf-8')
+        return get_signature_key(self.mac_address)
 
     def generate_signature(self, info_bytes: bytes) -> str:
         """Generate HMAC-SHA256 signature for INFO protobuf.
@@ -187,11 +202,16 @@ class VenstarSensor:
 
         # Get temperature index for lookup table
         temp_index = get_temperature_index(temperature, self.scale)
+        self.temperature_index = temp_index
 
-        _LOGGER.debug(
-            f"Building data packet for sensor {self.sensor_id} ({self.name}): "
-            f"temp={temperature}°{self.scale}, temp_index={temp_index}, seq={self.sequence}"
-        )
+        # Hot path: only format log messages when DEBUG is actually enabled
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug(
+                "Building data packet for sensor %s (%s): "
+                "temp=%s°%s, temp_index=%s, seq=%s",
+                self.sensor_id, self.name, temperature, self.scale, temp_index, self.sequence,
+            )
 
         # Build INFO message
         info = sensor_message_pb2.INFO(
@@ -212,10 +232,11 @@ class VenstarSensor:
         info_bytes = info.SerializeToString()
         signature = self.generate_signature(info_bytes)
 
-        _LOGGER.debug(
-            f"Sensor {self.sensor_id}: INFO bytes={len(info_bytes)}, "
-            f"signature={signature[:16]}... (truncated)"
-        )
+        if debug:
+            _LOGGER.debug(
+                "Sensor %s: INFO bytes=%s, signature=%s... (truncated)",
+                self.sensor_id, len(info_bytes), signature[:16],
+            )
 
         # Build SENSORDATA message
         sensor_data = sensor_message_pb2.SENSORDATA(
@@ -235,10 +256,11 @@ class VenstarSensor:
             self.sequence = 1
 
         packet = message.SerializeToString()
-        _LOGGER.debug(
-            f"Sensor {self.sensor_id}: Built data packet, size={len(packet)} bytes, "
-            f"next_seq={self.sequence}"
-        )
+        if debug:
+            _LOGGER.debug(
+                "Sensor %s: Built data packet, size=%s bytes, next_seq=%s",
+                self.sensor_id, len(packet), self.sequence,
+            )
 
         return packet
 
@@ -258,6 +280,7 @@ class VenstarSensor:
         from .protobuf import sensor_message_pb2
 
         temp_index = get_temperature_index(temperature, self.scale)
+        self.temperature_index = temp_index
 
         _LOGGER.info(
             f"Building PAIRING packet for sensor {self.sensor_id} ({self.name}): "
@@ -308,32 +331,36 @@ class VenstarSensor:
         return packet
 
 
-def broadcast_udp_packet(packet: bytes, port: int = UDP_PORT) -> None:
+def broadcast_udp_packet(
+    packet: bytes,
+    port: int = UDP_PORT,
+    repeat_count: int = BROADCAST_REPEAT_COUNT,
+    address: str = BROADCAST_ADDRESS,
+) -> None:
     """Broadcast UDP packet to the network.
 
-    Sends the packet 5 times to 255.255.255.255:5001 (Venstar protocol requirement).
+    Sends the packet 5 times (by default) to 255.255.255.255:5001 (Venstar
+    protocol requirement).
 
     Args:
         packet: Serialized protobuf packet to broadcast
         port: UDP port (default: 5001)
+        repeat_count: Number of copies to send (default: 5)
+        address: Destination address (default: the limited broadcast address)
     """
     try:
-        _LOGGER.debug(
-            f"Broadcasting UDP packet: size={len(packet)} bytes, "
-            f"destination={BROADCAST_ADDRESS}:{port}, repeats={BROADCAST_REPEAT_COUNT}, "
-            f"hex={packet.hex()[:64]}... (truncated)"
-        )
-
+        destination = (address, port)
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            for i in range(BROADCAST_REPEAT_COUNT):
-                bytes_sent = sock.sendto(packet, (BROADCAST_ADDRESS, port))
-                _LOGGER.debug(
-                    f"UDP broadcast {i+1}/{BROADCAST_REPEAT_COUNT}: "
-                    f"sent {bytes_sent} bytes to {BROADCAST_ADDRESS}:{port}"
-                )
+            for _ in range(repeat_count):
+                sock.sendto(packet, destination)
 
-        _LOGGER.debug(f"Successfully broadcast {BROADCAST_REPEAT_COUNT} UDP packets")
+        # Hot path: the packet trace records every send; hex dumps only at DEBUG
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Broadcast UDP packet %s times to %s:%s: size=%s bytes, hex=%s... (truncated)",
+                repeat_count, address, port, len(packet), packet.hex()[:64],
+            )
 
     except Exception as e:
         _LOGGER.error(
@@ -342,3 +369,51 @@ def broadcast_udp_packet(packet: bytes, port: int = UDP_PORT) -> None:
             exc_info=True
         )
         raise
+
+
+class BroadcastSocket:
+    """A UDP broadcast socket kept open across sends.
+
+    broadcast_udp_packet opens a socket per packet, which is right for a
+    send every minute or so; a pairing session repeats its bursts for
+    minutes and sends them all through one of these instead.
+    """
+
+    __slots__ = ("_sock", "_address")
+
+    def __init__(self, address: str = BROADCAST_ADDRESS) -> None:
+        """Open the socket.
+
+        Args:
+            address: Destination address (default: the limited broadcast address)
+
+        Raises:
+            OSError: If the socket cannot be opened
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._address = address
+
+    def send(
+        self,
+        packet: bytes,
+        port: int = UDP_PORT,
+        repeat_count: int = BROADCAST_REPEAT_COUNT,
+    ) -> None:
+        """Broadcast a packet, like broadcast_udp_packet but on the open socket.
+
+        Raises:
+            OSError: If the packet could not be sent
+        """
+        destination = (self._address, port)
+        for _ in range(repeat_count):
+            self._sock.sendto(packet, destination)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._sock.close()
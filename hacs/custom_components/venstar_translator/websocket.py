@@ -0,0 +1,63 @@
+"""Websocket API for Venstar Translator."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, MAX_SENSORS
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_broadcasts)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_broadcasts",
+        vol.Optional("sensor_ids"): [vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_SENSORS - 1))],
+    }
+)
+@callback
+def websocket_subscribe_broadcasts(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream broadcast events to the client, one message per tick.
+
+    Each message carries {"events": [...]} with the sensor ID, packet kind,
+    sequence, temperature, temperature index, start time, send duration and
+    result of every packet sent during that tick.
+    """
+    sensor_ids = set(msg["sensor_ids"]) if "sensor_ids" in msg else None
+
+    @callback
+    def forward_events(events: list[dict[str, Any]]) -> None:
+        """Forward a batch of events to the websocket client."""
+        if sensor_ids is not None:
+            events = [event for event in events if event["sensor_id"] in sensor_ids]
+            if not events:
+                return
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"events": events})
+        )
+
+    unsubscribers = [
+        entry_data["broadcaster"].events.subscribe(forward_events)
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+    ]
+
+    @callback
+    def unsubscribe() -> None:
+        """Stop streaming when the client unsubscribes or disconnects."""
+        for unsub in unsubscribers:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
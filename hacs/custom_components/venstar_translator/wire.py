@@ -0,0 +1,165 @@
+"""Minimal zero-copy decoder for Venstar SensorMessage packets.
+
+Decodes the subset of protobuf wire format used by sensor_message.proto
+straight from a memoryview, without building pb2 objects. The INFO
+submessage is returned as a view of the original bytes, so HMAC signatures
+can be verified against exactly what was sent on the wire.
+"""
+from __future__ import annotations
+
+# SensorMessage.Commands values (see protobuf/sensor_message.proto)
+COMMAND_SENSORDATA = 42
+COMMAND_SENSORPAIR = 43
+COMMAND_SUCCESS = 126
+COMMAND_FAILURE = 127
+
+# Wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+
+class DecodeError(ValueError):
+    """Raised when a packet is not a well-formed SensorMessage."""
+
+
+class DecodedMessage:
+    """Fields of a decoded SensorMessage (INFO fields are None when absent)."""
+
+    __slots__ = (
+        "command",
+        "sequence",
+        "sensor_id",
+        "mac",
+        "name",
+        "sensor_type",
+        "temperature",
+        "signature",
+        "info",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty message."""
+        self.command: int | None = None
+        self.sequence: int | None = None
+        self.sensor_id: int | None = None
+        self.mac: str | None = None
+        self.name: str | None = None
+        self.sensor_type: int | None = None
+        self.temperature: int | None = None
+        self.signature: str | None = None
+        self.info: memoryview | None = None  # Raw serialized INFO submessage
+
+
+def _read_varint(buf: memoryview, pos: int, end: int) -> tuple[int, int]:
+    """Read a varint, returning (value, new position)."""
+    result = 0
+    shift = 0
+    while pos < end:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            break
+    raise DecodeError("Truncated or oversized varint")
+
+
+def _iter_fields(buf: memoryview, pos: int, end: int):
+    """Yield (field number, wire type, value) for each field in buf[pos:end].
+
+    Varints are yielded as ints, length-delimited fields as memoryview
+    slices (no copy), fixed-width fields as None.
+    """
+    # Keys, lengths and most values in a SensorMessage fit in one byte, so
+    # those are read inline and only longer varints go through _read_varint
+    while pos < end:
+        key = buf[pos]
+        if key < 0x80:
+            pos += 1
+        else:
+            key, pos = _read_varint(buf, pos, end)
+        field, wire_type = key >> 3, key & 0x07
+        if wire_type == _VARINT:
+            if pos < end and buf[pos] < 0x80:
+                value = buf[pos]
+                pos += 1
+            else:
+                value, pos = _read_varint(buf, pos, end)
+            yield field, wire_type, value
+        elif wire_type == _LENGTH_DELIMITED:
+            if pos < end and buf[pos] < 0x80:
+                length = buf[pos]
+                pos += 1
+            else:
+                length, pos = _read_varint(buf, pos, end)
+            if pos + length > end:
+                raise DecodeError("Length-delimited field overruns message")
+            yield field, wire_type, buf[pos:pos + length]
+            pos += length
+        elif wire_type == _FIXED64:
+            pos += 8
+            yield field, wire_type, None
+        elif wire_type == _FIXED32:
+            pos += 4
+            yield field, wire_type, None
+        else:
+            raise DecodeError(f"Unsupported wire type {wire_type}")
+    if pos != end:
+        raise DecodeError("Field overruns message")
+
+
+def _decode_info(info: memoryview, message: DecodedMessage) -> None:
+    """Decode INFO fields into message."""
+    for field, wire_type, value in _iter_fields(info, 0, len(info)):
+        if wire_type == _VARINT:
+            if field == 1:
+                message.sequence = value
+            elif field == 2:
+                message.sensor_id = value
+            elif field == 9:
+                message.sensor_type = value
+            elif field == 10:
+                message.temperature = value
+        elif wire_type == _LENGTH_DELIMITED:
+            if field == 3:
+                message.mac = str(value, "utf-8", "replace")
+            elif field == 8:
+                message.name = str(value, "utf-8", "replace")
+
+
+def decode_sensor_message(data: bytes | bytearray | memoryview) -> DecodedMessage:
+    """Decode a SensorMessage packet.
+
+    Args:
+        data: Raw UDP payload
+
+    Returns:
+        Decoded message
+
+    Raises:
+        DecodeError: If the payload is not a well-formed SensorMessage
+    """
+    buf = data if isinstance(data, memoryview) else memoryview(data)
+    message = DecodedMessage()
+
+    for field, wire_type, value in _iter_fields(buf, 0, len(buf)):
+        if field == 1 and wire_type == _VARINT:
+            message.command = value
+        elif field == 42 and wire_type == _LENGTH_DELIMITED:
+            # SENSORDATA: 1 = INFO, 2 = Signature
+            for sub_field, sub_type, sub_value in _iter_fields(value, 0, len(value)):
+                if sub_type != _LENGTH_DELIMITED:
+                    continue
+                if sub_field == 1:
+                    message.info = sub_value
+                    _decode_info(sub_value, message)
+                elif sub_field == 2:
+                    message.signature = str(sub_value, "utf-8", "replace")
+
+    if message.command is None:
+        raise DecodeError("Missing required Command field")
+    return message
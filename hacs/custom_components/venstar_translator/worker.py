@@ -0,0 +1,358 @@
+"""Out-of-process broadcaster, driven by Home Assistant over a pipe.
+
+In the worker broadcast mode the integration runs this module as a child
+process so scheduled broadcasts keep their cadence while Home Assistant's
+event loop is stalled::
+
+    python -m custom_components.venstar_translator.worker
+
+Smoothing, hysteresis, the adaptive cadence, packet building, signing,
+scheduling and sending happen here, in the standalone daemon's broadcast
+loop. Home Assistant only pushes readings, sensor configuration and the
+delivery trackers' repeat counts, and supervisor.py applies what the worker
+reports. Both directions carry one compact JSON array per line, tag first::
+
+    Home Assistant -> worker (stdin)
+    ["c", mac_prefix, [[sensor_id, generation, name, purpose, scale,
+                        sequence, delay, temperature, smoothing,
+                        smoothing_samples, hysteresis, adaptive_keepalive,
+                        repeat_count], ...]]                      configuration
+    ["t", sensor_id, temperature or null]                         reading
+    ["r", sensor_id, repeat_count]                                repeat count
+
+    worker -> Home Assistant (stdout)
+    ["s", sensor_id, generation, sequence, next_sequence, temperature_index,
+     temperature, timestamp, duration, lateness, packet, error,
+     suppressed, retry, dropped]                                  send
+    ["k", sensor_id, suppressed]                                  skipped
+    ["u", sensor_id]                                              unavailable
+    ["h"]                                                         heartbeat
+
+A configuration message lists every sensor to broadcast; sensors missing
+from it are stopped. A new sensor, or one whose generation changed, starts
+over from the message's sequence after ``delay`` seconds; otherwise the
+worker keeps its own (newer) sequence, and only picks up changed filter and
+keepalive settings. ``packet`` is base64, ``error`` null for a successful
+send, and ``suppressed`` true if hysteresis held back an index change. A
+skipped broadcast repeated the last index before its keepalive was due. A
+failed send is retried with backoff until the next packet is due; each
+attempt is reported, ``retry`` counting the attempts before it and
+``dropped`` true on the failed attempt after which the packet is given up
+(the next packet then reuses its sequence). Logging goes to stderr, and the
+worker exits when its stdin closes, so it never outlives Home Assistant.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import sys
+import time
+from typing import Any
+
+from .cadence import AdaptiveCadence, get_keepalive_ceiling
+from .const import (
+    BROADCAST_REPEAT_COUNT,
+    PACKET_PREPARE_LEAD,
+    RETRY_INITIAL_DELAY,
+    RETRY_MAX_DELAY,
+    UDP_PORT,
+    WORKER_HEARTBEAT_INTERVAL,
+)
+from .daemon import BroadcastDaemon, TemperatureSource
+from .filtering import ReadingFilter
+from .ratelimit import get_broadcast_interval
+from .venstar_sensor import VenstarSensor, broadcast_udp_packet, get_temperature_index
+
+_LOGGER = logging.getLogger(__name__)
+
+MSG_CONFIG = "c"
+MSG_TEMPERATURE = "t"
+MSG_REPEAT_COUNT = "r"
+MSG_SENT = "s"
+MSG_SKIPPED = "k"
+MSG_UNAVAILABLE = "u"
+MSG_HEARTBEAT = "h"
+
+
+def encode_message(*fields: Any) -> bytes:
+    """Encode one protocol message as a JSON line."""
+    return json.dumps(fields, separators=(",", ":")).encode() + b"\n"
+
+
+class PushedSource(TemperatureSource):
+    """The latest reading Home Assistant pushed for a sensor."""
+
+    def __init__(self, options: dict[str, Any], sensor_id: int) -> None:
+        """Initialize the source."""
+        super().__init__(options, sensor_id)
+        self.temperature: float | None = options.get("temperature")
+
+    async def async_read(self) -> float | None:
+        """Return the latest pushed temperature."""
+        return self.temperature
+
+
+class BroadcastWorker(BroadcastDaemon):
+    """Broadcasts the sensors Home Assistant configures over stdin."""
+
+    def __init__(self) -> None:
+        """Initialize the worker with no sensors."""
+        super().__init__({"mac_prefix": "", "sensors": []})
+        self.generations: dict[int, int] = {}
+        self.filters: dict[int, ReadingFilter | None] = {}
+        self.cadences: dict[int, AdaptiveCadence] = {}
+        self.repeat_counts: dict[int, int] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._output: asyncio.WriteTransport | None = None
+
+    def _emit(self, *fields: Any) -> None:
+        """Write one message to Home Assistant.
+
+        stdout is a non-blocking pipe transport, so a stalled Home Assistant
+        that stops reading never holds up a broadcast.
+        """
+        if self._output is not None and not self._output.is_closing():
+            self._output.write(encode_message(*fields))
+
+    def handle(self, message: list[Any]) -> None:
+        """Apply one message from Home Assistant."""
+        tag = message[0]
+        if tag == MSG_TEMPERATURE:
+            source = self.sources.get(message[1])
+            if source is not None:
+                source.temperature = message[2]
+        elif tag == MSG_REPEAT_COUNT:
+            if message[1] in self.sensors:
+                self.repeat_counts[message[1]] = message[2]
+        elif tag == MSG_CONFIG:
+            self._configure(message[1], message[2])
+        else:
+            _LOGGER.warning(f"Ignoring unknown message {tag!r}")
+
+    def _configure(self, mac_prefix: str, sensors: list[list[Any]]) -> None:
+        """Start, restart and stop sensors to match a configuration message."""
+        configured = {entry[0] for entry in sensors}
+        for sensor_id in list(self._tasks):
+            if sensor_id not in configured:
+                self._stop_sensor(sensor_id)
+
+        for (
+            sensor_id, generation, name, purpose, scale, sequence, delay, temperature,
+            smoothing, smoothing_samples, hysteresis, adaptive_keepalive, repeat_count,
+        ) in sensors:
+            filter_settings = (smoothing, smoothing_samples, hysteresis, scale)
+            ceiling = get_keepalive_ceiling(purpose, adaptive_keepalive)
+            if self.generations.get(sensor_id) == generation and sensor_id in self._tasks:
+                self.sources[sensor_id].temperature = temperature
+                self.repeat_counts[sensor_id] = repeat_count
+                self.cadences[sensor_id].ceiling = ceiling
+                # A rebuilt filter starts over, as in the coordinators
+                reading_filter = self.filters[sensor_id]
+                if reading_filter is None or reading_filter.settings != filter_settings:
+                    self.filters[sensor_id] = ReadingFilter.from_settings(filter_settings)
+                continue
+
+            self._stop_sensor(sensor_id)
+            sensor = self.sensors[sensor_id] = VenstarSensor(
+                sensor_id=sensor_id,
+                mac_prefix=mac_prefix,
+                name=name,
+                purpose=purpose,
+                scale=scale,
+                sequence=sequence,
+            )
+            self.sources[sensor_id] = PushedSource({"temperature": temperature}, sensor_id)
+            self.generations[sensor_id] = generation
+            self.filters[sensor_id] = ReadingFilter.from_settings(filter_settings)
+            self.cadences[sensor_id] = AdaptiveCadence(get_broadcast_interval(purpose), ceiling)
+            self.repeat_counts[sensor_id] = repeat_count
+            self._tasks[sensor_id] = asyncio.create_task(self._broadcast_loop(sensor, delay))
+            _LOGGER.info(
+                f"Sensor {sensor_id} ({name}): generation {generation}, sequence {sequence}, "
+                f"first broadcast in {delay:.1f} s"
+            )
+
+    def _stop_sensor(self, sensor_id: int) -> None:
+        """Cancel a sensor's broadcast loop and forget it."""
+        task = self._tasks.pop(sensor_id, None)
+        if task is not None:
+            task.cancel()
+        self.lanes.release(sensor_id)
+        self.sensors.pop(sensor_id, None)
+        self.sources.pop(sensor_id, None)
+        self.generations.pop(sensor_id, None)
+        self.filters.pop(sensor_id, None)
+        self.cadences.pop(sensor_id, None)
+        self.repeat_counts.pop(sensor_id, None)
+
+    async def _async_broadcast(
+        self, sensor: VenstarSensor, temperature: float, lateness: float
+    ) -> float | None:
+        """Filter a reading, then build, send and report one scheduled data packet.
+
+        A packet repeating the last broadcast's index is skipped (and
+        reported as such) until the sensor's keepalive interval is up. A
+        failed send is retried with exponential backoff, as in the
+        coordinators: only the latest packet, refreshed against the latest
+        unfiltered reading, until the next scheduled packet supersedes it.
+        Every attempt is reported.
+
+        Returns:
+            Event-loop time the packet's send started, or None if none went out
+        """
+        loop = asyncio.get_running_loop()
+        sensor_id = sensor.sensor_id
+        suppressed = False
+        reading_filter = self.filters.get(sensor_id)
+        if reading_filter is not None:
+            temperature, suppressed = reading_filter.apply(temperature)
+        cadence = self.cadences[sensor_id]
+        if cadence.should_skip(get_temperature_index(temperature, sensor.scale), loop.time()):
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Sensor %s: index unchanged, skipping broadcast (keepalive every %s s)",
+                    sensor_id, min(cadence.keepalive, cadence.ceiling),
+                )
+            self._emit(MSG_SKIPPED, sensor_id, suppressed)
+            return None
+
+        # Retries end when the next scheduled packet is about to be due
+        until = loop.time() - lateness + get_broadcast_interval(sensor.purpose) - PACKET_PREPARE_LEAD
+        delay = RETRY_INITIAL_DELAY
+        retry = 0
+        sequence = sensor.sequence
+        packet = sensor.build_data_packet(temperature)
+        next_sequence = sensor.sequence
+        while True:
+            timestamp = time.time()
+            sent_at = loop.time()
+            started = time.monotonic()
+            error = None
+            try:
+                await loop.run_in_executor(
+                    None,
+                    broadcast_udp_packet,
+                    packet,
+                    UDP_PORT,
+                    self.repeat_counts.get(sensor_id, BROADCAST_REPEAT_COUNT),
+                )
+                sensor.sequence = next_sequence
+            except OSError as e:
+                # The retry, or else the next packet, reuses the sequence
+                sensor.sequence = sequence
+                error = str(e)
+            dropped = error is not None and loop.time() + delay >= until
+
+            self._emit(
+                MSG_SENT,
+                sensor_id,
+                self.generations.get(sensor_id),
+                sequence,
+                sensor.sequence,
+                sensor.temperature_index,
+                temperature,
+                round(timestamp, 3),
+                round(time.monotonic() - started, 4),
+                round(lateness, 3),
+                base64.b64encode(packet).decode("ascii"),
+                error,
+                suppressed,
+                retry,
+                dropped,
+            )
+
+            if error is None:
+                cadence.record_send(sensor.temperature_index, sent_at)
+                if retry:
+                    _LOGGER.info(
+                        f"Sensor {sensor_id} ({sensor.name}): packet sent after "
+                        f"{retry} {'retry' if retry == 1 else 'retries'}"
+                    )
+                return sent_at
+            if dropped:
+                cadence.record_failure()
+                _LOGGER.error(
+                    f"Error broadcasting sensor {sensor_id} ({sensor.name}): {error}, "
+                    f"dropping packet after {retry} {'retry' if retry == 1 else 'retries'}"
+                )
+                return None
+            if retry:
+                _LOGGER.debug("Sensor %s: retry %s failed: %s", sensor_id, retry, error)
+            else:
+                _LOGGER.error(f"Error broadcasting sensor {sensor_id} ({sensor.name}): {error}, retrying")
+
+            # Due low priority broadcasts needn't wait out the retries
+            self.lanes.release(sensor_id)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+            retry += 1
+
+            source = self.sources.get(sensor_id)
+            latest = source.temperature if source is not None else None
+            if reading_filter is None and latest is not None and latest != temperature:
+                temperature = latest
+                if get_temperature_index(temperature, sensor.scale) != sensor.temperature_index:
+                    packet = sensor.build_data_packet(temperature)
+                    next_sequence = sensor.sequence
+
+    def _report_unavailable(self, sensor: VenstarSensor) -> None:
+        """Report a broadcast skipped for lack of a reading."""
+        self._emit(MSG_UNAVAILABLE, sensor.sensor_id)
+
+    async def _heartbeat_loop(self, interval: float) -> None:
+        """Tell Home Assistant the worker's event loop is alive."""
+        while True:
+            self._emit(MSG_HEARTBEAT)
+            await asyncio.sleep(interval)
+
+    async def async_run(self, heartbeat_interval: float = WORKER_HEARTBEAT_INTERVAL) -> None:
+        """Process messages from stdin until it closes."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        self._output, _ = await loop.connect_write_pipe(asyncio.Protocol, sys.stdout)
+
+        heartbeat = asyncio.create_task(self._heartbeat_loop(heartbeat_interval))
+        try:
+            while line := await reader.readline():
+                try:
+                    self.handle(json.loads(line))
+                except (ValueError, IndexError, TypeError, KeyError) as e:
+                    _LOGGER.warning(f"Ignoring malformed message {line!r}: {e}")
+            _LOGGER.info("Standard input closed, stopping")
+        finally:
+            tasks = [heartbeat, *self._tasks.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._output.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the worker (started by the integration, not by hand)."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.venstar_translator.worker",
+        description="Broadcast emulated Venstar sensors for Home Assistant over stdin/stdout.",
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args(argv)
+
+    # The supervisor parses the level name back out of each line
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(levelname)s %(message)s",
+    )
+
+    try:
+        asyncio.run(BroadcastWorker().async_run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
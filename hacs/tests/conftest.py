@@ -0,0 +1,111 @@
+"""Shared fixtures for the Venstar Translator tests."""
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable, Iterator
+from typing import Any, NamedTuple
+
+import aiohttp
+import pytest
+
+from custom_components.venstar_translator.replay import VirtualClockLoop
+
+
+@pytest.fixture
+def virtual_loop() -> Iterator[VirtualClockLoop]:
+    """Event loop on a virtual clock, so timers fire without real waiting."""
+    loop = VirtualClockLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run_for(virtual_loop) -> Callable[[float], None]:
+    """Let the virtual clock run for a number of seconds."""
+
+    def run(seconds: float) -> None:
+        virtual_loop.run_until_complete(asyncio.sleep(seconds))
+
+    return run
+
+
+class FakeRequestRecord(NamedTuple):
+    """A request the fake session received."""
+
+    time: float  # Event-loop time
+    method: str
+    url: str
+    headers: dict[str, str]
+
+
+class FakeResponse:
+    """Response of the fake session."""
+
+    def __init__(self, status: int, body: Any = b"", headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body if isinstance(self._body, bytes) else json.dumps(self._body).encode()
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientError(f"HTTP {self.status}")
+
+
+class _FakeRequest:
+    """Async context manager returned by the fake session's get() and post()."""
+
+    def __init__(self, session: FakeSession, method: str, url: str, headers: dict[str, str]) -> None:
+        self._session = session
+        self._record = (method, url, headers)
+
+    async def __aenter__(self) -> FakeResponse:
+        session = self._session
+        method, url, headers = self._record
+        session.requests.append(
+            FakeRequestRecord(asyncio.get_running_loop().time(), method, url, headers)
+        )
+        if session.latency:
+            await asyncio.sleep(session.latency)
+        if session.error is not None:
+            raise session.error
+        if session.etag is not None and headers.get("If-None-Match") == session.etag:
+            return FakeResponse(304)
+        response_headers = {"ETag": session.etag} if session.etag is not None else {}
+        return FakeResponse(session.status, session.body, response_headers)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class FakeSession:
+    """Stands in for aiohttp.ClientSession: serves one document and records every request.
+
+    GETs honour If-None-Match against ``etag``; ``error`` is raised by
+    every request while set.
+    """
+
+    def __init__(self) -> None:
+        self.body: Any = {}
+        self.etag: str | None = None
+        self.latency = 0.0  # Seconds each request takes
+        self.status = 200
+        self.error: Exception | None = None
+        self.requests: list[FakeRequestRecord] = []
+
+    def get(
+        self, url: str, headers: dict[str, str] | None = None, ssl: bool = True, timeout: Any = None
+    ) -> _FakeRequest:
+        return _FakeRequest(self, "GET", url, headers or {})
+
+    def post(self, url: str, data: bytes = b"", timeout: Any = None) -> _FakeRequest:
+        return _FakeRequest(self, "POST", url, {})
+
+
+@pytest.fixture
+def fake_session() -> FakeSession:
+    """A fake aiohttp session answering 200 with an empty document."""
+    return FakeSession()
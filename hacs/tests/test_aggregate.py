@@ -0,0 +1,118 @@
+"""Tests for the incrementally maintained aggregates."""
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from custom_components.venstar_translator.aggregate import Aggregate
+from custom_components.venstar_translator.const import (
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MEDIAN,
+    AGGREGATE_MIN,
+    AGGREGATE_WEIGHTED,
+)
+
+
+@pytest.mark.parametrize(
+    ("aggregation", "expected"),
+    [
+        (AGGREGATE_MEAN, statistics.fmean),
+        (AGGREGATE_MIN, min),
+        (AGGREGATE_MAX, max),
+        (AGGREGATE_MEDIAN, statistics.median),
+    ],
+)
+def test_incremental_value_matches_recomputation(aggregation, expected) -> None:
+    """Random updates and drops keep the value equal to a full recomputation."""
+    rng = random.Random(aggregation)
+    aggregate = Aggregate(aggregation)
+    readings: dict[str, float] = {}
+    for _ in range(2000):
+        member = f"sensor.member_{rng.randrange(8)}"
+        if rng.random() < 0.1:
+            aggregate.update(member, None)
+            readings.pop(member, None)
+        else:
+            value = round(rng.uniform(60.0, 80.0), 1)
+            aggregate.update(member, value)
+            readings[member] = value
+
+        assert len(aggregate) == len(readings)
+        if readings:
+            assert aggregate.value(now=0.0) == pytest.approx(expected(readings.values()))
+        else:
+            assert aggregate.value(now=0.0) is None
+
+
+def test_weighted_mean() -> None:
+    """Members count by their weight; unlisted members weigh 1."""
+    aggregate = Aggregate(AGGREGATE_WEIGHTED, {"sensor.a": 3.0})
+    aggregate.update("sensor.a", 70.0)
+    aggregate.update("sensor.b", 74.0)
+    assert aggregate.value(now=0.0) == pytest.approx(71.0)
+
+    aggregate.update("sensor.a", 66.0)
+    assert aggregate.value(now=0.0) == pytest.approx(68.0)
+
+    aggregate.update("sensor.a", None)
+    assert aggregate.value(now=0.0) == pytest.approx(74.0)
+
+
+def test_last_member_gone_resets_running_sums() -> None:
+    """Emptying a mean leaves no rounding residue for the next members."""
+    aggregate = Aggregate(AGGREGATE_MEAN)
+    for value in (70.1, 70.2, 70.3):
+        aggregate.update("sensor.a", value)
+    aggregate.update("sensor.a", None)
+    assert aggregate.value(now=0.0) is None
+
+    aggregate.update("sensor.b", 0.3)
+    assert aggregate.value(now=0.0) == 0.3
+
+
+def test_silent_members_expire() -> None:
+    """Members without a report for max_age seconds are dropped."""
+    aggregate = Aggregate(AGGREGATE_MEAN, max_age=60)
+    aggregate.update("sensor.a", 70.0, reported=0.0)
+    aggregate.update("sensor.b", 74.0, reported=50.0)
+
+    assert aggregate.value(now=59.0) == 72.0
+    assert aggregate.value(now=100.0) == 74.0
+    assert len(aggregate) == 1
+    assert aggregate.value(now=200.0) is None
+
+
+def test_newer_report_supersedes_expiry() -> None:
+    """A member that reported again is not dropped for its older report."""
+    aggregate = Aggregate(AGGREGATE_MEAN, max_age=60)
+    aggregate.update("sensor.a", 70.0, reported=0.0)
+    aggregate.update("sensor.a", 71.0, reported=40.0)
+
+    assert aggregate.value(now=90.0) == 71.0
+    assert aggregate.value(now=101.0) is None
+
+
+def test_refresh_keeps_member_that_reported_unchanged() -> None:
+    """The last look before dropping picks up an unchanged, re-reported reading."""
+    aggregate = Aggregate(AGGREGATE_MEAN, max_age=60)
+    aggregate.update("sensor.a", 70.0, reported=0.0)
+
+    def refresh(member: str) -> tuple[float, float] | None:
+        return 70.0, 95.0
+
+    assert aggregate.value(now=100.0, refresh=refresh) == 70.0
+    assert aggregate.value(now=150.0) == 70.0
+    assert aggregate.value(now=160.0, refresh=lambda member: None) is None
+
+
+def test_expiry_heap_is_compacted() -> None:
+    """Frequent reports from few members don't grow the expiry heap without bound."""
+    aggregate = Aggregate(AGGREGATE_MEAN, max_age=60)
+    for reported in range(10000):
+        aggregate.update(f"sensor.member_{reported % 3}", 70.0, reported=float(reported))
+
+    assert len(aggregate._expiry) <= 2 * 3 + 32
+    assert aggregate.value(now=10000.0) == 70.0
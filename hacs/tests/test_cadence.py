@@ -0,0 +1,62 @@
+"""Tests for the adaptive broadcast cadence."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.venstar_translator.cadence import AdaptiveCadence, get_keepalive_ceiling
+from custom_components.venstar_translator.const import (
+    DEFAULT_SENSOR_TIMEOUT,
+    OUTDOOR_SENSOR_TIMEOUT,
+    PURPOSE_OUTDOOR,
+    PURPOSE_REMOTE,
+    PURPOSE_RETURN,
+    PURPOSE_SUPPLY,
+    VALID_PURPOSES,
+)
+from custom_components.venstar_translator.ratelimit import get_broadcast_interval
+
+
+@pytest.mark.parametrize(
+    ("purpose", "adaptive", "ceiling"),
+    [
+        (PURPOSE_REMOTE, False, 60),
+        (PURPOSE_REMOTE, True, 120),
+        (PURPOSE_SUPPLY, True, 120),
+        (PURPOSE_RETURN, True, 120),
+        (PURPOSE_OUTDOOR, True, 300),
+        (PURPOSE_OUTDOOR, False, 300),
+    ],
+)
+def test_keepalive_ceiling(purpose, adaptive, ceiling) -> None:
+    """Adaptive sensors stretch to the safe cap; others keep their interval."""
+    assert get_keepalive_ceiling(purpose, adaptive) == ceiling
+
+
+@pytest.mark.parametrize("purpose", VALID_PURPOSES)
+def test_lost_keepalive_stays_inside_sensor_timeout(purpose) -> None:
+    """Two ceilings (one keepalive lost) plus an interval of lateness fit in the timeout."""
+    interval = get_broadcast_interval(purpose)
+    timeout = OUTDOOR_SENSOR_TIMEOUT if purpose == PURPOSE_OUTDOOR else DEFAULT_SENSOR_TIMEOUT
+    for adaptive in (False, True):
+        ceiling = get_keepalive_ceiling(purpose, adaptive)
+        assert ceiling % interval == 0
+        assert 2 * ceiling + interval <= timeout
+
+
+def test_keepalive_grows_to_ceiling_and_resets() -> None:
+    """Repeats stretch the keepalive one interval at a time; a change or failure resets it."""
+    cadence = AdaptiveCadence(60, 120)
+    cadence.record_send(140, 0.0)
+    assert not cadence.should_skip(140, 60.0)
+    cadence.record_send(140, 60.0)
+    assert cadence.should_skip(140, 120.0)
+    assert not cadence.should_skip(140, 180.0)
+    assert not cadence.should_skip(141, 120.0)
+
+    cadence.record_send(140, 180.0)
+    assert cadence.keepalive == 120
+    cadence.record_failure()
+    assert cadence.keepalive == 60
+    cadence.record_send(141, 240.0)
+    assert cadence.keepalive == 60
+    assert cadence.changes == 2
@@ -0,0 +1,118 @@
+"""Tests for the coordinator's prepare-ahead broadcasts."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from custom_components.venstar_translator.broadcaster import Broadcaster
+from custom_components.venstar_translator.const import (
+    DEFAULT_INTERVAL,
+    PACKET_PREPARE_LEAD,
+    PURPOSE_REMOTE,
+    SETTING_ADAPTIVE_KEEPALIVE,
+)
+from custom_components.venstar_translator.coordinator import VenstarSensorCoordinator
+from custom_components.venstar_translator.registry import SensorRecord, SensorRegistry
+from custom_components.venstar_translator.replay import ReplayHass, ReplayStorage
+from custom_components.venstar_translator.venstar_sensor import get_temperature_index
+from custom_components.venstar_translator.wire import decode_sensor_message
+
+ENTITY_ID = "sensor.kitchen"
+
+
+class _Harness:
+    """One Remote sensor's coordinator on the virtual clock, recording its packets."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.hass = ReplayHass(loop, 0.0)
+        registry = SensorRegistry()
+        self.record = SensorRecord(0, ENTITY_ID, "Kitchen", PURPOSE_REMOTE)
+        registry.add(self.record)
+        storage = ReplayStorage("0123456789", registry)
+        # Every deadline is sent, so each one shows in the packets
+        storage.settings[SETTING_ADAPTIVE_KEEPALIVE] = False
+        self.sent: list[tuple[float, Any]] = []  # (time since start, decoded packet)
+        self.prepared: list[float] = []  # Times since start packets were built
+        broadcaster = Broadcaster(
+            self.hass,
+            storage,
+            send=lambda packet, port, repeat_count: self.sent.append(
+                (self.loop.time() - self.start, decode_sensor_message(packet))
+            ),
+        )
+        coordinators = self.hass.add_entry("entry", storage, broadcaster)
+        self.coordinator = coordinators[0] = VenstarSensorCoordinator(self.hass, "entry", 0)
+
+        prepare = self.coordinator._prepare_packet
+
+        def record_prepare(temperature: float) -> Any:
+            self.prepared.append(self.loop.time() - self.start)
+            return prepare(temperature)
+
+        self.coordinator._prepare_packet = record_prepare
+        self.start = loop.time()
+
+    def run_until(self, when: float) -> None:
+        """Run the loop until the given time since start."""
+        self.loop.run_until_complete(asyncio.sleep(self.start + when - self.loop.time()))
+
+
+@pytest.fixture
+def harness(virtual_loop) -> Iterator[_Harness]:
+    """Started coordinator reading 70.0 from its entity."""
+    harness = _Harness(virtual_loop)
+    harness.hass.states.set(ENTITY_ID, 70.0)
+    virtual_loop.run_until_complete(harness.coordinator.start())
+    yield harness
+    virtual_loop.run_until_complete(harness.coordinator.stop())
+
+
+def test_packet_is_built_ahead_and_sent_on_deadline(harness) -> None:
+    """Each packet is built PACKET_PREPARE_LEAD early and sent at its deadline."""
+    harness.run_until(2 * DEFAULT_INTERVAL + 1)
+
+    deadlines = [0.0, DEFAULT_INTERVAL, 2 * DEFAULT_INTERVAL]
+    assert harness.prepared == [0.0] + [d - PACKET_PREPARE_LEAD for d in deadlines[1:]]
+    assert [when for when, _ in harness.sent] == deadlines
+    assert [message.sequence for _, message in harness.sent] == [1, 2, 3]
+    assert harness.record.sequence == 4
+
+
+def test_new_index_at_deadline_rebuilds_packet(harness) -> None:
+    """A reading that changes the index after preparation is sent, not the stale one."""
+    harness.run_until(DEFAULT_INTERVAL - PACKET_PREPARE_LEAD / 2)
+    harness.hass.states.set(ENTITY_ID, 75.0)
+    harness.run_until(DEFAULT_INTERVAL + 1)
+
+    _, message = harness.sent[-1]
+    assert message.temperature == get_temperature_index(75.0, "F")
+    assert message.sequence == 2
+    assert harness.prepared == [0.0, DEFAULT_INTERVAL - PACKET_PREPARE_LEAD, DEFAULT_INTERVAL]
+
+
+def test_same_index_at_deadline_keeps_packet(harness) -> None:
+    """A reading with the same index is recorded without rebuilding the packet."""
+    harness.run_until(DEFAULT_INTERVAL - PACKET_PREPARE_LEAD / 2)
+    harness.hass.states.set(ENTITY_ID, 70.1)
+    harness.run_until(DEFAULT_INTERVAL + 1)
+
+    assert len(harness.prepared) == 2
+    assert harness.sent[-1][1].temperature == get_temperature_index(70.0, "F")
+    assert harness.record.last_temperature == 70.1
+
+
+def test_sequence_taken_meanwhile_rebuilds_packet(harness) -> None:
+    """A send between preparation and deadline moves the packet to the next sequence."""
+    harness.run_until(DEFAULT_INTERVAL - PACKET_PREPARE_LEAD / 2)
+    harness.record.sequence += 1  # As a resend or manual trigger would
+    harness.record.name = "Den"
+    harness.run_until(DEFAULT_INTERVAL + 1)
+
+    _, message = harness.sent[-1]
+    assert message.sequence == 3
+    assert message.name == "Den"
+    assert harness.record.sequence == 4
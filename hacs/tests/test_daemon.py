@@ -0,0 +1,73 @@
+"""Tests for the standalone daemon's config loading and startup baseline."""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from custom_components.venstar_translator import daemon
+from custom_components.venstar_translator.daemon import ConfigError, load_config
+
+SENSOR = {
+    "sensor_id": 0,
+    "name": "Kitchen",
+    "purpose": "Remote",
+    "scale": "F",
+    "source": {"type": "stdin"},
+}
+
+
+def _write(tmp_path: Path, config: Any) -> Path:
+    """Write a config file and return its path."""
+    path = tmp_path / "venstar.json"
+    path.write_text(json.dumps(config))
+    return path
+
+
+def test_valid_config_resolves_state_file(tmp_path) -> None:
+    """The MAC prefix is lower-cased and the state file resolved next to the config."""
+    config = load_config(_write(tmp_path, {"mac_prefix": "ABCDEF0123", "sensors": [SENSOR]}))
+
+    assert config["mac_prefix"] == "abcdef0123"
+    assert config["state_file"] == str(tmp_path / "venstar_state.json")
+
+
+@pytest.mark.parametrize(
+    ("config", "message"),
+    [
+        (["not", "an", "object"], "must be a JSON object"),
+        ({"mac_prefix": "0123"}, "10 hex characters"),
+        ({"mac_prefix": "0123456789"}, "No sensors"),
+        ({"mac_prefix": "0123456789", "sensors": {"0": SENSOR}}, "must be a list"),
+        ({"mac_prefix": "0123456789", "sensors": ["Kitchen"]}, "must be an object"),
+        ({"mac_prefix": "0123456789", "sensors": [SENSOR, SENSOR]}, "configured twice"),
+        ({"mac_prefix": "0123456789", "sensors": [{**SENSOR, "sensor_id": 20}]}, "sensor_id"),
+        ({"mac_prefix": "0123456789", "sensors": [{**SENSOR, "source": "stdin"}]}, "source type"),
+        ({"mac_prefix": "0123456789", "sensors": [{**SENSOR, "source": {"type": "ftp"}}]}, "source type"),
+    ],
+)
+def test_invalid_config_raises_config_error(tmp_path, config, message) -> None:
+    """Malformed configs raise ConfigError rather than escaping as other errors."""
+    with pytest.raises(ConfigError, match=message):
+        load_config(_write(tmp_path, config))
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs procfs")
+def test_startup_baseline_is_process_start() -> None:
+    """The baseline is the process start, so it covers interpreter start-up and imports."""
+    # The process has been running for at least the CPU time it has used
+    assert time.perf_counter() - daemon._process_start() >= time.process_time()
+
+
+def test_startup_baseline_falls_back_to_now(monkeypatch) -> None:
+    """Without procfs the baseline is the current time."""
+
+    def no_procfs(*args: Any, **kwargs: Any) -> None:
+        raise OSError("No such file or directory")
+
+    monkeypatch.setattr("builtins.open", no_procfs)
+    before = time.perf_counter()
+    assert before <= daemon._process_start() <= time.perf_counter()
@@ -0,0 +1,93 @@
+"""Tests for delivery tracking and the adaptive repeat count."""
+from __future__ import annotations
+
+from custom_components.venstar_translator.const import (
+    BROADCAST_REPEAT_COUNT,
+    MAX_REPEAT_COUNT,
+    MIN_REPEAT_COUNT,
+    REPEAT_DECREASE_STREAK,
+    REPEAT_LOSS_STEP,
+)
+from custom_components.venstar_translator.delivery import DeliveryTracker
+
+
+def _acknowledge(tracker: DeliveryTracker, first: int, count: int) -> int:
+    """Send and acknowledge count packets; return the next sequence."""
+    for sequence in range(first, first + count):
+        tracker.on_sent(sequence)
+        tracker.on_response(sequence, True)
+    return first + count
+
+
+def test_silence_does_not_adapt() -> None:
+    """Until the thermostat acknowledges once, unanswered packets change nothing."""
+    tracker = DeliveryTracker()
+    for sequence in range(1, 20):
+        tracker.on_sent(sequence)
+
+    assert not tracker.adaptive
+    assert tracker.losses == 0
+    assert tracker.repeat_count == BROADCAST_REPEAT_COUNT
+
+
+def test_acknowledged_streak_lowers_repeat_count() -> None:
+    """Every REPEAT_DECREASE_STREAK acknowledged packets drop one repeat, down to the minimum."""
+    tracker = DeliveryTracker()
+    sequence = _acknowledge(tracker, 1, REPEAT_DECREASE_STREAK)
+    assert tracker.repeat_count == BROADCAST_REPEAT_COUNT - 1
+
+    _acknowledge(tracker, sequence, REPEAT_DECREASE_STREAK * BROADCAST_REPEAT_COUNT)
+    assert tracker.repeat_count == MIN_REPEAT_COUNT
+
+
+def test_unanswered_packet_raises_repeat_count() -> None:
+    """A packet still unanswered when the next one is sent counts as lost."""
+    tracker = DeliveryTracker()
+    sequence = _acknowledge(tracker, 1, REPEAT_DECREASE_STREAK)
+    repeat_count = tracker.repeat_count
+
+    tracker.on_sent(sequence)
+    tracker.on_sent(sequence + 1)
+
+    assert tracker.losses == 1
+    assert tracker.repeat_count == repeat_count + REPEAT_LOSS_STEP
+
+
+def test_retried_packet_is_not_a_loss() -> None:
+    """Retrying a failed send with the same sequence doesn't count the packet as lost."""
+    tracker = DeliveryTracker()
+    sequence = _acknowledge(tracker, 1, 1)
+    repeat_count = tracker.repeat_count
+
+    for _ in range(3):
+        tracker.on_sent(sequence)
+    tracker.on_response(sequence, True)
+
+    assert tracker.losses == 0
+    assert tracker.repeat_count == repeat_count
+    assert tracker.successes == 2
+
+
+def test_failure_response_raises_repeat_count_to_maximum() -> None:
+    """FAILURE responses back off by REPEAT_LOSS_STEP, capped at the maximum."""
+    tracker = DeliveryTracker()
+    sequence = _acknowledge(tracker, 1, 1)
+    for sequence in range(sequence, sequence + 10):
+        tracker.on_sent(sequence)
+        tracker.on_response(sequence, False)
+
+    assert tracker.failures == 10
+    assert tracker.losses == 0
+    assert tracker.repeat_count == MAX_REPEAT_COUNT
+
+
+def test_stale_response_is_ignored() -> None:
+    """A response for another sequence neither acknowledges nor fails the pending packet."""
+    tracker = DeliveryTracker()
+    _acknowledge(tracker, 1, 1)
+    tracker.on_sent(2)
+    tracker.on_response(1, False)
+
+    assert tracker.stale_responses == 1
+    assert tracker.failures == 0
+    assert tracker.as_dict()["successes"] == 1
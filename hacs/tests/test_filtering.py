@@ -0,0 +1,95 @@
+"""Tests for per-sensor smoothing and index hysteresis."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.venstar_translator.const import (
+    PURPOSE_REMOTE,
+    SMOOTHING_EMA,
+    SMOOTHING_MEDIAN,
+    SMOOTHING_NONE,
+)
+from custom_components.venstar_translator.filtering import ReadingFilter
+from custom_components.venstar_translator.registry import SensorRecord
+from custom_components.venstar_translator.venstar_sensor import get_temperature_index
+
+# Hovers on the 72/73 °F rounding boundary
+NOISY = [72.49, 72.51, 72.48, 72.52, 72.47, 72.53, 72.5, 72.49, 72.51, 72.48]
+
+
+def _record(**filtering) -> SensorRecord:
+    """Build a Remote sensor record with the given filter settings."""
+    return SensorRecord(0, "sensor.kitchen", "Kitchen", PURPOSE_REMOTE, **filtering)
+
+
+def _flips(readings: list[float]) -> int:
+    """Count index changes between consecutive readings."""
+    indexes = [get_temperature_index(reading, "F") for reading in readings]
+    return sum(1 for a, b in zip(indexes, indexes[1:]) if a != b)
+
+
+def test_unfiltered_sensor_has_no_filter() -> None:
+    """Without smoothing or hysteresis no filter is built."""
+    assert ReadingFilter.for_sensor(_record()) is None
+    assert ReadingFilter.for_sensor(_record(smoothing=SMOOTHING_EMA)) is not None
+    assert ReadingFilter.for_sensor(_record(hysteresis=0.5)) is not None
+
+
+def test_ema_weighs_newest_reading() -> None:
+    """An N-reading EMA moves 2 / (N + 1) of the way to each new reading."""
+    reading_filter = ReadingFilter(SMOOTHING_EMA, 3, 0.0, "F")
+    assert reading_filter.apply(70.0) == (70.0, False)
+    assert reading_filter.apply(72.0) == (71.0, False)
+    assert reading_filter.apply(72.0) == (71.5, False)
+
+
+def test_median_ignores_single_spike() -> None:
+    """A one-reading spike doesn't move the median of the last three."""
+    reading_filter = ReadingFilter(SMOOTHING_MEDIAN, 3, 0.0, "F")
+    outputs = [reading_filter.apply(reading)[0] for reading in (70.0, 70.2, 95.0, 70.1)]
+    assert outputs == [70.0, 70.1, 70.2, 70.2]
+
+
+def test_hysteresis_holds_index_on_boundary_noise() -> None:
+    """Noise within the margin keeps the first index."""
+    reading_filter = ReadingFilter(SMOOTHING_NONE, 3, 0.5, "F")
+    outputs = []
+    suppressed = 0
+    for reading in NOISY:
+        value, held = reading_filter.apply(reading)
+        outputs.append(value)
+        suppressed += held
+
+    assert _flips(NOISY) > 5
+    assert _flips(outputs) == 0
+    assert suppressed == sum(
+        1 for reading in NOISY if get_temperature_index(reading, "F") != get_temperature_index(NOISY[0], "F")
+    )
+
+
+def test_hysteresis_follows_real_change() -> None:
+    """A reading past the margin changes the index right away."""
+    reading_filter = ReadingFilter(SMOOTHING_NONE, 3, 0.5, "F")
+    reading_filter.apply(72.4)
+    assert reading_filter.apply(72.6) == (72.4, True)
+    assert reading_filter.apply(73.2) == (73.2, False)
+    assert reading_filter.apply(72.6) == (72.6, False)
+    assert reading_filter.apply(72.4) == (72.6, True)
+    assert reading_filter.apply(71.8) == (71.8, False)
+
+
+@pytest.mark.parametrize("scale", ["F", "C"])
+def test_out_of_range_reading_is_passed_on(scale) -> None:
+    """Readings without an index bypass hysteresis rather than raising."""
+    reading_filter = ReadingFilter(SMOOTHING_NONE, 3, 1.0, scale)
+    reading_filter.apply(20.0)
+    assert reading_filter.apply(500.0) == (500.0, False)
+
+
+def test_settings_track_the_record() -> None:
+    """settings_of matches the settings of the filter built for a record."""
+    record = _record(smoothing=SMOOTHING_MEDIAN, smoothing_samples=5, hysteresis=0.3)
+    assert ReadingFilter.for_sensor(record).settings == ReadingFilter.settings_of(record)
+
+    record.hysteresis = 0.6
+    assert ReadingFilter.for_sensor(record).settings != (SMOOTHING_MEDIAN, 5, 0.3, "F")
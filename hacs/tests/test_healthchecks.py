@@ -0,0 +1,131 @@
+"""Tests for batched healthchecks.io pings."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import aiohttp
+
+from custom_components.venstar_translator.const import (
+    HEALTHCHECK_MAX_ATTEMPTS,
+    HEALTHCHECK_RETRY_BACKOFF,
+    HEALTHCHECK_RETRY_BACKOFF_MAX,
+)
+from custom_components.venstar_translator.healthchecks import HealthChecksPinger
+
+CHECK = "https://hc-ping.com/kitchen"
+OTHER_CHECK = "https://hc-ping.com/garage"
+
+
+def _ping(loop: asyncio.AbstractEventLoop, pinger: HealthChecksPinger, *args: Any) -> None:
+    """Record an outcome from inside the loop, as the coordinators do."""
+
+    async def ping() -> None:
+        pinger.ping(*args)
+
+    loop.run_until_complete(ping())
+
+
+def test_outcomes_within_window_are_sent_as_one_batch(virtual_loop, run_for, fake_session) -> None:
+    """Several outcomes are sent together, one request per check."""
+    session = fake_session
+    pinger = HealthChecksPinger(session, window=5.0)
+
+    async def ping() -> None:
+        for _ in range(3):
+            pinger.ping(CHECK, True)
+        pinger.ping(OTHER_CHECK, True)
+
+    virtual_loop.run_until_complete(ping())
+    run_for(6)
+
+    assert sorted(request.url for request in session.requests) == [OTHER_CHECK, CHECK]
+    assert all(request.time == 5.0 for request in session.requests)
+    assert pinger.batches == 1
+    assert pinger.merged == 2
+    assert pinger.sent == 2
+
+
+def test_failure_wins_within_window(virtual_loop, run_for, fake_session) -> None:
+    """A failure followed by a success in the same window is reported as a failure."""
+    session = fake_session
+    pinger = HealthChecksPinger(session, window=5.0)
+
+    async def ping() -> None:
+        pinger.ping(CHECK, False, "timeout")
+        pinger.ping(CHECK, True)
+
+    virtual_loop.run_until_complete(ping())
+    run_for(6)
+
+    assert [(request.method, request.url) for request in session.requests] == [("POST", f"{CHECK}/fail")]
+
+
+def test_server_errors_are_retried_with_backoff(virtual_loop, run_for, fake_session) -> None:
+    """5xx responses are retried with doubling delays until attempts run out."""
+    session = fake_session
+    session.status = 503
+    pinger = HealthChecksPinger(session, window=5.0)
+
+    _ping(virtual_loop, pinger, CHECK, True)
+    run_for(3600)
+
+    times = [request.time for request in session.requests]
+    assert len(times) == HEALTHCHECK_MAX_ATTEMPTS
+    delays = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert delays == [
+        min(HEALTHCHECK_RETRY_BACKOFF * 2**attempt, HEALTHCHECK_RETRY_BACKOFF_MAX)
+        for attempt in range(HEALTHCHECK_MAX_ATTEMPTS - 1)
+    ]
+    assert pinger.dropped == 1
+    assert pinger.queued_retries == 0
+
+
+def test_new_outcome_replaces_queued_retry(virtual_loop, run_for, fake_session) -> None:
+    """A newer outcome for a check supersedes its pending retry."""
+    session = fake_session
+    session.error = aiohttp.ClientConnectionError("unreachable")
+    pinger = HealthChecksPinger(session, window=5.0)
+
+    _ping(virtual_loop, pinger, CHECK, False, "down")
+    run_for(6)
+    assert pinger.queued_retries == 1
+
+    session.error = None
+    _ping(virtual_loop, pinger, CHECK, True)
+    run_for(3600)
+
+    assert [request.method for request in session.requests] == ["POST", "GET"]
+    assert pinger.queued_retries == 0
+    assert pinger.retried == 0
+
+
+def test_rejected_ping_is_not_retried(virtual_loop, run_for, fake_session) -> None:
+    """A 4xx (wrong URL) is counted as a failure but not retried."""
+    session = fake_session
+    session.status = 404
+    pinger = HealthChecksPinger(session, window=5.0)
+
+    _ping(virtual_loop, pinger, CHECK, True)
+    run_for(3600)
+
+    assert len(session.requests) == 1
+    assert pinger.failures == 1
+    assert pinger.queued_retries == 0
+
+
+def test_retry_queue_is_bounded(virtual_loop, run_for, fake_session) -> None:
+    """When the retry queue is full the oldest check is dropped."""
+    session = fake_session
+    session.status = 500
+    pinger = HealthChecksPinger(session, window=5.0, max_retries=2)
+
+    async def ping() -> None:
+        for check in range(3):
+            pinger.ping(f"{CHECK}{check}", True)
+
+    virtual_loop.run_until_complete(ping())
+    run_for(6)
+
+    assert pinger.queued_retries == 2
+    assert pinger.dropped == 1
@@ -0,0 +1,124 @@
+"""Tests for the shared, coalescing HTTP JSON fetcher."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import aiohttp
+import pytest
+
+from custom_components.venstar_translator.http_source import HttpJsonFetcher
+from custom_components.venstar_translator.sources import SourceError
+
+from .conftest import FakeSession
+
+URL = "http://weather.local/current"
+
+
+def _serve(session: FakeSession, body: Any, etag: str | None = None) -> FakeSession:
+    """Make the fake session serve a document, taking half a second per request."""
+    session.body = body
+    session.etag = etag
+    session.latency = 0.5
+    return session
+
+
+def test_concurrent_reads_share_one_request(virtual_loop, fake_session) -> None:
+    """Reads while a request is in flight wait for it instead of sending their own."""
+    session = _serve(fake_session, {"temperature": 71.5})
+    fetcher = HttpJsonFetcher(session, cache_ttl=30)
+
+    async def read_all() -> list[Any]:
+        return await asyncio.gather(*(fetcher.async_get(URL) for _ in range(5)))
+
+    documents = virtual_loop.run_until_complete(read_all())
+
+    assert documents == [{"temperature": 71.5}] * 5
+    assert len(session.requests) == 1
+    assert fetcher.coalesced == 4
+
+
+def test_cached_document_is_served_until_ttl(virtual_loop, monkeypatch, fake_session) -> None:
+    """Reads within cache_ttl are served from memory; later ones revalidate with the ETag."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.venstar_translator.http_source.time.monotonic", lambda: clock[0]
+    )
+    session = _serve(fake_session, {"temperature": 71.5}, etag='"v1"')
+    fetcher = HttpJsonFetcher(session, cache_ttl=30)
+
+    virtual_loop.run_until_complete(fetcher.async_get(URL))
+    clock[0] += 29
+    virtual_loop.run_until_complete(fetcher.async_get(URL))
+    assert len(session.requests) == 1
+    assert fetcher.cache_hits == 1
+
+    clock[0] += 2
+    document = virtual_loop.run_until_complete(fetcher.async_get(URL))
+    assert document == {"temperature": 71.5}
+    assert session.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert fetcher.not_modified == 1
+
+    # The 304 restarted the TTL
+    virtual_loop.run_until_complete(fetcher.async_get(URL))
+    assert len(session.requests) == 2
+
+
+def test_changed_document_replaces_cache(virtual_loop, fake_session) -> None:
+    """A new ETag means a new document, which is cached from then on."""
+    session = _serve(fake_session, {"temperature": 71.5}, etag='"v1"')
+    fetcher = HttpJsonFetcher(session, cache_ttl=0)
+
+    virtual_loop.run_until_complete(fetcher.async_get(URL))
+    session.body = {"temperature": 72.0}
+    session.etag = '"v2"'
+
+    assert virtual_loop.run_until_complete(fetcher.async_get(URL)) == {"temperature": 72.0}
+    assert fetcher.not_modified == 0
+
+
+def test_headers_are_part_of_the_cache_key(virtual_loop, fake_session) -> None:
+    """Different request headers are fetched separately."""
+    session = _serve(fake_session, {"temperature": 71.5})
+    fetcher = HttpJsonFetcher(session, cache_ttl=30)
+
+    virtual_loop.run_until_complete(fetcher.async_get(URL, {"Authorization": "a"}))
+    virtual_loop.run_until_complete(fetcher.async_get(URL, {"Authorization": "b"}))
+
+    assert len(session.requests) == 2
+
+
+@pytest.mark.parametrize(
+    ("status", "body", "error"),
+    [
+        (200, b"not json", None),
+        (503, {}, None),
+        (200, {}, aiohttp.ClientConnectionError("refused")),
+    ],
+)
+def test_failures_raise_source_error(virtual_loop, fake_session, status, body, error) -> None:
+    """Bad bodies, HTTP errors and connection errors all raise SourceError."""
+    session = _serve(fake_session, body)
+    session.status = status
+    session.error = error
+    fetcher = HttpJsonFetcher(session)
+
+    with pytest.raises(SourceError):
+        virtual_loop.run_until_complete(fetcher.async_get(URL))
+    assert fetcher.errors == 1
+
+
+def test_cancelled_reader_does_not_cancel_shared_request(virtual_loop, fake_session) -> None:
+    """One reader giving up leaves the request running for the others."""
+    session = _serve(fake_session, {"temperature": 71.5})
+    fetcher = HttpJsonFetcher(session)
+
+    async def read() -> Any:
+        first = asyncio.ensure_future(fetcher.async_get(URL))
+        second = asyncio.ensure_future(fetcher.async_get(URL))
+        await asyncio.sleep(0.1)
+        first.cancel()
+        return await second
+
+    assert virtual_loop.run_until_complete(read()) == {"temperature": 71.5}
+    assert len(session.requests) == 1
@@ -0,0 +1,76 @@
+"""Tests for routing thermostat responses to our sensors."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.venstar_translator.const import MAX_SENSORS, PURPOSE_REMOTE
+from custom_components.venstar_translator.listener import ResponseListener
+from custom_components.venstar_translator.protobuf import sensor_message_pb2
+from custom_components.venstar_translator.registry import SensorRecord, SensorRegistry
+from custom_components.venstar_translator.replay import ReplayStorage
+from custom_components.venstar_translator.venstar_sensor import VenstarSensor
+
+MAC_PREFIX = "0123456789"
+ADDR = ("192.168.1.50", 5001)
+
+
+def _packet(sensor_id: int, command: int, mac_prefix: str = MAC_PREFIX) -> bytes:
+    """Build a packet about a sensor, re-tagged with the given command."""
+    message = sensor_message_pb2.SensorMessage()
+    message.ParseFromString(
+        VenstarSensor(sensor_id, mac_prefix, "Kitchen", PURPOSE_REMOTE, "F").build_data_packet(72.0)
+    )
+    message.Command = command
+    return message.SerializeToString()
+
+
+@pytest.fixture
+def listener() -> ResponseListener:
+    """Listener for an entry with sensor 3 configured, recording every response."""
+    registry = SensorRegistry()
+    registry.add(SensorRecord(3, "sensor.kitchen", "Kitchen", PURPOSE_REMOTE))
+    listener = ResponseListener(
+        ReplayStorage(MAC_PREFIX, registry),
+        lambda sensor_id, sequence, success: listener.routed.append((sensor_id, sequence, success)),
+    )
+    listener.routed = []
+    return listener
+
+
+def test_response_for_configured_sensor_is_routed(listener) -> None:
+    """SUCCESS and FAILURE for a configured sensor reach on_response."""
+    listener.datagram_received(_packet(3, sensor_message_pb2.SensorMessage.SUCCESS), ADDR)
+    listener.datagram_received(_packet(3, sensor_message_pb2.SensorMessage.FAILURE), ADDR)
+
+    assert listener.routed == [(3, 1, True), (3, 1, False)]
+    assert listener.as_dict()["responses"] == 2
+
+
+@pytest.mark.parametrize(
+    ("sensor_id", "mac_prefix"),
+    [
+        (4, MAC_PREFIX),  # Our prefix, but not configured
+        (MAX_SENSORS, MAC_PREFIX),  # Our prefix, beyond the sensor range
+        (0xFF, MAC_PREFIX),
+        (3, "a1b2c3d4e5"),  # A real sensor
+    ],
+)
+def test_response_for_other_sensor_is_foreign(listener, sensor_id, mac_prefix) -> None:
+    """Responses about sensors that aren't configured here are only counted."""
+    listener.datagram_received(
+        _packet(sensor_id, sensor_message_pb2.SensorMessage.SUCCESS, mac_prefix), ADDR
+    )
+
+    assert listener.routed == []
+    assert listener.foreign == 1
+    assert listener.unattributed == 0
+
+
+def test_echoes_and_malformed_packets_are_counted(listener) -> None:
+    """Our own broadcasts count as echoes, undecodable packets as malformed."""
+    listener.datagram_received(_packet(3, sensor_message_pb2.SensorMessage.SENSORDATA), ADDR)
+    listener.datagram_received(_packet(4, sensor_message_pb2.SensorMessage.SENSORPAIR), ADDR)
+    listener.datagram_received(b"\xff\xff\xff", ADDR)
+
+    assert (listener.echoes, listener.foreign, listener.malformed) == (1, 1, 1)
+    assert listener.routed == []
@@ -0,0 +1,267 @@
+"""Memory footprint and resource leak tests for the broadcast path.
+
+The real coordinators and broadcaster run on the replay harness's virtual
+clock under tracemalloc, for 24 simulated hours of warm-up and 24 measured:
+
+- bytes per sensor: traced memory in steady state with 20 sensors minus with
+  one, divided by 19. The record, coordinator task and stop event,
+  statistics, rate limit ledger and delivery tracker all count. The warm-up
+  outlasts the one-hour rate windows and fills the 256-sample lateness
+  windows even at the outdoor sensors' five-minute interval, so every
+  bounded structure is full-size when measured.
+- growth per broadcast: traced bytes and live memory blocks gained over the
+  measured hours, divided by the broadcasts in between. A leak shows up as
+  growth that scales with the run.
+- transient peak: the most memory in use above the steady state, i.e. the
+  VenstarSensor, protobuf objects and packet bytes of the broadcasts in
+  flight.
+
+The send path test sends thousands of packets through broadcast_udp_packet
+to a loopback receiver, and as many to an invalid port (the error path),
+and compares the open file descriptors before and after, failing on any
+socket left for the garbage collector to close (ResourceWarning).
+
+The footprint runs take about 40 seconds; deselect them with
+``pytest -m "not memory"``.
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import os
+import random
+import socket
+import sys
+import time
+import tracemalloc
+import types
+import warnings
+from typing import Any
+
+import pytest
+
+from custom_components.venstar_translator import stats, venstar_sensor
+from custom_components.venstar_translator.broadcaster import Broadcaster
+from custom_components.venstar_translator.const import PURPOSE_REMOTE, VALID_PURPOSES
+from custom_components.venstar_translator.coordinator import VenstarSensorCoordinator
+from custom_components.venstar_translator.registry import SensorRecord, SensorRegistry
+from custom_components.venstar_translator.replay import (
+    ReplayHass,
+    ReplayStorage,
+    VirtualClockLoop,
+)
+
+pytestmark = pytest.mark.memory
+
+_ENTRY_ID = "memory"
+_MAC_PREFIX = "0123456789"
+
+SENSORS = 20
+WARMUP = 24 * 3600.0  # Virtual seconds before the steady state is taken
+DURATION = 24 * 3600.0  # Virtual seconds measured after the warm-up
+READING_INTERVAL = 30.0  # Virtual seconds between source readings
+SEND_PATH_ITERATIONS = 5000
+
+# Budgets, with headroom over the measured ~29 KiB per sensor, ~0.5 bytes
+# per broadcast and ~27 KiB transient peak (20 sensors, CPython 3.11)
+SENSOR_BUDGET = 40 * 1024  # Steady-state bytes per sensor
+GROWTH_BUDGET = 1.0  # Traced bytes retained per broadcast
+TRANSIENT_BUDGET = 32 * 1024  # Peak bytes above the steady state
+
+
+async def _async_run_sensors(
+    sensors: int, warmup: float, duration: float, seed: int = 0
+) -> dict[str, Any]:
+    """Broadcast a set of sensors on the running virtual clock loop.
+
+    Returns:
+        Steady-state bytes, growth and transient peak of the run
+    """
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    broadcasts = 0
+
+    def send(packet: bytes, port: int, repeat_count: int) -> None:
+        nonlocal broadcasts
+        broadcasts += 1
+
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    hass = ReplayHass(loop, 0.0)
+    registry = SensorRegistry()
+    storage = ReplayStorage(_MAC_PREFIX, registry)
+    broadcaster = Broadcaster(hass, storage, send=send)
+    coordinators = hass.add_entry(_ENTRY_ID, storage, broadcaster)
+
+    temperatures = {}
+    for sensor_id in range(sensors):
+        registry.add(
+            SensorRecord(
+                sensor_id,
+                f"sensor.memory_{sensor_id}",
+                f"Memory {sensor_id}",
+                VALID_PURPOSES[sensor_id % len(VALID_PURPOSES)],
+            )
+        )
+        temperatures[sensor_id] = rng.uniform(40.0, 75.0)
+
+    # Readings are generated as the run goes, so no timeline sits in memory
+    feeder: asyncio.TimerHandle | None = None
+
+    def feed() -> None:
+        nonlocal feeder
+        for sensor_id, temperature in temperatures.items():
+            temperature += rng.gauss(0.0, 0.2)
+            temperatures[sensor_id] = temperature
+            hass.states.set(f"sensor.memory_{sensor_id}", round(temperature, 2))
+        feeder = loop.call_later(READING_INTERVAL, feed)
+
+    feed()
+    for sensor_id in range(sensors):
+        coordinator = coordinators[sensor_id] = VenstarSensorCoordinator(hass, _ENTRY_ID, sensor_id)
+        await coordinator.start()
+
+    await asyncio.sleep(warmup)
+    gc.collect()
+    steady = tracemalloc.get_traced_memory()[0]
+    steady_blocks = sys.getallocatedblocks()
+    steady_broadcasts = broadcasts
+    tracemalloc.reset_peak()
+
+    await asyncio.sleep(duration)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sys.getallocatedblocks()
+
+    feeder.cancel()
+    for coordinator in coordinators.values():
+        await coordinator.stop()
+
+    return {
+        "steady_bytes": steady - baseline,
+        "growth_bytes": current - steady,
+        "growth_blocks": blocks - steady_blocks,
+        "broadcasts": broadcasts - steady_broadcasts,
+        "transient_peak_bytes": peak - steady,
+    }
+
+
+def _run_sensors(sensors: int, warmup: float, duration: float) -> dict[str, Any]:
+    """Run _async_run_sensors on a fresh virtual clock loop."""
+    loop = VirtualClockLoop()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # The statistics' hourly rate window prunes by time.monotonic(),
+        # which barely moves on a virtual clock; without this every
+        # broadcast of the run would stay in it and look like a leak
+        monkeypatch.setattr(
+            stats, "time", types.SimpleNamespace(monotonic=loop.time, time=time.time)
+        )
+        try:
+            return loop.run_until_complete(_async_run_sensors(sensors, warmup, duration))
+        finally:
+            loop.close()
+
+
+@pytest.fixture(scope="module")
+def footprint() -> dict[str, Any]:
+    """Measure a run of one sensor and one of SENSORS sensors."""
+    # Coordinator info logging would be measured along with everything else
+    logger = logging.getLogger("custom_components.venstar_translator")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        # Untraced first run: imports, protobuf descriptors and other one-time
+        # caches would otherwise be charged to whichever run comes first
+        _run_sensors(1, 600.0, 600.0)
+
+        tracemalloc.start()
+        try:
+            single = _run_sensors(1, WARMUP, DURATION)
+            full = _run_sensors(SENSORS, WARMUP, DURATION)
+        finally:
+            tracemalloc.stop()
+    finally:
+        logger.setLevel(level)
+
+    broadcasts = max(full["broadcasts"], 1)
+    return {
+        "bytes_per_sensor": (full["steady_bytes"] - single["steady_bytes"]) / (SENSORS - 1),
+        "growth_bytes_per_broadcast": full["growth_bytes"] / broadcasts,
+        "growth_blocks_per_broadcast": full["growth_blocks"] / broadcasts,
+        "transient_peak_bytes": full["transient_peak_bytes"],
+        "broadcasts": full["broadcasts"],
+    }
+
+
+def test_bytes_per_sensor(footprint) -> None:
+    """Each emulated sensor costs less than SENSOR_BUDGET bytes in steady state."""
+    assert footprint["bytes_per_sensor"] <= SENSOR_BUDGET
+
+
+def test_no_growth_per_broadcast(footprint) -> None:
+    """Broadcasts don't accumulate memory once every bounded window is full."""
+    assert footprint["broadcasts"] > 10000
+    assert footprint["growth_bytes_per_broadcast"] <= GROWTH_BUDGET
+    assert footprint["growth_blocks_per_broadcast"] < 0.1
+
+
+def test_transient_peak(footprint) -> None:
+    """Broadcasts in flight stay under TRANSIENT_BUDGET bytes above the steady state."""
+    assert footprint["transient_peak_bytes"] <= TRANSIENT_BUDGET
+
+
+def _open_fds() -> int | None:
+    """Count this process's open file descriptors, or None without procfs."""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def test_send_path_leaks_no_sockets(caplog) -> None:
+    """Successful and failed sends both close their sockets.
+
+    Successful sends go to a loopback receiver, never onto the network;
+    failed sends target port 0, which the kernel rejects.
+    """
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.setblocking(False)
+    port = receiver.getsockname()[1]
+    packet = venstar_sensor.VenstarSensor(
+        0, _MAC_PREFIX, "Memory", PURPOSE_REMOTE, "F"
+    ).build_data_packet(70.0)
+
+    # Every failed send logs a traceback; only the counts matter here
+    caplog.set_level(logging.CRITICAL, logger=venstar_sensor.__name__)
+    gc.collect()
+    before = _open_fds()
+    errors = 0
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            for iteration in range(SEND_PATH_ITERATIONS):
+                venstar_sensor.broadcast_udp_packet(packet, port, 1, "127.0.0.1")
+                try:
+                    venstar_sensor.broadcast_udp_packet(packet, 0, 1, "127.0.0.1")
+                except OSError:
+                    errors += 1
+                if iteration % 64 == 0:
+                    try:
+                        while receiver.recv(2048):
+                            pass
+                    except BlockingIOError:
+                        pass
+            gc.collect()
+        after = _open_fds()
+    finally:
+        receiver.close()
+
+    assert errors == SEND_PATH_ITERATIONS
+    assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
+    if before is not None:
+        assert after <= before
@@ -0,0 +1,86 @@
+"""Tests for the broadcast event ring buffer."""
+from __future__ import annotations
+
+from custom_components.venstar_translator.packet_trace import (
+    KIND_DATA,
+    KIND_PAIRING,
+    KIND_RESEND,
+    RESULT_ERROR,
+    RESULT_OK,
+    PacketTrace,
+)
+
+
+def _record(trace: PacketTrace, n: int, **overrides) -> None:
+    """Record a data event numbered n (timestamp and sequence n)."""
+    event = {
+        "timestamp": 1000.0 + n,
+        "duration": 0.0015,
+        "sensor_id": n % 20,
+        "kind": KIND_DATA,
+        "sequence": n,
+        "temp_index": 140,
+        "result": RESULT_OK,
+        "size": 58,
+        **overrides,
+    }
+    trace.record(**event)
+
+
+def test_events_decode_oldest_first() -> None:
+    """Dumped events carry what was recorded, oldest first."""
+    trace = PacketTrace(capacity=4)
+    _record(trace, 1)
+    _record(trace, 2, kind=KIND_PAIRING, result=RESULT_ERROR)
+
+    assert len(trace) == 2
+    assert trace.dump() == [
+        {
+            "timestamp": 1001.0,
+            "duration_ms": 1.5,
+            "sensor_id": 1,
+            "kind": "data",
+            "sequence": 1,
+            "temperature_index": 140,
+            "result": "ok",
+            "size": 58,
+        },
+        {
+            "timestamp": 1002.0,
+            "duration_ms": 1.5,
+            "sensor_id": 2,
+            "kind": "pairing",
+            "sequence": 2,
+            "temperature_index": 140,
+            "result": "error",
+            "size": 58,
+        },
+    ]
+
+
+def test_full_buffer_overwrites_the_oldest() -> None:
+    """Past capacity, each new event replaces the oldest and the count stays put."""
+    trace = PacketTrace(capacity=3)
+    for n in range(1, 8):
+        _record(trace, n)
+
+    assert len(trace) == 3
+    assert [event["sequence"] for event in trace.dump()] == [5, 6, 7]
+
+
+def test_unknown_sequence_and_index_read_back_as_none() -> None:
+    """Resends record no sequence or index, and dump them as None."""
+    trace = PacketTrace(capacity=2)
+    _record(trace, 1, kind=KIND_RESEND, sequence=None, temp_index=None)
+
+    (event,) = trace.dump()
+    assert event["kind"] == "resend"
+    assert event["sequence"] is None
+    assert event["temperature_index"] is None
+
+
+def test_empty_trace_dumps_nothing() -> None:
+    """A new trace holds no events."""
+    trace = PacketTrace(capacity=2)
+    assert len(trace) == 0
+    assert trace.dump() == []
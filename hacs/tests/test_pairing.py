@@ -0,0 +1,190 @@
+"""Tests for time-boxed pairing sessions and their broadcast socket."""
+from __future__ import annotations
+
+import asyncio
+import socket
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from custom_components.venstar_translator import pairing, venstar_sensor
+from custom_components.venstar_translator.broadcaster import Broadcaster
+from custom_components.venstar_translator.const import DEFAULT_INTERVAL, PURPOSE_REMOTE, SCHEDULE_SLACK
+from custom_components.venstar_translator.coordinator import async_start_coordinators
+from custom_components.venstar_translator.pairing import (
+    STATE_CANCELLED,
+    STATE_COMPLETED,
+    STATE_FAILED,
+    async_start_pairing_session,
+)
+from custom_components.venstar_translator.registry import SensorRecord, SensorRegistry
+from custom_components.venstar_translator.replay import ReplayHass, ReplayStorage
+from custom_components.venstar_translator.wire import (
+    COMMAND_SENSORDATA,
+    COMMAND_SENSORPAIR,
+    decode_sensor_message,
+)
+
+ENTRY_ID = "entry"
+
+
+class _Storage(ReplayStorage):
+    """ReplayStorage with the sequence update pairing applies."""
+
+    def update_sequence(self, sensor_id: int, sequence: int) -> None:
+        self.sensors.get(sensor_id).sequence = sequence
+
+
+class _FakeSocket:
+    """Stands in for BroadcastSocket, recording the session's bursts."""
+
+    def __init__(self, sent: list[tuple[float, int, int]]) -> None:
+        self._sent = sent
+        self.closed = False
+
+    def send(self, packet: bytes, port: int, repeat_count: int) -> None:
+        message = decode_sensor_message(packet)
+        self._sent.append((asyncio.get_running_loop().time(), message.command, message.sensor_id))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Entry:
+    """An entry's hass.data with two sensors, recording every packet sent."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.loop = loop
+        self.sent: list[tuple[float, int, int]] = []  # (time, command, sensor ID)
+        self.sockets: list[_FakeSocket] = []
+        self.hass = ReplayHass(loop, 0.0)
+        registry = SensorRegistry()
+        registry.add(SensorRecord(0, "sensor.kitchen", "Kitchen", PURPOSE_REMOTE, sequence=40))
+        registry.add(SensorRecord(1, "sensor.garage", "Garage", PURPOSE_REMOTE, sequence=50))
+        self.storage = _Storage("0123456789", registry)
+
+        def send(packet: bytes, port: int, repeat_count: int) -> None:
+            message = decode_sensor_message(packet)
+            self.sent.append((loop.time(), message.command, message.sensor_id))
+
+        self.hass.add_entry(ENTRY_ID, self.storage, Broadcaster(self.hass, self.storage, send=send))
+        self.data = self.hass.data["venstar_translator"][ENTRY_ID]
+        self.data["pairing"] = None
+        self.data["worker"] = None
+
+        def open_socket() -> _FakeSocket:
+            sock = _FakeSocket(self.sent)
+            self.sockets.append(sock)
+            return sock
+
+        monkeypatch.setattr(pairing, "BroadcastSocket", open_socket)
+        self.hass.states.set("sensor.kitchen", 70.0)  # sensor.garage stays unavailable
+
+    def run(self, coro: Any) -> Any:
+        return self.loop.run_until_complete(coro)
+
+    def run_for(self, seconds: float) -> None:
+        self.run(asyncio.sleep(seconds))
+
+
+@pytest.fixture
+def entry(virtual_loop, monkeypatch) -> Iterator[_Entry]:
+    """Entry whose Kitchen sensor is broadcasting."""
+    entry = _Entry(virtual_loop, monkeypatch)
+    entry.run(async_start_coordinators(entry.hass, ENTRY_ID, [0]))
+    yield entry
+
+    async def stop() -> None:
+        session = entry.data["pairing"]
+        if session is not None:
+            await session.async_cancel(resume=False)
+        for coordinator in entry.data["coordinators"].values():
+            await coordinator.stop()
+
+    entry.run(stop())
+
+
+def test_session_repeats_bursts_then_resumes(entry) -> None:
+    """Bursts repeat each interval; afterwards data resumes at sequence 1."""
+    start = entry.loop.time()
+    session = entry.run(async_start_pairing_session(entry.hass, ENTRY_ID, [0, 1, 7], 30, 10))
+
+    assert session.skipped == {1: "temperature unavailable from entity sensor.garage", 7: "not configured"}
+    assert list(entry.data["coordinators"]) == []  # Data broadcasts paused
+    entry.run_for(29)
+    pairing_bursts = [(when - start, sensor_id) for when, command, sensor_id in entry.sent
+                      if command == COMMAND_SENSORPAIR]
+    assert pairing_bursts == [(0.0, 0), (10.0, 0), (20.0, 0)]
+    assert session.state == STATE_COMPLETED
+    assert session.as_dict()["sensors"]["0"]["bursts"] == 3
+    assert entry.sockets[0].closed
+    assert entry.storage.get_sensor(0).sequence == 1
+
+    # The resumed sensor waits out its rate limit after the last burst
+    entry.run_for(DEFAULT_INTERVAL)
+    data = [(when - start, sensor_id) for when, command, sensor_id in entry.sent
+            if command == COMMAND_SENSORDATA]
+    # The first went out as the session started, before the sensor was paused
+    assert data == [(0.0, 0), (20.0 + DEFAULT_INTERVAL - SCHEDULE_SLACK, 0)]
+    assert entry.storage.get_sensor(0).sequence == 2
+
+
+def test_cancelled_session_resumes_broadcasts(entry) -> None:
+    """Cancelling ends the bursts, closes the socket and restarts the sensors."""
+    session = entry.run(async_start_pairing_session(entry.hass, ENTRY_ID, [0], 300, 10))
+    entry.run_for(15)
+    entry.run(session.async_cancel())
+
+    assert session.state == STATE_CANCELLED
+    assert session.as_dict()["sensors"]["0"]["bursts"] == 2
+    assert entry.sockets[0].closed
+    assert list(entry.data["coordinators"]) == [0]
+
+
+def test_new_session_replaces_running_one(entry) -> None:
+    """Starting a session cancels the running one first."""
+    first = entry.run(async_start_pairing_session(entry.hass, ENTRY_ID, [0], 300, 10))
+    second = entry.run(async_start_pairing_session(entry.hass, ENTRY_ID, [0], 300, 10))
+
+    assert first.state == STATE_CANCELLED
+    assert second.running
+    assert entry.data["pairing"] is second
+
+
+def test_socket_failure_fails_session(entry, monkeypatch) -> None:
+    """If no broadcast socket can be opened, nothing pauses and the session fails."""
+
+    def no_socket() -> None:
+        raise OSError("Network is down")
+
+    monkeypatch.setattr(pairing, "BroadcastSocket", no_socket)
+    session = entry.run(async_start_pairing_session(entry.hass, ENTRY_ID, [0], 30, 10))
+
+    assert session.state == STATE_FAILED
+    assert session.skipped == {0: "Network is down"}
+    assert list(entry.data["coordinators"]) == [0]
+
+
+def test_broadcast_socket_closed_when_setup_fails(monkeypatch) -> None:
+    """A socket whose SO_BROADCAST option is refused is closed, not leaked."""
+    opened = []
+
+    class RefusingSocket:
+        def __init__(self, *args: Any) -> None:
+            self.closed = False
+            opened.append(self)
+
+        def setsockopt(self, *args: Any) -> None:
+            raise OSError("Operation not permitted")
+
+        def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(venstar_sensor.socket, "socket", RefusingSocket)
+    with pytest.raises(OSError, match="not permitted"):
+        venstar_sensor.BroadcastSocket()
+
+    assert len(opened) == 1
+    assert opened[0].closed
+    assert socket.socket is RefusingSocket  # Patched for this test only
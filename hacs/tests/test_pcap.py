@@ -0,0 +1,146 @@
+"""Tests for the offline capture decoder.
+
+The fixtures under captures/ hold generated sensor traffic:
+
+- sensor_traffic.pcap (little-endian, microseconds, Ethernet): sensor 0
+  pairs (two copies), then sends sequence 2 (three copies), 3, 5, a resend
+  of 3 and a 6 whose temperature was altered after signing. In between are
+  a SUCCESS response, a DNS frame and a malformed payload on UDP 5001.
+- sensor_traffic.pcapng: a little-endian section (Ethernet, microseconds)
+  where sensor 1 sends 10, 11 and 13, plus a packet on an interface the
+  section never described, then a big-endian section (raw IPv4, nanosecond
+  tsresol) with two copies of 14, a simple packet block with 15 and a 12.
+"""
+from __future__ import annotations
+
+import io
+import struct
+from pathlib import Path
+
+import pytest
+
+from custom_components.venstar_translator.pcap import (
+    CSV_FIELDS,
+    CaptureDecoder,
+    CaptureError,
+    iter_frames,
+    main,
+    write_csv,
+)
+
+CAPTURES = Path(__file__).parent / "captures"
+T0 = 1700000000.0
+
+
+def _timeline(decoder: CaptureDecoder, mac: str) -> list[tuple]:
+    """Return a timeline's rows as (time, command, sequence, copies, gap, duplicate, reset, hmac)."""
+    columns = [CSV_FIELDS.index(field) for field in (
+        "time", "command", "sequence", "copies", "gap", "duplicate", "reset", "hmac"
+    )]
+    return [tuple(row[column] for column in columns) for row in decoder.timelines[mac].rows]
+
+
+def test_pcap_timeline() -> None:
+    """Copies fold into one row; gaps, duplicates and altered packets are flagged."""
+    decoder = CaptureDecoder()
+    decoder.decode_file(str(CAPTURES / "sensor_traffic.pcap"))
+
+    assert _timeline(decoder, "012345678900") == [
+        (T0, "pair", 1, 2, 0, False, False, "ok"),
+        (T0 + 60, "data", 2, 3, 0, False, False, "ok"),
+        (T0 + 120, "data", 3, 1, 0, False, False, "ok"),
+        (T0 + 180, "data", 5, 1, 1, False, False, "ok"),
+        (T0 + 190, "data", 3, 1, 0, True, False, "ok"),
+        (T0 + 240, "data", 6, 1, 0, False, False, "bad"),
+    ]
+    assert decoder.summary() == {
+        "frames": 12,
+        "sensor_payloads": 11,  # All but the DNS frame
+        "malformed": 1,
+        "sensors": {
+            "012345678900": {
+                "sensor_id": 0,
+                "name": "Kitchen",
+                "packets": 9,
+                "distinct_packets": 6,
+                "missing": 1,
+                "duplicates": 1,
+                "resets": 0,
+                "hmac_failures": 1,
+                "responses": 1,
+            },
+        },
+    }
+
+
+def test_pcapng_sections_and_interfaces() -> None:
+    """Each section has its own byte order, interfaces and timestamp resolution."""
+    decoder = CaptureDecoder()
+    decoder.decode_file(str(CAPTURES / "sensor_traffic.pcapng"))
+
+    rows = _timeline(decoder, "012345678901")
+    assert rows == [
+        (T0 + 100.5, "data", 10, 1, 0, False, False, "ok"),
+        (T0 + 400.5, "data", 11, 1, 0, False, False, "ok"),
+        (T0 + 700.5, "data", 13, 1, 1, False, False, "ok"),
+        (pytest.approx(T0 + 1000.25), "data", 14, 2, 0, False, False, "ok"),
+        (0.0, "data", 15, 1, 0, False, False, "ok"),  # Simple packets have no timestamp
+        (T0 + 1600, "data", 12, 1, 0, False, True, "ok"),
+    ]
+    assert decoder.frames == 7  # The packet on the undescribed interface is skipped
+
+
+def test_mac_prefix_filters_sensors() -> None:
+    """Only MACs with the given prefix get a timeline."""
+    decoder = CaptureDecoder("ABCDEF0123")
+    decoder.decode_file(str(CAPTURES / "sensor_traffic.pcap"))
+    assert decoder.timelines == {}
+
+    decoder = CaptureDecoder("0123456789")
+    decoder.decode_file(str(CAPTURES / "sensor_traffic.pcap"))
+    assert list(decoder.timelines) == ["012345678900"]
+
+
+def test_truncated_capture_keeps_complete_records() -> None:
+    """A capture cut off mid-record yields the records before the cut."""
+    data = (CAPTURES / "sensor_traffic.pcap").read_bytes()
+    frames = list(iter_frames(memoryview(data[:-10])))
+    assert len(frames) == 11
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00" * 64])
+def test_not_a_capture(data: bytes) -> None:
+    """Files that are neither pcap nor pcapng raise CaptureError."""
+    with pytest.raises(CaptureError):
+        iter_frames(memoryview(data))
+
+
+def test_big_endian_pcap_header() -> None:
+    """Classic pcap written big-endian is read with its own byte order."""
+    data = (CAPTURES / "sensor_traffic.pcap").read_bytes()
+    header = struct.unpack("<IHHiIII", data[:24])
+    converted = bytearray(struct.pack(">IHHiIII", *header))
+    pos = 24
+    while pos < len(data):
+        record = struct.unpack_from("<IIII", data, pos)
+        converted += struct.pack(">IIII", *record)
+        converted += data[pos + 16:pos + 16 + record[2]]
+        pos += 16 + record[2]
+
+    assert [timestamp for timestamp, _, _ in iter_frames(memoryview(bytes(converted)))] == [
+        timestamp for timestamp, _, _ in iter_frames(memoryview(data))
+    ]
+
+
+def test_csv_output(capsys) -> None:
+    """The command line writes one CSV row per distinct packet."""
+    assert main([str(CAPTURES / "sensor_traffic.pcap")]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == ",".join(CSV_FIELDS)
+    assert len(lines) == 7
+
+    decoder = CaptureDecoder()
+    decoder.decode_file(str(CAPTURES / "sensor_traffic.pcapng"))
+    output = io.StringIO()
+    write_csv(decoder, output)
+    assert len(output.getvalue().splitlines()) == 7
@@ -0,0 +1,92 @@
+"""Tests for the purpose-aware priority lanes."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.venstar_translator.const import (
+    LOW_PRIORITY_MAX_DEFER,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PURPOSE_OUTDOOR,
+    PURPOSE_REMOTE,
+    PURPOSE_RETURN,
+    PURPOSE_SUPPLY,
+)
+from custom_components.venstar_translator.priority import PriorityLanes, get_priority
+
+
+@pytest.mark.parametrize(
+    ("purpose", "priority"),
+    [
+        (PURPOSE_SUPPLY, PRIORITY_HIGH),
+        (PURPOSE_RETURN, PRIORITY_HIGH),
+        (PURPOSE_OUTDOOR, PRIORITY_LOW),
+        (PURPOSE_REMOTE, PRIORITY_LOW),
+    ],
+)
+def test_priority_by_purpose(purpose: str, priority: str) -> None:
+    """Supply and Return sensors are high priority, the rest low."""
+    assert get_priority(purpose) == priority
+
+
+def _wait_turn(loop: asyncio.AbstractEventLoop, lanes: PriorityLanes, releases: dict[int, float]) -> float:
+    """Wait for a turn while high priority sensors are released after the given delays."""
+    for sensor_id, delay in releases.items():
+        loop.call_later(delay, lanes.release, sensor_id)
+    return loop.run_until_complete(lanes.async_wait_turn())
+
+
+def test_nothing_due_returns_at_once(virtual_loop) -> None:
+    """Without a due high priority broadcast the turn is immediate and not counted."""
+    lanes = PriorityLanes()
+    lanes.expect(5, virtual_loop.time() + 10)  # Announced, but not due yet
+
+    assert _wait_turn(virtual_loop, lanes, {}) == 0.0
+    assert lanes.deferred == 0
+
+
+def test_waits_until_due_broadcasts_are_released(virtual_loop) -> None:
+    """A low priority broadcast goes once every due high priority one is done."""
+    lanes = PriorityLanes()
+    now = virtual_loop.time()
+    lanes.expect(5, now)
+    lanes.expect(6, now)
+
+    assert _wait_turn(virtual_loop, lanes, {5: 0.25, 6: 0.5}) == pytest.approx(0.5)
+    assert lanes.deferred == 1
+    assert lanes.deferred_seconds == pytest.approx(0.5)
+
+
+def test_wait_is_capped(virtual_loop) -> None:
+    """A high priority broadcast that never completes holds others for at most the cap."""
+    lanes = PriorityLanes()
+    lanes.expect(5, virtual_loop.time())
+
+    assert _wait_turn(virtual_loop, lanes, {}) == pytest.approx(LOW_PRIORITY_MAX_DEFER)
+
+
+def test_releasing_an_unannounced_sensor_is_harmless(virtual_loop) -> None:
+    """Releasing a sensor twice, or one that never announced, wakes nobody spuriously."""
+    lanes = PriorityLanes()
+    lanes.expect(5, virtual_loop.time())
+    lanes.release(7)
+
+    assert _wait_turn(virtual_loop, lanes, {5: 1.0, 6: 0.5}) == pytest.approx(1.0)
+    lanes.release(5)
+    assert lanes.as_dict()["deferred"] == 1
+
+
+def test_lateness_is_recorded_per_lane() -> None:
+    """Lateness goes into the sensor's lane; early sends count as on time."""
+    lanes = PriorityLanes()
+    lanes.record_lateness(PURPOSE_SUPPLY, 0.004)
+    lanes.record_lateness(PURPOSE_REMOTE, 0.2)
+    lanes.record_lateness(PURPOSE_OUTDOOR, -0.1)
+
+    lateness = lanes.as_dict()["lateness"]
+    assert lateness[PRIORITY_HIGH]["count"] == 1
+    assert lateness[PRIORITY_HIGH]["max_ms"] == 4.0
+    assert lateness[PRIORITY_LOW]["count"] == 2
+    assert lateness[PRIORITY_LOW]["p50_ms"] == 0.0
@@ -0,0 +1,149 @@
+"""Tests for the send ledger and the broadcaster's rate limit enforcement."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.venstar_translator.broadcaster import Broadcaster
+from custom_components.venstar_translator.const import (
+    DEFAULT_INTERVAL,
+    OUTDOOR_INTERVAL,
+    PURPOSE_OUTDOOR,
+    PURPOSE_REMOTE,
+    RATE_LIMIT_MODE_WARN,
+    RATE_LIMIT_WINDOW,
+    SCHEDULE_SLACK,
+    SETTING_RATE_LIMIT_MODE,
+)
+from custom_components.venstar_translator.packet_trace import (
+    KIND_DATA,
+    KIND_PAIRING,
+    KIND_RESEND,
+)
+from custom_components.venstar_translator.ratelimit import SendLedger
+from custom_components.venstar_translator.registry import SensorRecord, SensorRegistry
+from custom_components.venstar_translator.replay import ReplayHass, ReplayStorage
+
+MIN_GAP = DEFAULT_INTERVAL - SCHEDULE_SLACK
+
+
+def test_ledger_min_gap_follows_purpose() -> None:
+    """The allowed gap is the purpose's interval less the scheduler's slack."""
+    ledger = SendLedger()
+    assert ledger.time_until_allowed(0.0, PURPOSE_REMOTE) == 0.0
+
+    ledger.record(100.0)
+    assert ledger.time_until_allowed(110.0, PURPOSE_REMOTE) == MIN_GAP - 10
+    assert ledger.time_until_allowed(110.0, PURPOSE_OUTDOOR) == OUTDOOR_INTERVAL - SCHEDULE_SLACK - 10
+    assert ledger.time_until_allowed(100.0 + MIN_GAP, PURPOSE_REMOTE) == 0.0
+
+
+def test_ledger_keeps_a_sliding_window() -> None:
+    """Sends older than the window are pruned, but the last send is always kept."""
+    ledger = SendLedger()
+    for now in (0.0, 60.0, 120.0):
+        ledger.record(now)
+    assert ledger.gaps.count == 2
+
+    ledger.record(120.0 + RATE_LIMIT_WINDOW + 30)
+    summary = ledger.as_dict()
+    assert summary["sends"] == 4
+    assert summary["sends_in_window"] == 1
+    assert ledger.time_until_allowed(120.0 + RATE_LIMIT_WINDOW + 31, PURPOSE_REMOTE) > 0
+
+
+@pytest.fixture
+def broadcaster(virtual_loop) -> Broadcaster:
+    """Broadcaster for one Remote sensor, recording the loop time of every send."""
+    registry = SensorRegistry()
+    registry.add(SensorRecord(0, "sensor.kitchen", "Kitchen", PURPOSE_REMOTE))
+    broadcaster = Broadcaster(
+        ReplayHass(virtual_loop, 0.0),
+        ReplayStorage("0123456789", registry),
+        send=lambda packet, port, repeat_count: broadcaster.sent.append(
+            (virtual_loop.time(), packet)
+        ),
+    )
+    broadcaster.sent = []
+    return broadcaster
+
+
+def _send_at(broadcaster: Broadcaster, delay: float, packet: bytes, kind: int) -> asyncio.Task:
+    """Start a send after delay seconds; the task's result is async_send's."""
+
+    async def send() -> bool:
+        await asyncio.sleep(delay)
+        return await broadcaster.async_send(0, packet, kind, sequence=1)
+
+    return asyncio.ensure_future(send())
+
+
+def test_deferred_send_holds_up_neither_resends_nor_pairing(virtual_loop, broadcaster) -> None:
+    """A deferred data packet waits without the lock; a resend behind it is dropped.
+
+    Pairing goes out at once and restarts the data packet's wait.
+    """
+
+    async def scenario() -> list[bool]:
+        start = asyncio.get_running_loop().time()
+        tasks = [
+            _send_at(broadcaster, 0.0, b"data-1", KIND_DATA),
+            _send_at(broadcaster, 1.0, b"resend", KIND_RESEND),
+            _send_at(broadcaster, 2.0, b"data-2", KIND_DATA),
+            _send_at(broadcaster, 3.0, b"pairing", KIND_PAIRING),
+        ]
+        results = await asyncio.gather(*tasks)
+        broadcaster.sent = [(when - start, packet) for when, packet in broadcaster.sent]
+        return results
+
+    results = virtual_loop.run_until_complete(scenario())
+
+    assert results == [True, False, True, True]
+    assert broadcaster.sent == [
+        (0.0, b"data-1"),
+        (3.0, b"pairing"),
+        (pytest.approx(3.0 + MIN_GAP), b"data-2"),
+    ]
+    ledger = broadcaster.ledger_for(0)
+    assert ledger.dropped == 1
+    assert ledger.deferred == 1
+    assert ledger.deferred_seconds == pytest.approx((MIN_GAP - 2.0) + 3.0)
+    assert ledger.violations == 1  # The pairing packet
+
+
+def test_resend_after_scheduled_send_leaves_next_deadline_alone(virtual_loop, broadcaster) -> None:
+    """A resend just after a broadcast doesn't push the next broadcast back."""
+
+    async def scenario() -> list[bool]:
+        start = asyncio.get_running_loop().time()
+        results = await asyncio.gather(
+            _send_at(broadcaster, 0.0, b"data-1", KIND_DATA),
+            _send_at(broadcaster, 5.0, b"resend", KIND_RESEND),
+            _send_at(broadcaster, DEFAULT_INTERVAL, b"data-2", KIND_DATA),
+        )
+        broadcaster.sent = [(when - start, packet) for when, packet in broadcaster.sent]
+        return results
+
+    results = virtual_loop.run_until_complete(scenario())
+
+    assert results == [True, False, True]
+    assert broadcaster.sent == [(0.0, b"data-1"), (DEFAULT_INTERVAL, b"data-2")]
+    assert broadcaster.ledger_for(0).deferred == 0
+
+
+def test_warn_mode_sends_at_once(virtual_loop, broadcaster) -> None:
+    """In warn mode early sends, resends included, go out and count as violations."""
+    broadcaster._storage.settings[SETTING_RATE_LIMIT_MODE] = RATE_LIMIT_MODE_WARN
+
+    async def scenario() -> list[bool]:
+        return await asyncio.gather(
+            _send_at(broadcaster, 0.0, b"data-1", KIND_DATA),
+            _send_at(broadcaster, 1.0, b"resend", KIND_RESEND),
+            _send_at(broadcaster, 2.0, b"data-2", KIND_DATA),
+        )
+
+    assert virtual_loop.run_until_complete(scenario()) == [True, True, True]
+    assert [packet for _, packet in broadcaster.sent] == [b"data-1", b"resend", b"data-2"]
+    assert broadcaster.ledger_for(0).violations == 2
+    assert broadcaster.ledger_for(0).deferred == 0
@@ -0,0 +1,136 @@
+"""Tests for the sensor registry and its free-ID bitmap."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.venstar_translator.const import (
+    MAX_SENSORS,
+    PURPOSE_OUTDOOR,
+    PURPOSE_REMOTE,
+    SMOOTHING_EMA,
+    SOURCE_ENTITY,
+    SOURCE_HTTP_JSON,
+)
+from custom_components.venstar_translator.registry import SensorRecord, SensorRegistry
+
+
+def _record(sensor_id: int, name: str | None = None) -> SensorRecord:
+    """Build a Remote sensor record."""
+    name = name or f"Sensor {sensor_id}"
+    return SensorRecord(sensor_id, f"sensor.s{sensor_id}", name, PURPOSE_REMOTE)
+
+
+def test_next_free_id_fills_the_lowest_hole() -> None:
+    """The lowest unused ID is handed out, including holes left by removals."""
+    registry = SensorRegistry()
+    assert registry.next_free_id() == 0
+
+    for sensor_id in (0, 1, 2, 4):
+        registry.add(_record(sensor_id))
+    assert registry.next_free_id() == 3
+
+    registry.remove(1)
+    assert registry.next_free_id() == 1
+    assert 1 not in registry
+    assert registry.id_for_name("Sensor 1") is None
+
+
+def test_full_registry_has_no_free_id() -> None:
+    """With every slot taken next_free_id returns None, and freeing one reopens it."""
+    registry = SensorRegistry()
+    for sensor_id in range(MAX_SENSORS):
+        registry.add(_record(sensor_id))
+
+    assert registry.next_free_id() is None
+    registry.remove(MAX_SENSORS - 1)
+    assert registry.next_free_id() == MAX_SENSORS - 1
+
+
+@pytest.mark.parametrize(
+    ("record", "message"),
+    [
+        (_record(MAX_SENSORS), "out of range"),
+        (_record(-1), "out of range"),
+        (_record(0, "Other"), "Sensor 0 already exists"),
+        (_record(1, "Kitchen"), "name 'Kitchen' already exists"),
+    ],
+)
+def test_add_rejects_conflicts(record, message) -> None:
+    """IDs outside the range, taken IDs and taken names are rejected."""
+    registry = SensorRegistry()
+    registry.add(_record(0, "Kitchen"))
+
+    with pytest.raises(ValueError, match=message):
+        registry.add(record)
+    assert len(registry) == 1
+
+
+def test_rename_moves_the_name_index() -> None:
+    """A renamed sensor is found under its new name only; taken names are refused."""
+    registry = SensorRegistry()
+    kitchen = _record(0, "Kitchen")
+    registry.add(kitchen)
+    registry.add(_record(1, "Garage"))
+
+    registry.rename(kitchen, "Den")
+    assert kitchen.name == "Den"
+    assert registry.id_for_name("Den") == 0
+    assert registry.id_for_name("Kitchen") is None
+
+    with pytest.raises(ValueError, match="already exists"):
+        registry.rename(kitchen, "Garage")
+    registry.rename(kitchen, "Den")  # Its own name is fine
+
+
+def test_remove_unknown_sensor_raises() -> None:
+    """Removing an ID that isn't configured raises ValueError."""
+    with pytest.raises(ValueError, match="does not exist"):
+        SensorRegistry().remove(3)
+
+
+def test_iterates_in_id_order_and_round_trips() -> None:
+    """Records iterate by ID, and the persisted mapping rebuilds the same registry."""
+    registry = SensorRegistry()
+    registry.add(_record(5))
+    registry.add(SensorRecord(2, "sensor.outside", "Outside", PURPOSE_OUTDOOR, sequence=42))
+    registry.add(_record(0))
+
+    assert [record.sensor_id for record in registry] == [0, 2, 5]
+
+    restored = SensorRegistry.from_dict(registry.as_dict())
+    assert restored.as_dict() == registry.as_dict()
+    assert restored.get(2).sequence == 42
+    assert restored.next_free_id() == 1
+
+
+def test_as_dict_extends_config() -> None:
+    """The persisted layout is config() plus sequence and broadcast state."""
+    http = SensorRecord(
+        3,
+        "",
+        "Attic",
+        PURPOSE_REMOTE,
+        source=SOURCE_HTTP_JSON,
+        url="http://pi.local/attic",
+        json_path="$.temperature",
+        smoothing=SMOOTHING_EMA,
+        hysteresis=0.3,
+        sequence=7,
+        last_packet=b"\x08\x2a",
+        last_temperature=71.5,
+        last_broadcast=1700000000.0,
+    )
+    data = http.as_dict()
+    assert data == {
+        **http.config(),
+        "sequence": 7,
+        "last_packet": "CCo=",
+        "last_temperature": 71.5,
+        "last_broadcast": 1700000000.0,
+    }
+    assert SensorRecord.from_dict(3, data).as_dict() == data
+
+    entity = _record(0)
+    assert entity.config()["source"] == SOURCE_ENTITY
+    assert "source" not in entity.as_dict()
+    assert SensorRecord.from_dict(0, entity.as_dict()).config() == entity.config()
@@ -0,0 +1,115 @@
+"""Scheduling tests driven by the virtual-clock replay harness."""
+from __future__ import annotations
+
+from custom_components.venstar_translator.const import (
+    DEFAULT_INTERVAL,
+    OUTDOOR_INTERVAL,
+    PURPOSE_OUTDOOR,
+    PURPOSE_REMOTE,
+    PURPOSE_SUPPLY,
+)
+from custom_components.venstar_translator.registry import SensorRecord
+from custom_components.venstar_translator.replay import run_replay, synthetic_timeline
+from custom_components.venstar_translator.timeline import Timeline
+
+MAC_PREFIX = "0123456789"
+
+
+def _steady_timeline(hours: float, *purposes: str, temperature: float = 70.2) -> Timeline:
+    """Build a timeline whose sensors read the same temperature throughout."""
+    timeline = Timeline(
+        MAC_PREFIX,
+        {
+            sensor_id: SensorRecord(
+                sensor_id, f"sensor.steady_{sensor_id}", f"Steady {sensor_id}", purpose
+            ).as_dict()
+            for sensor_id, purpose in enumerate(purposes)
+        },
+    )
+    timeline.duration = hours * 3600
+    timeline.readings = [(0.0, sensor_id, temperature) for sensor_id in range(len(purposes))]
+    return timeline
+
+
+def test_synthetic_day_passes_every_check() -> None:
+    """Twenty sensors over six hours: counts, sequences, spacing and lateness hold."""
+    report = run_replay(synthetic_timeline(20, 6, seed=1))
+
+    assert report["failures"] == []
+    assert len(report["sensors"]) == 20
+    for result in report["sensors"].values():
+        assert result["packets"] + result["skipped"] == result["expected"]
+        assert result["sequence_breaks"] == 0
+        assert result["close_gaps"] == 0
+        assert result["long_gaps"] == 0
+
+
+def test_every_deadline_is_sent_without_keepalive_stretching() -> None:
+    """Without adaptive keepalive every deadline is broadcast, on time."""
+    report = run_replay(synthetic_timeline(4, 2, seed=2), adaptive_keepalive=False)
+
+    assert report["failures"] == []
+    for result in report["sensors"].values():
+        assert result["skipped"] == 0
+        assert result["packets"] == result["expected"]
+        assert result["max_lateness_ms"] == 0.0
+
+
+def test_deadlines_hold_with_slow_sends() -> None:
+    """A 50 ms send shifts no deadline and breaks no sequence."""
+    report = run_replay(synthetic_timeline(20, 2, seed=3), send_latency=0.05)
+
+    assert report["failures"] == []
+    for result in report["sensors"].values():
+        assert result["max_lateness_ms"] < 1000
+
+
+def test_unavailable_readings_are_not_broadcast() -> None:
+    """Deadlines without a reading are neither sent nor counted as expected."""
+    timeline = synthetic_timeline(4, 2, seed=4, dropout=0.3)
+
+    report = run_replay(timeline, adaptive_keepalive=False)
+
+    assert report["failures"] == []
+    for sensor_id, result in report["sensors"].items():
+        deadlines = timeline.duration // result["interval"]
+        assert result["expected"] < deadlines, sensor_id
+
+
+def test_steady_sensor_stretches_to_keepalive_ceiling() -> None:
+    """An unchanged index is sent at the keepalive ceiling, not every interval.
+
+    The ceiling leaves room for one lost keepalive inside the sensor
+    timeout, so 1-minute sensors send every other interval and Outdoor
+    sensors are not stretched at all.
+    """
+    report = run_replay(
+        _steady_timeline(2, PURPOSE_REMOTE, PURPOSE_OUTDOOR, PURPOSE_SUPPLY),
+        adaptive_keepalive=True,
+    )
+
+    assert report["failures"] == []
+    remote, outdoor, supply = (report["sensors"][str(sensor_id)] for sensor_id in range(3))
+    assert remote["expected"] == 2 * 3600 // DEFAULT_INTERVAL
+    assert outdoor["expected"] == 2 * 3600 // OUTDOOR_INTERVAL
+    for result in (remote, supply):
+        assert result["packets"] <= result["expected"] // 2 + 1
+    assert outdoor["packets"] == outdoor["expected"]
+    for result in (remote, outdoor, supply):
+        assert result["long_gaps"] == 0
+
+
+def test_timeline_round_trip(tmp_path) -> None:
+    """A written timeline reads back with the same readings and duration."""
+    timeline = synthetic_timeline(3, 0.5, seed=5, dropout=0.1)
+    path = str(tmp_path / "timeline.jsonl.gz")
+
+    timeline.write(path)
+    restored = Timeline.read(path)
+
+    assert restored.mac_prefix == timeline.mac_prefix
+    assert restored.duration == timeline.duration
+    assert restored.readings == timeline.readings
+    assert restored.sensors == {
+        sensor_id: data for sensor_id, data in timeline.sensors.items()
+    }
@@ -0,0 +1,131 @@
+"""Tests for bulk sensor import and loading saved settings."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.venstar_translator import storage as storage_module  # noqa: E402
+from custom_components.venstar_translator.const import (  # noqa: E402
+    MAX_SENSORS,
+    PURPOSE_OUTDOOR,
+    PURPOSE_REMOTE,
+    SETTING_ADAPTIVE_KEEPALIVE,
+)
+from custom_components.venstar_translator.storage import (  # noqa: E402
+    VenstarTranslatorStorage,
+)
+
+
+class _MemoryStore:
+    """Stands in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, hass: Any, version: int, key: str) -> None:
+        self.data = None
+
+    async def async_load(self) -> Any:
+        return self.data
+
+    async def async_save(self, data: Any) -> None:
+        self.data = data
+
+
+@pytest.fixture
+def storage(monkeypatch) -> VenstarTranslatorStorage:
+    """Storage with two sensors: Outside (0) and Kitchen (1)."""
+    monkeypatch.setattr(storage_module, "Store", _MemoryStore)
+    storage = VenstarTranslatorStorage(None)
+    storage.mac_prefix = "0123456789"
+    storage.add_sensor("sensor.outside", "Outside", PURPOSE_OUTDOOR)
+    storage.add_sensor("sensor.kitchen", "Kitchen", PURPOSE_REMOTE)
+    storage.get_sensor(1).sequence = 42
+    return storage
+
+
+def _entry(name: str, purpose: str = PURPOSE_REMOTE, **settings: Any) -> dict[str, Any]:
+    """Build an import entry for an entity source."""
+    return {"name": name, "purpose": purpose, "entity_id": f"sensor.{name.lower()}", **settings}
+
+
+def _layout(storage: VenstarTranslatorStorage) -> dict[int, tuple[str, str]]:
+    """Return every sensor's name and purpose by ID."""
+    return {record.sensor_id: (record.name, record.purpose) for record in storage.sensors}
+
+
+def test_import_adds_updates_and_keeps(storage) -> None:
+    """Entries update sensors by name or ID and add new ones under free IDs."""
+    added, updated, removed = storage.import_sensors(
+        [
+            _entry("Kitchen", entity_id="sensor.kitchen_2"),
+            _entry("Garage"),
+            _entry("Attic", sensor_id=5),
+        ]
+    )
+
+    assert (added, updated, removed) == ([2, 5], [1], [])
+    assert _layout(storage) == {
+        0: ("Outside", PURPOSE_OUTDOOR),
+        1: ("Kitchen", PURPOSE_REMOTE),
+        2: ("Garage", PURPOSE_REMOTE),
+        5: ("Attic", PURPOSE_REMOTE),
+    }
+    # Updated in place, keeping the sequence
+    assert storage.get_sensor(1).entity_id == "sensor.kitchen_2"
+    assert storage.get_sensor(1).sequence == 42
+
+
+def test_unchanged_entry_is_not_reported_as_updated(storage) -> None:
+    """Re-importing a sensor's own settings changes nothing."""
+    entry = {"sensor_id": 1, **storage.get_sensor(1).config()}
+
+    assert storage.import_sensors([entry]) == ([], [], [])
+
+
+def test_replace_removes_unlisted_sensors(storage) -> None:
+    """With replace, sensors the document doesn't mention are removed."""
+    added, updated, removed = storage.import_sensors([_entry("Kitchen")], replace=True)
+
+    assert (added, updated, removed) == ([], [], [0])
+    assert _layout(storage) == {1: ("Kitchen", PURPOSE_REMOTE)}
+
+
+@pytest.mark.parametrize(
+    ("entries", "message"),
+    [
+        ([_entry("Garage", "Basement")], "entry 1: invalid purpose"),
+        ([_entry("A name far too long")], "longer than"),
+        ([_entry("Garage", sensor_id=3), _entry("Attic", sensor_id=3)], "sensor 3 is listed twice"),
+        ([_entry("Kitchen", PURPOSE_OUTDOOR, sensor_id=0)], "sensor 0"),
+        ([_entry(f"Sensor {n}") for n in range(MAX_SENSORS)], f"maximum {MAX_SENSORS} sensors"),
+    ],
+)
+def test_invalid_document_changes_nothing(storage, entries, message) -> None:
+    """Any invalid entry rejects the whole import and leaves storage untouched."""
+    before = storage.sensors.as_dict()
+
+    with pytest.raises(ValueError, match=message):
+        storage.import_sensors([_entry("Porch"), *entries])
+
+    assert storage.sensors.as_dict() == before
+
+
+def test_every_error_is_reported(storage) -> None:
+    """The error lists every invalid entry, not just the first."""
+    with pytest.raises(ValueError) as excinfo:
+        storage.import_sensors([_entry(""), _entry("Garage", scale="K")])
+
+    assert "entry 0: name is required" in str(excinfo.value)
+    assert "entry 1: invalid scale" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(("multiple", "adaptive"), [(1, False), (2, True), (3, True)])
+def test_keepalive_multiple_loads_as_on_off(storage, multiple: int, adaptive: bool) -> None:
+    """A saved keepalive multiple becomes the adaptive keepalive switch."""
+    storage._store.data = {"mac_prefix": "0123456789", "settings": {"keepalive_multiple": multiple}}
+    asyncio.run(storage.async_load())
+
+    assert storage.settings[SETTING_ADAPTIVE_KEEPALIVE] is adaptive
+    assert "keepalive_multiple" not in storage.settings
@@ -0,0 +1,81 @@
+"""Tests for the zero-copy SensorMessage decoder."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.venstar_translator.const import PURPOSE_OUTDOOR
+from custom_components.venstar_translator.protobuf import sensor_message_pb2
+from custom_components.venstar_translator.venstar_sensor import VenstarSensor
+from custom_components.venstar_translator.wire import (
+    COMMAND_SENSORDATA,
+    COMMAND_SENSORPAIR,
+    DecodeError,
+    decode_sensor_message,
+)
+
+
+@pytest.fixture
+def sensor() -> VenstarSensor:
+    """Outdoor sensor 7 at sequence 300 (a two-byte varint)."""
+    return VenstarSensor(7, "0123456789", "Porch", PURPOSE_OUTDOOR, "F", sequence=300)
+
+
+def test_decodes_data_packet(sensor) -> None:
+    """Every INFO field the decoder reads matches what protobuf serialized."""
+    packet = sensor.build_data_packet(41.0)
+    expected = sensor_message_pb2.SensorMessage()
+    expected.ParseFromString(packet)
+
+    message = decode_sensor_message(packet)
+
+    assert message.command == COMMAND_SENSORDATA
+    assert message.sequence == 300
+    assert message.sensor_id == 7
+    assert message.mac == "012345678907"
+    assert message.name == "Porch"
+    assert message.sensor_type == sensor_message_pb2.INFO.OUTDOOR
+    assert message.temperature == sensor.temperature_index
+    assert message.signature == expected.SensorData.Signature
+    assert message.info.tobytes() == expected.SensorData.Info.SerializeToString()
+
+
+def test_info_is_a_view_of_the_packet(sensor) -> None:
+    """The INFO submessage points into the original buffer rather than a copy."""
+    packet = bytearray(sensor.build_data_packet(41.0))
+    message = decode_sensor_message(packet)
+
+    assert message.info.obj is packet
+    assert message.signature == sensor.generate_signature(message.info.tobytes())
+
+
+def test_decodes_pairing_packet(sensor) -> None:
+    """Pairing packets carry sequence 1 and the signature key itself."""
+    message = decode_sensor_message(sensor.build_pairing_packet(41.0))
+
+    assert message.command == COMMAND_SENSORPAIR
+    assert message.sequence == 1
+    assert message.signature == sensor.signature_key
+
+
+@pytest.mark.parametrize(
+    "packet",
+    [
+        b"",  # No Command
+        b"\x08",  # Truncated varint
+        b"\x08\x2a\xd2\x02\x10\x0a",  # SENSORDATA length past the end
+        b"\x08\x2a\x0b",  # Wire type 3 (groups) is not used
+        b"\x08\x2a\x15\x00",  # Fixed32 past the end
+    ],
+)
+def test_malformed_packets_raise(packet: bytes) -> None:
+    """Malformed packets raise DecodeError instead of returning partial fields."""
+    with pytest.raises(DecodeError):
+        decode_sensor_message(packet)
+
+
+def test_response_has_no_info() -> None:
+    """A bare SUCCESS response decodes with only its command."""
+    message = decode_sensor_message(b"\x08\x7e")
+    assert message.command == 126
+    assert message.mac is None
+    assert message.info is None
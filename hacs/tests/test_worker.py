@@ -0,0 +1,233 @@
+"""Tests for the broadcast worker's filtering, cadence and repeat count."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+
+from custom_components.venstar_translator import worker as worker_module
+from custom_components.venstar_translator.const import (
+    BROADCAST_REPEAT_COUNT,
+    PURPOSE_REMOTE,
+    SMOOTHING_NONE,
+)
+from custom_components.venstar_translator.worker import (
+    MSG_CONFIG,
+    MSG_REPEAT_COUNT,
+    MSG_SENT,
+    MSG_SKIPPED,
+    MSG_TEMPERATURE,
+    BroadcastWorker,
+)
+
+INTERVAL = 60  # Remote sensors' broadcast interval
+
+
+@pytest.fixture
+def worker(virtual_loop, monkeypatch) -> Iterator[BroadcastWorker]:
+    """Worker whose sends and reports are recorded instead of performed."""
+
+    def run_inline(executor: Any, func: Callable[..., Any], *args: Any) -> asyncio.Future:
+        # No thread, so the virtual clock never waits on one
+        future = virtual_loop.create_future()
+        try:
+            future.set_result(func(*args))
+        except OSError as e:
+            future.set_exception(e)
+        return future
+
+    monkeypatch.setattr(virtual_loop, "run_in_executor", run_inline)
+    worker = BroadcastWorker()
+    worker.sends = []
+    worker.messages = []
+    monkeypatch.setattr(
+        worker_module,
+        "broadcast_udp_packet",
+        lambda packet, port, repeat_count: worker.sends.append(repeat_count),
+    )
+    worker._emit = lambda *fields: worker.messages.append(fields)
+    yield worker
+
+    async def stop() -> None:
+        tasks = list(worker._tasks.values())
+        for sensor_id in list(worker._tasks):
+            worker._stop_sensor(sensor_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    virtual_loop.run_until_complete(stop())
+
+
+def _configure(
+    loop: asyncio.AbstractEventLoop,
+    worker: BroadcastWorker,
+    temperature: float,
+    hysteresis: float = 0.0,
+    adaptive_keepalive: bool = True,
+) -> None:
+    """Configure one Remote sensor from inside the loop, as the supervisor does."""
+
+    async def configure() -> None:
+        worker.handle([
+            MSG_CONFIG,
+            "0123456789",
+            [[
+                0, 1, "Kitchen", PURPOSE_REMOTE, "F", 1, 0.0, temperature,
+                SMOOTHING_NONE, 3, hysteresis, adaptive_keepalive, BROADCAST_REPEAT_COUNT,
+            ]],
+        ])
+
+    loop.run_until_complete(configure())
+
+
+def _tags(worker: BroadcastWorker) -> list[str]:
+    """Return the tags of the reports so far."""
+    return [message[0] for message in worker.messages]
+
+
+def test_steady_sensor_stretches_to_keepalive(virtual_loop, run_for, worker) -> None:
+    """An unchanged index is skipped until the keepalive interval is up."""
+
+    _configure(virtual_loop, worker, 72.0)
+    run_for(10 * INTERVAL + 1)
+
+    # Sent at 0, 60, 180, 300, 420 and 540 s (keepalive 60, then the 120 s ceiling)
+    assert _tags(worker).count(MSG_SENT) == 6
+    assert _tags(worker).count(MSG_SKIPPED) == 5
+    assert worker.cadences[0].skipped == 5
+
+
+def test_changed_index_is_sent_at_once(virtual_loop, run_for, worker) -> None:
+    """A new index goes out at the next interval, however long the keepalive."""
+
+    _configure(virtual_loop, worker, 72.0)
+    run_for(4 * INTERVAL + 1)
+    worker.handle([MSG_TEMPERATURE, 0, 75.0])
+    worker.messages.clear()
+    run_for(INTERVAL)
+
+    assert _tags(worker) == [MSG_SENT]
+    assert worker.cadences[0].keepalive == INTERVAL
+
+
+def test_hysteresis_holds_boundary_noise(virtual_loop, run_for, worker) -> None:
+    """Readings flipping across a rounding boundary keep the first index."""
+
+    _configure(virtual_loop, worker, 72.49, hysteresis=0.5, adaptive_keepalive=False)
+    for reading in (72.51, 72.48, 72.52):
+        run_for(INTERVAL)
+        worker.handle([MSG_TEMPERATURE, 0, reading])
+    run_for(INTERVAL)
+
+    sent = [message for message in worker.messages if message[0] == MSG_SENT]
+    assert len({message[5] for message in sent}) == 1
+    assert [message[12] for message in sent] == [False, True, False, True]
+
+
+def test_filter_settings_change_keeps_sensor_running(virtual_loop, worker) -> None:
+    """New filter settings under the same generation don't restart the sensor."""
+
+    _configure(virtual_loop, worker, 72.0)
+    task = worker._tasks[0]
+    assert worker.filters[0] is None
+
+    _configure(virtual_loop, worker, 72.0, hysteresis=0.5)
+
+    assert worker._tasks[0] is task
+    assert worker.filters[0].settings == (SMOOTHING_NONE, 3, 0.5, "F")
+
+
+def test_pushed_repeat_count_is_used(virtual_loop, run_for, worker) -> None:
+    """Sends use the repeat count Home Assistant last pushed."""
+
+    _configure(virtual_loop, worker, 72.0, adaptive_keepalive=False)
+    run_for(1)
+    worker.handle([MSG_REPEAT_COUNT, 0, 2])
+    run_for(INTERVAL)
+
+    assert worker.sends == [BROADCAST_REPEAT_COUNT, 2]
+
+
+def _fail_sends(monkeypatch, worker: BroadcastWorker, failures: int | None) -> None:
+    """Make the next failures sends fail (all of them if None), recording the rest."""
+    remaining = [failures]
+
+    def send(packet: bytes, port: int, repeat_count: int) -> None:
+        if remaining[0] is None or remaining[0] > 0:
+            if remaining[0] is not None:
+                remaining[0] -= 1
+            raise OSError("Network is unreachable")
+        worker.sends.append(repeat_count)
+
+    monkeypatch.setattr(worker_module, "broadcast_udp_packet", send)
+
+
+def _sent(worker: BroadcastWorker) -> list[tuple]:
+    """Return (sequence, next sequence, error, retry, dropped) of each send report."""
+    return [
+        (message[3], message[4], message[11], message[13], message[14])
+        for message in worker.messages
+        if message[0] == MSG_SENT
+    ]
+
+
+def test_failed_send_is_retried(virtual_loop, run_for, worker, monkeypatch) -> None:
+    """A failed send is retried with backoff and goes out with its own sequence."""
+
+    _configure(virtual_loop, worker, 72.0, adaptive_keepalive=False)
+    run_for(1)
+    worker.messages.clear()
+    worker.sends.clear()
+    _fail_sends(monkeypatch, worker, 2)
+    start = virtual_loop.time()
+    run_for(INTERVAL + 4)
+
+    assert _sent(worker) == [
+        (2, 2, "Network is unreachable", 0, False),
+        (2, 2, "Network is unreachable", 1, False),
+        (2, 3, None, 2, False),
+    ]
+    assert worker.sends == [BROADCAST_REPEAT_COUNT]
+    # Sent 1 + 2 seconds after the deadline; the next broadcast keeps the interval
+    assert worker.cadences[0]._last_sent == pytest.approx(start + INTERVAL - 1 + 3)
+
+
+def test_retry_sends_latest_reading(virtual_loop, run_for, worker, monkeypatch) -> None:
+    """A reading pushed while a packet waits for its retry replaces the packet's."""
+
+    _configure(virtual_loop, worker, 72.0, adaptive_keepalive=False)
+    run_for(1)
+    worker.messages.clear()
+    _fail_sends(monkeypatch, worker, 1)
+    run_for(INTERVAL - 0.5)
+    worker.handle([MSG_TEMPERATURE, 0, 75.0])
+    run_for(1)
+
+    retried = worker.messages[-1]
+    assert (retried[3], retried[4], retried[6], retried[11]) == (2, 3, 75.0, None)
+    assert retried[5] == worker.sensors[0].temperature_index
+
+
+def test_failed_packet_dropped_before_next_deadline(virtual_loop, run_for, worker, monkeypatch) -> None:
+    """Retries stop before the next packet is due, which then reuses the sequence."""
+
+    _configure(virtual_loop, worker, 72.0)
+    run_for(3 * INTERVAL + 1)
+    assert worker.cadences[0].keepalive > INTERVAL
+
+    _fail_sends(monkeypatch, worker, None)
+    worker.handle([MSG_TEMPERATURE, 0, 75.0])
+    worker.messages.clear()
+    run_for(2 * INTERVAL - 2)
+
+    # Sent at the deadline, then 1, 3, 7, 15, 31 and 47 s after it
+    reports = _sent(worker)
+    assert [retry for _, _, _, retry, _ in reports] == list(range(7))
+    assert [dropped for _, _, _, _, dropped in reports] == [False] * 6 + [True]
+    assert worker.cadences[0].keepalive == INTERVAL
+    sequence = worker.sensors[0].sequence
+
+    _fail_sends(monkeypatch, worker, 0)
+    run_for(INTERVAL)
+    assert _sent(worker)[-1][:3] == (sequence, sequence + 1, None)